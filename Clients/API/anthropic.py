@@ -3,6 +3,7 @@ import logging
 from typing import Dict, List, Optional, Any
 # Import base classes BUT NOT the config constants anymore
 from Clients.base import BaseClient, ProviderConfig, ModelConfig, PricingTier, Message
+from Clients.conversation_log import ConversationLog
 import anthropic
 
 class AnthropicClient(BaseClient):
@@ -22,19 +23,22 @@ class AnthropicClient(BaseClient):
         )
 
     def _format_messages(self, messages: List[Message]) -> Dict[str, Any]:
-        # ... (remains the same) ...
-        formatted = []
-        system = None
-        for msg in messages:
-            if msg.role == "system":
-                system = msg.content
-            else:
-                # Anthropic uses 'user' and 'assistant'
-                role = "assistant" if msg.role == "assistant" else "user"
-                # Handle potential non-string content just in case
-                content = str(msg.content) if msg.content is not None else ""
-                formatted.append({"role": role, "content": content})
-        return {"formatted_msgs": formatted, "system": system}
+        # The system prompt goes in its own parameter; the latest one wins
+        if isinstance(messages, ConversationLog):
+            system_msg = messages.last(role="system")
+        else:
+            system_msg = next((msg for msg in reversed(messages) if msg.role == "system"), None)
+        return {"formatted_msgs": self._format_each(messages, self._format_message),
+                "system": system_msg.content if system_msg is not None else None}
+
+    def _format_message(self, msg: Message) -> Optional[Dict[str, str]]:
+        if msg.role == "system":
+            return None
+        # Anthropic uses 'user' and 'assistant'
+        role = "assistant" if msg.role == "assistant" else "user"
+        # Handle potential non-string content just in case
+        content = str(msg.content) if msg.content is not None else ""
+        return {"role": role, "content": content}
 
 
     async def _call_api(self, formatted_messages: Dict[str, Any], model_name: str, **kwargs):
@@ -93,6 +97,7 @@ class AnthropicClient(BaseClient):
         if formatted_data["system"]:
             params["system"] = formatted_data["system"]
 
+        await self._throttle()
         try:
             async with self.client.messages.stream(**params) as stream:
                 async for chunk in stream:
@@ -101,10 +106,9 @@ class AnthropicClient(BaseClient):
                     # Anthropic streams might have other event types, like message_start, message_delta, message_stop
                     # We only care about content deltas for now.
                     elif chunk.type == "message_stop":
-                        # Optional: Log final usage stats if needed, though base class doesn't handle this yet
-                        # final_message = await stream.get_final_message()
-                        # print(f"Input Tokens: {final_message.usage.input_tokens}")
-                        # print(f"Output Tokens: {final_message.usage.output_tokens}")
+                        final_message = await stream.get_final_message()
+                        self._record_usage(model, final_message.usage.input_tokens,
+                                           final_message.usage.output_tokens)
                         break
         except Exception as e:
             # Log specific stream error
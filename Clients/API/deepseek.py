@@ -32,20 +32,18 @@ class DeepSeekClient(BaseClient):
 
 
     def _format_messages(self, messages: List[Message]) -> List[Dict[str, str]]:
-        # ... (remains the same) ...
-        formatted = []
-        for msg in messages:
-            content_str = str(msg.content) if msg.content is not None else ""
-            # Keep system messages even if content is empty/whitespace
-            # Keep user/assistant messages only if content is non-empty/non-whitespace
-            if msg.role == 'system' or content_str.strip():
-                 formatted.append({"role": msg.role, "content": content_str})
-            elif msg.role != 'system':
-                 # Only log if skipping non-system, non-empty message (should be rare)
-                 if content_str:
-                     print(f"[DeepSeekClient._format_messages] Skipping message with only whitespace: Role={msg.role}")
+        return self._format_each(messages, self._format_message)
 
-        return formatted
+    def _format_message(self, msg: Message) -> Optional[Dict[str, str]]:
+        content_str = str(msg.content) if msg.content is not None else ""
+        # Keep system messages even if content is empty/whitespace
+        # Keep user/assistant messages only if content is non-empty/non-whitespace
+        if msg.role == 'system' or content_str.strip():
+            return {"role": msg.role, "content": content_str}
+        # Only log if skipping non-system, non-empty message (should be rare)
+        if content_str:
+            print(f"[DeepSeekClient._format_messages] Skipping message with only whitespace: Role={msg.role}")
+        return None
 
 
     async def _call_api(self, formatted_messages: List[Dict[str, str]], model_name: str, **kwargs):
@@ -140,7 +138,9 @@ class DeepSeekClient(BaseClient):
             "model": model_to_use,
             "max_tokens": kwargs.get('max_tokens', 4096), # Increased default
             "temperature": kwargs.get('temperature', 0.7),
-            "stream": True
+            "stream": True,
+            # The final chunk then carries the token usage of the whole call
+            "stream_options": {"include_usage": True}
         }
 
         # --- DEBUG LOGGING ---
@@ -154,9 +154,12 @@ class DeepSeekClient(BaseClient):
         # --- END DEBUG LOGGING ---
 
 
+        await self._throttle()
         try:
             response = await self.client.chat.completions.create(**params)
             async for chunk in response:
+                if getattr(chunk, "usage", None):
+                    self._record_usage(model, chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
                 content_delta = None
                 try:
                     # Standard OpenAI streaming chunk format
@@ -5,7 +5,9 @@ from Clients.base import (
     PricingTier,
     ProviderConfig,
     UsageStats,
+    track_usage,
 )
+from Clients.conversation_log import ConversationLog, LogEntry
 
 # Import clients
 try:
@@ -26,6 +28,9 @@ __all__ = [
     "PricingTier",
     "ProviderConfig",
     "UsageStats",
+    "track_usage",
+    "ConversationLog",
+    "LogEntry",
     
     # Client implementations
     "AnthropicClient",
@@ -1,8 +1,12 @@
+import contextvars
 import importlib
 import os
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any, AsyncGenerator
+from typing import List, Dict, Optional, Any, AsyncGenerator, Callable, Iterator
+
+from Clients.conversation_log import ConversationLog
 
 @dataclass
 class Message:
@@ -40,7 +44,32 @@ class UsageStats:
     output_tokens: int
     cost: float
 
+# Clients are shared between sessions, so usage is added to whichever tracker the calling task set
+_session_usage: contextvars.ContextVar[Optional[UsageStats]] = contextvars.ContextVar("session_usage", default=None)
+
+@contextmanager
+def track_usage() -> Iterator[UsageStats]:
+    """Collects the token usage and cost of every API call made inside the block (on this task)."""
+    stats = UsageStats(input_tokens=0, output_tokens=0, cost=0.0)
+    token = _session_usage.set(stats)
+    try:
+        yield stats
+    finally:
+        _session_usage.reset(token)
+
+def add_usage(usage: UsageStats) -> None:
+    """Adds usage tracked elsewhere (e.g. by sub-sessions on their own tasks) to the active tracker, if any."""
+    stats = _session_usage.get()
+    if stats is None:
+        return
+    stats.input_tokens += usage.input_tokens
+    stats.output_tokens += usage.output_tokens
+    stats.cost += usage.cost
+
 class BaseClient:
+    # Shared request budget (Core.rate_limit.SharedRateLimiter) set by a multi-process supervisor
+    rate_limiter = None
+
     def __init__(self, config: ProviderConfig):
         self.config = config
         self.api_key = os.getenv(config.api_key_env)
@@ -71,12 +100,36 @@ class BaseClient:
             raise ValueError(f"Model {model} not found in {self.config.name} config")
         return self.config.models[model]
 
+    def calculate_cost(self, model_name: str, input_tokens: int, output_tokens: int, cache_hit: bool = True) -> float:
+        pricing = self._get_model_config(model_name).pricing
+        return (input_tokens * pricing.input + output_tokens * pricing.output) / 1_000_000
+
+    async def _throttle(self):
+        """Waits for the shared request budget, if one is set, before an API call."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+    def _record_usage(self, model_name: str, input_tokens: int, output_tokens: int):
+        """Adds one call's token counts to the active track_usage() block, if any."""
+        if _session_usage.get() is None:
+            return
+        add_usage(UsageStats(input_tokens, output_tokens, self.calculate_cost(model_name, input_tokens, output_tokens)))
+
     def _initialize_client(self):
         raise NotImplementedError("Subclasses must implement _initialize_client")
 
     def _format_messages(self, messages: List[Message]) -> Any:
         raise NotImplementedError("Subclasses must implement _format_messages")
 
+    def _format_each(self, messages: List[Message], format_message: Callable[[Message], Any]) -> List[Any]:
+        """
+        `format_message` applied to every message, leaving out None results.
+        A ConversationLog keeps the results, so each turn formats only its new messages.
+        """
+        if isinstance(messages, ConversationLog):
+            return messages.formatted(self.config.name, format_message)
+        return [item for item in map(format_message, messages) if item is not None]
+
     def _call_api(self, **kwargs):
         raise NotImplementedError("Subclasses must implement _call_api")
 
@@ -91,12 +144,17 @@ class BaseClient:
             model_to_use = model_config.name
             formatted_data_for_api = self._format_messages(messages)
 
+            await self._throttle()
             api_response = await self._call_api(
                 formatted_messages=formatted_data_for_api,
                 model_name=model_to_use,
                 **kwargs
             )
 
+            usage = getattr(api_response, "usage", None)
+            if usage is not None:
+                self._record_usage(model, *_token_counts(usage))
+
             result_text = self._process_response(api_response)
             return result_text
 
@@ -109,3 +167,14 @@ class BaseClient:
                 yield item
         except asyncio.TimeoutError:
             raise RuntimeError("Streaming timed out")
+
+
+def _token_counts(usage) -> tuple:
+    """(input, output) tokens from an Anthropic- or OpenAI-style usage object."""
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "prompt_tokens", 0)
+    output_tokens = getattr(usage, "output_tokens", None)
+    if output_tokens is None:
+        output_tokens = getattr(usage, "completion_tokens", 0)
+    return input_tokens or 0, output_tokens or 0
@@ -0,0 +1,94 @@
+"""
+ConversationLog: an agent's history as an indexed, append-only sequence.
+
+It reads like the list of Messages it replaces (len, indexing, slicing,
+iteration; entries have `role` and `content`), but:
+
+- each entry records its kind (what the runtime added it as, e.g. a user
+  request, a tool result or a reminder) and an estimated token count;
+- positions are indexed by role and by kind, so "the latest user request"
+  is a lookup instead of a scan of the history;
+- formatted() keeps each client's provider payload and extends it with the
+  entries added since the last call, so a turn formats only its new
+  messages instead of rebuilding the payload from the whole history.
+
+Entries are never changed or removed once appended; the cached payloads
+rely on that.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Rough average for English text and code; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+class LogEntry:
+    __slots__ = ("role", "content", "kind", "tokens")
+
+    def __init__(self, role: str, content: str, kind: str):
+        self.role = role
+        self.content = content
+        self.kind = kind
+        self.tokens = len(content) // CHARS_PER_TOKEN + 1
+
+    def __repr__(self) -> str:
+        return f"LogEntry(role={self.role!r}, kind={self.kind!r}, content={self.content[:40]!r})"
+
+
+class ConversationLog:
+    def __init__(self):
+        self._entries: List[LogEntry] = []
+        self._by_role: Dict[str, List[int]] = {}
+        self._by_kind: Dict[str, List[int]] = {}
+        # Per formatting key: (payload items, number of entries they cover)
+        self._formatted: Dict[str, Tuple[List[Any], int]] = {}
+        self.tokens = 0
+
+    def append(self, role: str, content: str, kind: Optional[str] = None) -> LogEntry:
+        """Adds an entry; `kind` defaults to the role."""
+        entry = LogEntry(role, content, kind or role)
+        position = len(self._entries)
+        self._entries.append(entry)
+        self._by_role.setdefault(entry.role, []).append(position)
+        self._by_kind.setdefault(entry.kind, []).append(position)
+        self.tokens += entry.tokens
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return iter(self._entries)
+
+    def __reversed__(self) -> Iterator[LogEntry]:
+        return reversed(self._entries)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[LogEntry, List[LogEntry]]:
+        return self._entries[index]
+
+    def positions(self, role: Optional[str] = None, kind: Optional[str] = None) -> List[int]:
+        """Positions of the entries with this role or kind, oldest first (do not modify the list)."""
+        if kind is not None:
+            return self._by_kind.get(kind, [])
+        return self._by_role.get(role, [])
+
+    def last(self, role: Optional[str] = None, kind: Optional[str] = None) -> Optional[LogEntry]:
+        """The latest entry with this role or kind, or None."""
+        positions = self.positions(role, kind)
+        return self._entries[positions[-1]] if positions else None
+
+    def formatted(self, key: str, format_entry: Callable[[LogEntry], Any]) -> List[Any]:
+        """
+        `format_entry` applied to every entry, leaving out those it returns None for.
+
+        The result is kept under `key` (one per client) and only entries added
+        since the previous call are formatted. `format_entry` must depend on
+        nothing but the entry. Callers must not modify the returned list.
+        """
+        items, covered = self._formatted.get(key, ([], 0))
+        for entry in self._entries[covered:]:
+            item = format_entry(entry)
+            if item is not None:
+                items.append(item)
+        self._formatted[key] = (items, len(self._entries))
+        return items
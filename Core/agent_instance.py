@@ -1,14 +1,18 @@
 import asyncio
-from typing import Dict, List, Optional, TYPE_CHECKING, Union
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
 import traceback
 import re # Import re for parsing
 
-from Clients.base import BaseClient, Message
+from Clients.base import BaseClient
+from Clients.conversation_log import ConversationLog
 from Core.tool_parser import ToolCallParser
 from Core.executor import Executor
 from Core.stream_manager import StreamManager
+from Core.scheduler import Priority, Scheduler, SessionTag, default_scheduler
+from Core.jobs import JobLimitReached, JobManager
 from Tools.error_codes import ConversationEnded, PauseRequested, ErrorCodes
-from Tools.base import Tool, ToolResult
+from Tools.base import Tool, ToolResult, to_bool
+from Tools.context import ToolContext
 from Prompts.main import build_system_prompt
 
 if TYPE_CHECKING:
@@ -17,12 +21,31 @@ if TYPE_CHECKING:
 # Define a unique signal object
 TOOL_EXECUTED_SIGNAL = object()
 
+# Kinds of history entries besides the plain roles ("system", "user" for real requests, "assistant" for answers)
+KIND_TOOL_RESULT = "tool-result"
+KIND_REMINDER = "reminder"          # "Proceed." and [SYSTEM REMINDER] nudges from the turn loops
+KIND_JOB_RESULT = "job-result"      # Finished background jobs (Core/jobs.py)
+
+
+def message_kind(role: str, content: str) -> str:
+    """What a history message is, from the conventions the runtime writes it with."""
+    if role == 'user':
+        if content.startswith(("Proceed.", "[SYSTEM REMINDER]")):
+            return KIND_REMINDER
+        if content.startswith("[Background job"):
+            return KIND_JOB_RESULT
+    elif role == 'assistant' and content.startswith("[Tool Result for"):
+        return KIND_TOOL_RESULT
+    return role
+
 def format_result(name: str, exit_code: int, output: str) -> str:
     safe_output = str(output).replace('@end', '@_end')
     return f"@result {name}\nexit_code: {exit_code}\noutput: {safe_output}\n@end"
 
 class AgentInstance:
-    def __init__(self, config: 'AgentConfiguration', client: BaseClient, executor: Executor, all_discovered_tools: Dict[str, Tool]):
+    def __init__(self, config: 'AgentConfiguration', client: BaseClient, executor: Executor, all_discovered_tools: Dict[str, Tool],
+                 session_id: Optional[str] = None, system_prompt: Optional[str] = None,
+                 priority: Priority = Priority.INTERACTIVE, scheduler: Optional[Scheduler] = None):
         if not config or not client or not executor or all_discovered_tools is None:
             raise ValueError("AgentInstance requires config, client, executor, and all_discovered_tools.")
 
@@ -30,11 +53,27 @@ class AgentInstance:
         self.client = client
         self.executor = executor
         self.all_discovered_tools = all_discovered_tools
-        self.messages: List[Message] = []
+        # Indexed by role and kind; clients format only the entries added since the previous turn
+        self.messages = ConversationLog()
+        # Session-scoped tool state; tool instances themselves are shared.
+        # Several sessions of one agent (batch runs) need distinct ids so their snapshot stores do not collide.
+        self.tool_context = ToolContext(session_id=session_id or config.agent_id)
+        # Admission for this session's LLM streams and tool runs, shared with every other session
+        self.scheduler = scheduler or default_scheduler()
+        self.schedule_tag = SessionTag(self.tool_context.session_id, priority)
+        # Tool calls made with `background: true` (see Core/jobs.py)
+        self.jobs = JobManager(self.tool_context.session_id)
+        self.tool_context.jobs = self.jobs
         self.tool_parser = ToolCallParser()
         self.stream_manager = StreamManager()
 
-        system_prompt_text = build_system_prompt(self.config, self.all_discovered_tools)
+        # Optional observer of turn progress: called as listener(kind, data) for "text", "tool_call", "tool_result",
+        # "job_started" and "job_finished"
+        self.listener: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+        # Callers creating many sessions of one agent pass the prompt they already built
+        system_prompt_text = system_prompt if system_prompt is not None else \
+            build_system_prompt(self.config, self.all_discovered_tools)
         if system_prompt_text:
             self.add_message('system', system_prompt_text)
         else:
@@ -55,7 +94,7 @@ class AgentInstance:
         # Allow empty system messages, but generally avoid empty user/assistant messages
         # Allow empty assistant messages only if they follow a raw tool result message
         if not content.strip() and role != 'system':
-             if not (self.messages and self.messages[-1].role == 'assistant' and self.messages[-1].content.startswith("[Tool Result for")):
+             if not (self.messages and self.messages[-1].kind == KIND_TOOL_RESULT):
                   return
 
 
@@ -64,7 +103,17 @@ class AgentInstance:
             if self.messages and self.messages[-1].role == 'user' and self.messages[-1].content == "Proceed.":
                 return
 
-        self.messages.append(Message(role=role, content=content))
+        self.messages.append(role, content, message_kind(role, content))
+
+    @property
+    def last_user_prompt(self) -> Optional[str]:
+        """Latest user message that is a real request (not a reminder or a background job's result)."""
+        entry = self.messages.last(kind='user')
+        return entry.content if entry is not None else None
+
+    def _emit(self, kind: str, **data):
+        if self.listener is not None:
+            self.listener(kind, data)
 
     async def execute_turn(self) -> Union[Optional[str], object]: # Updated return type hint
         accumulated_response_before_tool = ""
@@ -80,9 +129,12 @@ class AgentInstance:
             if len(self.messages) == 1 and self.messages[0].role == 'system':
                 return "[ERROR: Turn cannot start with only a system message]"
 
-            stream = self.client.chat_completion_stream(
-                messages=self.messages,
-                model=self.config.model_name
+            self._deliver_job_results()
+
+            stream = self.scheduler.stream(
+                f"llm:{self.config.model_provider}",
+                self.client.chat_completion_stream(messages=self.messages, model=self.config.model_name),
+                self.schedule_tag
             )
 
             processed_stream_generator = self.stream_manager.process_stream(stream)
@@ -93,6 +145,7 @@ class AgentInstance:
                 if output_text:
                     accumulated_response_before_tool += output_text
                     print(output_text, end='', flush=True)
+                    self._emit("text", text=output_text)
 
                 if tool_data:
                     tool_call_occurred = True # Mark that a tool was called
@@ -192,13 +245,18 @@ class AgentInstance:
 
         # --- If permission granted, execute the tool ---
         else:
-            args_str = "\n".join([f"{k}: {v}" for k, v in tool_args_dict.items()])
-            tool_executor_input = f"@tool {tool_name}\n{args_str}\n@end"
             print(f"\n[Agent '{self.config.agent_id}' executing tool: {tool_name}]")
+            self._emit("tool_call", tool=tool_name, args={k: str(v) for k, v in tool_args_dict.items()})
 
+            background = to_bool(tool_args_dict.pop("background", False))
             try:
-                # Execute the tool - might raise ConversationEnded
-                result_str = self.executor.execute(tool_executor_input, agent_config=self.config)
+                if background:
+                    result_str = self._start_job(tool_name, tool_args_dict)
+                else:
+                    # Execute the tool - might raise ConversationEnded
+                    result_str = await self.executor.execute_call_async(
+                        tool_name, tool_args_dict, agent_config=self.config, context=self.tool_context,
+                        scheduler=self.scheduler, tag=self.schedule_tag)
                 print(f"\n[Tool result raw string for {tool_name}]:\n{result_str}\n") # Log raw result
 
                 # --- Parse exit code and output message *only needed for pause check* ---
@@ -239,6 +297,7 @@ class AgentInstance:
                 tool_succeeded = False # Ensure failure flag is set
 
             # --- REVERTED: Add the FULL raw tool result string to message history ---
+            self._emit("tool_result", tool=tool_name, exit_code=parsed_exit_code, result=result_str)
             history_message = f"[Tool Result for {tool_name}]:\n{result_str}" # Use the raw result_str
             self.add_message('assistant', history_message)
             print(f"[Added to History]: {history_message}") # Log what was added
@@ -253,3 +312,45 @@ class AgentInstance:
 
         # If it wasn't a successful pause or end (which raises), the method ends here,
         # and execute_turn will return TOOL_EXECUTED_SIGNAL.
+
+    def _start_job(self, tool_name: str, tool_args: dict) -> str:
+        """Launches a tool call as a background job; returns the @result block handed back at once."""
+        tool = self.executor.tools.get(tool_name)
+        if tool is None:
+            return format_result(tool_name, ErrorCodes.TOOL_NOT_FOUND, f"Tool '{tool_name}' not found in registry.")
+        if tool.config.runs_on_loop or tool.config.mutates_files:
+            return format_result(tool_name, ErrorCodes.INVALID_OPERATION,
+                                 f"'{tool_name}' cannot run in the background; call it without `background`")
+        call = self.executor.execute_call_async(tool_name, tool_args, agent_config=self.config,
+                                                context=self.tool_context, scheduler=self.scheduler,
+                                                tag=self.schedule_tag)
+        try:
+            job = self.jobs.start(tool_name, tool_args, call)
+        except JobLimitReached as e:
+            return format_result(tool_name, ErrorCodes.RESOURCE_BUSY, f"{e}; wait for one with job_wait first")
+        self._emit("job_started", job=job.id, tool=tool_name)
+        return format_result(tool_name, ErrorCodes.SUCCESS,
+                             f"Started background job {job.id}. Its result will be added to the conversation when "
+                             f"it finishes; check on it with job_status or job_wait.")
+
+    def _deliver_job_results(self):
+        """Adds the results of background jobs that finished since the last turn to the history."""
+        for job in self.jobs.take_finished():
+            if job.status == "cancelled":
+                self.add_message('user', f"[Background job {job.id} cancelled: {job.tool}]")
+                continue
+            self._emit("job_finished", job=job.id, tool=job.tool, exit_code=job.exit_code, result=job.result)
+            self.add_message('user', f"[Background job {job.id} finished: {job.tool} ({job.status} after "
+                                     f"{job.elapsed:.1f}s)]\n{job.result}")
+
+    async def await_background_jobs(self) -> bool:
+        """
+        For turn loops whose agent just answered: waits until a background job
+        finishes so its result starts the next turn. False if none is running.
+        """
+        if not self.jobs.running():
+            return False
+        print(f"[Agent '{self.config.agent_id}' waiting for background jobs: "
+              f"{', '.join(job.id for job in self.jobs.running())}]")
+        await self.jobs.wait_any()
+        return True
@@ -0,0 +1,207 @@
+"""
+Headless batch runs: many independent sessions read from a JSONL file.
+
+Each input line is an object with a "prompt" and optionally an "id" (the
+line number by default), an "agent" and "max_turns". Every session gets its
+own AgentInstance, so its history and ToolContext are private, while the
+orchestrator's API clients, executor and discovered tools are shared. At most
+`concurrency` sessions run at once.
+
+One JSON line per session is appended to the output file as soon as it
+finishes: id, agent, status, output, turns, usage (tokens and cost) and
+elapsed seconds. Status is one of:
+
+- "completed": the agent answered without calling a tool;
+- "ended": the agent called the end tool;
+- "paused": the agent asked for input, which nobody can give in batch mode;
+- "max_turns": the turn limit was reached;
+- "error": the turn or the client failed ("error" holds the reason).
+
+After the result line, the session's id is appended to the progress file. A
+rerun with the same progress file skips those sessions, so a crashed batch
+resumes where it stopped. A crash between the two writes can repeat one
+session's result line; readers should key results by id.
+
+The sessions' terminal output is discarded; a progress line goes to stderr.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from Clients.base import track_usage
+from Core.agent_instance import AgentInstance, TOOL_EXECUTED_SIGNAL
+from Core.orchestrator import Orchestrator, build_reminder
+from Core.scheduler import Priority
+from Tools.error_codes import ConversationEnded, PauseRequested
+
+DEFAULT_CONCURRENCY = 8
+
+
+@dataclass
+class BatchItem:
+    id: str
+    prompt: str
+    agent: Optional[str] = None
+    max_turns: Optional[int] = None
+
+
+def load_items(path: str) -> List[BatchItem]:
+    """Reads batch input; raises ValueError naming the line of a malformed entry."""
+    items, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})") from None
+            if not isinstance(data, dict) or not isinstance(data.get("prompt"), str) or not data["prompt"].strip():
+                raise ValueError(f"{path}:{number}: expected an object with a non-empty \"prompt\"")
+            max_turns = data.get("max_turns")
+            if max_turns is not None and (not isinstance(max_turns, int) or isinstance(max_turns, bool)
+                                          or max_turns <= 0):
+                raise ValueError(f"{path}:{number}: \"max_turns\" must be a positive integer")
+            item = BatchItem(id=str(data.get("id", number)), prompt=data["prompt"],
+                             agent=data.get("agent"), max_turns=max_turns)
+            if item.id in seen:
+                raise ValueError(f"{path}:{number}: duplicate id '{item.id}'")
+            seen.add(item.id)
+            items.append(item)
+    return items
+
+
+def load_progress(path: str) -> Set[str]:
+    """Ids recorded as finished by an earlier run."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+async def run_unattended(agent: AgentInstance, prompt: str, max_turns: int,
+                         record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs `prompt` on a fresh session until it finishes, with nobody to answer.
+
+    Fills `record` in place with "status", "output" and "turns" (and "error"),
+    so a caller that cancels the run still sees how far it got. Never raises
+    except for cancellation.
+    """
+    record.setdefault("status", "max_turns")
+    record.setdefault("output", "")
+    record.setdefault("turns", 0)
+    try:
+        agent.add_message('user', prompt)
+        while record["turns"] < max_turns:
+            result = await agent.execute_turn()
+            record["turns"] += 1
+            if result is TOOL_EXECUTED_SIGNAL:
+                agent.add_message('user', build_reminder(agent, prompt))
+                continue
+            if isinstance(result, str) and result.startswith("[ERROR:"):
+                record.update(status="error", error=result)
+                break
+            record.update(status="completed", output=result or "")
+            # An answer given while background jobs run is not the end: their results start the next turn
+            if not await agent.await_background_jobs():
+                break
+    except PauseRequested as pr:
+        record.update(status="paused", output=pr.message)
+    except ConversationEnded as ce:
+        record.update(status="ended", output=str(ce))
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        await agent.jobs.cancel_all()
+    return record
+
+
+class BatchRunner:
+    def __init__(self, orchestrator: Orchestrator, output_path: str, progress_path: Optional[str] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, default_agent: str = "ceo", max_turns: int = 10,
+                 quiet: bool = True):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.orchestrator = orchestrator
+        self.output_path = output_path
+        self.progress_path = progress_path or output_path + ".progress"
+        self.concurrency = concurrency
+        self.default_agent = default_agent
+        self.max_turns = max_turns
+        self.quiet = quiet
+
+    async def run(self, items: List[BatchItem]) -> Counter:
+        """Runs every item not yet in the progress file; returns the count of each status."""
+        finished = load_progress(self.progress_path)
+        pending = [item for item in items if item.id not in finished]
+        statuses: Counter = Counter()
+        self._report(f"{len(items) - len(pending)} of {len(items)} sessions already done; running {len(pending)}")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        with open(self.output_path, "a", encoding="utf-8") as output, \
+                open(self.progress_path, "a", encoding="utf-8") as progress, \
+                (open(os.devnull, "w") if self.quiet else contextlib.nullcontext(sys.stdout)) as sink, \
+                contextlib.redirect_stdout(sink):
+
+            async def worker():
+                while True:
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    record = await self.run_session(item)
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+                    progress.write(item.id + "\n")
+                    progress.flush()
+                    statuses[record["status"]] += 1
+                    done = sum(statuses.values())
+                    self._report(f"{done}/{len(pending)} sessions finished ({statuses['error']} errors)")
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+        return statuses
+
+    async def run_session(self, item: BatchItem) -> Dict[str, Any]:
+        """Runs one prompt to completion without a user; never raises."""
+        agent_id = item.agent or self.default_agent
+        max_turns = item.max_turns if item.max_turns is not None else self.max_turns
+        record: Dict[str, Any] = {"id": item.id, "agent": agent_id, "status": "max_turns", "output": "", "turns": 0}
+        started = time.monotonic()
+
+        with track_usage() as usage:
+            try:
+                agent = self._new_session(agent_id, item.id)
+            except Exception as e:
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+            else:
+                try:
+                    await run_unattended(agent, item.prompt, max_turns, record)
+                finally:
+                    # Nobody can restore a finished batch session's checkpoints
+                    agent.tool_context.snapshots.delete()
+
+        record["usage"] = {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens,
+                           "cost": round(usage.cost, 6)}
+        record["elapsed"] = round(time.monotonic() - started, 3)
+        return record
+
+    def _new_session(self, agent_id: str, item_id: str) -> AgentInstance:
+        safe_id = re.sub(r"[^\w.-]", "_", item_id)
+        # Batch sessions queue behind interactive ones for LLM and tool slots (Core/scheduler.py)
+        return self.orchestrator.new_session(agent_id, f"{agent_id}-batch-{safe_id}", priority=Priority.BATCH)
+
+    def _report(self, text: str) -> None:
+        print(f"[batch] {text}", file=sys.stderr, flush=True)
@@ -0,0 +1,154 @@
+"""
+Fan-out of subtasks from one agent session to other agents.
+
+Every session the Orchestrator creates carries a Delegator in its
+ToolContext. The delegate tool hands it a list of subtasks, each naming a
+loaded agent; the Delegator starts one fresh session per subtask
+(Orchestrator.new_session, so each has its own history and tool context),
+runs them unattended like batch sessions (Core/batch.py) and returns one
+record per subtask, in input order: agent, task, status, output, turns,
+usage and elapsed seconds. Status is a batch status or "timed_out".
+
+Budgets, all capped by the Delegator's own limits:
+
+- at most `max_parallel` subtasks of one call run at once;
+- each subtask gets at most `max_turns` turns;
+- the whole call gets `timeout` seconds, after which unfinished subtasks
+  are cancelled and report what they had produced so far;
+- sub-sessions may delegate in turn, down to `max_depth` levels.
+
+Sub-sessions inherit the caller's scheduling priority (Core/scheduler.py),
+and their token usage is added to the caller's track_usage() block.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from Clients.base import add_usage, track_usage
+from Core.agent_instance import AgentInstance
+from Core.batch import run_unattended
+from Core.scheduler import Priority
+
+DEFAULT_MAX_PARALLEL = 4
+DEFAULT_MAX_TURNS = 8
+DEFAULT_TIMEOUT = 300.0
+MAX_SUBTASKS = 8
+MAX_DEPTH = 2
+
+
+@dataclass
+class Subtask:
+    agent: str
+    task: str
+
+
+class Delegator:
+    def __init__(self, orchestrator, session_id: str, priority: Priority = Priority.INTERACTIVE, depth: int = 0,
+                 max_parallel: int = DEFAULT_MAX_PARALLEL, max_turns: int = DEFAULT_MAX_TURNS,
+                 timeout: float = DEFAULT_TIMEOUT, max_depth: int = MAX_DEPTH):
+        self.orchestrator = orchestrator
+        self.session_id = session_id
+        self.priority = priority
+        self.depth = depth
+        self.max_parallel = max_parallel
+        self.max_turns = max_turns
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self._spawned = itertools.count(1)
+
+    def agents(self) -> List[str]:
+        """Ids of the agents subtasks can go to."""
+        return list(self.orchestrator.agents)
+
+    def run_threadsafe(self, loop: asyncio.AbstractEventLoop, subtasks: List[Subtask],
+                       max_turns: Optional[int] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """run() for a tool running in a worker thread; blocks it until the subtasks finish on `loop`."""
+        return asyncio.run_coroutine_threadsafe(self.run(subtasks, max_turns, timeout), loop).result()
+
+    async def run(self, subtasks: List[Subtask], max_turns: Optional[int] = None,
+                  timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Runs the subtasks concurrently; raises ValueError or KeyError before starting any if they are invalid."""
+        if not subtasks:
+            raise ValueError("No subtasks given")
+        if len(subtasks) > MAX_SUBTASKS:
+            raise ValueError(f"At most {MAX_SUBTASKS} subtasks per call; got {len(subtasks)}")
+        unknown = sorted({s.agent for s in subtasks} - set(self.orchestrator.agents))
+        if unknown:
+            raise KeyError(f"Unknown agent(s): {', '.join(unknown)}")
+        max_turns = min(max_turns or self.max_turns, self.max_turns)
+        timeout = min(timeout or self.timeout, self.timeout)
+
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        records = [{"agent": s.agent, "task": s.task, "status": "queued", "output": "", "turns": 0}
+                   for s in subtasks]
+        tasks = [asyncio.create_task(self._run_one(subtask, record, semaphore, max_turns))
+                 for subtask, record in zip(subtasks, records)]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task, record in zip(tasks, records):
+            if task in pending:
+                record["status"] = "timed_out"
+        return records
+
+    async def _run_one(self, subtask: Subtask, record: Dict[str, Any], semaphore: asyncio.Semaphore,
+                       max_turns: int) -> None:
+        async with semaphore:
+            await self.run_one(subtask, max_turns, record)
+
+    async def run_one(self, subtask: Subtask, max_turns: Optional[int] = None,
+                      record: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Runs one subtask in a fresh session and returns its record, filled in
+        place so a cancelled run keeps its partial output. Never raises except
+        for cancellation.
+        """
+        if record is None:
+            record = {"agent": subtask.agent, "task": subtask.task, "output": "", "turns": 0}
+        started = time.monotonic()
+        agent = None
+        caller = contextvars.copy_context()     # Still sees the caller's usage tracker
+        with track_usage() as usage:
+            try:
+                agent = self._new_session(subtask.agent)
+                record["status"] = "max_turns"
+                await run_unattended(agent, subtask.task, min(max_turns or self.max_turns, self.max_turns), record)
+            except asyncio.CancelledError:
+                record["output"] = record["output"] or _last_answer(agent)
+                raise
+            except Exception as e:
+                record.update(status="error", error=f"{type(e).__name__}: {e}")
+            finally:
+                if agent is not None:
+                    agent.tool_context.snapshots.delete()
+                record["usage"] = {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens,
+                                   "cost": round(usage.cost, 6)}
+                record["elapsed"] = round(time.monotonic() - started, 3)
+                caller.run(add_usage, usage)
+        return record
+
+    def _new_session(self, agent_id: str) -> AgentInstance:
+        session_id = f"{self.session_id}-{agent_id}-{next(self._spawned)}"
+        agent = self.orchestrator.new_session(agent_id, session_id, priority=self.priority)
+        agent.tool_context.delegator = self.child(session_id) if self.depth + 1 < self.max_depth else None
+        return agent
+
+    def child(self, session_id: str) -> 'Delegator':
+        """The Delegator for a sub-session, one level deeper with the same limits."""
+        return Delegator(self.orchestrator, session_id, self.priority, self.depth + 1, self.max_parallel,
+                         self.max_turns, self.timeout, self.max_depth)
+
+
+def _last_answer(agent: Optional[AgentInstance]) -> str:
+    """The latest assistant text of an unfinished session, skipping raw tool results."""
+    if agent is None:
+        return ""
+    entry = agent.messages.last(kind='assistant')
+    return entry.content if entry is not None else ""
@@ -1,13 +1,18 @@
+import asyncio
 import re
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, TYPE_CHECKING
 import traceback
 
 from Tools.base import ToolResult, Tool
 from Tools.Core.registry import ToolRegistry
+from Tools.context import ToolContext, current_context, use_calling_loop, use_context
+from Tools.Core.streamed_text import StreamedText
 from Tools.error_codes import ErrorCodes, ConversationEnded
 
 if TYPE_CHECKING:
     from Core.agent_config import AgentConfiguration
+    from Core.scheduler import Scheduler, SessionTag
 
 def parse_tool_call(text: str) -> Dict[str, Any]:
     tool_pattern = r'@tool\s+(?P<name>\w+)(?P<body>.*?)@end'
@@ -16,40 +21,37 @@ def parse_tool_call(text: str) -> Dict[str, Any]:
         raise ValueError("Invalid tool call format")
         
     args = {}
-    current_key = None
-    current_value = []
+    block_key = None
+    block_lines = []
     
-    for line in match.group('body').strip().split('\n'):
-        line = line.strip()
+    for raw_line in match.group('body').strip('\n').split('\n'):
+        raw_line = raw_line.rstrip('\r')
+        line = raw_line.strip()
+        
+        # Inside a <<< block lines are kept verbatim (indentation, diff markers, "key: value" text)
+        if block_key is not None:
+            if line == '>>>':
+                args[block_key] = '\n'.join(block_lines).strip('\n')
+                block_key = None
+                block_lines = []
+            else:
+                block_lines.append(raw_line)
+            continue
+            
         if not line:
             continue
             
         if ': ' in line:
-            if current_key and current_value:
-                args[current_key] = '\n'.join(current_value).strip()
-                
             key, val = line.split(': ', 1)
-            current_key = key.strip()
             val = val.strip()
-            
             if val == '<<<':
-                current_value = []
+                block_key = key.strip()
+                block_lines = []
                 continue
-                
-            args[current_key] = val
-            current_key = None
-            
-        elif line == '>>>':
-            if current_key:
-                args[current_key] = '\n'.join(current_value).strip()
-                current_key = None
-                current_value = []
-                
-        elif current_key:
-            current_value.append(line)
+            args[key.strip()] = val
             
-    if current_key and current_value:
-        args[current_key] = '\n'.join(current_value).strip()
+    if block_key is not None:
+        args[block_key] = '\n'.join(block_lines).strip('\n')
         
     return {'tool': match.group('name'), 'args': args}
 
@@ -57,6 +59,12 @@ def format_result(name: str, exit_code: int, output: str) -> str:
     safe_output = str(output).replace('@end', '@_end')
     return f"@result {name}\nexit_code: {exit_code}\noutput: {safe_output}\n@end"
 
+def _release_tool_slot(scheduler: 'Scheduler', worker: asyncio.Future) -> None:
+    """Done callback of a tool's worker: frees its slot, and consumes the result if the caller was cancelled."""
+    scheduler.release("tools")
+    if not worker.cancelled():
+        worker.exception()
+
 class Executor:
     def __init__(self):
         registry = ToolRegistry()
@@ -65,7 +73,16 @@ class Executor:
     def register_tool(self, tool):
         self.tools[tool.name] = tool
 
-    def execute(self, tool_call: str, agent_config: Optional['AgentConfiguration'] = None) -> str:
+    def execute(self, tool_call: str, agent_config: Optional['AgentConfiguration'] = None,
+                context: Optional[ToolContext] = None) -> str:
+        """
+        Parses and runs a tool call, returning the formatted @result block.
+
+        `context` carries the calling session's tool state (read tracking,
+        caches, working directory). Tools are shared between sessions, so
+        every session should pass its own; without one, tools fall back to
+        the process-wide default context.
+        """
         tool_name = "error"
         parsed = None
         
@@ -83,12 +100,72 @@ class Executor:
                 else:
                     return format_result("parse_error", ErrorCodes.INVALID_ARGUMENTS, f"Invalid tool call format - {str(e)}")
 
-            tool = self.tools.get(parsed['tool'])
+            return self.execute_call(parsed['tool'], parsed['args'], agent_config=agent_config, context=context)
+
+        except ConversationEnded as ce:
+            raise ce
+
+        except Exception as e:
+            print(f"ERROR during tool execution ({tool_name}): {type(e).__name__} - {e}")
+            traceback.print_exc()
+            return format_result(tool_name, ErrorCodes.UNKNOWN_ERROR, f"Unexpected error executing tool: {str(e)}")
+
+    async def execute_call_async(self, tool_name: str, args: Dict[str, Any],
+                                 agent_config: Optional['AgentConfiguration'] = None,
+                                 context: Optional[ToolContext] = None,
+                                 scheduler: Optional['Scheduler'] = None, tag: Optional['SessionTag'] = None) -> str:
+        """
+        execute_call for callers on an event loop shared by many sessions.
+
+        Waits for a "tools" slot from `scheduler` (fair between sessions, see
+        Core/scheduler.py), then runs the tool in a worker thread so a slow
+        tool does not stall other sessions. Tools whose config sets
+        `runs_on_loop` run directly on the loop thread; tools that set
+        `waits_on_sessions` run in a worker thread without taking a slot.
+
+        A thread cannot be stopped, so a cancelled call keeps its slot until
+        the worker thread has finished.
+        """
+        tool = self.tools.get(tool_name)
+        if tool is None or tool.config.runs_on_loop:
+            return self.execute_call(tool_name, args, agent_config=agent_config, context=context)
+        # to_thread copies the contextvars, so the worker sees the caller's tool context and loop
+        with use_calling_loop(asyncio.get_running_loop()):
+            call = asyncio.to_thread(self.execute_call, tool_name, args, agent_config, context)
+            if scheduler is None or tool.config.waits_on_sessions:
+                return await call
+            try:
+                await scheduler.acquire("tools", tag)
+            except BaseException:
+                call.close()
+                raise
+            worker = asyncio.ensure_future(call)
+        worker.add_done_callback(lambda done: _release_tool_slot(scheduler, done))
+        return await asyncio.shield(worker)
+
+    def execute_call(self, tool_name: str, args: Dict[str, Any],
+                     agent_config: Optional['AgentConfiguration'] = None,
+                     context: Optional[ToolContext] = None) -> str:
+        """
+        Runs an already parsed tool call and returns the formatted @result block.
+
+        Callers holding parsed arguments should use this rather than rebuilding
+        @tool text, which cannot round-trip multi-line values.
+        """
+        try:
+            tool = self.tools.get(tool_name)
             if not tool:
-                return format_result(parsed['tool'], ErrorCodes.TOOL_NOT_FOUND, f"Tool '{parsed['tool']}' not found in registry.")
+                return format_result(tool_name, ErrorCodes.TOOL_NOT_FOUND, f"Tool '{tool_name}' not found in registry.")
 
-            result: ToolResult = tool.execute(**parsed['args'])
-            return format_result(parsed['tool'], result.code, result.message)
+            tool_args = args
+            if not tool.config.accepts_streamed_text:
+                tool_args = {k: str(v) if isinstance(v, StreamedText) else v for k, v in args.items()}
+
+            with use_context(context) if context is not None else nullcontext():
+                if tool.config.mutates_files:
+                    current_context().snapshots.checkpoint(tool_name)
+                result: ToolResult = tool.execute(**tool_args)
+            return format_result(tool_name, result.code, result.message)
 
         except ConversationEnded as ce:
             raise ce
@@ -96,4 +173,10 @@ class Executor:
         except Exception as e:
             print(f"ERROR during tool execution ({tool_name}): {type(e).__name__} - {e}")
             traceback.print_exc()
-            return format_result(tool_name, ErrorCodes.UNKNOWN_ERROR, f"Unexpected error executing tool: {str(e)}")
\ No newline at end of file
+            return format_result(tool_name, ErrorCodes.UNKNOWN_ERROR, f"Unexpected error executing tool: {str(e)}")
+
+        finally:
+            # Spilled argument blocks are anonymous temporary files; release them
+            for value in args.values():
+                if isinstance(value, StreamedText):
+                    value.close()
@@ -0,0 +1,148 @@
+"""
+Hibernation of idle server sessions: conversations parked on disk.
+
+Every AgentInstance keeps its whole history in memory, and a server session
+also keeps its event log for replay, so a server holding many conversations
+that are mostly idle grows without bound. The Hibernator sweeps the server's
+sessions periodically. It writes a session to disk and drops its agent and
+events when either:
+
+- the session has been idle for `idle_seconds`, or
+- the resident sessions exceed `memory_budget`, in which case the least
+  recently active idle sessions go first until the rest fit.
+
+A session only counts as idle while it waits for a message with no turn
+and no background job running. Its next message (or a client replaying
+its events) rehydrates it: a fresh AgentInstance from the orchestrator
+with the saved history, read records and working directory restored.
+Memory thus follows the active sessions rather than all of them.
+
+Sessions are stored by SessionStore as one gzip-compressed JSON file each.
+The shared system prompt is not stored; the fresh agent already has it.
+Sizes are measured in characters of history and event data, which is
+where a session's memory goes.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from Tools.Core.file_cache import FileStamp
+from Tools.context import ReadRecord
+
+DEFAULT_IDLE_SECONDS = 900.0
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024   # Characters kept resident across all sessions
+SWEEP_INTERVAL = 30.0
+FORMAT_VERSION = 2
+
+
+def dump_agent(agent) -> Dict[str, Any]:
+    """The conversation state of an AgentInstance as JSON-serialisable data."""
+    messages = agent.messages
+    if messages and messages[0].role == 'system':
+        messages = messages[1:]
+    context = agent.tool_context
+    return {
+        "messages": [[m.role, m.content, m.kind] for m in messages],
+        "working_dir": context.working_dir,
+        "read_files": {path: [asdict(r.stamp) if isinstance(r.stamp, FileStamp) else None, r.digest,
+                              list(r.view) if isinstance(r.view, tuple) else r.view]
+                       for path, r in context.read_files.items()},
+    }
+
+
+def restore_agent(agent, state: Dict[str, Any]) -> None:
+    """Loads dump_agent() data into a fresh AgentInstance (which holds only its system prompt)."""
+    for role, content, kind in state["messages"]:
+        agent.messages.append(role, content, kind)
+    context = agent.tool_context
+    context.working_dir = state.get("working_dir")
+    for path, (stamp, digest, view) in state.get("read_files", {}).items():
+        context.read_files[path] = ReadRecord(FileStamp(**stamp) if stamp else None, digest,
+                                              tuple(view) if isinstance(view, list) else view)
+
+
+def agent_size(agent) -> int:
+    """Approximate resident size of a conversation, in characters (the shared system prompt excluded)."""
+    return sum(len(m.content) for m in agent.messages if m.role != 'system')
+
+
+class SessionStore:
+    """Hibernated sessions on disk: one gzip-compressed JSON file per session."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json.gz")
+
+    def save(self, session_id: str, state: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(session_id)
+        # Written aside and renamed, so a crash never leaves half a session behind
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump({"version": FORMAT_VERSION, **state}, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        with gzip.open(self.path(session_id), "rt", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Session '{session_id}' was saved in an unknown format: {state.get('version')}")
+        return state
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self.path(session_id))
+        except FileNotFoundError:
+            pass
+
+
+class Hibernator:
+    """
+    Decides which sessions to hibernate. Sessions are Core.server.Session
+    objects: they report `last_active`, `hibernated`, can_hibernate() and
+    resident_size(), and do the work in hibernate().
+    """
+
+    def __init__(self, store: SessionStore, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 idle_seconds: float = DEFAULT_IDLE_SECONDS, interval: float = SWEEP_INTERVAL):
+        self.store = store
+        self.memory_budget = memory_budget
+        self.idle_seconds = idle_seconds
+        self.interval = interval
+
+    def victims(self, sessions: Iterable, now: Optional[float] = None) -> List:
+        """Sessions to hibernate: long idle ones, then least recently active idle ones while over budget."""
+        now = time.monotonic() if now is None else now
+        resident = [s for s in sessions if not s.hibernated]
+        sizes = {id(s): s.resident_size() for s in resident}
+        total = sum(sizes.values())
+        victims = []
+        for session in sorted((s for s in resident if s.can_hibernate()), key=lambda s: s.last_active):
+            if total <= self.memory_budget and now - session.last_active < self.idle_seconds:
+                break
+            victims.append(session)
+            total -= sizes[id(session)]
+        return victims
+
+    async def sweep(self, sessions: Iterable) -> int:
+        """Hibernates this round's victims; returns how many went to disk."""
+        count = 0
+        for session in self.victims(sessions):
+            try:
+                if await session.hibernate(self.store):
+                    count += 1
+            except OSError as e:
+                print(f"[Hibernator] Could not hibernate session '{session.id}': {e}")
+        return count
+
+    async def run(self, sessions: Callable[[], Iterable]) -> None:
+        """Sweeps `sessions()` every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep(list(sessions()))
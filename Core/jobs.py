@@ -0,0 +1,147 @@
+"""
+Background tool jobs: a tool call that runs while its agent keeps working.
+
+An agent adds `background: true` to a tool call to run it as a job. The
+call returns a job id at once and the tool runs as an asyncio task, with
+the same fair scheduling as a foreground call (Executor.execute_call_async).
+Tools that run on the loop (end, pause, message...) are instant anyway, and
+tools that change files stay in the foreground so their checkpoints keep
+the order of the agent's edits.
+
+Each session has a JobManager. A finished job's @result block is added to
+the history at the start of the agent's next turn, unless the agent already
+fetched it with job_status or job_wait. When the agent stops with jobs still
+running, the turn loops (interactive, concurrent, server, batch and
+delegated sessions alike) wait for one to finish and run another turn
+instead of going idle.
+"""
+
+import asyncio
+import itertools
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, List, Optional
+
+from Core.executor import format_result
+from Tools.error_codes import ErrorCodes
+
+DEFAULT_MAX_JOBS = 4
+_EXIT_CODE = re.compile(r"^exit_code: (-?\d+)$", re.MULTILINE)
+
+
+class JobLimitReached(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    tool: str
+    args: Dict[str, str]
+    task: Optional[asyncio.Task] = None
+    result: str = ""                # The tool's @result block once finished
+    exit_code: Optional[int] = None
+    started: float = field(default_factory=time.monotonic)
+    finished: Optional[float] = None
+    delivered: bool = False         # The agent has seen the result
+
+    @property
+    def status(self) -> str:
+        if self.finished is None:
+            return "running"
+        if self.exit_code is None:
+            return "cancelled"
+        return "completed" if self.exit_code == 0 else "failed"
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    def describe(self) -> str:
+        return f"{self.id} ({self.tool}): {self.status} after {self.elapsed:.1f}s"
+
+    def report(self) -> str:
+        """The status line, followed by the @result block once finished (which counts as delivered)."""
+        if self.finished is None or self.status == "cancelled":
+            return self.describe()
+        self.delivered = True
+        return f"{self.describe()}\n{self.result}"
+
+
+class JobManager:
+    """A session's background jobs. Methods other than wait_threadsafe must be called on the event loop."""
+
+    def __init__(self, session_id: str = "default", max_running: int = DEFAULT_MAX_JOBS):
+        self.session_id = session_id
+        self.max_running = max_running
+        self.jobs: Dict[str, Job] = {}
+        self._ids = itertools.count(1)
+        # Set whenever a job finishes
+        self._finished = asyncio.Event()
+
+    def start(self, tool: str, args: Dict[str, Any], call: Awaitable[str]) -> Job:
+        """Runs `call` (a coroutine returning an @result block) as a job; raises JobLimitReached when full."""
+        if len(self.running()) >= self.max_running:
+            call.close()
+            raise JobLimitReached(f"{self.max_running} background jobs are already running")
+        job = Job(id=f"job-{next(self._ids)}", tool=tool, args={k: str(v) for k, v in args.items()})
+        job.task = asyncio.create_task(self._run(job, call), name=f"{self.session_id}:{job.id}")
+        self.jobs[job.id] = job
+        return job
+
+    async def _run(self, job: Job, call: Awaitable[str]) -> None:
+        try:
+            job.result = await call
+            match = _EXIT_CODE.search(job.result)
+            job.exit_code = int(match.group(1)) if match else ErrorCodes.UNKNOWN_ERROR
+        except asyncio.CancelledError:
+            job.result = ""
+            raise
+        except Exception as e:
+            # Foreground-only signals (ConversationEnded...) and unexpected errors both end the job
+            job.exit_code = ErrorCodes.UNKNOWN_ERROR
+            job.result = format_result(job.tool, job.exit_code, f"Background job failed: {type(e).__name__}: {e}")
+        finally:
+            job.finished = time.monotonic()
+            self._finished.set()
+
+    def get(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id.strip())
+        if job is None:
+            raise KeyError(f"No job '{job_id}'; known jobs: {', '.join(self.jobs) or 'none'}")
+        return job
+
+    def running(self) -> List[Job]:
+        return [job for job in self.jobs.values() if job.finished is None]
+
+    def take_finished(self) -> List[Job]:
+        """Finished jobs whose result the agent has not seen yet; marks them seen."""
+        finished = [job for job in self.jobs.values() if job.finished is not None and not job.delivered]
+        for job in finished:
+            job.delivered = True
+        return finished
+
+    async def wait_any(self) -> None:
+        """Returns once a running job finishes (at once if none is running or one finished unseen)."""
+        while self.running() and not any(j.finished is not None and not j.delivered for j in self.jobs.values()):
+            self._finished.clear()
+            await self._finished.wait()
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Job:
+        """Waits up to `timeout` seconds for a job; returns it finished or still running."""
+        job = self.get(job_id)
+        if job.finished is None:
+            await asyncio.wait({job.task}, timeout=timeout)
+        return job
+
+    def wait_threadsafe(self, loop: asyncio.AbstractEventLoop, job_id: str, timeout: Optional[float]) -> Job:
+        """wait() for a tool running in a worker thread."""
+        return asyncio.run_coroutine_threadsafe(self.wait(job_id, timeout), loop).result()
+
+    async def cancel_all(self) -> None:
+        """Stops waiting for running jobs (a tool already in a worker thread still runs to its end)."""
+        tasks = [job.task for job in self.running()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
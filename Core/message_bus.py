@@ -0,0 +1,109 @@
+"""
+In-process message bus connecting concurrently running agents.
+
+Every participant (each agent, plus "user" for the human at the console)
+registers an address and gets a bounded inbox. Messages are addressed
+envelopes; a full inbox is backpressure:
+
+- `post` never blocks and raises MailboxFull instead. Tools use it, since
+  they run synchronously on the event loop and cannot wait.
+- `send` waits until the recipient has room.
+
+The bus also notices when the whole system has gone quiet, i.e. every
+registered participant is waiting in `receive` and no message is in flight,
+which is how Orchestrator.run_concurrent knows the run has finished.
+
+All methods must be called from the event loop's thread.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+USER = "user"
+DEFAULT_INBOX_SIZE = 32
+
+
+class UnknownRecipient(KeyError):
+    """No participant is registered under the address."""
+
+
+class MailboxFull(Exception):
+    """The recipient's inbox is at capacity."""
+
+
+@dataclass
+class Envelope:
+    sender: str
+    recipient: str
+    text: str
+    important: bool = False
+    # "message", or "pause" when the sender is blocked waiting for a reply
+    kind: str = "message"
+    created: float = field(default_factory=time.time)
+
+
+class MessageBus:
+    def __init__(self, inbox_size: int = DEFAULT_INBOX_SIZE):
+        self.inbox_size = inbox_size
+        self._inboxes: Dict[str, asyncio.Queue] = {}
+        self._waiting: Set[str] = set()
+        self._quiet = asyncio.Event()
+
+    def register(self, address: str, inbox_size: Optional[int] = None) -> asyncio.Queue:
+        if address in self._inboxes:
+            raise ValueError(f"Address '{address}' is already registered")
+        inbox = asyncio.Queue(maxsize=inbox_size or self.inbox_size)
+        self._inboxes[address] = inbox
+        return inbox
+
+    def addresses(self) -> List[str]:
+        return list(self._inboxes)
+
+    def pending(self, address: str) -> int:
+        return self._inbox(address).qsize()
+
+    def _inbox(self, address: str) -> asyncio.Queue:
+        inbox = self._inboxes.get(address)
+        if inbox is None:
+            raise UnknownRecipient(address)
+        return inbox
+
+    def post(self, envelope: Envelope) -> None:
+        """Delivers without waiting; raises UnknownRecipient or MailboxFull."""
+        inbox = self._inbox(envelope.recipient)
+        try:
+            inbox.put_nowait(envelope)
+        except asyncio.QueueFull:
+            raise MailboxFull(envelope.recipient) from None
+
+    async def send(self, envelope: Envelope) -> None:
+        """Delivers, waiting while the recipient's inbox is full."""
+        await self._inbox(envelope.recipient).put(envelope)
+
+    async def receive(self, address: str) -> Envelope:
+        """Waits for the next message to `address`."""
+        inbox = self._inbox(address)
+        self._waiting.add(address)
+        try:
+            self._check_quiet()
+            return await inbox.get()
+        finally:
+            self._waiting.discard(address)
+
+    def drain(self, address: str) -> List[Envelope]:
+        """Takes every message already waiting for `address`."""
+        inbox = self._inbox(address)
+        envelopes = []
+        while not inbox.empty():
+            envelopes.append(inbox.get_nowait())
+        return envelopes
+
+    def _check_quiet(self) -> None:
+        if len(self._waiting) == len(self._inboxes) and all(q.empty() for q in self._inboxes.values()):
+            self._quiet.set()
+
+    async def wait_quiet(self) -> None:
+        """Returns once every participant is idle with an empty inbox."""
+        await self._quiet.wait()
@@ -2,8 +2,9 @@ import asyncio
 import importlib
 import inspect
 import os
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 import yaml
 import traceback
 
@@ -14,11 +15,50 @@ from Clients.base import BaseClient, ProviderConfig, Message
 from Core.agent_config import AgentConfiguration
 from Core.agent_instance import AgentInstance, TOOL_EXECUTED_SIGNAL
 from Core.executor import Executor
+from Core.scheduler import Priority
+from Core.message_bus import MessageBus, Envelope, USER, DEFAULT_INBOX_SIZE
 from Tools.error_codes import ConversationEnded, PauseRequested, ErrorCodes
 from Prompts.main import build_system_prompt, discover_tools
 from Core.utils import get_multiline_input
 
 
+def build_reminder(agent: AgentInstance, fallback_prompt: str) -> str:
+    """The [SYSTEM REMINDER] added after a tool call, restating the latest real user request."""
+    last_real_user_prompt = agent.last_user_prompt or fallback_prompt
+    return f"[SYSTEM REMINDER] Previous step completed. Recall the goal: \"{last_real_user_prompt[:100].strip()}...\" Now execute the *next* step based on your plan."
+
+
+class LoopState(Enum):
+    RUN_TURN = "run_turn"           # The agent takes its next turn
+    AWAIT_INPUT = "await_input"     # The agent paused; the user's reply comes next
+    AWAIT_JOBS = "await_jobs"       # The agent answered with background jobs running; one finishing comes next
+    DONE = "done"
+
+
+def format_envelope(envelope: Envelope) -> str:
+    """How a bus message appears in the recipient agent's history."""
+    if envelope.sender == USER:
+        return envelope.text
+    prefix = "[IMPORTANT message" if envelope.important else "[Message"
+    return f"{prefix} from {envelope.sender} (reply with the message tool, to: {envelope.sender})]\n{envelope.text}"
+
+
+async def console_user(envelope: Envelope) -> Optional[str]:
+    """Default user side of run_concurrent: prints messages and answers pauses from the console."""
+    if envelope.important:
+        print(f"\n!!! IMPORTANT MESSAGE from {envelope.sender} !!!\n{envelope.text}\n!!!\n")
+    else:
+        print(f"\n[{envelope.sender} -> user]\n{envelope.text}\n")
+    if envelope.kind != "pause":
+        return None
+    try:
+        # In a worker thread so the other agents keep running while the user types
+        user_input = await asyncio.to_thread(get_multiline_input, f"(reply to {envelope.sender}) > ")
+    except EOFError:
+        return None
+    return user_input if user_input.strip() else "Proceed."
+
+
 def load_agent_configurations(config_dir: str = "./AgentConfigs") -> List[AgentConfiguration]:
     # This function remains largely the same, as it loads agent-specific overrides/definitions
     # It doesn't need the detailed provider config from config.py itself.
@@ -187,100 +227,80 @@ class Orchestrator:
                     executor=self.executor,
                     all_discovered_tools=self.all_discovered_tools
                 )
+                agent_instance.tool_context.delegator = self._delegator(agent_config.agent_id)
                 self.agents[agent_config.agent_id] = agent_instance
 
             except Exception as e:
                 print(f"Error creating agent instance '{agent_config.agent_id}': {e}")
                 traceback.print_exc()
 
+    def new_session(self, agent_id: str, session_id: str, priority: Priority = Priority.INTERACTIVE) -> AgentInstance:
+        """
+        A fresh conversation with a loaded agent: own history and tool context,
+        sharing the agent's client, executor, tools and compiled system prompt.
+        """
+        template = self.agents.get(agent_id)
+        if template is None:
+            raise KeyError(f"Agent '{agent_id}' not found; available: {', '.join(self.agents)}")
+        system_prompt = None
+        if template.messages and template.messages[0].role == 'system':
+            system_prompt = template.messages[0].content
+        agent = AgentInstance(config=template.config, client=template.client, executor=template.executor,
+                              all_discovered_tools=template.all_discovered_tools,
+                              session_id=session_id, system_prompt=system_prompt, priority=priority)
+        agent.tool_context.delegator = self._delegator(session_id, priority)
+        return agent
+
+    def _delegator(self, session_id: str, priority: Priority = Priority.INTERACTIVE):
+        """Lets the session hand subtasks to the loaded agents (the delegate tool)."""
+        # Imported here: Core.delegation runs sessions through Core.batch, which imports this module
+        from Core.delegation import Delegator
+        return Delegator(self, session_id, priority)
+
     async def run_main_loop(self, initial_prompt: str, target_agent_id: str = "ceo", max_turns: int = 10):
-        # This function remains the same as the previous version with the SYSTEM REMINDER logic
+        """
+        Drives one agent as a state machine over turn outcomes:
+
+        - a tool call adds a [SYSTEM REMINDER] of the goal and runs the next turn;
+        - a plain answer adds "Proceed." and runs the next turn, or, while background
+          jobs run, waits for one to finish and runs the next turn on its result;
+        - a pause waits for the user's reply (read off the event loop), then runs the next turn;
+        - the end tool, an error or `max_turns` finishes the loop.
+        """
         agent = self.agents.get(target_agent_id)
         if not agent:
             print(f"Error: Target agent '{target_agent_id}' not found.")
             print(f"Available agents: {list(self.agents.keys())}")
             return
 
-        # Store the initial prompt for potential reminders
-        _initial_user_prompt = initial_prompt
-        agent.add_message('user', _initial_user_prompt)
-        print(f"\nUser (to {target_agent_id}): {_initial_user_prompt}")
+        agent.add_message('user', initial_prompt)
+        print(f"\nUser (to {target_agent_id}): {initial_prompt}")
 
+        state = LoopState.RUN_TURN
         turn_count = 0
-        while turn_count < max_turns:
+        while state is not LoopState.DONE:
             try:
+                if state is LoopState.AWAIT_INPUT:
+                    state = await self._await_user_input(agent, target_agent_id)
+                    continue
+                if state is LoopState.AWAIT_JOBS:
+                    await agent.await_background_jobs()
+                    state = LoopState.RUN_TURN
+                    continue
+
+                if turn_count >= max_turns:
+                    print(f"\n[Orchestrator] Reached max turns ({max_turns}). Stopping loop.")
+                    break
                 print(f"\n--- Turn {turn_count + 1}/{max_turns} ({target_agent_id}) ---")
-
-                # --- Determine if "Proceed." should potentially be added LATER ---
-                should_add_proceed_later = False
-                if agent.messages:
-                    potential_last_assistant_msg_index = -1
-                    if agent.messages[-1].role == 'user' and agent.messages[-1].content.startswith("[SYSTEM REMINDER]"):
-                        if len(agent.messages) > 1:
-                           potential_last_assistant_msg_index = -2
-                    else:
-                        potential_last_assistant_msg_index = -1
-
-                    if potential_last_assistant_msg_index < 0 and len(agent.messages) > abs(potential_last_assistant_msg_index):
-                        last_msg = agent.messages[potential_last_assistant_msg_index]
-                        if last_msg.role == 'assistant' and not last_msg.content.startswith(("Tool '", "[Tool Result", "@result", "!!! IMPORTANT", "✓ CONVERSATION ENDED", "✗ CONVERSATION ENDED", "⚠ CONVERSATION ENDED")):
-                            if not (len(agent.messages) > 1 and agent.messages[-2].role == 'user' and agent.messages[-2].content == "Proceed."):
-                                should_add_proceed_later = True
-
-                # --- Execute the agent's turn ---
                 result = await agent.execute_turn()
                 turn_count += 1
+                state = self._after_turn(agent, target_agent_id, result, initial_prompt)
 
-                # --- Handle results and inject reminder if necessary ---
-                reminder_added_this_turn = False
-                if result is TOOL_EXECUTED_SIGNAL:
-                    print("[Orchestrator] Non-pausing tool executed.")
-                    # --- ADD REMINDER ---
-                    last_real_user_prompt = _initial_user_prompt
-                    for i in range(len(agent.messages) - 1, -1, -1):
-                         msg = agent.messages[i]
-                         if msg.role == 'user' and not msg.content.startswith(("Proceed.", "[SYSTEM REMINDER]")):
-                              last_real_user_prompt = msg.content
-                              break
-                    reminder_text = f"[SYSTEM REMINDER] Previous step completed. Recall the goal: \"{last_real_user_prompt[:100].strip()}...\" Now execute the *next* step based on your plan."
-                    agent.add_message('user', reminder_text)
-                    print(f"User: {reminder_text}")
-                    reminder_added_this_turn = True
-                    # --- END REMINDER ---
-                    pass
-
-                elif isinstance(result, str) and result.startswith("[ERROR:"):
-                    print(f"\n[Orchestrator] Agent '{target_agent_id}' reported error: {result}. Stopping loop.")
-                    break
-                elif isinstance(result, str):
-                    pass
-                elif result is None:
-                     print(f"\n[Orchestrator] Agent '{target_agent_id}' returned None unexpectedly. Stopping loop.")
-                     break
-
-                # --- Add "Proceed." ONLY if needed AND turn didn't run a tool AND no reminder was just added ---
-                if should_add_proceed_later and result is not TOOL_EXECUTED_SIGNAL and not reminder_added_this_turn:
-                    if not (agent.messages and agent.messages[-1].role == 'user' and agent.messages[-1].content == "Proceed."):
-                        agent.add_message('user', "Proceed.")
-                        print("User: Proceed.")
-
-            # --- Handle control flow exceptions ---
             except PauseRequested as pr:
                 print("\n-----------------------------------------------------")
                 print(f"[Orchestrator] {pr.message}")
                 print("-----------------------------------------------------")
-                user_input = get_multiline_input("> ")
-                if user_input is None:
-                    print("\nExiting loop due to user input (EOF).")
-                    break
-                elif user_input.strip():
-                    print(f"User (to {target_agent_id}): {user_input}")
-                    agent.add_message('user', user_input)
-                else:
-                    print("[Empty input received. Resuming autonomous run...]")
-                    agent.add_message('user', "Proceed.")
-                    print("User: Proceed.")
-                continue
+                state = LoopState.AWAIT_INPUT
 
             except ConversationEnded as ce:
                 print(f"\n[Orchestrator] Caught ConversationEnded signal: {ce}")
@@ -295,11 +315,146 @@ class Orchestrator:
                 traceback.print_exc()
                 break
 
-            # --- Max turns check ---
-            if turn_count >= max_turns:
-                print(f"\n[Orchestrator] Reached max turns ({max_turns}). Stopping loop.")
-                break
+        await agent.jobs.cancel_all()
+        agent.tool_context.snapshots.delete()
+        print(f"\n--- Main Loop Finished ({target_agent_id}) ---")
+
+    def _after_turn(self, agent: AgentInstance, agent_id: str, result, initial_prompt: str) -> LoopState:
+        """Applies a finished turn's outcome to the history and returns the next state."""
+        if result is TOOL_EXECUTED_SIGNAL:
+            print("[Orchestrator] Non-pausing tool executed.")
+            reminder_text = build_reminder(agent, initial_prompt)
+            agent.add_message('user', reminder_text)
+            print(f"User: {reminder_text}")
+            return LoopState.RUN_TURN
+        if result is None:
+            print(f"\n[Orchestrator] Agent '{agent_id}' returned None unexpectedly. Stopping loop.")
+            return LoopState.DONE
+        if isinstance(result, str) and result.startswith("[ERROR:"):
+            print(f"\n[Orchestrator] Agent '{agent_id}' reported error: {result}. Stopping loop.")
+            return LoopState.DONE
+        # A plain answer with background jobs running: the next turn starts from a job's result
+        if agent.jobs.running():
+            return LoopState.AWAIT_JOBS
+        # A plain answer: nudge the agent on so every turn starts from a user message
+        if agent.messages and agent.messages[-1].role == 'assistant':
+            agent.add_message('user', "Proceed.")
+            print("User: Proceed.")
+        return LoopState.RUN_TURN
+
+    async def _await_user_input(self, agent: AgentInstance, agent_id: str) -> LoopState:
+        try:
+            # In a worker thread: input() would otherwise block the event loop
+            user_input = await asyncio.to_thread(get_multiline_input, "> ")
+        except EOFError:
+            print("\nExiting loop due to user input (EOF).")
+            return LoopState.DONE
+        if user_input.strip():
+            print(f"User (to {agent_id}): {user_input}")
+            agent.add_message('user', user_input)
+        else:
+            print("[Empty input received. Resuming autonomous run...]")
+            agent.add_message('user', "Proceed.")
+            print("User: Proceed.")
+        return LoopState.RUN_TURN
+
+    async def run_concurrent(self, initial_prompt: str, target_agent_id: str = "ceo", max_turns: int = 10,
+                             inbox_size: int = DEFAULT_INBOX_SIZE,
+                             user_handler: Optional[Callable[[Envelope], Awaitable[Optional[str]]]] = None):
+        """
+        Runs every loaded agent as its own asyncio task, connected by a MessageBus.
+
+        The initial prompt goes to `target_agent_id`; agents then talk to each
+        other and to the user through the message tool's `to` argument. An
+        agent sleeps on its inbox until a message arrives, then takes turns
+        until it answers without a tool call (at most `max_turns` per wake-up).
+        Messages for the user go to `user_handler`, whose return value (if not
+        None) is sent back to the sender; the default prints to the console and
+        prompts for input when an agent pauses.
+
+        The run finishes when an agent ends the conversation or when every
+        agent is idle with no messages in flight.
+        """
+        if target_agent_id not in self.agents:
+            print(f"Error: Target agent '{target_agent_id}' not found.")
+            print(f"Available agents: {list(self.agents.keys())}")
+            return
 
-            await asyncio.sleep(0.1)
+        bus = MessageBus(inbox_size)
+        bus.register(USER)
+        for agent_id, agent in self.agents.items():
+            bus.register(agent_id)
+            agent.tool_context.message_bus = bus
 
-        print(f"\n--- Main Loop Finished ({target_agent_id}) ---")
+        bus.post(Envelope(sender=USER, recipient=target_agent_id, text=initial_prompt))
+        print(f"\nUser (to {target_agent_id}): {initial_prompt}")
+
+        tasks = [asyncio.create_task(self._run_agent(agent, bus, max_turns), name=f"agent:{agent_id}")
+                 for agent_id, agent in self.agents.items()]
+        tasks.append(asyncio.create_task(self._run_user(bus, user_handler or console_user), name="user"))
+        quiet = asyncio.create_task(bus.wait_quiet())
+        try:
+            done, _ = await asyncio.wait(tasks + [quiet], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not quiet and not task.cancelled() and task.exception() is not None:
+                    error = task.exception()
+                    print(f"\n[Orchestrator] Task '{task.get_name()}' failed: {type(error).__name__}: {error}")
+        finally:
+            for task in tasks + [quiet]:
+                task.cancel()
+            await asyncio.gather(*tasks, quiet, return_exceptions=True)
+            for agent in self.agents.values():
+                agent.tool_context.message_bus = None
+                await agent.jobs.cancel_all()
+                agent.tool_context.snapshots.delete()
+
+        print("\n--- Concurrent Run Finished ---")
+
+    async def _run_agent(self, agent: AgentInstance, bus: MessageBus, max_turns: int):
+        """One agent's task: wait for messages, then work until it goes idle. Returns when the conversation ends."""
+        agent_id = agent.config.agent_id
+        while True:
+            first = await bus.receive(agent_id)
+            for envelope in [first] + bus.drain(agent_id):
+                agent.add_message('user', format_envelope(envelope))
+            fallback_prompt = first.text
+
+            for turn in range(max_turns):
+                print(f"\n--- Turn {turn + 1}/{max_turns} ({agent_id}) ---")
+                try:
+                    result = await agent.execute_turn()
+                except PauseRequested as pr:
+                    # The user's reply arrives through the inbox like any other message
+                    await bus.send(Envelope(sender=agent_id, recipient=USER, text=pr.message, kind="pause"))
+                    break
+                except ConversationEnded as ce:
+                    print(f"\n[Orchestrator] Agent '{agent_id}' ended the conversation: {ce}")
+                    return
+
+                if result is not TOOL_EXECUTED_SIGNAL:
+                    if isinstance(result, str) and result.startswith("[ERROR:"):
+                        print(f"\n[Orchestrator] Agent '{agent_id}' reported error: {result}")
+                        break
+                    # Not idle while background jobs run: a finished job's result starts the next turn
+                    if not await agent.await_background_jobs():
+                        break
+                    for envelope in bus.drain(agent_id):
+                        agent.add_message('user', format_envelope(envelope))
+                    continue
+                # Messages that arrived during the tool call take the place of the reminder
+                arrived = bus.drain(agent_id)
+                for envelope in arrived:
+                    agent.add_message('user', format_envelope(envelope))
+                if not arrived:
+                    agent.add_message('user', build_reminder(agent, fallback_prompt))
+                # Let the other agents run between turns even if this one never awaited
+                await asyncio.sleep(0)
+            else:
+                print(f"\n[Orchestrator] Agent '{agent_id}' reached max turns ({max_turns}); waiting for messages.")
+
+    async def _run_user(self, bus: MessageBus, handler: Callable[[Envelope], Awaitable[Optional[str]]]):
+        while True:
+            envelope = await bus.receive(USER)
+            reply = await handler(envelope)
+            if reply is not None:
+                await bus.send(Envelope(sender=USER, recipient=envelope.sender, text=reply))
@@ -0,0 +1,58 @@
+"""
+Request budgets shared by every worker process on the machine.
+
+A SharedRateLimiter is a token bucket whose state (tokens left, last refill
+time) lives in shared memory, so the supervisor creates one per provider and
+hands it to each worker it spawns; together the workers stay within the
+provider's requests-per-minute limit however the sessions are spread.
+
+`reserve` takes a token even when the bucket is empty, leaving it in debt,
+and returns how long the caller must wait. Callers therefore queue in the
+order they arrived instead of all retrying when a token frees up.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from typing import Optional
+
+
+class SharedRateLimiter:
+    def __init__(self, requests_per_minute: float, burst: Optional[float] = None, context=None):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        context = context or multiprocessing.get_context("spawn")
+        self.requests_per_minute = requests_per_minute
+        self.rate = requests_per_minute / 60.0
+        # By default a second's worth of requests may go out at once
+        self.capacity = float(burst) if burst else max(1.0, self.rate)
+        # [tokens, time of last refill]; CLOCK_MONOTONIC is system-wide, so all processes agree
+        self._state = context.Array('d', [self.capacity, time.monotonic()])
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """Takes `cost` tokens; returns the seconds to wait before making the request."""
+        with self._state.get_lock():
+            now = time.monotonic()
+            tokens = min(self.capacity, self._state[0] + (now - self._state[1]) * self.rate) - cost
+            self._state[0] = tokens
+            self._state[1] = now
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        delay = self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def parse_rate_limits(specs) -> dict:
+    """Turns ["anthropic=50", ...] (provider=requests per minute) into {"anthropic": 50.0, ...}."""
+    limits = {}
+    for spec in specs or []:
+        provider, _, value = spec.partition("=")
+        try:
+            limits[provider.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid rate limit '{spec}'; expected provider=requests_per_minute") from None
+        if not provider.strip() or limits[provider.strip()] <= 0:
+            raise ValueError(f"Invalid rate limit '{spec}'; expected provider=requests_per_minute")
+    return limits
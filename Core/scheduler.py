@@ -0,0 +1,150 @@
+"""
+Admission control for LLM calls and tool executions shared by many sessions.
+
+Each resource ("llm:<provider>", "tools") has a concurrency cap. When it is
+full, waiting requests are admitted by weighted fair queueing: every
+request gets a virtual finish tag
+
+    start  = max(virtual time, the session's previous finish tag)
+    finish = start + cost / weight
+
+and the smallest tag goes first. A session's weight is its priority class
+weight (interactive 16, background 4, batch 1) times its own weight, so a
+batch session that has issued hundreds of calls queues behind an
+interactive one that just arrived, yet still makes progress: nothing is
+starved. Finish tags are kept even for requests admitted without waiting,
+so a session's history counts from the moment contention starts.
+
+Caps come from `caps` by full resource name, then by the part before ":",
+then `default_cap`. The process-wide default_scheduler() reads
+AGENT_LLM_CONCURRENCY and AGENT_TOOL_CONCURRENCY.
+
+All methods must be called from the event loop's thread.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+
+class Priority(Enum):
+    INTERACTIVE = 16
+    BACKGROUND = 4
+    BATCH = 1
+
+
+@dataclass(frozen=True)
+class SessionTag:
+    session_id: str = "default"
+    priority: Priority = Priority.INTERACTIVE
+    weight: float = 1.0
+
+    @property
+    def share(self) -> float:
+        return self.priority.value * self.weight
+
+
+_DEFAULT_TAG = SessionTag()
+# Finish tags older than the virtual time carry no information; prune past this many sessions
+_PRUNE_AT = 1024
+
+
+class _Resource:
+    def __init__(self, cap: int):
+        self.cap = cap
+        self.active = 0
+        self.virtual_time = 0.0
+        self.finish: Dict[str, float] = {}
+        # (finish tag, arrival order, start tag, future)
+        self.waiting: List[Tuple[float, int, float, asyncio.Future]] = []
+
+    def tags(self, tag: SessionTag, cost: float) -> Tuple[float, float]:
+        start = max(self.virtual_time, self.finish.get(tag.session_id, 0.0))
+        finish = start + cost / tag.share
+        self.finish[tag.session_id] = finish
+        if len(self.finish) > _PRUNE_AT:
+            self.finish = {s: f for s, f in self.finish.items() if f > self.virtual_time}
+        return start, finish
+
+
+class Scheduler:
+    def __init__(self, caps: Optional[Dict[str, int]] = None, default_cap: int = 8):
+        self.caps = dict(caps or {})
+        self.default_cap = default_cap
+        self._resources: Dict[str, _Resource] = {}
+        self._order = itertools.count()
+
+    def _resource(self, name: str) -> _Resource:
+        resource = self._resources.get(name)
+        if resource is None:
+            cap = self.caps.get(name, self.caps.get(name.split(":", 1)[0], self.default_cap))
+            resource = self._resources[name] = _Resource(max(1, cap))
+        return resource
+
+    async def acquire(self, name: str, tag: Optional[SessionTag] = None, cost: float = 1.0) -> None:
+        resource = self._resource(name)
+        start, finish = resource.tags(tag or _DEFAULT_TAG, cost)
+        if resource.active < resource.cap and not resource.waiting:
+            resource.active += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(resource.waiting, (finish, next(self._order), start, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(name)      # Admitted just as we were cancelled; pass the slot on
+            raise
+
+    def release(self, name: str) -> None:
+        resource = self._resource(name)
+        resource.active -= 1
+        while resource.waiting and resource.active < resource.cap:
+            _, _, start, future = heapq.heappop(resource.waiting)
+            if future.done():
+                continue    # Cancelled while waiting
+            resource.virtual_time = max(resource.virtual_time, start)
+            resource.active += 1
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, name: str, tag: Optional[SessionTag] = None, cost: float = 1.0):
+        await self.acquire(name, tag, cost)
+        try:
+            yield
+        finally:
+            self.release(name)
+
+    async def stream(self, name: str, source: AsyncIterator, tag: Optional[SessionTag] = None) -> AsyncIterator:
+        """Iterates `source` while holding a slot; the slot is freed when it is exhausted or closed."""
+        async with self.slot(name, tag):
+            try:
+                async for item in source:
+                    yield item
+            finally:
+                if hasattr(source, "aclose"):
+                    await source.aclose()
+
+    def load(self, name: str) -> Tuple[int, int]:
+        """(running, waiting) for a resource."""
+        resource = self._resource(name)
+        return resource.active, sum(1 for *_, future in resource.waiting if not future.done())
+
+
+_default_scheduler: Optional[Scheduler] = None
+
+
+def default_scheduler() -> Scheduler:
+    """The scheduler shared by every session in this process."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = Scheduler(caps={
+            "llm": int(os.getenv("AGENT_LLM_CONCURRENCY", "16")),
+            "tools": int(os.getenv("AGENT_TOOL_CONCURRENCY", "8")),
+        })
+    return _default_scheduler
@@ -0,0 +1,466 @@
+"""
+Long-running HTTP server multiplexing many agent sessions on one event loop.
+
+Endpoints (JSON bodies and responses):
+
+    POST   /sessions                   {"agent": "ceo", "prompt"?, "id"?} -> 201 {"id", "agent", "state"}
+    GET    /sessions                   -> 200 [{"id", "agent", "state"}, ...]
+    GET    /sessions/{id}              -> 200 {"id", "agent", "state", "last_event", "hibernated"}
+    POST   /sessions/{id}/messages     {"text": "..."} -> 202
+    GET    /sessions/{id}/events       -> Server-Sent Events stream
+    POST   /sessions/{id}/cancel       -> 200; stops the running turn, the session stays open
+    DELETE /sessions/{id}              -> 200; stops and removes the session
+
+Each session is an AgentInstance from Orchestrator.new_session, so the API
+clients, tool registry and compiled system prompts are shared, and runs as
+its own asyncio task that takes user messages from a bounded inbox (a full
+inbox answers 429). A pause tool call does not block anything: the session
+publishes a "pause" event and the next posted message is the user's answer.
+
+Idle sessions are hibernated to disk when the server holds too many (see
+Core/hibernation.py) and restored transparently by their next message.
+
+Events carry increasing ids. The events endpoint replays everything after
+the `after` query parameter or the Last-Event-ID header, then follows the
+session live until it is deleted, so a client can reconnect without losing
+output. Event kinds: user, text, tool_call, tool_result, turn_complete, pause,
+error, cancelled, ended, closed.
+
+Only the Python standard library is used: HTTP/1.1 with one request per
+connection, no TLS. Put it behind a reverse proxy when exposing it.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from Core.agent_instance import AgentInstance, TOOL_EXECUTED_SIGNAL
+from Core.hibernation import (DEFAULT_IDLE_SECONDS, DEFAULT_MEMORY_BUDGET, Hibernator, SessionStore, agent_size,
+                              dump_agent, restore_agent)
+from Core.orchestrator import Orchestrator, build_reminder
+from Tools.context import default_cache_dir
+from Tools.error_codes import ConversationEnded, PauseRequested
+
+DEFAULT_PORT = 8765
+INBOX_SIZE = 16
+MAX_EVENTS = 2000           # Events kept per session for replay
+MAX_BODY_BYTES = 1024 * 1024
+KEEPALIVE_SECONDS = 15.0
+
+_REASONS = {200: "OK", 201: "Created", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 429: "Too Many Requests",
+            500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Event:
+    id: int
+    kind: str
+    data: Dict[str, Any]
+    created: float = field(default_factory=time.time)
+
+
+class Session:
+    def __init__(self, session_id: str, agent: AgentInstance, max_turns: int,
+                 factory: Optional[Callable[[], AgentInstance]] = None):
+        self.id = session_id
+        # None while hibernated; `factory` makes the fresh instance its saved state is restored into
+        self.agent: Optional[AgentInstance] = agent
+        self.agent_id = agent.config.agent_id
+        self.max_turns = max_turns
+        self.factory = factory
+        # "idle", "running", "waiting_input" (after a pause) or "ended"
+        self.state = "idle"
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=INBOX_SIZE)
+        self.events: Deque[Event] = deque(maxlen=MAX_EVENTS)
+        self.closed = False
+        self._next_event = itertools.count(1)
+        self._wakeup = asyncio.Event()
+        self._turn: Optional[asyncio.Task] = None
+        self._cancel_requested = False
+        self.task: Optional[asyncio.Task] = None
+        self.last_active = time.monotonic()
+        self.hibernated = False
+        self._last_event = 0
+        self._store: Optional[SessionStore] = None
+        # Serialises hibernate() and wake()
+        self._swap = asyncio.Lock()
+        # Kept across hibernation, so a woken session can still restore its checkpoints
+        self.snapshots = agent.tool_context.snapshots
+        agent.listener = self.publish
+
+    def describe(self) -> Dict[str, Any]:
+        return {"id": self.id, "agent": self.agent_id, "state": self.state, "last_event": self._last_event,
+                "hibernated": self.hibernated}
+
+    def publish(self, kind: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self._last_event = next(self._next_event)
+        self.last_active = time.monotonic()
+        self.events.append(Event(self._last_event, kind, data or {}))
+        # Wake every subscriber; each waits on the event current when it last caught up
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    async def follow(self, after: int):
+        """Yields events with id > `after`, then new ones as they come; None as a keepalive tick."""
+        if self.hibernated and after < self._last_event:
+            await self.wake()
+        while True:
+            wakeup = self._wakeup
+            backlog = [event for event in self.events if event.id > after]
+            for event in backlog:
+                yield event
+                after = event.id
+            if self.closed:
+                return
+            if not backlog:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+
+    def post(self, text: str) -> None:
+        if self.state == "ended" or self.closed:
+            raise HTTPError(409, "Session has ended")
+        try:
+            self.inbox.put_nowait(text)
+        except asyncio.QueueFull:
+            raise HTTPError(429, "Too many queued messages; wait for the session to catch up") from None
+
+    def cancel_turn(self) -> bool:
+        if self._turn is not None and not self._turn.done():
+            self._cancel_requested = True
+            self._turn.cancel()
+            return True
+        return False
+
+    # --- Hibernation (Core/hibernation.py) ---
+
+    def can_hibernate(self) -> bool:
+        """Waiting for a message with no turn, queued message or unseen background job."""
+        return (self.agent is not None and self.factory is not None and not self.closed
+                and self.state in ("idle", "waiting_input", "ended") and self._turn is None
+                and self.inbox.empty() and all(job.delivered for job in self.agent.jobs.jobs.values()))
+
+    def resident_size(self) -> int:
+        if self.agent is None:
+            return 0
+        return agent_size(self.agent) + sum(len(str(event.data)) for event in self.events)
+
+    async def hibernate(self, store: SessionStore) -> bool:
+        """Writes the session to `store` and drops its agent and events; False if it is not idle (any more)."""
+        async with self._swap:
+            if not self.can_hibernate():
+                return False
+            active = self.last_active
+            state = {"agent": dump_agent(self.agent),
+                     "events": [[e.id, e.kind, e.data, e.created] for e in self.events]}
+            await asyncio.to_thread(store.save, self.id, state)
+            if not self.can_hibernate() or self.last_active != active:
+                return False    # A message arrived while writing; the file is replaced next time
+            self.agent.listener = None
+            self.agent = None
+            self.events.clear()
+            self._store = store
+            self.hibernated = True
+            return True
+
+    async def wake(self) -> None:
+        """Restores a hibernated session into a fresh agent from the factory."""
+        async with self._swap:
+            if not self.hibernated:
+                return
+            state = await asyncio.to_thread(self._store.load, self.id)
+            agent = self.factory()
+            restore_agent(agent, state["agent"])
+            agent.tool_context.snapshots = self.snapshots
+            agent.listener = self.publish
+            # Events published while asleep (none so far) stay after the restored ones
+            self.events = deque([Event(*e) for e in state["events"]] + list(self.events), maxlen=MAX_EVENTS)
+            self.agent = agent
+            self.hibernated = False
+            self.last_active = time.monotonic()
+            self._store.delete(self.id)
+
+    async def run(self) -> None:
+        """The session's task: take a user message, work on it, repeat."""
+        while True:
+            if self.state != "waiting_input":
+                self.state = "idle"
+            text = await self.inbox.get()
+            self.state = "running"
+            await self.wake()
+            self.agent.add_message('user', text)
+            self.publish("user", {"text": text})
+            self._turn = asyncio.create_task(self._work(text))
+            try:
+                ended = await self._turn
+            except asyncio.CancelledError:
+                if not self._cancel_requested:
+                    raise       # The session itself is being stopped
+                self._cancel_requested = False
+                self.state = "idle"
+                self.publish("cancelled")
+                continue
+            finally:
+                self._turn = None
+            if ended:
+                self.state = "ended"
+                return
+
+    async def _work(self, goal: str) -> bool:
+        """Takes turns until the agent answers, pauses or ends; returns True when the conversation ended."""
+        agent = self.agent
+        for turn in range(self.max_turns):
+            try:
+                result = await agent.execute_turn()
+            except PauseRequested as pr:
+                self.state = "waiting_input"
+                self.publish("pause", {"message": pr.message})
+                return False
+            except ConversationEnded as ce:
+                self.publish("ended", {"message": str(ce)})
+                return True
+            if result is TOOL_EXECUTED_SIGNAL:
+                agent.add_message('user', build_reminder(agent, goal))
+                continue
+            if isinstance(result, str) and result.startswith("[ERROR:"):
+                self.publish("error", {"message": result})
+                return False
+            self.publish("turn_complete", {"output": result or "", "turns": turn + 1})
+            # Background jobs still running: their results start another turn when they finish
+            if not await agent.await_background_jobs():
+                return False
+        self.publish("turn_complete", {"output": "", "turns": self.max_turns, "max_turns_reached": True})
+        return False
+
+
+class AgentServer:
+    def __init__(self, orchestrator: Orchestrator, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 max_turns: int = 10, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 idle_seconds: float = DEFAULT_IDLE_SECONDS, store_dir: Optional[str] = None):
+        self.orchestrator = orchestrator
+        self.host = host
+        self.port = port
+        self.max_turns = max_turns
+        self.sessions: Dict[str, Session] = {}
+        self._ids = itertools.count(1)
+        self._server: Optional[asyncio.AbstractServer] = None
+        store = SessionStore(store_dir or os.path.join(default_cache_dir(), "sessions"))
+        self.hibernator = Hibernator(store, memory_budget, idle_seconds)
+        self._sweeper: Optional[asyncio.Task] = None
+
+    # --- Lifecycle ---
+
+    async def start(self) -> int:
+        """Starts listening; returns the bound port (useful with port=0)."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._sweeper = asyncio.create_task(self.hibernator.run(self.sessions.values), name="hibernator")
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        print(f"Agent server listening on http://{self.host}:{self.port}")
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def shutdown(self, grace: float = 0.0) -> None:
+        """Stops accepting connections, lets running turns finish for up to `grace` seconds, then closes."""
+        if self._server is not None:
+            self._server.close()
+        deadline = asyncio.get_running_loop().time() + grace
+        while any(s.state == "running" for s in self.sessions.values()) \
+                and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.1)
+        await self.close()
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+        for session_id in list(self.sessions):
+            await self.delete_session(session_id)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # --- Sessions ---
+
+    def create_session(self, agent_id: str, prompt: Optional[str] = None, session_id: Optional[str] = None) -> Session:
+        if agent_id not in self.orchestrator.agents:
+            raise HTTPError(404, f"Unknown agent '{agent_id}'; available: {', '.join(self.orchestrator.agents)}")
+        if session_id is None:
+            session_id = f"s{next(self._ids)}"
+        elif not re.fullmatch(r"[\w-]{1,64}", session_id):
+            raise HTTPError(400, "Session ids are 1-64 letters, digits, '_' or '-'")
+        if session_id in self.sessions:
+            raise HTTPError(409, f"Session '{session_id}' already exists")
+        factory = lambda: self.orchestrator.new_session(agent_id, f"{agent_id}-server-{session_id}")
+        session = Session(session_id, factory(), self.max_turns, factory)
+        session.task = asyncio.create_task(self._run_session(session), name=f"session:{session_id}")
+        self.sessions[session_id] = session
+        if prompt:
+            session.post(prompt)
+        return session
+
+    async def _run_session(self, session: Session) -> None:
+        try:
+            await session.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            session.state = "ended"
+            session.publish("error", {"message": f"{type(e).__name__}: {e}"})
+
+    async def delete_session(self, session_id: str) -> None:
+        session = self._session(session_id)
+        del self.sessions[session_id]
+        session.task.cancel()
+        await asyncio.gather(session.task, return_exceptions=True)
+        if session.agent is not None:
+            await session.agent.jobs.cancel_all()
+        self.hibernator.store.delete(session_id)
+        session.snapshots.delete()
+        session.state = "ended"
+        session.closed = True
+        session.publish("closed")
+
+    def _session(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, f"No session '{session_id}'")
+        return session
+
+    # --- HTTP ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await read_request(reader)
+                await self._dispatch(method, target, headers, body, writer)
+            except HTTPError as e:
+                await respond(writer, e.status, {"error": e.message})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+            except Exception as e:
+                await respond(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str], body: bytes,
+                        writer: asyncio.StreamWriter) -> None:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:1] != ["sessions"] or len(parts) > 3:
+            raise HTTPError(404, f"No route for {url.path}")
+
+        if len(parts) == 1:
+            if method == "POST":
+                data = json_body(body)
+                session_id = str(data["id"]) if data.get("id") is not None else None
+                session = self.create_session(str(data.get("agent") or "ceo"), data.get("prompt"), session_id)
+                return await respond(writer, 201, session.describe())
+            if method == "GET":
+                return await respond(writer, 200, [s.describe() for s in self.sessions.values()])
+            raise HTTPError(405, f"{method} not allowed on /sessions")
+
+        session = self._session(parts[1])
+        action = parts[2] if len(parts) == 3 else None
+        route = (method, action)
+        if route == ("GET", None):
+            return await respond(writer, 200, session.describe())
+        if route == ("DELETE", None):
+            await self.delete_session(session.id)
+            return await respond(writer, 200, {"id": session.id, "state": "deleted"})
+        if route == ("POST", "messages"):
+            text = json_body(body).get("text")
+            if not isinstance(text, str) or not text.strip():
+                raise HTTPError(400, "Expected a non-empty \"text\"")
+            session.post(text)
+            return await respond(writer, 202, session.describe())
+        if route == ("POST", "cancel"):
+            cancelled = session.cancel_turn()
+            return await respond(writer, 200, {"id": session.id, "cancelled": cancelled})
+        if route == ("GET", "events"):
+            after = parse_qs(url.query).get("after", [headers.get("last-event-id", "0")])[0]
+            try:
+                after = int(after)
+            except ValueError:
+                raise HTTPError(400, "'after' must be an event id") from None
+            return await _stream_events(writer, session, after)
+        raise HTTPError(404, f"No route for {method} {url.path}")
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    match = re.match(r"(\w+) (\S+) HTTP/1\.[01]$", request_line)
+    if not match:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1")
+        if line in ("\r\n", "\n", ""):
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return match.group(1).upper(), match.group(2), headers, body
+
+
+def json_body(body: bytes) -> Dict[str, Any]:
+    if not body:
+        return {}
+    try:
+        data = json.loads(body)
+    except ValueError:
+        raise HTTPError(400, "Body is not valid JSON") from None
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Body must be a JSON object")
+    return data
+
+
+async def respond(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+
+
+async def _stream_events(writer: asyncio.StreamWriter, session: Session, after: int) -> None:
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                 b"Connection: close\r\n\r\n")
+    await writer.drain()
+    async for event in session.follow(after):
+        if event is None:
+            writer.write(b": keepalive\n\n")
+        else:
+            data = json.dumps(event.data)
+            writer.write(f"id: {event.id}\nevent: {event.kind}\ndata: {data}\n\n".encode("utf-8"))
+        # Raises ConnectionError once the client has gone, which ends the stream
+        await writer.drain()
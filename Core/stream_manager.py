@@ -7,9 +7,9 @@ class StreamManager:
 
     async def process_stream(self, stream) -> AsyncGenerator:
         try:
+            # No per-chunk sleep(0): awaiting the network already yields to other tasks
             async for chunk in stream:
                 yield chunk
-                await asyncio.sleep(0)
         except asyncio.TimeoutError:
             await self.close_stream(stream)
             raise
@@ -0,0 +1,295 @@
+"""
+Shards server sessions across worker processes, one event loop per core.
+
+The supervisor spawns N workers. Each worker builds its own Orchestrator
+(tool registry, API clients, agents) and runs an AgentServer on a private
+localhost port. The supervisor listens on the public port and forwards
+every request to the worker that owns the session:
+
+- it assigns session ids itself and picks the worker by rendezvous hashing
+  of the id, so routing needs no table and is the same after restarts;
+- GET /sessions asks every worker and merges the lists;
+- everything else, SSE event streams included, is piped through unchanged.
+
+Provider request budgets are SharedRateLimiters (Core/rate_limit.py) in
+shared memory, handed to every worker, so all processes together respect
+one requests-per-minute limit per provider.
+
+Each worker hibernates its own idle sessions under its own memory budget
+(Core/hibernation.py). A worker that dies is respawned with exponential backoff. restart_worker()
+and rolling_restart() restart workers gracefully: the worker stops
+accepting requests and gets `grace` seconds to finish running turns. A
+worker's sessions live in its memory and do not survive its restart.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from Core.hibernation import DEFAULT_IDLE_SECONDS, DEFAULT_MEMORY_BUDGET
+from Core.rate_limit import SharedRateLimiter
+from Core.server import AgentServer, DEFAULT_PORT, HTTPError, json_body, read_request, respond
+
+READY_TIMEOUT = 60.0
+MAX_BACKOFF = 30.0
+MONITOR_INTERVAL = 0.5
+
+
+def worker_for(session_id: str, workers: int) -> int:
+    """Rendezvous hashing: the worker index with the highest hash for this session."""
+    return max(range(workers),
+               key=lambda i: hashlib.blake2b(f"{i}:{session_id}".encode(), digest_size=8).digest())
+
+
+def load_orchestrator(config_dir: str = "./AgentConfigs"):
+    """Default worker factory: an Orchestrator over the YAML agent configurations."""
+    from Core.orchestrator import Orchestrator, load_agent_configurations
+    return Orchestrator(load_agent_configurations(config_dir))
+
+
+def _worker_main(index: int, factory: Callable, limiters: Dict[str, SharedRateLimiter], ready,
+                 max_turns: int, grace: float, hibernation: Dict[str, Any]) -> None:
+    # Ctrl-C reaches the whole process group; the supervisor decides how workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve_worker(index, factory, limiters, ready, max_turns, grace, hibernation))
+
+
+async def _serve_worker(index, factory, limiters, ready, max_turns, grace, hibernation) -> None:
+    orchestrator = factory()
+    for provider, client in getattr(orchestrator, "clients", {}).items():
+        client.rate_limiter = limiters.get(provider)
+    server = AgentServer(orchestrator, host="127.0.0.1", port=0, max_turns=max_turns, **hibernation)
+    port = await server.start()
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    ready.send(port)
+    ready.close()
+    await stop.wait()
+    await server.shutdown(grace)
+
+
+@dataclass
+class WorkerHandle:
+    index: int
+    process: Any = None
+    port: Optional[int] = None      # None while (re)starting
+    started: float = 0.0
+    failures: int = 0
+    restarting: bool = False
+
+
+class Supervisor:
+    def __init__(self, factory: Callable = load_orchestrator, workers: Optional[int] = None,
+                 host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 rate_limits: Optional[Dict[str, float]] = None, max_turns: int = 10, grace: float = 30.0,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, idle_seconds: float = DEFAULT_IDLE_SECONDS):
+        self._mp = multiprocessing.get_context("spawn")
+        self.factory = factory
+        self.host = host
+        self.port = port
+        self.max_turns = max_turns
+        self.grace = grace
+        # Per worker; see Core/hibernation.py
+        self.hibernation = {"memory_budget": memory_budget, "idle_seconds": idle_seconds}
+        self.limiters = {provider: SharedRateLimiter(rpm, context=self._mp)
+                         for provider, rpm in (rate_limits or {}).items()}
+        self.workers = [WorkerHandle(i) for i in range(workers or os.cpu_count() or 1)]
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._monitor: Optional[asyncio.Task] = None
+
+    # --- Workers ---
+
+    async def _spawn(self, handle: WorkerHandle) -> None:
+        receiver, sender = self._mp.Pipe(duplex=False)
+        process = self._mp.Process(
+            target=_worker_main, name=f"agent-worker-{handle.index}", daemon=True,
+            args=(handle.index, self.factory, self.limiters, sender, self.max_turns, self.grace, self.hibernation))
+        process.start()
+        sender.close()
+        handle.process = process
+        try:
+            handle.port = await asyncio.to_thread(_wait_ready, receiver, process)
+        finally:
+            receiver.close()
+        handle.started = time.monotonic()
+
+    async def _stop(self, handle: WorkerHandle) -> None:
+        process, handle.port = handle.process, None
+        if process is None or not process.is_alive():
+            return
+        process.terminate()         # SIGTERM: the worker drains, then exits
+        await asyncio.to_thread(process.join, self.grace + 5)
+        if process.is_alive():
+            process.kill()
+            await asyncio.to_thread(process.join)
+
+    async def restart_worker(self, index: int) -> None:
+        """Gracefully replaces one worker; its sessions are lost, routing is unchanged."""
+        handle = self.workers[index]
+        handle.restarting = True
+        try:
+            await self._stop(handle)
+            await self._spawn(handle)
+        finally:
+            handle.restarting = False
+
+    async def rolling_restart(self) -> None:
+        """Restarts every worker, one at a time, so the others keep serving."""
+        for handle in self.workers:
+            await self.restart_worker(handle.index)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(MONITOR_INTERVAL)
+            for handle in self.workers:
+                if handle.restarting or handle.process is None or handle.process.is_alive():
+                    continue
+                handle.port = None
+                # A worker that ran for a while before dying starts over with a short backoff
+                if time.monotonic() - handle.started > 60:
+                    handle.failures = 0
+                delay = min(MAX_BACKOFF, 0.5 * 2 ** handle.failures)
+                handle.failures += 1
+                print(f"[supervisor] Worker {handle.index} exited with code {handle.process.exitcode}; "
+                      f"restarting in {delay:.1f}s")
+                handle.restarting = True
+                asyncio.create_task(self._respawn_later(handle, delay))
+
+    async def _respawn_later(self, handle: WorkerHandle, delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+            await self._spawn(handle)
+        except Exception as e:
+            print(f"[supervisor] Worker {handle.index} failed to start: {e}")
+        finally:
+            handle.restarting = False
+
+    # --- Lifecycle ---
+
+    async def start(self) -> int:
+        """Spawns the workers and starts the public listener; returns its port."""
+        await asyncio.gather(*(self._spawn(handle) for handle in self.workers))
+        self._monitor = asyncio.create_task(self._watch())
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.rolling_restart()))
+        print(f"Supervisor listening on http://{self.host}:{self.port} with {len(self.workers)} workers")
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._monitor is not None:
+            self._monitor.cancel()
+            await asyncio.gather(self._monitor, return_exceptions=True)
+            self._monitor = None
+        if self._server is not None:
+            self._server.close()
+        await asyncio.gather(*(self._stop(handle) for handle in self.workers))
+
+    # --- Proxy ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await read_request(reader)
+                await self._route(method, target, headers, body, writer)
+            except HTTPError as e:
+                await respond(writer, e.status, {"error": e.message})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, target, headers, body, writer) -> None:
+        parts = [p for p in urlsplit(target).path.split("/") if p]
+        if parts[:1] != ["sessions"]:
+            raise HTTPError(404, f"No route for {urlsplit(target).path}")
+        if len(parts) == 1 and method == "GET":
+            return await respond(writer, 200, await self._list_sessions())
+        if len(parts) == 1 and method == "POST":
+            data = json_body(body)
+            data.setdefault("id", uuid.uuid4().hex[:16])
+            body = json.dumps(data).encode("utf-8")
+            return await self._forward(worker_for(str(data["id"]), len(self.workers)),
+                                       method, target, headers, body, writer)
+        if len(parts) == 1:
+            raise HTTPError(405, f"{method} not allowed on /sessions")
+        return await self._forward(worker_for(parts[1], len(self.workers)), method, target, headers, body, writer)
+
+    async def _forward(self, index, method, target, headers, body, writer) -> None:
+        port = self.workers[index].port
+        if port is None:
+            raise HTTPError(503, f"Worker {index} is restarting; retry shortly")
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            raise HTTPError(503, f"Worker {index} is unavailable; retry shortly") from None
+        try:
+            head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+                f"{name}: {value}\r\n" for name, value in headers.items()
+                if name not in ("content-length", "connection"))
+            head += f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            upstream_writer.write(head.encode("latin-1") + body)
+            await upstream_writer.drain()
+            # Piped as it arrives, so event streams stay live
+            while True:
+                chunk = await upstream_reader.read(65536)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        finally:
+            upstream_writer.close()
+
+    async def _list_sessions(self) -> List[Dict[str, Any]]:
+        async def fetch(handle):
+            if handle.port is None:
+                return []
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", handle.port)
+            except OSError:
+                return []
+            try:
+                writer.write(b"GET /sessions HTTP/1.1\r\nHost: worker\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                response = await reader.read()
+            finally:
+                writer.close()
+            _, _, payload = response.partition(b"\r\n\r\n")
+            return [dict(session, worker=handle.index) for session in json.loads(payload or b"[]")]
+
+        listings = await asyncio.gather(*(fetch(handle) for handle in self.workers))
+        return [session for listing in listings for session in listing]
+
+
+def _wait_ready(receiver, process) -> int:
+    """Blocks until the worker reports its port; fails if it dies or takes too long first."""
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if receiver.poll(0.1):
+            return receiver.recv()
+        if not process.is_alive():
+            raise RuntimeError(f"Worker {process.name} exited with code {process.exitcode} during startup")
+    process.kill()
+    raise RuntimeError(f"Worker {process.name} did not start within {READY_TIMEOUT:.0f}s")
+
@@ -0,0 +1,255 @@
+"""
+Task graphs: a project as subtasks with dependencies, run in parallel.
+
+A TaskGraph is a DAG of TaskNodes. Each node names the agent that should do
+it and the nodes it depends on. run_graph() dispatches every node whose
+dependencies have completed to a fresh session of its agent (through a
+Delegator, Core/delegation.py), so independent nodes run concurrently and
+the wall-clock time of a project approaches its critical path rather than
+the sum of its steps. When nodes are ready at the same time, the one with
+the longest chain of dependents goes first.
+
+A node's prompt carries the results of the nodes it depends on. A node
+that fails (error, max turns, a pause nobody can answer) is retried in a
+new session, told why the previous attempt failed, up to `max_retries`
+times; after that it is "failed" and everything downstream of it is
+"blocked". Nodes still running when the timeout expires are "cancelled".
+
+Graphs come from a planning agent (the submit_plan tool) or from a JSON
+file (load_plan, run.py --plan):
+
+    {"tasks": [{"id": "schema", "task": "Design the schema", "agent": "worker"},
+               {"id": "api", "task": "Write the API", "depends_on": ["schema"]}]}
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from Core.delegation import Delegator, Subtask
+from Core.utils import condense
+
+DEFAULT_AGENT = "worker"
+DEFAULT_MAX_PARALLEL = 4
+DEFAULT_MAX_RETRIES = 1
+# Budget for plans submitted by an agent (the submit_plan tool)
+DEFAULT_TIMEOUT = 1800.0
+# Dependency results quoted in a node's prompt are condensed to this many characters each
+DEPENDENCY_RESULT_CHARS = 4000
+_SUCCEEDED = ("completed", "ended")
+
+
+class TaskStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    BLOCKED = "blocked"         # A dependency failed or was cancelled
+    CANCELLED = "cancelled"     # Still running (or waiting) when the run stopped
+
+
+@dataclass
+class TaskNode:
+    id: str
+    task: str
+    agent: str = DEFAULT_AGENT
+    depends_on: List[str] = field(default_factory=list)
+    status: TaskStatus = TaskStatus.PENDING
+    result: str = ""
+    error: str = ""
+    attempts: int = 0
+    # Record of the latest attempt (see Delegator.run_one)
+    record: Dict[str, Any] = field(default_factory=dict)
+
+
+class TaskGraph:
+    def __init__(self, nodes: Optional[List[TaskNode]] = None):
+        self.nodes: Dict[str, TaskNode] = {}
+        self.dependents: Dict[str, List[str]] = {}
+        for node in nodes or []:
+            self.add(node)
+
+    @classmethod
+    def from_specs(cls, specs: List[Dict[str, Any]], default_agent: str = DEFAULT_AGENT) -> 'TaskGraph':
+        """Builds and validates a graph from dicts with "id", "task" and optional "agent" and "depends_on"."""
+        graph = cls()
+        for number, spec in enumerate(specs, 1):
+            if not isinstance(spec, dict) or not str(spec.get("task") or "").strip():
+                raise ValueError(f"Task {number}: expected an object with a non-empty \"task\"")
+            depends_on = spec.get("depends_on") or []
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
+            graph.add(TaskNode(id=str(spec.get("id") or number), task=str(spec["task"]).strip(),
+                               agent=str(spec.get("agent") or default_agent),
+                               depends_on=[str(d) for d in depends_on]))
+        graph.validate()
+        return graph
+
+    def add(self, node: TaskNode) -> None:
+        if node.id in self.nodes:
+            raise ValueError(f"Duplicate task id '{node.id}'")
+        self.nodes[node.id] = node
+        self.dependents.setdefault(node.id, [])
+        for dependency in node.depends_on:
+            self.dependents.setdefault(dependency, []).append(node.id)
+
+    def validate(self) -> None:
+        """Raises ValueError for an empty graph, unknown dependencies or a cycle."""
+        if not self.nodes:
+            raise ValueError("The plan has no tasks")
+        for node in self.nodes.values():
+            unknown = [d for d in node.depends_on if d not in self.nodes]
+            if unknown:
+                raise ValueError(f"Task '{node.id}' depends on unknown task(s): {', '.join(unknown)}")
+        # Kahn's algorithm; whatever is left over lies on or behind a cycle
+        remaining = {node_id: len(set(node.depends_on)) for node_id, node in self.nodes.items()}
+        queue = [node_id for node_id, count in remaining.items() if count == 0]
+        while queue:
+            node_id = queue.pop()
+            del remaining[node_id]
+            for dependent in set(self.dependents[node_id]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        if remaining:
+            raise ValueError(f"The plan has a dependency cycle among: {', '.join(sorted(remaining))}")
+
+    def heights(self) -> Dict[str, int]:
+        """Length in nodes of the longest chain from each node to the end of the graph."""
+        heights: Dict[str, int] = {}
+
+        def height(node_id: str) -> int:
+            if node_id not in heights:
+                heights[node_id] = 1 + max((height(d) for d in set(self.dependents[node_id])), default=0)
+            return heights[node_id]
+
+        for node_id in self.nodes:
+            height(node_id)
+        return heights
+
+    def ready(self) -> List[TaskNode]:
+        """Pending nodes whose dependencies have all completed."""
+        return [node for node in self.nodes.values()
+                if node.status is TaskStatus.PENDING
+                and all(self.nodes[d].status is TaskStatus.COMPLETED for d in node.depends_on)]
+
+    def prompt_for(self, node: TaskNode) -> str:
+        """The node's task, with the results of its dependencies and the reason its last attempt failed."""
+        parts = [node.task]
+        if node.depends_on:
+            parts.append("Results of the tasks this one builds on:")
+            for dependency in node.depends_on:
+                done = self.nodes[dependency]
+                parts.append(f"[{done.id}] {done.task.splitlines()[0][:80]}\n"
+                             f"{condense(done.result, DEPENDENCY_RESULT_CHARS) or '(no output)'}")
+        if node.error:
+            parts.append(f"A previous attempt at this task failed: {node.error}\nTry again, avoiding that problem.")
+        return "\n\n".join(parts)
+
+    def finish(self, node: TaskNode, record: Dict[str, Any], max_retries: int) -> None:
+        """Applies the outcome of an attempt: completed, pending again for a retry, or failed."""
+        node.record = record
+        if record.get("status") in _SUCCEEDED:
+            node.status, node.result, node.error = TaskStatus.COMPLETED, record.get("output", ""), ""
+            return
+        node.error = record.get("error") or f"{record.get('status')}: {condense(record.get('output', ''), 500)}"
+        if node.attempts <= max_retries:
+            node.status = TaskStatus.PENDING
+        else:
+            node.status = TaskStatus.FAILED
+            self.block_dependents(node)
+
+    def block_dependents(self, node: TaskNode) -> None:
+        for dependent in self.dependents[node.id]:
+            blocked = self.nodes[dependent]
+            if blocked.status is TaskStatus.PENDING:
+                blocked.status = TaskStatus.BLOCKED
+                blocked.error = f"Dependency '{node.id}' {node.status.value}"
+                self.block_dependents(blocked)
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for node in self.nodes.values():
+            counts[node.status.value] = counts.get(node.status.value, 0) + 1
+        return counts
+
+    def summary(self) -> str:
+        """A report of every node's status and result, in graph order."""
+        lines = [", ".join(f"{count} {status}" for status, count in self.counts().items())]
+        for node in self.nodes.values():
+            after = f" after {', '.join(node.depends_on)}" if node.depends_on else ""
+            lines.append(f"\n[{node.id}] {node.agent}{after} ({node.status.value}, "
+                         f"{node.attempts} attempt{'s' if node.attempts != 1 else ''})")
+            text = node.result if node.status is TaskStatus.COMPLETED else node.error
+            lines.append(condense(text) or "(no output)")
+        return "\n".join(lines)
+
+
+def load_plan(path: str, default_agent: str = DEFAULT_AGENT) -> TaskGraph:
+    """Reads a plan file: {"tasks": [...]} or a bare list of task objects."""
+    with open(path, encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: invalid JSON ({e})") from None
+    specs = data.get("tasks") if isinstance(data, dict) else data
+    if not isinstance(specs, list):
+        raise ValueError(f"{path}: expected a list of tasks")
+    return TaskGraph.from_specs(specs, default_agent)
+
+
+async def run_graph(graph: TaskGraph, delegator: Delegator, max_parallel: int = DEFAULT_MAX_PARALLEL,
+                    max_turns: Optional[int] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                    timeout: Optional[float] = None,
+                    on_update: Optional[Callable[[TaskNode], None]] = None) -> TaskGraph:
+    """
+    Runs the graph to completion (or until `timeout` seconds pass) and returns it.
+
+    At most `max_parallel` nodes run at once. `on_update` is called with a
+    node each time its status changes.
+    """
+    graph.validate()
+    unknown = sorted({node.agent for node in graph.nodes.values()} - set(delegator.agents()))
+    if unknown:
+        raise KeyError(f"Unknown agent(s): {', '.join(unknown)}")
+    heights = graph.heights()
+    notify = on_update or (lambda node: None)
+    deadline = time.monotonic() + timeout if timeout else None
+    running: Dict[asyncio.Task, TaskNode] = {}
+
+    try:
+        while True:
+            # Longest remaining chain first: it bounds when the whole graph can finish
+            for node in sorted(graph.ready(), key=lambda n: -heights[n.id])[:max_parallel - len(running)]:
+                node.status = TaskStatus.RUNNING
+                node.attempts += 1
+                task = asyncio.create_task(delegator.run_one(Subtask(node.agent, graph.prompt_for(node)), max_turns))
+                running[task] = node
+                notify(node)
+            if not running:
+                break
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                node = running.pop(task)
+                graph.finish(node, task.result(), max_retries)
+                notify(node)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        for node in running.values():
+            node.status = TaskStatus.CANCELLED
+            notify(node)
+            graph.block_dependents(node)
+        # Ready nodes that never got a slot
+        for node in graph.nodes.values():
+            if node.status is TaskStatus.PENDING:
+                node.status = TaskStatus.CANCELLED
+                notify(node)
+    return graph
@@ -1,11 +1,69 @@
 from typing import Tuple, Optional, Dict, Any
-from Core.executor import parse_tool_call
 import re
 
+from Tools.Core.streamed_text import StreamedText
+
+TOOL_START = "@tool"
+TOOL_END = "@end"
+# A partial line inside a <<< block longer than this cannot be '>>>', so it is written out early
+_BLOCK_FLUSH_CHARS = 64 * 1024
+_TOOL_NAME = re.compile(r'\s*(\w+)')
+
+class _BlockValue:
+    """
+    Collects the lines of one <<< block as they stream in.
+
+    Leading and trailing empty lines are dropped, like parse_tool_call's
+    strip('\\n'); the text goes to a StreamedText, which spills to disk when large.
+    """
+    def __init__(self):
+        self.text = StreamedText()
+        self.started = False
+        self.pending_newlines = 0
+        self.in_line = False
+
+    def write_part(self, part: str):
+        if not part:
+            return
+        if self.started and not self.in_line:
+            self.text.write('\n' * (self.pending_newlines + 1))
+        self.text.write(part)
+        self.started = True
+        self.in_line = True
+        self.pending_newlines = 0
+
+    def end_line(self):
+        if self.in_line:
+            self.in_line = False
+        elif self.started:
+            self.pending_newlines += 1
+
+    def value(self):
+        if self.text.spilled:
+            return self.text
+        value = str(self.text)
+        self.text.close()
+        return value
+
 class ToolCallParser:
+    """
+    Incremental parser for @tool ... @end calls in a streamed model response.
+
+    Text outside tool calls is passed through as it arrives. Inside a call,
+    arguments are parsed line by line, and `<<<` blocks are written out as
+    they stream in rather than buffered whole, so a very large `content:`
+    block costs at most SPOOL_MAX_BYTES of memory (see Tools/Core/streamed_text.py).
+    """
     def __init__(self):
         self.buffer = ""
         self.parsing_tool = False
+        self._reset_call()
+
+    def _reset_call(self):
+        self.tool_name = None
+        self.args: Dict[str, Any] = {}
+        self.block_key = None
+        self.block = None
 
     def feed(self, text: str) -> Tuple[str, Optional[Dict]]:
         output_text = ""
@@ -13,25 +71,96 @@ class ToolCallParser:
 
         if not self.parsing_tool:
             combined = self.buffer + text
-            tool_start_index = combined.find("@tool")
+            tool_start_index = combined.find(TOOL_START)
 
             if tool_start_index != -1:
                 output_text = combined[:tool_start_index]
-                self.buffer = combined[tool_start_index:]
+                self.buffer = combined[tool_start_index + len(TOOL_START):]
                 self.parsing_tool = True
+                self._reset_call()
+                tool_data = self._consume()
             else:
-                output_text = text
-                self.buffer += text
+                # Hold back a possible partial "@tool" at the end of the chunk
+                keep = 0
+                for n in range(len(TOOL_START) - 1, 0, -1):
+                    if combined.endswith(TOOL_START[:n]):
+                        keep = n
+                        break
+                output_text = combined[:len(combined) - keep]
+                self.buffer = combined[len(combined) - keep:]
         else:
-             self.buffer += text
-             tool_end_index = self.buffer.find("@end")
-             if tool_end_index != -1:
-                 tool_section = self.buffer[:tool_end_index + 4]
-                 self.buffer = self.buffer[tool_end_index + 4:]
-                 self.parsing_tool = False
-
-                 try:
-                     tool_data = parse_tool_call(tool_section)
-                 except ValueError as e:
-                     print(f"Warning: Invalid tool format detected and skipped: {e}")
+            self.buffer += text
+            tool_data = self._consume()
         return output_text, tool_data
+
+    def _consume(self) -> Optional[Dict]:
+        """Parses as much of the buffered call as possible; returns the call once @end is reached."""
+        if self.tool_name is None:
+            newline = self.buffer.find('\n')
+            end = self.buffer.find(TOOL_END)
+            if newline == -1 and end == -1:
+                return None
+            cut = min(i for i in (newline, end) if i != -1)
+            match = _TOOL_NAME.match(self.buffer[:cut])
+            if not match:
+                print("Warning: Invalid tool format detected and skipped: missing tool name")
+                self.parsing_tool = False
+                self.buffer = self.buffer[cut:]
+                return None
+            self.tool_name = match.group(1)
+            self.buffer = self.buffer[match.end():]
+
+        while True:
+            if self.block is not None:
+                newline = self.buffer.find('\n')
+                if newline == -1:
+                    if not self.block.in_line and self.buffer.strip() == TOOL_END:
+                        # The call ended without '>>>' and without a final newline
+                        self.args[self.block_key] = self.block.value()
+                        self.buffer = ""
+                        return self._finish()
+                    if len(self.buffer) > _BLOCK_FLUSH_CHARS:
+                        self.block.write_part(self.buffer)
+                        self.buffer = ""
+                    return None
+                line = self.buffer[:newline]
+                self.buffer = self.buffer[newline + 1:]
+                stripped = line.strip()
+                if not self.block.in_line and stripped in ('>>>', TOOL_END):
+                    self.args[self.block_key] = self.block.value()
+                    self.block_key = self.block = None
+                    if stripped == TOOL_END:
+                        return self._finish()
+                    continue
+                self.block.write_part(line.rstrip('\r'))
+                self.block.end_line()
+                continue
+
+            end = self.buffer.find(TOOL_END)
+            newline = self.buffer.find('\n')
+            if end != -1 and (newline == -1 or end < newline):
+                self._parse_arg_line(self.buffer[:end])
+                self.buffer = self.buffer[end + len(TOOL_END):]
+                return self._finish()
+            if newline == -1:
+                return None
+            self._parse_arg_line(self.buffer[:newline])
+            self.buffer = self.buffer[newline + 1:]
+
+    def _parse_arg_line(self, line: str):
+        line = line.strip()
+        if ': ' not in line:
+            return
+        key, val = line.split(': ', 1)
+        val = val.strip()
+        if val == '<<<':
+            self.block_key = key.strip()
+            self.block = _BlockValue()
+            return
+        self.args[key.strip()] = val
+
+    def _finish(self) -> Dict:
+        tool_data = {'tool': self.tool_name, 'args': self.args}
+        self.parsing_tool = False
+        self._reset_call()
+        return tool_data
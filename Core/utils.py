@@ -1,3 +1,7 @@
+# Longer sub-agent answers keep their head and tail
+MAX_OUTPUT_CHARS = 2000
+
+
 def get_multiline_input(prompt: str = "> ") -> str:
     print(prompt, end="", flush=True)
     lines = []
@@ -11,3 +15,12 @@ def get_multiline_input(prompt: str = "> ") -> str:
             break
         lines.append(line)
     return "\n".join(lines) 
+
+
+def condense(text: str, limit: int = MAX_OUTPUT_CHARS) -> str:
+    """`text` stripped and, when longer than `limit`, cut to its head and tail with a note in between."""
+    text = (text or "").strip()
+    if len(text) <= limit:
+        return text
+    head, tail = limit * 3 // 4, limit // 4
+    return f"{text[:head]}\n[... {len(text) - head - tail} characters omitted ...]\n{text[-tail:]}"
@@ -177,10 +177,21 @@ To use a tool, output a block EXACTLY like this, replacing placeholders:
         builder.add_section("File Path Handling", path_rules)
 
 
-    # 6. Allowed Tools Documentation (Filtered based on Config - Keep as is)
+    # 6. Background Jobs (If the job tools are allowed)
+    if 'job_status' in config.allowed_tools or 'job_wait' in config.allowed_tools:
+        background_jobs = """
+- Add `background: true` to a slow tool call (a search, a delegation...) to run it as a background job. The call returns a job id at once, so you can keep working while it runs.
+- Tools that change files and instant tools (message, pause, end) always run in the foreground.
+- When a job finishes, its result is added to the conversation before your next turn. Use `job_status` to check on jobs and `job_wait` when you cannot continue without a result.
+- If you finish your answer while jobs are still running, you will be given their results when they arrive.
+""".strip()
+        builder.add_section("Background Jobs", background_jobs)
+
+
+    # 7. Allowed Tools Documentation (Filtered based on Config - Keep as is)
     allowed_tools_docs = build_allowed_tools_section(all_discovered_tools, config.allowed_tools)
     builder.add_section("Allowed Tools", allowed_tools_docs)
 
-    # 7. (Future) Add sections for Communication Protocols, Task Management Rules, etc.
+    # 8. (Future) Add sections for Communication Protocols, Task Management Rules, etc.
 
     return builder.generate()
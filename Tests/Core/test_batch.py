@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from Clients.base import BaseClient, ModelConfig, PricingTier, ProviderConfig
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.batch import BatchRunner, BatchItem, load_items
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+
+
+class FakeClient(BaseClient):
+    """Answers each prompt with a canned reply and reports 1000 input / 100 output tokens per call."""
+    def __init__(self, replies):
+        self.config = ProviderConfig(
+            name="fake", api_base="", api_key_env="FAKE_KEY", default_model="fake-model",
+            models={"fake-model": ModelConfig("fake-model", 1000, PricingTier(input=1.0, output=10.0))})
+        self.replies = replies
+
+    async def chat_completion_stream(self, messages, model=None, **kwargs):
+        prompt = next(m.content for m in messages if m.role == 'user')
+        reply = self.replies.get(prompt)
+        if isinstance(reply, Exception):
+            raise reply
+        self._record_usage(model, 1000, 100)
+        for word in reply.split(" "):
+            yield word + " "
+            await asyncio.sleep(0)
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        os.environ["AGENT_TOOL_CACHE_DIR"] = os.path.join(self.dir, "cache")
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+        self.output = os.path.join(self.dir, "out.jsonl")
+
+    def runner(self, replies, **kwargs):
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake",
+                                    model_name="fake-model", system_prompt="Answer briefly.")
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.agents = {"ceo": AgentInstance(config, FakeClient(replies), Executor(), {})}
+        return BatchRunner(orchestrator, self.output, **kwargs)
+
+    def results(self):
+        with open(self.output, encoding="utf-8") as f:
+            return {record["id"]: record for record in map(json.loads, f)}
+
+    def test_runs_sessions_and_records_usage(self):
+        items = [BatchItem(str(i), f"question {i}") for i in range(5)]
+        runner = self.runner({f"question {i}": f"answer {i}" for i in range(5)}, concurrency=2)
+        statuses = asyncio.run(runner.run(items))
+
+        self.assertEqual(statuses["completed"], 5)
+        results = self.results()
+        self.assertEqual(results["3"]["output"].strip(), "answer 3")
+        self.assertEqual(results["3"]["turns"], 1)
+        self.assertEqual(results["3"]["usage"], {"input_tokens": 1000, "output_tokens": 100, "cost": 0.002})
+
+    def test_resumes_from_progress_file(self):
+        items = [BatchItem("a", "first"), BatchItem("b", "second")]
+        with open(self.output + ".progress", "w", encoding="utf-8") as f:
+            f.write("a\n")
+        statuses = asyncio.run(self.runner({"first": "1", "second": "2"}).run(items))
+
+        self.assertEqual(sum(statuses.values()), 1)
+        self.assertEqual(list(self.results()), ["b"])
+        with open(self.output + ".progress", encoding="utf-8") as f:
+            self.assertEqual(f.read().split(), ["a", "b"])
+
+    def test_failures_are_recorded_not_raised(self):
+        items = [BatchItem("ok", "fine"), BatchItem("bad", "boom"), BatchItem("lost", "x", agent="nobody")]
+        runner = self.runner({"fine": "yes", "boom": RuntimeError("provider down")})
+        statuses = asyncio.run(runner.run(items))
+
+        self.assertEqual((statuses["completed"], statuses["error"]), (1, 2))
+        results = self.results()
+        self.assertIn("provider down", results["bad"]["error"])
+        self.assertIn("nobody", results["lost"]["error"])
+
+    def test_load_items_validates_lines(self):
+        path = os.path.join(self.dir, "in.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"prompt": "one"}\n\n{"id": "x", "prompt": "two", "agent": "cto"}\n')
+        items = load_items(path)
+        self.assertEqual([(i.id, i.agent) for i in items], [("1", None), ("x", "cto")])
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"id": "x", "prompt": "again"}\n')
+        with self.assertRaisesRegex(ValueError, ":4: duplicate id"):
+            load_items(path)
+
+    def test_load_items_validates_max_turns(self):
+        path = os.path.join(self.dir, "in.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"prompt": "one", "max_turns": 3}\n')
+        self.assertEqual(load_items(path)[0].max_turns, 3)
+        for bad in ('"ten"', '0', '-1', '2.5', 'true'):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"prompt": "one"}\n{"prompt": "two", "max_turns": %s}\n' % bad)
+            with self.assertRaisesRegex(ValueError, ':2: "max_turns" must be a positive integer'):
+                load_items(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
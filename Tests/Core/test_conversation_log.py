@@ -0,0 +1,73 @@
+import unittest
+
+from Clients.API.deepseek import DeepSeekClient
+from Clients.base import Message, ModelConfig, PricingTier, ProviderConfig
+from Clients.conversation_log import ConversationLog
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance, KIND_REMINDER, KIND_TOOL_RESULT
+from Core.delegation import _last_answer
+from Core.executor import Executor
+from Tests.Core.test_server import ScriptedClient
+
+
+class TestConversationLog(unittest.TestCase):
+    def test_reads_like_a_message_list_with_indexes(self):
+        log = ConversationLog()
+        log.append("system", "Be brief.")
+        log.append("user", "hello")
+        log.append("user", "Proceed.", "reminder")
+        log.append("assistant", "hi")
+        self.assertEqual(len(log), 4)
+        self.assertEqual([m.role for m in log[1:]], ["user", "user", "assistant"])
+        self.assertEqual(log[-1].content, "hi")
+        self.assertEqual(log.positions(role="user"), [1, 2])
+        self.assertEqual(log.last(kind="user").content, "hello")
+        self.assertIsNone(log.last(kind="tool-result"))
+        self.assertEqual(log.tokens, sum(entry.tokens for entry in log))
+
+    def test_formatting_covers_only_new_entries(self):
+        log = ConversationLog()
+        formatted = []
+
+        def format_entry(entry):
+            formatted.append(entry.content)
+            return None if entry.role == "system" else entry.content.upper()
+
+        log.append("system", "rules")
+        log.append("user", "a")
+        self.assertEqual(log.formatted("fake", format_entry), ["A"])
+        log.append("assistant", "b")
+        self.assertEqual(log.formatted("fake", format_entry), ["A", "B"])
+        self.assertEqual(formatted, ["rules", "a", "b"])
+
+    def test_client_payload_matches_a_full_rebuild(self):
+        client = DeepSeekClient.__new__(DeepSeekClient)
+        client.config = ProviderConfig(name="deepseek", api_base="", api_key_env="KEY", default_model="m",
+                                       models={"m": ModelConfig("m", 1000, PricingTier(input=0.0, output=0.0))})
+        messages = [Message("system", "rules"), Message("user", "hi"), Message("assistant", "  "),
+                    Message("assistant", "there")]
+        log = ConversationLog()
+        for message in messages[:2]:
+            log.append(message.role, message.content)
+        client._format_messages(log)
+        for message in messages[2:]:
+            log.append(message.role, message.content)
+        self.assertEqual(client._format_messages(log), client._format_messages(messages))
+
+
+class TestAgentHistory(unittest.TestCase):
+    def test_agent_classifies_messages(self):
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake", model_name="fake-model",
+                                    system_prompt="Answer briefly.")
+        agent = AgentInstance(config, ScriptedClient({}), Executor(), {})
+        agent.add_message('user', "Fix the bug")
+        agent.add_message('assistant', "Looking.")
+        agent.add_message('assistant', "[Tool Result for ls]:\n@result ls\nexit_code: 0\noutput: a.py\n@end")
+        agent.add_message('user', "[SYSTEM REMINDER] Previous step completed.")
+        self.assertEqual([m.kind for m in agent.messages[1:]], ["user", "assistant", KIND_TOOL_RESULT, KIND_REMINDER])
+        self.assertEqual(agent.last_user_prompt, "Fix the bug")
+        self.assertEqual(_last_answer(agent), "Looking.")
+
+
+if __name__ == '__main__':
+    unittest.main()
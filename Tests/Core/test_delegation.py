@@ -0,0 +1,110 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from Clients.base import track_usage
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.batch import run_unattended
+from Core.delegation import Delegator, Subtask
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+from Core.utils import condense
+from Tests.Core.test_server import ScriptedClient
+from Tools.Special.delegate import parse_tasks
+
+FAN_OUT = """@tool delegate
+tasks: <<<
+agent: worker
+sum 1+1
+---
+sum 2+2
+>>>
+@end"""
+
+
+class CountingClient(ScriptedClient):
+    """ScriptedClient that reports 10 input / 1 output tokens per call."""
+    async def chat_completion_stream(self, messages, model=None, **kwargs):
+        self._record_usage(model, 10, 1)
+        async for chunk in super().chat_completion_stream(messages, model, **kwargs):
+            yield chunk
+
+
+class TestDelegation(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+        client = CountingClient({"split": FAN_OUT, "sum 1+1": "2", "sum 2+2": "4"})
+        executor = Executor()
+        self.orchestrator = Orchestrator.__new__(Orchestrator)
+        self.orchestrator.agents = {
+            agent_id: AgentInstance(AgentConfiguration(agent_id=agent_id, role=agent_id, model_provider="fake",
+                                                       model_name="fake-model", system_prompt="Answer briefly."),
+                                    client, executor, {})
+            for agent_id in ("ceo", "worker")
+        }
+
+    def test_delegate_tool_fans_out_and_reports(self):
+        async def scenario():
+            ceo = self.orchestrator.new_session("ceo", "s1")
+            with track_usage() as usage:
+                record = await run_unattended(ceo, "split", 3, {})
+            return ceo, record, usage
+
+        ceo, record, usage = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+        self.assertEqual(record["status"], "completed")
+        result = next(m.content for m in ceo.messages if m.content.startswith("[Tool Result for delegate]"))
+        self.assertIn("exit_code: 0", result)
+        self.assertIn("2 subtasks: 2 completed", result)
+        self.assertLess(result.index("[1] worker (completed, 1 turns): sum 1+1\n2"),
+                        result.index("[2] worker (completed, 1 turns): sum 2+2\n4"))
+        # Two calls by the ceo and one by each worker
+        self.assertEqual((usage.input_tokens, usage.output_tokens), (40, 4))
+
+    def test_budget_stops_unfinished_subtasks(self):
+        async def scenario():
+            delegator = Delegator(self.orchestrator, "s1", max_parallel=1, timeout=0.2)
+            return await delegator.run([Subtask("worker", "sum 1+1"), Subtask("worker", "slow"),
+                                        Subtask("worker", "sum 2+2")], timeout=60)
+
+        records = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+        self.assertEqual([r["status"] for r in records], ["completed", "timed_out", "timed_out"])
+        self.assertEqual(records[0]["output"], "2")
+        self.assertEqual(records[2]["turns"], 0)
+
+    def test_rejects_unknown_agents_and_limits_depth(self):
+        async def scenario():
+            delegator = Delegator(self.orchestrator, "s1", max_depth=2)
+            with self.assertRaises(KeyError):
+                await delegator.run([Subtask("intern", "anything")])
+            child = delegator._new_session("worker")
+            grandchild = child.tool_context.delegator._new_session("worker")
+            self.assertEqual(child.tool_context.delegator.depth, 1)
+            self.assertIsNone(grandchild.tool_context.delegator)
+
+        asyncio.run(scenario())
+
+
+class TestDelegateArguments(unittest.TestCase):
+    def test_parse_tasks(self):
+        text = "agent: reviewer\nCheck a.py\nand b.py\n---\n\n---\nWrite docs\n"
+        self.assertEqual(parse_tasks(text, "worker"),
+                         [("reviewer", "Check a.py\nand b.py"), ("worker", "Write docs")])
+        with self.assertRaises(ValueError):
+            parse_tasks("agent: worker\n---\nok", "worker")
+
+    def test_condense_keeps_head_and_tail(self):
+        text = "a" * 3000 + "END"
+        condensed = condense(text, limit=100)
+        self.assertTrue(condensed.startswith("a" * 75))
+        self.assertTrue(condensed.endswith("END"))
+        self.assertIn("2903 characters omitted", condensed)
+
+
+if __name__ == '__main__':
+    unittest.main()
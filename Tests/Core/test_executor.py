@@ -3,6 +3,8 @@ import unittest
 from unittest.mock import MagicMock, patch
 from Core.executor import Executor, parse_tool_call, format_result
 from Tools.base import ToolResult, ErrorCodes
+from Tools.context import ToolContext, current_context
+from Tools.Core.streamed_text import StreamedText
 
 class TestExecutor(unittest.TestCase):
     def setUp(self):
@@ -11,6 +13,7 @@ class TestExecutor(unittest.TestCase):
 
         self.mock_tool = MagicMock()
         self.mock_tool.name = "mock_tool"
+        self.mock_tool.config.mutates_files = False
         self.mock_tool.execute.return_value = ToolResult(success=True, code=ErrorCodes.SUCCESS, message="Success")
 
         self.executor.register_tool(self.mock_tool)
@@ -46,6 +49,46 @@ arg2: value2
         self.mock_tool.execute.assert_called_once_with(arg1='value1', arg2='value2')
 
 
+    def test_parse_multiline_block_keeps_raw_lines(self):
+        call_text = """@tool mock_tool
+content: <<<
+def f():
+    key: value
+-removed
+>>>
+flag: true
+@end"""
+        parsed = parse_tool_call(call_text)
+
+        self.assertEqual(parsed['args'], {'content': "def f():\n    key: value\n-removed", 'flag': 'true'})
+
+    def test_execute_call_passes_args_unchanged(self):
+        args = {'content': "line 1\n  line 2\n"}
+        result = self.executor.execute_call("mock_tool", args)
+
+        self.assertIn("exit_code: 0", result)
+        self.mock_tool.execute.assert_called_once_with(content="line 1\n  line 2\n")
+
+    def test_execute_call_materializes_streamed_text(self):
+        self.mock_tool.config.accepts_streamed_text = False
+        content = StreamedText(max_memory=4)
+        content.write("streamed content")
+
+        self.executor.execute_call("mock_tool", {'content': content})
+
+        self.mock_tool.execute.assert_called_once_with(content="streamed content")
+
+    def test_execute_activates_session_context(self):
+        context = ToolContext(session_id="session-1")
+        seen = []
+        self.mock_tool.execute.side_effect = lambda **kwargs: seen.append(current_context()) or \
+            ToolResult(success=True, code=ErrorCodes.SUCCESS, message="Success")
+
+        self.executor.execute("@tool mock_tool\narg1: value1\n@end", context=context)
+
+        self.assertIs(seen[0], context)
+        self.assertIsNot(current_context(), context)
+
     def test_execute_tool_not_found(self):
         call_text = """@tool unknown_tool
 arg1: value1
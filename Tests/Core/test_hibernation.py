@@ -0,0 +1,98 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.executor import Executor
+from Core.hibernation import Hibernator, SessionStore, dump_agent, restore_agent
+from Core.orchestrator import Orchestrator
+from Core.server import AgentServer
+from Tests.Core.test_server import ScriptedClient, read_events, request
+from Tools.Core.file_cache import FileStamp
+
+
+def fake_session(name, last_active, size, idle=True):
+    return SimpleNamespace(id=name, last_active=last_active, hibernated=False,
+                           can_hibernate=lambda: idle, resident_size=lambda: size)
+
+
+class TestHibernation(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake",
+                                    model_name="fake-model", system_prompt="Answer briefly.")
+        self.orchestrator = Orchestrator.__new__(Orchestrator)
+        self.orchestrator.agents = {"ceo": AgentInstance(config, ScriptedClient({"hello": "hi there"}), Executor(), {})}
+
+    def test_state_round_trips_through_the_store(self):
+        agent = self.orchestrator.new_session("ceo", "s1")
+        agent.add_message('user', "hello")
+        agent.add_message('assistant', "hi there")
+        agent.tool_context.working_dir = self.dir
+        agent.tool_context.mark_read("a.py", FileStamp(1, 2, 3, 4), "abc", ("lines", 1, None, None, None, None))
+        store = SessionStore(os.path.join(self.dir, "sessions"))
+        store.save("s1", dump_agent(agent))
+
+        restored = self.orchestrator.new_session("ceo", "s1")
+        restore_agent(restored, store.load("s1"))
+        self.assertEqual([(m.role, m.content) for m in restored.messages],
+                         [(m.role, m.content) for m in agent.messages])
+        self.assertEqual(restored.last_user_prompt, "hello")
+        self.assertEqual(restored.tool_context.last_read("a.py"), agent.tool_context.last_read("a.py"))
+        store.delete("s1")
+        self.assertFalse(os.path.exists(store.path("s1")))
+
+    def test_victims_are_long_idle_then_least_recent_over_budget(self):
+        hibernator = Hibernator(SessionStore(self.dir), memory_budget=100, idle_seconds=60)
+        stale = fake_session("stale", 0, 10)
+        older = fake_session("older", 80, 50)
+        busy = fake_session("busy", 70, 40, idle=False)
+        recent = fake_session("recent", 90, 50)
+        victims = hibernator.victims([recent, busy, older, stale], now=100)
+        # 150 resident: "stale" is past idle_seconds, "older" brings the rest within budget
+        self.assertEqual([s.id for s in victims], ["stale", "older"])
+
+    def test_server_hibernates_idle_sessions_and_wakes_them(self):
+        async def scenario():
+            server = AgentServer(self.orchestrator, port=0, memory_budget=0,
+                                 store_dir=os.path.join(self.dir, "sessions"))
+            port = await server.start()
+            try:
+                _, created = await request(port, "POST", "/sessions", {"prompt": "hello"})
+                path = f"/sessions/{created['id']}"
+                await read_events(port, path + "/events", 3)
+                session = server.sessions[created["id"]]
+
+                self.assertEqual(await server.hibernator.sweep(server.sessions.values()), 1)
+                self.assertIsNone(session.agent)
+                self.assertTrue(os.path.exists(server.hibernator.store.path(session.id)))
+                _, state = await request(port, "GET", path)
+                self.assertEqual((state["hibernated"], state["last_event"]), (True, 3))
+
+                # Replaying the events wakes it
+                events = await read_events(port, path + "/events?after=1", 2)
+                self.assertEqual([kind for _, kind, _ in events], ["text", "turn_complete"])
+                self.assertFalse(session.hibernated)
+                self.assertEqual(await server.hibernator.sweep(server.sessions.values()), 1)
+
+                # So does its next message, with the conversation intact
+                await request(port, "POST", path + "/messages", {"text": "again"})
+                events = await read_events(port, path + "/events?after=3", 3)
+                self.assertEqual([event_id for event_id, _, _ in events], [4, 5, 6])
+                self.assertEqual([m.content for m in session.agent.messages[1:]], ["hello", "hi there", "again", "ok"])
+            finally:
+                await server.close()
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
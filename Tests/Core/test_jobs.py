@@ -0,0 +1,119 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.batch import run_unattended
+from Core.executor import Executor, format_result
+from Core.jobs import JobLimitReached, JobManager
+from Tests.Core.test_server import ScriptedClient
+from Tools.base import Tool, ToolConfig, ToolResult, ErrorCodes
+from Tools.context import ToolContext
+
+BACKGROUND_CALL = """@tool nap
+seconds: 0.2
+background: true
+@end"""
+
+
+class Nap(Tool):
+    """Sleeps in its worker thread, like a slow search."""
+    def __init__(self):
+        super().__init__("nap", "Sleeps for a while.", [], config=ToolConfig())
+
+    def _run(self, args):
+        time.sleep(float(args.get("seconds", 0.1)))
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="rested")
+
+
+async def result_after(delay, text="found it", exit_code=ErrorCodes.SUCCESS):
+    await asyncio.sleep(delay)
+    return format_result("search", exit_code, text)
+
+
+class TestJobManager(unittest.TestCase):
+    def test_jobs_run_concurrently_and_report_their_outcome(self):
+        async def scenario():
+            jobs = JobManager("s1")
+            ok = jobs.start("search", {"pattern": "x"}, result_after(0.05))
+            failed = jobs.start("search", {}, result_after(0.05, "no match", ErrorCodes.OPERATION_FAILED))
+            self.assertEqual([job.id for job in jobs.running()], ["job-1", "job-2"])
+            await asyncio.gather(ok.task, failed.task)
+            self.assertEqual((ok.status, failed.status), ("completed", "failed"))
+            self.assertIn("found it", ok.result)
+            self.assertEqual([job.id for job in jobs.take_finished()], ["job-1", "job-2"])
+            self.assertEqual(jobs.take_finished(), [])
+
+        asyncio.run(scenario())
+
+    def test_limit_wait_and_cancel(self):
+        async def scenario():
+            jobs = JobManager("s1", max_running=1)
+            slow = jobs.start("search", {}, result_after(60))
+            with self.assertRaises(JobLimitReached):
+                jobs.start("search", {}, result_after(0))
+            self.assertIs(await jobs.wait("job-1", timeout=0.01), slow)
+            self.assertEqual(slow.status, "running")
+            with self.assertRaisesRegex(KeyError, "known jobs: job-1"):
+                jobs.get("job-9")
+            await jobs.cancel_all()
+            self.assertEqual(slow.status, "cancelled")
+
+        asyncio.run(scenario())
+
+
+class TestBackgroundCalls(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+        self.executor = Executor()
+        self.executor.register_tool(Nap())
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake", model_name="fake-model",
+                                    system_prompt="Answer briefly.")
+        self.agent = AgentInstance(config, ScriptedClient({"go": BACKGROUND_CALL}), self.executor, {})
+
+    def test_result_is_delivered_after_the_agent_answers(self):
+        record = asyncio.run(asyncio.wait_for(run_unattended(self.agent, "go", 5, {}), timeout=5))
+        self.assertEqual((record["status"], record["turns"]), ("completed", 3))
+        contents = [m.content for m in self.agent.messages]
+        started = next(c for c in contents if c.startswith("[Tool Result for nap]"))
+        self.assertIn("Started background job job-1", started)
+        delivered = next(c for c in contents if c.startswith("[Background job job-1 finished: nap (completed"))
+        self.assertIn("rested", delivered)
+        # The delivery is not mistaken for the user's request
+        self.assertEqual(self.agent.last_user_prompt, "go")
+
+    def test_job_tools(self):
+        async def scenario():
+            context = ToolContext(jobs=JobManager("s1"))
+            context.jobs.start("nap", {}, self.executor.execute_call_async("nap", {"seconds": "0.2"}, context=context))
+            waited = await self.executor.execute_call_async("job_wait", {"job": "job-1", "timeout": "0.01"},
+                                                            context=context)
+            self.assertIn(f"exit_code: {ErrorCodes.TIMEOUT}", waited)
+            status = await self.executor.execute_call_async("job_status", {}, context=context)
+            self.assertIn("job-1 (nap): running", status)
+            waited = await self.executor.execute_call_async("job_wait", {"job": "job-1", "timeout": "5"},
+                                                            context=context)
+            self.assertIn("job-1 (nap): completed", waited)
+            self.assertIn("rested", waited)
+            # Already seen through job_wait, so not delivered again
+            self.assertEqual(context.jobs.take_finished(), [])
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+    def test_file_changing_and_unknown_tools_stay_in_the_foreground(self):
+        refused = self.agent._start_job("write_file", {"path": "a.txt", "content": "x"})
+        self.assertIn(f"exit_code: {ErrorCodes.INVALID_OPERATION}", refused)
+        missing = self.agent._start_job("teleport", {})
+        self.assertIn(f"exit_code: {ErrorCodes.TOOL_NOT_FOUND}", missing)
+        self.assertEqual(self.agent.jobs.jobs, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
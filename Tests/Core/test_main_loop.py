@@ -0,0 +1,67 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+from Tests.Core.test_server import ScriptedClient
+
+
+class TestRunMainLoop(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+        self.dir = tmp.name
+
+    def run_loop(self, replies, prompt, max_turns=10):
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake",
+                                    model_name="fake-model", system_prompt="Answer briefly.")
+        agent = AgentInstance(config, ScriptedClient(replies), Executor(), {})
+        agent.tool_context.working_dir = self.dir
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.agents = {"ceo": agent}
+        asyncio.run(asyncio.wait_for(orchestrator.run_main_loop(prompt, "ceo", max_turns=max_turns), timeout=5))
+        return agent
+
+    def history(self, agent):
+        return [(m.role, m.content.splitlines()[0]) for m in agent.messages[1:]]
+
+    def test_reminder_after_tool_and_proceed_after_answer(self):
+        agent = self.run_loop({"Say hi": "@tool message\ntext: hi\n@end"}, "Say hi", max_turns=3)
+        history = self.history(agent)
+        self.assertEqual(history[0], ("user", "Say hi"))
+        self.assertEqual(history[1], ("assistant", "[Tool Result for message]:"))
+        self.assertTrue(history[2][1].startswith('[SYSTEM REMINDER] Previous step completed. Recall the goal: "Say hi'))
+        self.assertEqual(history[3:], [("assistant", "ok"), ("user", "Proceed."), ("assistant", "ok"),
+                                       ("user", "Proceed.")])
+        self.assertEqual(agent.last_user_prompt, "Say hi")
+
+    def test_pause_reads_input_and_end_stops(self):
+        replies = {"start": "@tool pause\nmessage: Which file?\n@end",
+                   "README": "@tool end\nmessage: done\n@end"}
+        with patch("Core.orchestrator.get_multiline_input", return_value="README") as ask:
+            agent = self.run_loop(replies, "start")
+        ask.assert_called_once()
+        self.assertEqual(agent.last_user_prompt, "README")
+        self.assertEqual(self.history(agent)[-1], ("user", "README"))
+
+    def test_eof_at_pause_stops(self):
+        with patch("Core.orchestrator.get_multiline_input", side_effect=EOFError):
+            agent = self.run_loop({"start": "@tool pause\nmessage: ?\n@end"}, "start")
+        self.assertEqual(self.history(agent)[-1][0], "assistant")
+
+    def test_snapshot_store_is_removed_at_the_end(self):
+        agent = self.run_loop({"start": "@tool write_file\npath: out.txt\ncontent: hi\n@end"}, "start", max_turns=1)
+        with open(os.path.join(self.dir, "out.txt")) as f:
+            self.assertEqual(f.read(), "hi")
+        self.assertFalse(os.path.exists(agent.tool_context.snapshots.directory))
+
+
+if __name__ == '__main__':
+    unittest.main()
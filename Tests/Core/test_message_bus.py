@@ -0,0 +1,193 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from Core.agent_instance import TOOL_EXECUTED_SIGNAL
+from Core.jobs import JobManager
+from Core.message_bus import MessageBus, Envelope, MailboxFull, UnknownRecipient, USER
+from Core.orchestrator import Orchestrator
+from Tools.base import ErrorCodes
+from Tools.context import ToolContext, use_context
+from Tools.error_codes import ConversationEnded
+from Tools.Special.message import Message
+
+
+class ScriptedAgent:
+    """Stands in for AgentInstance; each turn runs the next step of its script."""
+    def __init__(self, agent_id, steps, cache_dir):
+        self.config = SimpleNamespace(agent_id=agent_id)
+        self.tool_context = ToolContext(session_id=agent_id, cache_dir=cache_dir)
+        self.messages = []
+        self.last_user_prompt = None
+        self.steps = list(steps)
+        self.jobs = JobManager(agent_id)
+
+    def add_message(self, role, content):
+        self.messages.append(SimpleNamespace(role=role, content=content))
+        if role == 'user' and not content.startswith(("Proceed.", "[SYSTEM REMINDER]")):
+            self.last_user_prompt = content
+
+    def send(self, to, text):
+        with use_context(self.tool_context):
+            return Message().execute(to=to, text=text)
+
+    async def await_background_jobs(self):
+        return False
+
+    async def execute_turn(self):
+        if not self.steps:
+            return "Nothing more to do."
+        return self.steps.pop(0)(self)
+
+
+class TestMessageBus(unittest.TestCase):
+    def test_post_respects_capacity_and_addresses(self):
+        async def scenario():
+            bus = MessageBus(inbox_size=2)
+            bus.register("a")
+            bus.post(Envelope("user", "a", "one"))
+            bus.post(Envelope("user", "a", "two"))
+            with self.assertRaises(MailboxFull):
+                bus.post(Envelope("user", "a", "three"))
+            with self.assertRaises(UnknownRecipient):
+                bus.post(Envelope("user", "b", "hello"))
+            self.assertEqual([e.text for e in bus.drain("a")], ["one", "two"])
+
+        asyncio.run(scenario())
+
+    def test_send_waits_for_room(self):
+        async def scenario():
+            bus = MessageBus(inbox_size=1)
+            bus.register("a")
+            await bus.send(Envelope("user", "a", "one"))
+            blocked = asyncio.create_task(bus.send(Envelope("user", "a", "two")))
+            await asyncio.sleep(0)
+            self.assertFalse(blocked.done())
+            self.assertEqual((await bus.receive("a")).text, "one")
+            await blocked
+            self.assertEqual((await bus.receive("a")).text, "two")
+
+        asyncio.run(scenario())
+
+    def test_quiet_once_everyone_waits_on_an_empty_inbox(self):
+        async def scenario():
+            bus = MessageBus()
+            bus.register("a")
+            bus.register("b")
+            bus.post(Envelope("a", "b", "ping"))
+            receivers = [asyncio.create_task(bus.receive("a")), asyncio.create_task(bus.receive("b"))]
+            await asyncio.sleep(0)
+            self.assertFalse(bus._quiet.is_set())     # b still had mail when a started waiting
+            await receivers[1]
+            waiter = asyncio.create_task(bus.receive("b"))
+            await asyncio.wait_for(bus.wait_quiet(), timeout=1)
+            for task in (receivers[0], waiter):
+                task.cancel()
+
+        asyncio.run(scenario())
+
+
+class TestMessageTool(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.context = ToolContext(session_id="ceo", cache_dir=tmp.name)
+
+    def test_without_bus_only_user_is_reachable(self):
+        with use_context(self.context):
+            code, message = Message().execute(text="hi")
+            self.assertEqual((code, message), (ErrorCodes.SUCCESS, "Message displayed."))
+            code, _ = Message().execute(text="hi", to="worker")
+            self.assertEqual(code, ErrorCodes.RESOURCE_UNAVAILABLE)
+
+    def test_routes_through_bus(self):
+        async def scenario():
+            bus = MessageBus(inbox_size=1)
+            for address in (USER, "ceo", "worker"):
+                bus.register(address)
+            self.context.message_bus = bus
+            with use_context(self.context):
+                code, message = Message().execute(text="do it", to="worker", important=True)
+                self.assertEqual((code, message), (ErrorCodes.SUCCESS, "Message sent to worker."))
+                envelope = bus.drain("worker")[0]
+                self.assertEqual((envelope.sender, envelope.text, envelope.important), ("ceo", "do it", True))
+
+                bus.post(Envelope(USER, "worker", "filler"))
+                code, message = Message().execute(text="again", to="worker")
+                self.assertEqual(code, ErrorCodes.RESOURCE_BUSY)
+                code, message = Message().execute(text="?", to="nobody")
+                self.assertEqual(code, ErrorCodes.RESOURCE_NOT_FOUND)
+                self.assertIn("worker", message)
+
+        asyncio.run(scenario())
+
+
+class TestRunConcurrent(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+
+    def orchestrator(self, *agents):
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.agents = {agent.config.agent_id: agent for agent in agents}
+        return orchestrator
+
+    def test_agents_exchange_messages_until_quiet(self):
+        def delegate(agent):
+            agent.send("worker", "compute 6*7")
+            return TOOL_EXECUTED_SIGNAL
+
+        def answer(agent):
+            agent.send("ceo", "42")
+            return TOOL_EXECUTED_SIGNAL
+
+        def report(agent):
+            agent.send("user", "The answer is 42")
+            return TOOL_EXECUTED_SIGNAL
+
+        ceo = ScriptedAgent("ceo", [delegate, lambda a: "Waiting for worker.", report], self.cache_dir)
+        worker = ScriptedAgent("worker", [answer], self.cache_dir)
+        for agent in (ceo, worker):
+            agent.tool_context.snapshots.checkpoint("setup")
+        received = []
+
+        async def user(envelope):
+            received.append((envelope.sender, envelope.text))
+
+        asyncio.run(asyncio.wait_for(
+            self.orchestrator(ceo, worker).run_concurrent("What is 6*7?", "ceo", user_handler=user), timeout=5))
+
+        self.assertEqual(received, [("ceo", "The answer is 42")])
+        self.assertEqual(worker.messages[0].content.splitlines()[1], "compute 6*7")
+        self.assertTrue(any("from worker" in m.content and "42" in m.content for m in ceo.messages))
+        self.assertIsNone(ceo.tool_context.message_bus)
+        # Every agent's snapshot store is removed at teardown
+        self.assertFalse(any(os.path.exists(a.tool_context.snapshots.directory) for a in (ceo, worker)))
+
+    def test_conversation_end_stops_every_agent(self):
+        def end(agent):
+            raise ConversationEnded("done")
+
+        def spin(agent):
+            agent.steps.append(spin)
+            return TOOL_EXECUTED_SIGNAL
+
+        busy = ScriptedAgent("busy", [], self.cache_dir)
+        ceo = ScriptedAgent("ceo", [lambda a: (a.send("busy", "go"), TOOL_EXECUTED_SIGNAL)[1], end],
+                            self.cache_dir)
+        busy.steps = [spin]
+
+        async def user(envelope):
+            return None
+
+        asyncio.run(asyncio.wait_for(
+            self.orchestrator(ceo, busy).run_concurrent("start", "ceo", max_turns=1000, user_handler=user),
+            timeout=5))
+        self.assertTrue(ceo.messages)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import unittest
+from collections import Counter
+
+from Core.executor import Executor
+from Core.scheduler import Priority, Scheduler, SessionTag
+from Tools.base import ErrorCodes, Tool, ToolConfig, ToolResult
+
+
+class TestScheduler(unittest.TestCase):
+    def test_cap_is_enforced(self):
+        async def scenario():
+            scheduler = Scheduler(caps={"llm": 2})
+            running, peak = 0, 0
+
+            async def call():
+                nonlocal running, peak
+                async with scheduler.slot("llm:fake"):
+                    running += 1
+                    peak = max(peak, running)
+                    await asyncio.sleep(0.01)
+                    running -= 1
+
+            await asyncio.gather(*(call() for _ in range(6)))
+            self.assertEqual(peak, 2)
+            self.assertEqual(scheduler.load("llm:fake"), (0, 0))
+
+        asyncio.run(scenario())
+
+    def test_interactive_overtakes_batch_backlog(self):
+        async def scenario():
+            scheduler = Scheduler(caps={"tools": 1})
+            batch = SessionTag("batch", Priority.BATCH)
+            order = []
+
+            async def call(tag, label):
+                async with scheduler.slot("tools", tag):
+                    order.append(label)
+                    await asyncio.sleep(0)
+
+            await scheduler.acquire("tools", batch)
+            tasks = [asyncio.create_task(call(batch, f"batch-{i}")) for i in range(5)]
+            await asyncio.sleep(0)
+            tasks.append(asyncio.create_task(call(SessionTag("user"), "interactive")))
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.load("tools"), (1, 6))
+            scheduler.release("tools")
+            await asyncio.gather(*tasks)
+            self.assertEqual(order[0], "interactive")
+
+        asyncio.run(scenario())
+
+    def test_shares_follow_weights_without_starvation(self):
+        async def scenario():
+            scheduler = Scheduler(caps={"llm": 1})
+            admitted = Counter()
+
+            async def session(tag):
+                while True:
+                    async with scheduler.slot("llm", tag):
+                        admitted[tag.priority] += 1
+                        await asyncio.sleep(0)
+
+            tags = [SessionTag("a", Priority.INTERACTIVE), SessionTag("b", Priority.BACKGROUND),
+                    SessionTag("c", Priority.BATCH)]
+            # Several calls in flight per session, so every session always has one waiting
+            tasks = [asyncio.create_task(session(tag)) for tag in tags for _ in range(3)]
+            while sum(admitted.values()) < 210:
+                await asyncio.sleep(0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.assertGreater(admitted[Priority.BATCH], 5)
+            self.assertGreater(admitted[Priority.BACKGROUND], 2 * admitted[Priority.BATCH])
+            self.assertGreater(admitted[Priority.INTERACTIVE], 2 * admitted[Priority.BACKGROUND])
+            self.assertEqual(scheduler.load("llm"), (0, 0))
+
+        asyncio.run(scenario())
+
+    def test_cancelled_waiter_gives_up_its_place(self):
+        async def scenario():
+            scheduler = Scheduler(caps={"tools": 1})
+            await scheduler.acquire("tools")
+            waiter = asyncio.create_task(scheduler.acquire("tools"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            self.assertEqual(scheduler.load("tools"), (1, 0))
+            scheduler.release("tools")
+            await asyncio.wait_for(scheduler.acquire("tools"), timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_stream_holds_slot_until_closed(self):
+        async def scenario():
+            scheduler = Scheduler(caps={"llm": 1})
+
+            async def source():
+                for chunk in ("a", "b", "c"):
+                    yield chunk
+
+            stream = scheduler.stream("llm:fake", source())
+            self.assertEqual(await stream.__anext__(), "a")
+            self.assertEqual(scheduler.load("llm:fake"), (1, 0))
+            await stream.aclose()
+            self.assertEqual(scheduler.load("llm:fake"), (0, 0))
+
+        asyncio.run(scenario())
+
+
+class ThreadName(Tool):
+    def __init__(self, runs_on_loop=False):
+        super().__init__("thread_name", "Reports the thread it runs on.", [],
+                         config=ToolConfig(runs_on_loop=runs_on_loop))
+
+    def _run(self, args):
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=threading.current_thread().name)
+
+
+class Blocking(Tool):
+    def __init__(self):
+        super().__init__("blocking", "Waits until released.", [], config=ToolConfig())
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def _run(self, args):
+        self.release.wait(5)
+        self.finished.set()
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="done")
+
+
+class TestExecuteCallAsync(unittest.TestCase):
+    def test_tools_run_off_the_loop_unless_marked(self):
+        async def scenario():
+            executor = Executor.__new__(Executor)
+            executor.tools = {"threaded": ThreadName(), "inline": ThreadName(runs_on_loop=True)}
+            scheduler = Scheduler(caps={"tools": 1})
+            loop_thread = threading.current_thread().name
+            threaded = await executor.execute_call_async("threaded", {}, scheduler=scheduler)
+            inline = await executor.execute_call_async("inline", {}, scheduler=scheduler)
+            self.assertNotIn(loop_thread, threaded)
+            self.assertIn(loop_thread, inline)
+            self.assertEqual(scheduler.load("tools"), (0, 0))
+
+        asyncio.run(scenario())
+
+    def test_cancelled_call_keeps_its_slot_until_the_thread_ends(self):
+        async def scenario():
+            executor = Executor.__new__(Executor)
+            blocking = Blocking()
+            executor.tools = {"blocking": blocking}
+            scheduler = Scheduler(caps={"tools": 1})
+            call = asyncio.create_task(executor.execute_call_async("blocking", {}, scheduler=scheduler))
+            await asyncio.sleep(0.05)
+            call.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await call
+            self.assertEqual(scheduler.load("tools"), (1, 0))
+            blocking.release.set()
+            await asyncio.to_thread(blocking.finished.wait, 5)
+            await asyncio.sleep(0.05)
+            self.assertEqual(scheduler.load("tools"), (0, 0))
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from Clients.base import BaseClient, ModelConfig, PricingTier, ProviderConfig
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+from Core.server import AgentServer
+
+
+class ScriptedClient(BaseClient):
+    """Replies to the latest user message from a table; "slow" never finishes."""
+    def __init__(self, replies):
+        self.config = ProviderConfig(
+            name="fake", api_base="", api_key_env="FAKE_KEY", default_model="fake-model",
+            models={"fake-model": ModelConfig("fake-model", 1000, PricingTier(input=0.0, output=0.0))})
+        self.replies = replies
+
+    async def chat_completion_stream(self, messages, model=None, **kwargs):
+        prompt = [m.content for m in messages if m.role == 'user'][-1]
+        if prompt == "slow":
+            await asyncio.Event().wait()
+        yield self.replies.get(prompt, "ok")
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+async def read_events(port, path, count):
+    """Reads `count` SSE events as (id, kind, data) tuples."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    events = []
+    while len(events) < count:
+        block = (await reader.readuntil(b"\n\n")).decode()
+        fields = dict(line.split(": ", 1) for line in block.strip().splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    writer.close()
+    return events
+
+
+class TestAgentServer(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+    def serve(self, scenario, replies=None):
+        config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake",
+                                    model_name="fake-model", system_prompt="Answer briefly.")
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.agents = {"ceo": AgentInstance(config, ScriptedClient(replies or {}), Executor(), {})}
+
+        async def main():
+            server = AgentServer(orchestrator, port=0)
+            port = await server.start()
+            try:
+                await asyncio.wait_for(scenario(server, port), timeout=5)
+            finally:
+                await server.close()
+
+        asyncio.run(main())
+
+    def test_session_conversation_streams_events(self):
+        async def scenario(server, port):
+            status, session = await request(port, "POST", "/sessions", {"agent": "ceo", "prompt": "hello"})
+            self.assertEqual((status, session["state"]), (201, "idle"))
+            events = await read_events(port, f"/sessions/{session['id']}/events", 3)
+            self.assertEqual([kind for _, kind, _ in events], ["user", "text", "turn_complete"])
+            self.assertEqual(events[2][2]["output"], "hi there")
+
+            status, _ = await request(port, "POST", f"/sessions/{session['id']}/messages", {"text": "again"})
+            self.assertEqual(status, 202)
+            replay = await read_events(port, f"/sessions/{session['id']}/events?after=3", 3)
+            self.assertEqual([event_id for event_id, _, _ in replay], [4, 5, 6])
+
+            status, listing = await request(port, "GET", "/sessions")
+            self.assertEqual([s["id"] for s in listing], [session["id"]])
+
+        self.serve(scenario, {"hello": "hi there"})
+
+    def test_pause_waits_for_next_message(self):
+        async def scenario(server, port):
+            _, session = await request(port, "POST", "/sessions", {"prompt": "ask me"})
+            events = await read_events(port, f"/sessions/{session['id']}/events", 4)
+            self.assertEqual(events[-1][1:], ("pause", {"message": "Which file?"}))
+            _, state = await request(port, "GET", f"/sessions/{session['id']}")
+            self.assertEqual(state["state"], "waiting_input")
+
+            await request(port, "POST", f"/sessions/{session['id']}/messages", {"text": "README"})
+            events = await read_events(port, f"/sessions/{session['id']}/events?after=4", 3)
+            self.assertEqual(events[-1][2]["output"], "Reading README")
+
+        self.serve(scenario, {"ask me": "@tool pause\nmessage: Which file?\n@end", "README": "Reading README"})
+
+    def test_cancel_and_delete(self):
+        async def scenario(server, port):
+            _, session = await request(port, "POST", "/sessions", {"prompt": "slow"})
+            path = f"/sessions/{session['id']}"
+            await read_events(port, path + "/events", 1)
+            status, result = await request(port, "POST", path + "/cancel")
+            self.assertEqual((status, result["cancelled"]), (200, True))
+            events = await read_events(port, path + "/events?after=1", 1)
+            self.assertEqual(events[0][1], "cancelled")
+
+            status, _ = await request(port, "DELETE", path)
+            self.assertEqual(status, 200)
+            status, error = await request(port, "POST", path + "/messages", {"text": "hi"})
+            self.assertEqual(status, 404)
+            status, _ = await request(port, "POST", "/sessions", {"agent": "nobody"})
+            self.assertEqual(status, 404)
+
+        self.serve(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main()
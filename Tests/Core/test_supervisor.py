@@ -0,0 +1,100 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+from Core.rate_limit import SharedRateLimiter, parse_rate_limits
+from Core.supervisor import Supervisor, worker_for
+from Tests.Core.test_server import ScriptedClient, request, read_events
+
+
+def scripted_orchestrator():
+    """Worker factory; runs in the spawned worker process."""
+    config = AgentConfiguration(agent_id="ceo", role="ceo", model_provider="fake",
+                                model_name="fake-model", system_prompt="Answer briefly.")
+    client = ScriptedClient({"hello": f"hi from {os.getpid()}"})
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.clients = {"fake": client}
+    orchestrator.agents = {"ceo": AgentInstance(config, client, Executor(), {})}
+    return orchestrator
+
+
+class TestRouting(unittest.TestCase):
+    def test_worker_for_is_stable_and_spreads_sessions(self):
+        ids = [f"session-{i}" for i in range(400)]
+        counts = Counter(worker_for(session_id, 4) for session_id in ids)
+        self.assertEqual(sorted(counts), [0, 1, 2, 3])
+        self.assertGreater(min(counts.values()), 60)
+        self.assertEqual([worker_for(i, 4) for i in ids], [worker_for(i, 4) for i in ids])
+
+        # Adding a worker only moves the sessions the new worker takes over
+        moved = [i for i in ids if worker_for(i, 5) != worker_for(i, 4)]
+        self.assertTrue(all(worker_for(i, 5) == 4 for i in moved))
+
+
+class TestSharedRateLimiter(unittest.TestCase):
+    def test_burst_then_paced(self):
+        limiter = SharedRateLimiter(600)        # 10 per second, burst of 10
+        delays = [limiter.reserve() for _ in range(12)]
+        self.assertEqual(delays[:10], [0.0] * 10)
+        self.assertAlmostEqual(delays[10], 0.1, delta=0.02)
+        self.assertAlmostEqual(delays[11], 0.2, delta=0.02)
+
+    def test_parse_rate_limits(self):
+        self.assertEqual(parse_rate_limits(["anthropic=50", "deepseek=120.5"]),
+                         {"anthropic": 50.0, "deepseek": 120.5})
+        with self.assertRaises(ValueError):
+            parse_rate_limits(["anthropic"])
+
+
+class TestSupervisor(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+    def test_sessions_are_sharded_and_workers_restarted(self):
+        async def main():
+            supervisor = Supervisor(scripted_orchestrator, workers=2, port=0, rate_limits={"fake": 6000}, grace=1)
+            port = await supervisor.start()
+            try:
+                ids = []
+                for _ in range(6):
+                    status, session = await request(port, "POST", "/sessions", {"prompt": "hello"})
+                    self.assertEqual(status, 201)
+                    ids.append(session["id"])
+                replies = set()
+                for session_id in ids:
+                    events = await read_events(port, f"/sessions/{session_id}/events", 3)
+                    replies.add(events[-1][2]["output"])
+                self.assertEqual(len(replies), len({worker_for(i, 2) for i in ids}))
+
+                _, listing = await request(port, "GET", "/sessions")
+                self.assertEqual({(s["id"], s["worker"]) for s in listing}, {(i, worker_for(i, 2)) for i in ids})
+
+                # A crashed worker is replaced; its sessions are gone but routing still works
+                crashed = supervisor.workers[0].process
+                crashed.kill()
+                while supervisor.workers[0].process is crashed or supervisor.workers[0].port is None:
+                    await asyncio.sleep(0.1)
+                _, listing = await request(port, "GET", "/sessions")
+                self.assertEqual({s["worker"] for s in listing}, {1} & {worker_for(i, 2) for i in ids})
+                status, _ = await request(port, "POST", "/sessions", {"prompt": "hello"})
+                self.assertEqual(status, 201)
+
+                await supervisor.restart_worker(1)
+                self.assertTrue(supervisor.workers[1].process.is_alive())
+            finally:
+                await supervisor.close()
+
+        asyncio.run(asyncio.wait_for(main(), timeout=60))
+
+
+if __name__ == '__main__':
+    unittest.main()
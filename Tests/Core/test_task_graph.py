@@ -0,0 +1,165 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from Clients.base import BaseClient, ModelConfig, PricingTier, ProviderConfig
+from Core.agent_config import AgentConfiguration
+from Core.agent_instance import AgentInstance
+from Core.batch import run_unattended
+from Core.delegation import Delegator
+from Core.executor import Executor
+from Core.orchestrator import Orchestrator
+from Core.task_graph import TaskGraph, TaskStatus, load_plan, run_graph
+from Tools.Special.plan import parse_plan
+
+PLAN_CALL = """@tool submit_plan
+tasks: <<<
+id: a
+first
+---
+id: b
+after: a
+second
+>>>
+@end"""
+
+
+class PlanClient(BaseClient):
+    """Answers "done <first line of prompt>"; "broken" always fails, "flaky" fails once, "slow" never finishes."""
+    def __init__(self, replies=None):
+        self.config = ProviderConfig(
+            name="fake", api_base="", api_key_env="FAKE_KEY", default_model="fake-model",
+            models={"fake-model": ModelConfig("fake-model", 1000, PricingTier(input=0.0, output=0.0))})
+        self.replies = replies or {}
+        self.calls = Counter()
+        self.prompts = {}
+        self.active = self.peak = 0
+
+    async def chat_completion_stream(self, messages, model=None, **kwargs):
+        prompt = [m.content for m in messages if m.role == 'user'][-1]
+        title = prompt.splitlines()[0]
+        self.calls[title] += 1
+        self.prompts[title] = prompt
+        if title == "broken" or (title == "flaky" and self.calls[title] == 1):
+            raise RuntimeError(f"{title} failed")
+        if title == "slow":
+            await asyncio.Event().wait()
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        yield self.replies.get(prompt, f"done {title}")
+
+
+class TestTaskGraph(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        os.environ["AGENT_TOOL_CACHE_DIR"] = tmp.name
+        self.addCleanup(os.environ.pop, "AGENT_TOOL_CACHE_DIR", None)
+
+    def orchestrator(self, client):
+        executor = Executor()
+        orchestrator = Orchestrator.__new__(Orchestrator)
+        orchestrator.agents = {
+            agent_id: AgentInstance(AgentConfiguration(agent_id=agent_id, role=agent_id, model_provider="fake",
+                                                       model_name="fake-model", system_prompt="Answer briefly."),
+                                    client, executor, {})
+            for agent_id in ("ceo", "worker")
+        }
+        return orchestrator
+
+    def run_graph(self, specs, client=None, **kwargs):
+        client = client or PlanClient()
+        graph = TaskGraph.from_specs(specs)
+        delegator = Delegator(self.orchestrator(client), "plan")
+        asyncio.run(asyncio.wait_for(run_graph(graph, delegator, **kwargs), timeout=5))
+        return graph, client
+
+    def test_validation(self):
+        with self.assertRaisesRegex(ValueError, "cycle among: a, b"):
+            TaskGraph.from_specs([{"id": "a", "task": "x", "depends_on": "b"},
+                                  {"id": "b", "task": "y", "depends_on": ["a"]},
+                                  {"id": "c", "task": "z"}])
+        with self.assertRaisesRegex(ValueError, "unknown task"):
+            TaskGraph.from_specs([{"id": "a", "task": "x", "depends_on": ["missing"]}])
+        with self.assertRaisesRegex(ValueError, "Duplicate"):
+            TaskGraph.from_specs([{"id": "a", "task": "x"}, {"id": "a", "task": "y"}])
+
+    def test_independent_nodes_run_in_parallel_and_results_flow_downstream(self):
+        graph, client = self.run_graph([
+            {"id": "a", "task": "root"},
+            {"id": "b", "task": "left", "depends_on": ["a"]},
+            {"id": "c", "task": "right", "depends_on": ["a"]},
+            {"id": "d", "task": "join", "depends_on": ["b", "c"]},
+        ])
+        self.assertEqual(graph.counts(), {"completed": 4})
+        self.assertEqual(client.peak, 2)
+        self.assertIn("[b] left\ndone left", client.prompts["join"])
+        self.assertIn("[c] right\ndone right", client.prompts["join"])
+        self.assertEqual(graph.nodes["d"].result, "done join")
+
+    def test_critical_path_goes_first(self):
+        order = []
+        graph, _ = self.run_graph([
+            {"id": "leaf", "task": "leaf"},
+            {"id": "head", "task": "head"},
+            {"id": "middle", "task": "middle", "depends_on": ["head"]},
+            {"id": "tail", "task": "tail", "depends_on": ["middle"]},
+        ], max_parallel=1, on_update=lambda node: order.append((node.id, node.status)))
+        started = [node_id for node_id, status in order if status is TaskStatus.RUNNING]
+        self.assertEqual(started[:2], ["head", "middle"])
+
+    def test_retries_then_blocks_dependents(self):
+        graph, client = self.run_graph([
+            {"id": "f", "task": "flaky"},
+            {"id": "x", "task": "broken"},
+            {"id": "y", "task": "after broken", "depends_on": ["x"]},
+            {"id": "z", "task": "after that", "depends_on": ["y"]},
+        ], max_retries=1)
+        self.assertEqual(graph.nodes["f"].status, TaskStatus.COMPLETED)
+        self.assertIn("previous attempt at this task failed", client.prompts["flaky"])
+        self.assertEqual((graph.nodes["x"].status, graph.nodes["x"].attempts), (TaskStatus.FAILED, 2))
+        self.assertEqual([graph.nodes[n].status for n in "yz"], [TaskStatus.BLOCKED, TaskStatus.BLOCKED])
+        self.assertEqual(client.calls["after broken"], 0)
+
+    def test_timeout_cancels_running_nodes(self):
+        graph, _ = self.run_graph([
+            {"id": "s", "task": "slow"},
+            {"id": "t", "task": "then", "depends_on": ["s"]},
+            {"id": "q", "task": "quick"},
+        ], timeout=0.3)
+        self.assertEqual([graph.nodes[n].status for n in "stq"],
+                         [TaskStatus.CANCELLED, TaskStatus.BLOCKED, TaskStatus.COMPLETED])
+
+    def test_submit_plan_tool(self):
+        client = PlanClient({"plan": PLAN_CALL})
+        orchestrator = self.orchestrator(client)
+
+        async def scenario():
+            ceo = orchestrator.new_session("ceo", "s1")
+            await run_unattended(ceo, "plan", 3, {})
+            return ceo
+
+        ceo = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+        result = next(m.content for m in ceo.messages if m.content.startswith("[Tool Result for submit_plan]"))
+        self.assertIn("exit_code: 0", result)
+        self.assertIn("[b] worker after a (completed, 1 attempt)\ndone second", result)
+        self.assertIn("[a] first\ndone first", client.prompts["second"])
+
+    def test_plan_parsing(self):
+        specs = parse_plan("id: a\nagent: ceo\nfirst\n---\nafter: a, 1\nsecond", "worker")
+        self.assertEqual(specs, [{"id": "a", "task": "first", "agent": "ceo", "depends_on": []},
+                                 {"id": "2", "task": "second", "agent": "worker", "depends_on": ["a", "1"]}])
+        path = os.path.join(self.dir, "plan.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tasks": [{"id": "a", "task": "x"}, {"task": "y", "depends_on": "a"}]}, f)
+        self.assertEqual(load_plan(path).nodes["2"].depends_on, ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
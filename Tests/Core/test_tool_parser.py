@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import patch
+
+from Core.tool_parser import ToolCallParser
+from Tools.Core.streamed_text import StreamedText
+
+class TestToolCallParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = ToolCallParser()
+
+    def feed_all(self, chunks):
+        output, calls = "", []
+        for chunk in chunks:
+            text, tool_data = self.parser.feed(chunk)
+            output += text
+            if tool_data:
+                calls.append(tool_data)
+        return output, calls
+
+    def test_text_and_tool_call(self):
+        output, calls = self.feed_all(["Some text @to", "ol read_file\npath: a.txt\n@end"])
+
+        self.assertEqual(output, "Some text ")
+        self.assertEqual(calls, [{'tool': 'read_file', 'args': {'path': 'a.txt'}}])
+
+    def test_block_split_across_chunks(self):
+        text = "@tool write_file\npath: a.py\ncontent: <<<\n\ndef f():\n    return 'x: y'\n\n>>>\noverwrite: true\n@end"
+        chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+        _, calls = self.feed_all(chunks)
+
+        self.assertEqual(calls, [{'tool': 'write_file', 'args': {
+            'path': 'a.py', 'content': "def f():\n    return 'x: y'", 'overwrite': 'true'}}])
+
+    def test_large_block_is_streamed(self):
+        line = "x" * 100 + "\n"
+        with patch('Tools.Core.streamed_text.SPOOL_MAX_BYTES', 1000), \
+                patch('Core.tool_parser._BLOCK_FLUSH_CHARS', 50):
+            parser_chunks = ["@tool write_file\npath: big.txt\ncontent: <<<\n"] + [line] * 50 + ["y" * 300, "\n>>>\n@end"]
+            _, calls = self.feed_all(parser_chunks)
+
+        content = calls[0]['args']['content']
+        self.assertIsInstance(content, StreamedText)
+        self.assertTrue(content.spilled)
+        self.assertEqual(str(content), line * 50 + "y" * 300)
+
+    def test_end_closes_unterminated_block(self):
+        _, calls = self.feed_all(["@tool message\ntext: <<<\nhello\n@end"])
+        self.assertEqual(calls, [{'tool': 'message', 'args': {'text': 'hello'}}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Tools.File.bulk_replace import BulkReplace, PARALLEL_MIN_FILES
+from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestBulkReplace(unittest.TestCase):
+    def setUp(self):
+        self.tool = BulkReplace()
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        self.context = ToolContext(working_dir=self.workspace, cache_dir=os.path.join(self.temp_dir, "cache"))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+
+        self.write("pkg/a.py", "from pkg.b import old_name\n\nold_name()\n")
+        self.write("pkg/b.py", "def old_name():\n    return 'old_name'\n")
+        self.write("README.md", "Call old_name to start.\n")
+        self.write("pkg/c.py", "unrelated = 1\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, rel, content):
+        path = os.path.join(self.workspace, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def read(self, rel):
+        with open(os.path.join(self.workspace, rel)) as f:
+            return f.read()
+
+    def test_default_scope_is_the_process_cwd(self):
+        other_root = os.path.join(self.temp_dir, "agent_fs_root")
+        os.makedirs(os.path.join(other_root, "pkg"))
+        with open(os.path.join(other_root, "pkg", "a.py"), 'w') as f:
+            f.write("old_name()\n")
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.workspace)
+        context = ToolContext(cache_dir=self.context.cache_dir)
+        with use_context(context), patch('config.AGENT_FS_ROOT', other_root):
+            result = self.tool.execute(find="old_name", replace="new_name", glob="pkg/b.py", dry_run="false")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("pkg/b.py (2)", result.message)
+        self.assertEqual(self.read("pkg/b.py"), "def new_name():\n    return 'new_name'\n")
+        with open(os.path.join(other_root, "pkg", "a.py")) as f:
+            self.assertEqual(f.read(), "old_name()\n")
+
+    def test_dry_run_by_default(self):
+        result = self.tool.execute(find="old_name", replace="new_name", glob="*.py")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        lines = result.message.splitlines()
+        self.assertTrue(lines[0].startswith("Dry run: would replace 4 occurrences in 2 files"))
+        self.assertIn("pkg/a.py (2)", lines)
+        self.assertIn("  1: - from pkg.b import old_name", lines)
+        self.assertIn("     + from pkg.b import new_name", lines)
+        self.assertNotIn("README.md", result.message)
+        self.assertIn("old_name", self.read("pkg/a.py"))
+
+    def test_apply_literal(self):
+        result = self.tool.execute(find="old_name", replace="new\\name", dry_run="false")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(result.message.startswith("Replaced 5 occurrences in 3 files:"))
+        self.assertEqual(self.read("pkg/b.py"), "def new\\name():\n    return 'new\\name'\n")
+        self.assertEqual(self.read("README.md"), "Call new\\name to start.\n")
+        self.assertEqual(sorted(os.listdir(os.path.join(self.workspace, "pkg"))), ["a.py", "b.py", "c.py"])
+
+    def test_apply_regex_with_groups_and_path(self):
+        result = self.tool.execute(find=r"def (\w+)\(\)", replace=r"def \1(self)", regex="true",
+                                   path="pkg", dry_run="false")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(self.read("pkg/b.py").startswith("def old_name(self):"))
+
+        result = self.tool.execute(find=r"(\w+)", replace=r"\2", regex="true")
+        self.assertEqual(result.code, ErrorCodes.MALFORMED_ARGUMENT)
+
+    def test_failure_rolls_back_every_file(self):
+        real_replace = os.replace
+        calls = []
+
+        def failing_replace(src, dst):
+            if not src.endswith(".bak"):
+                calls.append(dst)
+                if len(calls) == 2:
+                    raise OSError("disk full")
+            return real_replace(src, dst)
+
+        with patch("Tools.File.bulk_replace.os.replace", side_effect=failing_replace):
+            result = self.tool.execute(find="old_name", replace="new_name", dry_run="false")
+
+        self.assertEqual(result.code, ErrorCodes.OPERATION_FAILED)
+        self.assertIn("rolled back", result.message)
+        self.assertEqual(self.read("pkg/a.py"), "from pkg.b import old_name\n\nold_name()\n")
+        self.assertEqual(self.read("pkg/b.py"), "def old_name():\n    return 'old_name'\n")
+        leftovers = [name for _, _, files in os.walk(self.workspace) for name in files
+                     if name.endswith((".tmp", ".bak"))]
+        self.assertEqual(leftovers, [])
+
+    def test_many_files_use_process_pool(self):
+        for i in range(PARALLEL_MIN_FILES + 4):
+            self.write(f"gen/m{i}.py", f"value_{i} = old_name\n")
+        result = self.tool.execute(find="old_name", replace="new_name", glob="gen/**", dry_run="false")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(result.message.startswith(f"Replaced {PARALLEL_MIN_FILES + 4} occurrences"))
+        self.assertEqual(self.read("gen/m7.py"), "value_7 = new_name\n")
+        self.assertIn("old_name", self.read("pkg/a.py"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Tools.File.copy import CopyFile
+from Tools.Core import fastcopy
+from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestCopyFile(unittest.TestCase):
+    def setUp(self):
+        self.tool = CopyFile()
+        self.temp_dir = tempfile.mkdtemp()
+        scope = use_context(ToolContext(working_dir=self.temp_dir, cache_dir=os.path.join(self.temp_dir, "cache")))
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+        self.source = os.path.join(self.temp_dir, "source.bin")
+        with open(self.source, 'wb') as f:
+            f.write(os.urandom(3 * 1024 * 1024 + 17))
+        os.chmod(self.source, 0o640)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read(self, path):
+        with open(os.path.join(self.temp_dir, path), 'rb') as f:
+            return f.read()
+
+    def test_copy_file(self):
+        result = self.tool.execute(source="source.bin", destination="copy.bin")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("3,145,745 bytes", result.message)
+        self.assertEqual(self.read("copy.bin"), self.read("source.bin"))
+        self.assertEqual(os.stat(os.path.join(self.temp_dir, "copy.bin")).st_mode & 0o777, 0o640)
+
+    def test_copy_into_directory_and_overwrite(self):
+        os.mkdir(os.path.join(self.temp_dir, "out"))
+        result = self.tool.execute(source="source.bin", destination="out")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "out", "source.bin")))
+
+        result = self.tool.execute(source="source.bin", destination="out")
+        self.assertEqual(result.code, ErrorCodes.RESOURCE_EXISTS)
+        result = self.tool.execute(source="source.bin", destination="out", overwrite="true")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+
+    def test_fallbacks_copy_identical_bytes(self):
+        unsupported = OSError(fastcopy.errno.EXDEV, "Invalid cross-device link")
+        with patch.object(fastcopy.fcntl, "ioctl", side_effect=unsupported), \
+                patch.object(fastcopy.os, "copy_file_range", side_effect=unsupported, create=True):
+            result = self.tool.execute(source="source.bin", destination="a.bin")
+            self.assertIn("sendfile", result.message)
+            with patch.object(fastcopy.os, "sendfile", side_effect=unsupported, create=True):
+                result = self.tool.execute(source="source.bin", destination="b.bin")
+            self.assertIn("read/write", result.message)
+        self.assertEqual(self.read("a.bin"), self.read("source.bin"))
+        self.assertEqual(self.read("b.bin"), self.read("source.bin"))
+
+    def test_copy_directory(self):
+        tree = os.path.join(self.temp_dir, "tree")
+        os.makedirs(os.path.join(tree, "sub"))
+        with open(os.path.join(tree, "sub", "a.txt"), 'w') as f:
+            f.write("a")
+        os.symlink("sub/a.txt", os.path.join(tree, "link"))
+
+        result = self.tool.execute(source="tree", destination="tree2")
+        self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+
+        result = self.tool.execute(source="tree", destination="tree2", recursive="true")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("1 files", result.message)
+        self.assertEqual(self.read("tree2/sub/a.txt"), b"a")
+        self.assertEqual(os.readlink(os.path.join(self.temp_dir, "tree2", "link")), "sub/a.txt")
+
+        result = self.tool.execute(source="tree", destination="tree/sub/inner", recursive="true")
+        self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+
+if __name__ == '__main__':
+    unittest.main()
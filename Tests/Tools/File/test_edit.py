@@ -7,11 +7,17 @@ from unittest.mock import patch, MagicMock
 from Tools.File.edit import EditFile
 from Tools.File.read import ReadFile
 from Tools.base import ErrorCodes
+from Tools.context import ToolContext, use_context
 
 class TestEditFile(unittest.TestCase):
     def setUp(self):
         self.edit_tool = EditFile()
         self.read_tool = ReadFile()
+        # Each test runs in its own session so read tracking does not leak
+        self.context = ToolContext()
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
         self.temp_dir = tempfile.mkdtemp()
         
         # Create a test file
@@ -21,7 +27,7 @@ class TestEditFile(unittest.TestCase):
             f.write("Line 2: Python Testing\n")
             f.write("Line 3: EditFile Tool\n")
         
-        # Read the file first to set last_read_file
+        # Read the file first so the session records the read
         self.read_tool.execute(path=self.test_file)
                 
         # Create a binary file (cannot be edited with text encoding)
@@ -40,7 +46,7 @@ class TestEditFile(unittest.TestCase):
         }
         
         # Ensure the file has been read first
-        self.edit_tool.read_tool.last_read_file = self.test_file
+        self.context.mark_read(self.test_file)
         
         exit_code, message = self.edit_tool.execute(
             filename=self.test_file, 
@@ -60,6 +66,86 @@ class TestEditFile(unittest.TestCase):
             self.assertNotIn("Hello World", content)
             self.assertNotIn("Python Testing", content)
     
+    def test_edit_reuses_cached_content(self):
+        """Test that an edit after read_file does not reread the file."""
+        real_open = open
+        def no_read_open(file, mode='r', *args, **kwargs):
+            if 'r' in mode:
+                raise AssertionError("file reread from disk")
+            return real_open(file, mode, *args, **kwargs)
+
+        with patch('builtins.open', side_effect=no_read_open):
+            exit_code, _ = self.edit_tool.execute(
+                filename=self.test_file,
+                replacements=json.dumps({"Hello World": "Hello Universe"})
+            )
+            self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+            # The written content is cached too, so a follow-up edit needs no read
+            exit_code, _ = self.edit_tool.execute(
+                filename=self.test_file,
+                replacements=json.dumps({"Hello Universe": "Hello Again"})
+            )
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        with open(self.test_file) as f:
+            self.assertIn("Hello Again", f.read())
+
+    def test_patterns_match_original_content(self):
+        """Test that replacements are not rescanned by later patterns."""
+        exit_code, message = self.edit_tool.execute(
+            filename=self.test_file,
+            replacements=json.dumps({"Hello": "Python", "Python Testing": "Tests"})
+        )
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("Line 2: 'Python Testing' -> 'Tests'", message)
+        with open(self.test_file) as f:
+            self.assertEqual(f.read(), "Line 1: Python World\nLine 2: Tests\nLine 3: EditFile Tool\n")
+
+    def test_edit_overlapping_patterns(self):
+        """Test that overlapping patterns are rejected without touching the file."""
+        exit_code, message = self.edit_tool.execute(
+            filename=self.test_file,
+            replacements=json.dumps({"Hello World": "a", "World\nLine 2": "b"})
+        )
+
+        self.assertEqual(exit_code, ErrorCodes.INVALID_OPERATION)
+        self.assertIn("overlap", message)
+        with open(self.test_file) as f:
+            self.assertIn("Hello World", f.read())
+
+    def test_failed_write_leaves_file_intact(self):
+        """Test that a failure while replacing the file keeps the original content."""
+        with patch('Tools.Core.atomic.os.replace', side_effect=OSError("disk full")):
+            exit_code, message = self.edit_tool.execute(
+                filename=self.test_file,
+                replacements=json.dumps({"Hello World": "Hello Universe"})
+            )
+
+        self.assertEqual(exit_code, ErrorCodes.OPERATION_FAILED)
+        self.assertIn("Error writing file", message)
+        with open(self.test_file) as f:
+            self.assertIn("Hello World", f.read())
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")])
+
+    def test_edit_large_file_streaming(self):
+        """Test that large files are edited in streaming passes with chunk-spanning patterns."""
+        big_file = os.path.join(self.temp_dir, "big.txt")
+        with open(big_file, 'w') as f:
+            f.write("filler line\n" * 50 + "needle in the haystack\n" + "filler line\n" * 50 + "tail end")
+        self.context.mark_read(big_file)
+
+        with patch('Tools.File.edit.STREAM_MIN_BYTES', 0), patch('Tools.File.edit.STREAM_CHUNK_CHARS', 7):
+            exit_code, message = self.edit_tool.execute(
+                filename=big_file,
+                replacements=json.dumps({"needle in the haystack": "found it", "tail end": "the end"})
+            )
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("Line 51: 'needle in the haystack' -> 'found it'", message)
+        self.assertIn("Line 102: 'tail end' -> 'the end'", message)
+        with open(big_file) as f:
+            self.assertEqual(f.read(), "filler line\n" * 50 + "found it\n" + "filler line\n" * 50 + "the end")
+
     def test_edit_nonexistent_file(self):
         """Test editing a file that doesn't exist."""
         nonexistent_file = os.path.join(self.temp_dir, "nonexistent.txt")
@@ -96,10 +182,21 @@ class TestEditFile(unittest.TestCase):
         self.assertEqual(exit_code, ErrorCodes.INVALID_OPERATION)
         self.assertIn("must be read first", message)
     
+    def test_read_in_another_session_does_not_count(self):
+        """Test that reads are tracked per session."""
+        with use_context(ToolContext(session_id="other")):
+            exit_code, message = self.edit_tool.execute(
+                filename=self.test_file,
+                replacements=json.dumps({"Hello World": "Hello Universe"})
+            )
+
+        self.assertEqual(exit_code, ErrorCodes.INVALID_OPERATION)
+        self.assertIn("must be read first", message)
+
     def test_edit_pattern_not_found(self):
         """Test editing with a pattern that doesn't exist."""
         # Ensure the file has been read first
-        self.edit_tool.read_tool.last_read_file = self.test_file
+        self.context.mark_read(self.test_file)
         
         exit_code, message = self.edit_tool.execute(
             filename=self.test_file, 
@@ -116,9 +213,9 @@ class TestEditFile(unittest.TestCase):
         with open(repeat_file, 'w') as f:
             f.write("repeat pattern\n" * 3)
         
-        # Read the file first - make sure we directly set the last_read_file
+        # Read the file first
         self.read_tool.execute(path=repeat_file)
-        self.edit_tool.read_tool.last_read_file = repeat_file
+        self.context.mark_read(repeat_file)
         
         # Try to edit
         exit_code, message = self.edit_tool.execute(
@@ -132,7 +229,7 @@ class TestEditFile(unittest.TestCase):
     def test_invalid_json_replacements(self):
         """Test editing with invalid JSON replacements."""
         # Ensure the file has been read first
-        self.edit_tool.read_tool.last_read_file = self.test_file
+        self.context.mark_read(self.test_file)
         
         exit_code, message = self.edit_tool.execute(
             filename=self.test_file, 
@@ -145,7 +242,7 @@ class TestEditFile(unittest.TestCase):
     def test_non_dict_replacements(self):
         """Test editing with non-dict JSON replacements."""
         # Ensure the file has been read first
-        self.edit_tool.read_tool.last_read_file = self.test_file
+        self.context.mark_read(self.test_file)
         
         exit_code, message = self.edit_tool.execute(
             filename=self.test_file, 
@@ -188,8 +285,8 @@ class TestEditFile(unittest.TestCase):
     
     def test_edit_invalid_encoding(self):
         """Test editing a file with an invalid encoding."""
-        # Directly set last_read_file for this test
-        self.edit_tool.read_tool.last_read_file = self.binary_file
+        # Mark the file as read directly; read_file cannot decode it
+        self.context.mark_read(self.binary_file)
         
         exit_code, message = self.edit_tool.execute(
             filename=self.binary_file, 
@@ -202,7 +299,9 @@ class TestEditFile(unittest.TestCase):
     def test_exception_handling(self):
         """Test handling of unexpected exceptions."""
         # Ensure the file has been read first
-        self.edit_tool.read_tool.last_read_file = self.test_file
+        self.context.mark_read(self.test_file)
+        # Force the edit to read from disk rather than the session cache
+        self.context.files.clear()
         
         with patch('builtins.open', side_effect=Exception("Unexpected error")):
             exit_code, message = self.edit_tool.execute(
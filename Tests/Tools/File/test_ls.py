@@ -0,0 +1,91 @@
+import os
+import re
+import unittest
+import tempfile
+import shutil
+from Tools.File.ls import ListDirectory
+from Tools.base import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestListDirectory(unittest.TestCase):
+    def setUp(self):
+        self.tool = ListDirectory()
+        self.temp_dir = tempfile.mkdtemp()
+        scope = use_context(ToolContext(working_dir=self.temp_dir))
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+
+        for rel in ["b.txt", "a.txt", ".hidden", "src/main.py", "src/util.py", "src/deep/inner.py",
+                    "build/out.o", "logs/run.log", "docs/readme.md"]:
+            full = os.path.join(self.temp_dir, rel)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, 'w') as f:
+                f.write("x" * 10)
+        with open(os.path.join(self.temp_dir, ".gitignore"), 'w') as f:
+            f.write("build/\n*.log\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def listing(self, **kwargs):
+        exit_code, message = self.tool.execute(**kwargs)
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS, message)
+        return message
+
+    def test_directories_first_and_hidden_files(self):
+        lines = self.listing().splitlines()[1:]
+        self.assertEqual(lines, ["docs/", "logs/", "src/", "a.txt", "b.txt"])
+
+        self.assertIn(".hidden", self.listing(show_hidden="true"))
+
+    def test_gitignore_and_ignore_patterns(self):
+        message = self.listing(recursive="true", ignore="docs")
+        self.assertNotIn("build", message)
+        self.assertNotIn("run.log", message)
+        self.assertNotIn("readme.md", message)
+        self.assertIn("inner.py", message)
+
+        message = self.listing(recursive="true", use_gitignore="false")
+        self.assertIn("out.o", message)
+        self.assertIn("run.log", message)
+
+    def test_max_depth(self):
+        message = self.listing(recursive="true", max_depth=2)
+        self.assertIn("main.py", message)
+        self.assertIn("deep/", message)
+        self.assertNotIn("inner.py", message)
+
+    def test_long_format_sizes(self):
+        message = self.listing(long_format="true")
+        self.assertRegex(message, r"FILE\s+10\s+a\.txt")
+        self.assertRegex(message, r"DIR\s+<DIR>\s+src")
+
+    def test_paging_with_cursor(self):
+        full = self.listing(recursive="true")
+        names = [line for line in full.splitlines() if line and not line.startswith("Directory:")]
+
+        paged = []
+        cursor = None
+        for _ in range(20):
+            kwargs = dict(recursive="true", max_entries=2)
+            if cursor:
+                kwargs["cursor"] = cursor
+            message = self.listing(**kwargs)
+            match = re.search(r"Continue with cursor: (\S+)\]", message)
+            paged += [line for line in message.splitlines()
+                      if line and not line.startswith(("Directory:", "[Listed"))]
+            if not match:
+                break
+            cursor = match.group(1)
+        self.assertEqual(paged, names)
+
+    def test_invalid_arguments(self):
+        exit_code, _ = self.tool.execute(cursor="nonsense")
+        self.assertEqual(exit_code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+        exit_code, _ = self.tool.execute(max_entries=0)
+        self.assertEqual(exit_code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+        exit_code, _ = self.tool.execute(path="missing")
+        self.assertEqual(exit_code, ErrorCodes.RESOURCE_NOT_FOUND)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Tools.File.move import MoveFile
+from Tools.File.read import ReadFile
+from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestMoveFile(unittest.TestCase):
+    def setUp(self):
+        self.tool = MoveFile()
+        self.temp_dir = tempfile.mkdtemp()
+        self.context = ToolContext(working_dir=self.temp_dir, cache_dir=os.path.join(self.temp_dir, "cache"))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+        with open(os.path.join(self.temp_dir, "a.txt"), 'w') as f:
+            f.write("content")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_move_file_keeps_read_record(self):
+        ReadFile().execute(path="a.txt")
+        result = self.tool.execute(source="a.txt", destination="b.txt")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertEqual(result.message, "Moved 'a.txt' to '" + os.path.join(self.temp_dir, "b.txt") + "'")
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "a.txt")))
+        self.assertTrue(self.context.has_read("b.txt"))
+        self.assertFalse(self.context.has_read("a.txt"))
+
+    def test_move_refuses_to_overwrite(self):
+        with open(os.path.join(self.temp_dir, "b.txt"), 'w') as f:
+            f.write("other")
+        result = self.tool.execute(source="a.txt", destination="b.txt")
+        self.assertEqual(result.code, ErrorCodes.RESOURCE_EXISTS)
+        result = self.tool.execute(source="a.txt", destination="b.txt", overwrite="true")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        with open(os.path.join(self.temp_dir, "b.txt")) as f:
+            self.assertEqual(f.read(), "content")
+
+    def test_move_directory_across_filesystems(self):
+        os.makedirs(os.path.join(self.temp_dir, "dir", "sub"))
+        with open(os.path.join(self.temp_dir, "dir", "sub", "f.txt"), 'w') as f:
+            f.write("f")
+        real_replace = os.replace
+
+        def cross_device(src, dst):
+            if src.endswith("dir"):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return real_replace(src, dst)
+
+        with patch("Tools.Core.fastcopy.os.replace", side_effect=cross_device):
+            result = self.tool.execute(source="dir", destination="moved")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("across filesystems", result.message)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "dir")))
+        with open(os.path.join(self.temp_dir, "moved", "sub", "f.txt")) as f:
+            self.assertEqual(f.read(), "f")
+
+if __name__ == '__main__':
+    unittest.main()
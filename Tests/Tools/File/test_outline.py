@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Tools.File.outline import OutlineFile
+from Tools.File.read import ReadFile
+from Tools.Core import code_outline
+from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+SOURCE = '''import os
+
+CONSTANT = 1
+
+def helper(a, b=2) -> int:
+    return a + b
+
+class Executor(Base):
+    """Runs tools."""
+
+    def __init__(self):
+        self.tools = {}
+
+    @staticmethod
+    def execute(tool_call_text, agent_config=None):
+        first = 1
+        second = 2
+        return first + second
+
+    class Inner:
+        def execute(self):
+            pass
+
+async def fetch():
+    pass
+'''
+
+class TestOutline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.context = ToolContext(working_dir=self.temp_dir, cache_dir=os.path.join(self.temp_dir, 'cache'))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+        self.path = os.path.join(self.temp_dir, "module.py")
+        with open(self.path, 'w') as f:
+            f.write(SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_outline_lists_definitions_with_ranges(self):
+        result = OutlineFile().execute(path="module.py")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertEqual(result.message.splitlines(), [
+            "module.py (7 definitions):",
+            "def helper(a, b=2) -> int  L5-6",
+            "class Executor(Base)  L8-22",
+            "  def __init__(self)  L11-12",
+            "  def execute(tool_call_text, agent_config=None)  L14-18",
+            "  class Inner  L20-22",
+            "    def execute(self)  L21-22",
+            "async def fetch()  L24-25",
+        ])
+
+        result = OutlineFile().execute(path="module.py", max_depth=1)
+        self.assertNotIn("__init__", result.message)
+        self.assertIn("class Executor(Base)", result.message)
+
+    def test_outline_errors(self):
+        with open(os.path.join(self.temp_dir, "broken.py"), 'w') as f:
+            f.write("def broken(:\n")
+        result = OutlineFile().execute(path="broken.py")
+        self.assertEqual(result.code, ErrorCodes.OPERATION_FAILED)
+        self.assertIn("line 1", result.message)
+
+        result = OutlineFile().execute(path="notes.txt")
+        self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+
+    def test_parse_is_cached_until_file_changes(self):
+        OutlineFile().execute(path="module.py")
+        with patch.object(code_outline, 'parse_outline', wraps=code_outline.parse_outline) as parse:
+            OutlineFile().execute(path="module.py")
+            ReadFile().execute(path="module.py", symbol="helper")
+            self.assertEqual(parse.call_count, 0)
+
+            with open(self.path, 'a') as f:
+                f.write("\ndef added():\n    pass\n")
+            result = OutlineFile().execute(path="module.py")
+            self.assertEqual(parse.call_count, 1)
+        self.assertIn("def added()", result.message)
+
+    def test_read_symbol(self):
+        result = ReadFile().execute(path="module.py", symbol="Executor.execute")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertEqual(result.message.splitlines(), [
+            "    @staticmethod",
+            "    def execute(tool_call_text, agent_config=None):",
+            "        first = 1",
+            "        second = 2",
+            "        return first + second",
+            "[Showing lines 14-18 of 25 (def Executor.execute)]",
+        ])
+
+        result = ReadFile().execute(path="module.py", symbol="helper")
+        self.assertTrue(result.message.startswith("def helper(a, b=2) -> int:\n    return a + b\n"))
+
+    def test_read_symbol_in_pages(self):
+        result = ReadFile().execute(path="module.py", symbol="Executor.execute", limit=2)
+        self.assertTrue(result.message.endswith(
+            "[Showing lines 14-15 of 25 (def Executor.execute); continue with offset: 16]"))
+        result = ReadFile().execute(path="module.py", symbol="Executor.execute", offset=16)
+        self.assertTrue(result.message.startswith("        first = 1"))
+        self.assertTrue(result.message.endswith("[Showing lines 16-18 of 25 (def Executor.execute)]"))
+
+    def test_read_symbol_not_found_or_ambiguous(self):
+        result = ReadFile().execute(path="module.py", symbol="execute")
+        self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+        self.assertIn("Executor.execute (L14)", result.message)
+        self.assertIn("Executor.Inner.execute (L21)", result.message)
+
+        result = ReadFile().execute(path="module.py", symbol="Executor.exec")
+        self.assertEqual(result.code, ErrorCodes.RESOURCE_NOT_FOUND)
+        self.assertIn("Did you mean: Executor.execute", result.message)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import os
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from Tools.File.patch import PatchFile
+from Tools.Core.atomic import atomic_write
+from Tools.base import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestPatchFile(unittest.TestCase):
+    def setUp(self):
+        self.patch_tool = PatchFile()
+        self.temp_dir = tempfile.mkdtemp()
+        self.context = ToolContext(working_dir=self.temp_dir)
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+
+        self.source = os.path.join(self.temp_dir, "app.py")
+        with open(self.source, 'w') as f:
+            f.write("import os\n\ndef greet(name):\n    return 'Hello ' + name\n\n"
+                    "def add(a, b):\n    return a + b\n")
+        self.other = os.path.join(self.temp_dir, "util.py")
+        with open(self.other, 'w') as f:
+            f.write("VALUE = 1\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_multi_file_patch(self):
+        """Test applying hunks to several files in one call."""
+        diff = """--- a/app.py
++++ b/app.py
+@@ -3,2 +3,2 @@
+ def greet(name):
+-    return 'Hello ' + name
++    return f'Hello {name}'
+@@ -6,2 +6,2 @@
+ def add(a, b):
+-    return a + b
++    return sum((a, b))
+--- a/util.py
++++ b/util.py
+@@ -1 +1 @@
+-VALUE = 1
++VALUE = 2
+"""
+        exit_code, message = self.patch_tool.execute(patch=diff)
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("Patched 2 files (3 hunks)", message)
+        self.assertIn("Hunk 2: applied at line 6", message)
+        self.assertEqual(self.read(self.source), "import os\n\ndef greet(name):\n    return f'Hello {name}'\n\n"
+                                                 "def add(a, b):\n    return sum((a, b))\n")
+        self.assertEqual(self.read(self.other), "VALUE = 2\n")
+
+    def test_fuzzy_context_and_offset(self):
+        """Test hunks with wrong line numbers, whitespace drift and stale context."""
+        diff = """@@ -10,3 +10,3 @@
+ def add(a, b):
+-    return a +  b
++    return b + a
+ # stale context line
+"""
+        exit_code, message = self.patch_tool.execute(patch=diff, path="app.py")
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("offset -4 lines", message)
+        self.assertIn("fuzz 1", message)
+        self.assertIn("ignoring whitespace", message)
+        # Context lines keep the file's own text
+        self.assertIn("def add(a, b):\n    return b + a\n", self.read(self.source))
+
+    def test_hunks_with_repeated_context_apply_in_order(self):
+        block = "a\nx = 1\nb\n"
+        with open(self.source, 'w') as f:
+            f.write(block * 3)
+        # The second hunk's line number points before the first one
+        diff = """@@ -4,3 +4,3 @@
+ a
+-x = 1
++x = 2
+ b
+@@ -2,3 +2,3 @@
+ a
+-x = 1
++x = 3
+ b
+"""
+        exit_code, message = self.patch_tool.execute(patch=diff, path="app.py")
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS, message)
+        self.assertEqual(self.read(self.source), block + "a\nx = 2\nb\n" + "a\nx = 3\nb\n")
+
+    def test_hunk_without_line_numbers(self):
+        """Test a bare @@ header located purely by content."""
+        diff = """@@ ... @@
+-import os
++import os
++import sys
+"""
+        exit_code, message = self.patch_tool.execute(patch=diff, path="app.py")
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertTrue(self.read(self.source).startswith("import os\nimport sys\n"))
+
+    def test_failed_hunk_changes_nothing(self):
+        """Test that one failing hunk leaves every file untouched."""
+        diff = """--- a/util.py
++++ b/util.py
+@@ -1 +1 @@
+-VALUE = 1
++VALUE = 2
+--- a/app.py
++++ b/app.py
+@@ -1,1 +1,1 @@
+-import missing
++import present
+"""
+        before = self.read(self.source)
+        exit_code, message = self.patch_tool.execute(patch=diff)
+
+        self.assertEqual(exit_code, ErrorCodes.OPERATION_FAILED)
+        self.assertIn("no files were changed", message)
+        self.assertIn("util.py\n  Hunk 1: applied at line 1", message)
+        self.assertIn("Hunk 1: FAILED", message)
+        self.assertEqual(self.read(self.other), "VALUE = 1\n")
+        self.assertEqual(self.read(self.source), before)
+
+    def test_write_failure_rolls_back(self):
+        """Test that files already written are restored when a later write fails."""
+        diff = """--- a/util.py
++++ b/util.py
+@@ -1 +1 @@
+-VALUE = 1
++VALUE = 2
+--- /dev/null
++++ b/new.py
+@@ -0,0 +1,2 @@
++print('new')
++print('file')
+"""
+        def failing_write(path, data, fsync=True):
+            if path.endswith("new.py"):
+                raise OSError("disk full")
+            return atomic_write(path, data, fsync)
+
+        with patch('Tools.File.patch.atomic_write', side_effect=failing_write):
+            exit_code, message = self.patch_tool.execute(patch=diff)
+
+        self.assertEqual(exit_code, ErrorCodes.OPERATION_FAILED)
+        self.assertIn("rolled back", message)
+        self.assertEqual(self.read(self.other), "VALUE = 1\n")
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "new.py")))
+
+    def test_create_and_delete_files(self):
+        """Test /dev/null headers for new and removed files."""
+        diff = """--- /dev/null
++++ b/new.py
+@@ -0,0 +1,2 @@
++print('new')
++print('file')
+--- a/util.py
++++ /dev/null
+@@ -1 +0,0 @@
+-VALUE = 1
+"""
+        exit_code, message = self.patch_tool.execute(patch=diff)
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("new.py (created)", message)
+        self.assertIn("util.py (deleted)", message)
+        self.assertEqual(self.read(os.path.join(self.temp_dir, "new.py")), "print('new')\nprint('file')\n")
+        self.assertFalse(os.path.exists(self.other))
+
+    def test_dry_run(self):
+        """Test that dry_run reports results without writing."""
+        diff = "@@ -1 +1 @@\n-VALUE = 1\n+VALUE = 3\n"
+        exit_code, message = self.patch_tool.execute(patch=diff, path="util.py", dry_run="true")
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("Dry run", message)
+        self.assertEqual(self.read(self.other), "VALUE = 1\n")
+
+    def test_no_newline_at_end_of_file(self):
+        """Test the '\\ No newline at end of file' marker."""
+        diff = "@@ -1 +1 @@\n-VALUE = 1\n+VALUE = 4\n\\ No newline at end of file\n"
+        exit_code, _ = self.patch_tool.execute(patch=diff, path="util.py")
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertEqual(self.read(self.other), "VALUE = 4")
+
+    def test_invalid_patch(self):
+        """Test a patch without hunks or headers."""
+        exit_code, message = self.patch_tool.execute(patch="not a diff")
+        self.assertEqual(exit_code, ErrorCodes.MALFORMED_ARGUMENT)
+        self.assertIn("Invalid patch", message)
+
+        exit_code, message = self.patch_tool.execute(patch="@@ -1 +1 @@\n-a\n+b\n")
+        self.assertEqual(exit_code, ErrorCodes.MALFORMED_ARGUMENT)
+        self.assertIn("pass the target path", message)
+
+    def test_missing_file(self):
+        """Test patching a file that does not exist."""
+        exit_code, message = self.patch_tool.execute(patch="@@ -1 +1 @@\n-a\n+b\n", path="missing.py")
+        self.assertEqual(exit_code, ErrorCodes.RESOURCE_NOT_FOUND)
+        self.assertIn("not found", message)
+
+if __name__ == '__main__':
+    unittest.main()
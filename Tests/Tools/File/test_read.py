@@ -4,10 +4,15 @@ from unittest.mock import patch
 from Tools.File.read import ReadFile
 from Tools.error_codes import ErrorCodes
 from Tools.base import ToolResult
+from Tools.context import ToolContext, use_context
 
 class TestReadFile(unittest.TestCase):
     def setUp(self):
         self.tool = ReadFile()
+        self.context = ToolContext(cache_dir=os.path.join(os.path.dirname(__file__), 'test_temp', 'cache'))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
         self.temp_dir = os.path.join(os.path.dirname(__file__), 'test_temp')
         os.makedirs(self.temp_dir, exist_ok=True)
         self.test_file = os.path.join(self.temp_dir, "test.txt")
@@ -54,5 +59,98 @@ class TestReadFile(unittest.TestCase):
         self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
         self.assertIn("invalid", result.message.lower())
 
+    def test_repeated_read_reports_unchanged(self):
+        self.tool.execute(path=self.test_file)
+        result = self.tool.execute(path=self.test_file)
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("unchanged since your last read", result.message)
+
+        forced = self.tool.execute(path=self.test_file, force="true")
+        self.assertEqual(forced.message, "Test content")
+
+    def test_repeated_read_served_from_cache(self):
+        self.tool.execute(path=self.test_file)
+        with patch("builtins.open", side_effect=AssertionError("file reopened")):
+            result = self.tool.execute(path=self.test_file, lines=1)
+        self.assertEqual(result.message, "Test content")
+
+    def test_modified_file_is_reread(self):
+        self.tool.execute(path=self.test_file)
+        with open(self.test_file, 'w') as f:
+            f.write("Changed content, longer")
+        result = self.tool.execute(path=self.test_file)
+        self.assertEqual(result.message, "Changed content, longer")
+
+    def _write_numbered(self, count):
+        path = os.path.join(self.temp_dir, "numbered.txt")
+        with open(path, 'w') as f:
+            for i in range(1, count + 1):
+                f.write(f"line {i}\n")
+        return path
+
+    def test_read_line_range(self):
+        path = self._write_numbered(50)
+        result = self.tool.execute(path=path, offset=10, limit=2)
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(result.message.startswith("line 10\nline 11\n"))
+        self.assertIn("continue with offset: 12", result.message)
+
+    def test_read_tail(self):
+        path = self._write_numbered(50)
+        result = self.tool.execute(path=path, mode="tail", limit=2)
+        self.assertTrue(result.message.startswith("line 49\nline 50\n"))
+        self.assertIn("last 2 lines of 50", result.message)
+
+    def test_read_byte_range(self):
+        path = self._write_numbered(50)
+        result = self.tool.execute(path=path, byte_offset=7, byte_limit=6)
+        self.assertTrue(result.message.startswith("line 2"))
+        self.assertIn("bytes 7-13", result.message)
+
+    def test_max_bytes_truncates_at_line_boundary(self):
+        path = self._write_numbered(50)
+        result = self.tool.execute(path=path, max_bytes=20)
+        self.assertTrue(result.message.startswith("line 1\nline 2\n["))
+        self.assertIn("truncated at max_bytes=20", result.message)
+
+    def test_binary_file_is_summarised(self):
+        path = os.path.join(self.temp_dir, "data.bin")
+        with open(path, 'wb') as f:
+            f.write(b"\x00\x01\x02binary")
+        result = self.tool.execute(path=path)
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("Binary file", result.message)
+        self.assertNotIn("binary", result.message)
+
+    def test_undecodable_file_edges_are_not_trimmed(self):
+        path = os.path.join(self.temp_dir, "latin1.txt")
+        with open(path, 'wb') as f:
+            f.write(b"hello caf\xe9")
+        result = self.tool.execute(path=path)
+        self.assertIn("Undecodable file", result.message)
+
+    def test_byte_range_may_split_a_character(self):
+        path = os.path.join(self.temp_dir, "utf8.txt")
+        with open(path, 'wb') as f:
+            f.write("caf\u00e9 au lait".encode('utf-8'))
+        result = self.tool.execute(path=path, byte_offset=4, byte_limit=4)
+        self.assertTrue(result.message.startswith(" au\n"))
+
+    def test_large_file_uses_persisted_line_index(self):
+        path = self._write_numbered(2000)
+        self.context.files.max_file_bytes = 0
+        with patch("Tools.Core.file_reader.INDEXED_MIN_BYTES", 1):
+            result = self.tool.execute(path=path, offset=1500, limit=1)
+            self.assertTrue(result.message.startswith("line 1500\n"))
+            sidecar_dir = os.path.join(self.context.cache_dir, "line_index")
+            self.assertEqual(len(os.listdir(sidecar_dir)), 1)
+
+            # A new session reuses the sidecar instead of rescanning
+            with use_context(ToolContext(cache_dir=self.context.cache_dir)) as other:
+                other.files.max_file_bytes = 0
+                with patch("Tools.Core.file_reader.LineIndex.build", side_effect=AssertionError("rescanned")):
+                    result = self.tool.execute(path=path, offset=1999, limit=1)
+        self.assertTrue(result.message.startswith("line 1999\n"))
+
 if __name__ == '__main__':
     unittest.main()
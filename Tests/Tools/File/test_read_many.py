@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Tools.File.read_many import ReadManyFiles, allocate_budget
+from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestReadManyFiles(unittest.TestCase):
+    def setUp(self):
+        self.tool = ReadManyFiles()
+        self.temp_dir = tempfile.mkdtemp()
+        self.context = ToolContext(working_dir=self.temp_dir, cache_dir=os.path.join(self.temp_dir, "cache"))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+        self.write("src/a.py", "a = 1\n")
+        self.write("src/b.py", "b = 2\n")
+        self.write("notes.txt", "notes\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, rel, content):
+        path = os.path.join(self.temp_dir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test_reads_paths_and_globs_in_order(self):
+        result = self.tool.execute(paths="notes.txt, src/*.py, missing.txt, docs/*.md")
+
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertEqual(result.message.splitlines()[:8], [
+            "==> notes.txt <==", "notes",
+            "==> src/a.py <==", "a = 1",
+            "==> src/b.py <==", "b = 2",
+            "==> missing.txt <==", "[Error: File 'missing.txt' not found]",
+        ])
+        self.assertIn("==> docs/*.md <==\n[No files match]", result.message)
+        # Files read here count as read for edit_file
+        self.assertTrue(self.context.has_read(os.path.join(self.temp_dir, "src/a.py")))
+
+    def test_budget_is_shared(self):
+        self.write("big1.txt", "x" * 99 + "\n")
+        self.write("big2.txt", "y" * 99 + "\n")
+        result = self.tool.execute(paths="notes.txt, big1.txt, big2.txt", max_total_bytes=106)
+
+        self.assertIn("==> notes.txt <==\nnotes\n", result.message)
+        self.assertIn("==> big1.txt <==\n" + "x" * 50 + "\n[Showing lines 1-1 of 1", result.message)
+        self.assertIn("==> big2.txt <==\n" + "y" * 50 + "\n[Showing lines 1-1 of 1", result.message)
+        self.assertEqual(result.message.count("truncated at max_bytes=50"), 2)
+
+    def test_allocate_budget(self):
+        self.assertEqual(allocate_budget([10, 1000, 1000], 400, 500), [10, 245, 245])
+        self.assertEqual(allocate_budget([10, 20], 400, 500), [10, 20])
+        self.assertEqual(allocate_budget([100, 100], 30, 500), [30, 30])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Core.executor import Executor
+from Tools.File.write import WriteFile
+from Tools.File.edit import EditFile
+from Tools.File.delete import DeleteFile
+from Tools.File.read import ReadFile
+from Tools.File.move import MoveFile
+from Tools.File.restore import RestoreCheckpoint
+from Tools.Core.snapshots import SnapshotStore, WORKSPACE_DIR_NAME, snapshot_root
+from Tools.context import ToolContext
+
+class TestRestoreCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        os.makedirs(self.workspace)
+        self.context = ToolContext(session_id="s1", working_dir=self.workspace,
+                                   cache_dir=os.path.join(self.temp_dir, "cache"))
+        with patch('Tools.Core.registry.ToolRegistry.get_all', return_value={}):
+            self.executor = Executor()
+        for tool in (WriteFile(), EditFile(), DeleteFile(), ReadFile(), MoveFile(), RestoreCheckpoint()):
+            self.executor.register_tool(tool)
+        with open(os.path.join(self.workspace, "keep.txt"), 'w') as f:
+            f.write("original\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def call(self, tool, **args):
+        return self.executor.execute_call(tool, args, context=self.context)
+
+    def read(self, name):
+        with open(os.path.join(self.workspace, name)) as f:
+            return f.read()
+
+    def test_checkpoints_record_only_touched_files(self):
+        self.call("read_file", path="keep.txt")
+        self.call("edit_file", filename="keep.txt", replacements=json.dumps({"original": "edited"}))
+        self.call("write_file", path="new.txt", content="new")
+        self.call("read_file", path="new.txt")
+
+        checkpoints = self.context.snapshots.list()
+        self.assertEqual([(c.id, c.label) for c in checkpoints], [(1, "edit_file"), (2, "write_file")])
+        self.assertEqual(list(checkpoints[0].entries), [os.path.join(self.workspace, "keep.txt")])
+        self.assertEqual(checkpoints[1].entries[os.path.join(self.workspace, "new.txt")].kind, "absent")
+
+        listing = self.call("restore_checkpoint")
+        self.assertIn("2: write_file", listing)
+        self.assertIn("1: edit_file", listing)
+
+    def test_restore_undoes_later_changes(self):
+        keep = os.path.join(self.workspace, "keep.txt")
+        original_inode = os.stat(keep).st_ino
+        self.call("read_file", path="keep.txt")
+        self.call("edit_file", filename="keep.txt", replacements=json.dumps({"original": "edited"}))
+        self.call("write_file", path="new.txt", content="new")
+        self.call("write_file", path="keep.txt", content="appended\n", mode="append")
+        self.call("delete_file", filename="keep.txt")
+        self.assertFalse(os.path.exists(keep))
+
+        result = self.call("restore_checkpoint", checkpoint="3")
+        self.assertIn("exit_code: 0", result)
+        self.assertEqual(self.read("keep.txt"), "edited\n")
+
+        self.call("restore_checkpoint", checkpoint="1")
+        self.assertEqual(self.read("keep.txt"), "original\n")
+        self.assertEqual(os.stat(keep).st_ino, original_inode)
+        self.assertFalse(os.path.exists(os.path.join(self.workspace, "new.txt")))
+        self.assertEqual(self.context.snapshots.list(), [])
+        # Restored files must be read again before editing
+        self.assertFalse(self.context.has_read("keep.txt"))
+
+    def test_directory_move_is_restored(self):
+        os.makedirs(os.path.join(self.workspace, "pkg"))
+        with open(os.path.join(self.workspace, "pkg", "a.py"), 'w') as f:
+            f.write("a")
+        self.call("move_file", source="pkg", destination="lib")
+        self.assertFalse(os.path.exists(os.path.join(self.workspace, "pkg")))
+
+        self.call("restore_checkpoint", checkpoint="1")
+        self.assertEqual(self.read("pkg/a.py"), "a")
+        self.assertFalse(os.path.exists(os.path.join(self.workspace, "lib")))
+
+    def test_journal_survives_restart(self):
+        self.call("write_file", path="keep.txt", content="replaced", overwrite="true")
+        store = SnapshotStore(self.context.snapshots.directory)
+        self.assertEqual([c.label for c in store.list()], ["write_file"])
+        store.restore(1)
+        self.assertEqual(self.read("keep.txt"), "original\n")
+
+    def test_sessions_never_share_a_store(self):
+        self.call("write_file", path="keep.txt", content="replaced", overwrite="true")
+        rerun = ToolContext(session_id="s1", working_dir=self.workspace, cache_dir=self.context.cache_dir)
+        self.assertNotEqual(rerun.snapshots.directory, self.context.snapshots.directory)
+        self.assertEqual(rerun.snapshots.list(), [])
+        self.context.snapshots.delete()
+        self.assertFalse(os.path.exists(self.context.snapshots.directory))
+
+    def test_store_follows_the_workspace_filesystem(self):
+        cache = self.context.cache_dir
+        self.assertEqual(snapshot_root(cache, self.workspace), os.path.join(cache, "snapshots"))
+        with patch('Tools.Core.snapshots._device', side_effect=lambda path: hash(path)):
+            self.assertEqual(snapshot_root(cache, self.workspace), os.path.join(self.workspace, WORKSPACE_DIR_NAME))
+
+    def test_unknown_checkpoint(self):
+        result = self.call("restore_checkpoint", checkpoint="7")
+        self.assertIn("not found", result)
+
+if __name__ == '__main__':
+    unittest.main()
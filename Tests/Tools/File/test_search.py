@@ -0,0 +1,117 @@
+import os
+import time
+import unittest
+import tempfile
+import shutil
+from unittest.mock import patch
+from Tools.File.read import ReadFile
+from Tools.File.search import SearchFiles
+from Tools.Core.trigram_index import TrigramIndex, get_index
+from Tools.base import ErrorCodes
+from Tools.context import ToolContext, use_context
+
+class TestSearchFiles(unittest.TestCase):
+    def setUp(self):
+        self.tool = SearchFiles()
+        self.temp_dir = tempfile.mkdtemp()
+        self.workspace = os.path.join(self.temp_dir, "workspace")
+        self.context = ToolContext(working_dir=self.workspace, cache_dir=os.path.join(self.temp_dir, "cache"))
+        scope = use_context(self.context)
+        scope.__enter__()
+        self.addCleanup(scope.__exit__, None, None, None)
+
+        self.write("src/app.py", "import os\n\ndef load_config(path):\n    return open(path).read()\n")
+        self.write("src/util.py", "def helper():\n    return load_config('x')\n")
+        self.write("docs/notes.md", "Remember to call load_config early.\n")
+        self.write("build/gen.py", "def load_config(): pass\n")
+        self.write(".gitignore", "build/\n")
+        self.write("data.bin", "load_config\x00\x01")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, rel, content):
+        path = os.path.join(self.workspace, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test_literal_search_ranks_definitions_first(self):
+        exit_code, message = self.tool.execute(query="load_config")
+
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertTrue(message.startswith("3 matches in 3 files"))
+        lines = message.splitlines()
+        self.assertEqual(lines[1], "src/app.py")
+        self.assertIn("  3: def load_config(path):", lines)
+        self.assertNotIn("build/gen.py", message)
+        self.assertNotIn("data.bin", message)
+
+    def test_regex_glob_and_path_filters(self):
+        exit_code, message = self.tool.execute(query=r"def \w+\(", regex="true", glob="*.py")
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("src/app.py", message)
+        self.assertIn("src/util.py", message)
+
+        exit_code, message = self.tool.execute(query="load_config", path="docs")
+        self.assertTrue(message.startswith("1 matches in 1 files"))
+        self.assertIn("docs/notes.md", message)
+
+    def test_case_sensitivity(self):
+        exit_code, message = self.tool.execute(query="LOAD_CONFIG")
+        self.assertIn("No matches", message)
+        exit_code, message = self.tool.execute(query="LOAD_CONFIG", case_sensitive="false")
+        self.assertTrue(message.startswith("3 matches"))
+
+    def test_index_updates_incrementally(self):
+        self.tool.execute(query="load_config")
+        index = get_index(self.workspace, self.context.cache_dir)
+        self.assertIn("src/app.py", index.files)
+
+        time.sleep(0.01)
+        self.write("src/new_module.py", "value = compute_total()\n")
+        os.remove(os.path.join(self.workspace, "docs/notes.md"))
+        with patch.object(TrigramIndex, '_add', wraps=index._add) as add:
+            exit_code, message = self.tool.execute(query="compute_total")
+        self.assertIn("src/new_module.py", message)
+        # Only the new file was read again
+        self.assertEqual(add.call_count, 1)
+        self.assertNotIn("docs/notes.md", index.files)
+
+        # The saved index loads with the same content
+        loaded = TrigramIndex.load(self.workspace, index.index_path)
+        self.assertEqual(sorted(loaded.files), sorted(index.files))
+        self.assertEqual(loaded.candidates([b"compute_total"]), ["src/new_module.py"])
+
+    def test_files_too_large_to_index_are_scanned(self):
+        self.write("logs/huge.log", "x" * 100 + "\nrare_marker here\n")
+        with patch('Tools.Core.trigram_index.MAX_FILE_BYTES', 64):
+            exit_code, message = self.tool.execute(query="rare_marker")
+            self.assertIn("logs/huge.log", get_index(self.workspace, self.context.cache_dir).oversized())
+        self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+        self.assertIn("logs/huge.log\n  2: rare_marker here", message)
+
+    def test_hits_open_with_read_file_from_the_process_cwd(self):
+        # Production sessions leave working_dir unset: paths resolve against the cwd, not AGENT_FS_ROOT
+        other_root = os.path.join(self.temp_dir, "agent_fs_root")
+        os.makedirs(other_root)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.workspace)
+        context = ToolContext(cache_dir=self.context.cache_dir)
+        with use_context(context), patch('config.AGENT_FS_ROOT', other_root):
+            exit_code, message = self.tool.execute(query="def helper")
+            self.assertEqual(exit_code, ErrorCodes.SUCCESS)
+            hit = message.splitlines()[1]
+            self.assertEqual(hit, "src/util.py")
+            result = ReadFile().execute(path=hit)
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertTrue(result.message.startswith("def helper():"))
+
+    def test_invalid_queries(self):
+        exit_code, _ = self.tool.execute(query="(", regex="true")
+        self.assertEqual(exit_code, ErrorCodes.MALFORMED_ARGUMENT)
+        exit_code, _ = self.tool.execute(query="")
+        self.assertEqual(exit_code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ import shutil
 from unittest.mock import patch
 
 from Tools.File.write import WriteFile
+from Tools.Core.streamed_text import StreamedText
 from Tools.error_codes import ErrorCodes
 
 class TestWriteFile(unittest.TestCase):
@@ -89,5 +90,66 @@ class TestWriteFile(unittest.TestCase):
 
         self.assertTrue(os.path.getsize(self.test_file) > 90000)
 
+    def test_append_mode(self):
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            f.write("first\n")
+
+        result = self.tool.execute(path=self.test_file, content="second\n", mode="append")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertIn("Appended 7 bytes", result.message)
+
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "first\nsecond\n")
+
+    def test_invalid_mode(self):
+        result = self.tool.execute(path=self.test_file, content="x", mode="prepend")
+        self.assertEqual(result.code, ErrorCodes.INVALID_ARGUMENT_VALUE)
+
+    def test_atomic_overwrite_failure_keeps_original(self):
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            f.write("Existing content")
+
+        with patch('Tools.Core.atomic.os.replace', side_effect=OSError("rename failed")):
+            result = self.tool.execute(path=self.test_file, content=self.test_content, overwrite="true")
+
+        self.assertEqual(result.code, ErrorCodes.OPERATION_FAILED)
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "Existing content")
+        self.assertEqual(os.listdir(self.temp_dir), ["test_file.txt"])
+
+    def test_fsync_is_opt_in_and_independent_of_atomic(self):
+        with patch('os.fsync', wraps=os.fsync) as fsync:
+            self.tool.execute(path=self.test_file, content="a")
+            self.assertEqual(fsync.call_count, 0)
+            self.tool.execute(path=self.test_file, content="b", overwrite="true", atomic="false", fsync="true")
+            self.assertEqual(fsync.call_count, 1)
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "b")
+        self.assertEqual(os.listdir(self.temp_dir), ["test_file.txt"])
+
+    def test_new_and_replaced_file_modes(self):
+        old_umask = os.umask(0o027)
+        try:
+            self.tool.execute(path=self.test_file, content=self.test_content)
+            self.assertEqual(os.stat(self.test_file).st_mode & 0o777, 0o640)
+            os.chmod(self.test_file, 0o600)
+            self.tool.execute(path=self.test_file, content="new", overwrite="true")
+            self.assertEqual(os.stat(self.test_file).st_mode & 0o777, 0o600)
+        finally:
+            os.umask(old_umask)
+
+    def test_streamed_content(self):
+        content = StreamedText(max_memory=1024)
+        for i in range(1000):
+            content.write(f"line {i} \u00e9\n")
+        self.assertTrue(content.spilled)
+
+        with patch('Tools.File.write.FSYNC_BATCH_BYTES', 4096):
+            result = self.tool.execute(path=self.test_file, content=content)
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), "".join(f"line {i} \u00e9\n" for i in range(1000)))
+
 if __name__ == '__main__':
     unittest.main()
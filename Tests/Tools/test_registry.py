@@ -0,0 +1,98 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from Tools.Core.registry import ToolRegistry, LazyTool
+from Tools.error_codes import ErrorCodes
+
+TOOL_SOURCE = '''
+from Tools.base import Tool, Argument, ArgumentType, ToolResult, ErrorCodes
+
+class Shout(Tool):
+    def __init__(self):
+        super().__init__(
+            name="shout",
+            description="Upper-cases text",
+            args=[Argument("text", ArgumentType.STRING, "Text to shout")]
+        )
+
+    def _run(self, args):
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=args["text"].upper())
+'''
+
+MODULE_NAME = "agent_tools.{dir}.shout"
+
+
+class TestToolRegistryManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tool_dir = os.path.join(self.temp_dir, "extra")
+        os.makedirs(self.tool_dir)
+        with open(os.path.join(self.tool_dir, "shout.py"), "w") as f:
+            f.write(TOOL_SOURCE)
+        self.manifest = os.path.join(self.temp_dir, "manifest.json")
+        self.module_name = MODULE_NAME.format(dir="extra")
+        self._saved_instance = ToolRegistry._instance
+
+    def tearDown(self):
+        ToolRegistry._instance = self._saved_instance
+        sys.modules.pop(self.module_name, None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fresh_registry(self):
+        ToolRegistry._instance = None
+        registry = ToolRegistry()
+        registry.manifest_path = type(registry.manifest_path)(self.manifest)
+        registry.add_tool_dir(self.tool_dir)
+        return registry
+
+    def test_manifest_written_on_first_discovery(self):
+        tools = self._fresh_registry().get_all()
+        self.assertIn("shout", tools)
+        with open(self.manifest) as f:
+            modules = json.load(f)["modules"]
+        self.assertEqual(modules[self.module_name]["tools"][0]["name"], "shout")
+
+    def test_unchanged_module_is_not_imported_until_executed(self):
+        self._fresh_registry().get_all()
+        sys.modules.pop(self.module_name, None)
+
+        tools = self._fresh_registry().get_all()
+        shout = tools["shout"]
+        self.assertIsInstance(shout, LazyTool)
+        self.assertEqual(shout.args[0].name, "text")
+        self.assertNotIn(self.module_name, sys.modules)
+
+        result = shout.execute(text="hi")
+        self.assertEqual(result.code, ErrorCodes.SUCCESS)
+        self.assertEqual(result.message, "HI")
+        self.assertIn(self.module_name, sys.modules)
+
+    def test_changed_module_is_rescanned(self):
+        self._fresh_registry().get_all()
+        with open(os.path.join(self.tool_dir, "shout.py"), "w") as f:
+            f.write(TOOL_SOURCE.replace("Upper-cases text", "Shouts text loudly"))
+        sys.modules.pop(self.module_name, None)
+
+        tools = self._fresh_registry().get_all()
+        self.assertNotIsInstance(tools["shout"], LazyTool)
+        self.assertEqual(tools["shout"].description, "Shouts text loudly")
+    def test_change_to_shared_module_rescans_every_tool(self):
+        shared = Path(self.temp_dir) / "base.py"
+        shared.write_text("DEFAULT = 1\n")
+        with patch("Tools.Core.registry._shared_sources", return_value=[shared]):
+            self._fresh_registry().get_all()
+            sys.modules.pop(self.module_name, None)
+            self.assertIsInstance(self._fresh_registry().get_all()["shout"], LazyTool)
+
+            shared.write_text("DEFAULT = 22\n")
+            sys.modules.pop(self.module_name, None)
+            self.assertNotIsInstance(self._fresh_registry().get_all()["shout"], LazyTool)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Crash-safe file replacement for the File tools.
+
+Content is written to a temporary file in the target's directory, flushed and
+fsynced, then renamed over the target. A reader (or a crash) sees either the
+old file or the new one, never a partially written mix. The target keeps its
+permission bits; like any rename-based write, hard links to the old file are
+not updated.
+"""
+
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+
+def fsync_directory(directory: str) -> None:
+    """Persists a rename in `directory`; a no-op where directories cannot be opened."""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _create_temp(directory: str, name: str) -> Tuple[BinaryIO, str]:
+    """
+    Creates a new, uniquely named temporary file next to the target ('xb' fails if it exists).
+
+    open() creates it with mode 0o666 and the kernel applies the process umask,
+    so it already has the mode of any newly created file.
+    """
+    for _ in range(100):
+        temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return open(temp_path, "xb"), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Could not create a temporary file in '{directory}'")
+
+
+class AtomicWriter:
+    """Result holder for atomic_writer: the final stat of the written file."""
+
+    def __init__(self, file: BinaryIO, temp_path: str):
+        self.file = file
+        self.temp_path = temp_path
+        self.stat: Optional[os.stat_result] = None
+
+    def write(self, data: bytes) -> int:
+        return self.file.write(data)
+
+
+@contextmanager
+def atomic_writer(path: str, fsync: bool = True) -> Iterator[AtomicWriter]:
+    """
+    Yields a binary writer whose content replaces `path` when the block exits.
+
+    If the block raises, the temporary file is removed and `path` is untouched.
+    """
+    directory = os.path.dirname(path) or "."
+    f, temp_path = _create_temp(directory, os.path.basename(path))
+    try:
+        with f:
+            writer = AtomicWriter(f, temp_path)
+            yield writer
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass    # A new file keeps the mode it was created with
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        fsync_directory(directory)
+    writer.stat = os.stat(path)
+
+
+def write_staged(path: str, data: bytes, fsync: bool = True) -> str:
+    """
+    Writes `data` to a new temporary file next to `path`, with path's permission
+    bits, and returns its name. The caller renames it over `path` (or unlinks it)
+    later, e.g. to commit several files together.
+    """
+    directory = os.path.dirname(path) or "."
+    f, temp_path = _create_temp(directory, os.path.basename(path))
+    try:
+        with f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return temp_path
+
+
+def atomic_write(path: str, data: bytes, fsync: bool = True) -> os.stat_result:
+    """Atomically replaces `path` with `data`; returns the new file's stat."""
+    with atomic_writer(path, fsync=fsync) as writer:
+        writer.write(data)
+    return writer.stat
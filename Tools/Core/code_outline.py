@@ -0,0 +1,154 @@
+"""
+Outlines of Python source files: classes and functions with their line ranges.
+
+Parsing is done with the ast module and cached process-wide by path, keyed on
+the file's FileStamp, so repeated outline and symbol reads of an unchanged
+module cost one stat. Used by the outline tool and by read_file's `symbol`
+argument to return a single definition instead of a whole file.
+"""
+
+import ast
+import os
+import stat
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Tuple, Union
+
+from Tools.base import ErrorCodes, ToolResult
+from Tools.Core.file_cache import FileStamp
+
+PYTHON_SUFFIXES = (".py", ".pyi", ".pyw")
+MAX_SIGNATURE_CHARS = 120
+_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Symbol:
+    qualname: str       # e.g. "Executor.execute"
+    kind: str           # "class", "def" or "async def"
+    signature: str      # "(self, tool_call_text)" or the base classes of a class
+    start: int          # First line, including decorators (1-based)
+    end: int            # Last line (inclusive)
+    depth: int          # Nesting level; 0 for module-level definitions
+
+    @property
+    def name(self) -> str:
+        return self.qualname.rpartition(".")[2]
+
+    def describe(self) -> str:
+        return f"{self.kind} {self.name}{self.signature}  L{self.start}-{self.end}"
+
+
+def _signature(node) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in node.bases] + [ast.unparse(k) for k in node.keywords]
+        text = f"({', '.join(bases)})" if bases else ""
+    else:
+        text = f"({ast.unparse(node.args)})"
+        if node.returns is not None:
+            text += f" -> {ast.unparse(node.returns)}"
+    if len(text) > MAX_SIGNATURE_CHARS:
+        text = text[:MAX_SIGNATURE_CHARS - 4] + "...)"
+    return text
+
+
+def parse_outline(source: str) -> List[Symbol]:
+    """
+    Classes and functions of a module in source order.
+
+    Methods and nested classes are included with dotted names; functions
+    defined inside functions are not. Raises SyntaxError for invalid source.
+    """
+    tree = ast.parse(source)
+    symbols: List[Symbol] = []
+
+    def visit(body, prefix, depth):
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                kind = "class"
+            elif isinstance(node, ast.AsyncFunctionDef):
+                kind = "async def"
+            elif isinstance(node, ast.FunctionDef):
+                kind = "def"
+            else:
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            qualname = f"{prefix}{node.name}"
+            symbols.append(Symbol(qualname, kind, _signature(node), start, node.end_lineno, depth))
+            if kind == "class":
+                visit(node.body, qualname + ".", depth + 1)
+
+    visit(tree.body, "", 0)
+    return symbols
+
+
+def find_symbols(symbols: List[Symbol], name: str) -> List[Symbol]:
+    """
+    Symbols addressed by `name`: an exact qualified name, otherwise every symbol
+    whose qualified name ends with it (so 'execute' finds 'Executor.execute').
+    """
+    exact = [s for s in symbols if s.qualname == name]
+    if exact:
+        return exact
+    suffix = "." + name
+    return [s for s in symbols if s.qualname.endswith(suffix)]
+
+
+_cache: "OrderedDict[str, Tuple[FileStamp, List[Symbol]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cached_outline(path: str, stamp: FileStamp, load: Callable[[], bytes]) -> List[Symbol]:
+    """
+    The outline of `path` as of `stamp`; `load()` is called for the content only on a cache miss.
+
+    Raises SyntaxError or UnicodeDecodeError if the content cannot be parsed.
+    """
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            _cache.move_to_end(path)
+            return cached[1]
+    symbols = parse_outline(load().decode("utf-8-sig"))
+    with _cache_lock:
+        _cache[path] = (stamp, symbols)
+        _cache.move_to_end(path)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return symbols
+
+
+def is_python_file(path: str) -> bool:
+    return path.lower().endswith(PYTHON_SUFFIXES)
+
+
+def load_outline(context, path: str, display_path: str) -> Union[List[Symbol], ToolResult]:
+    """The file's symbols from the process-wide parse cache, or a ToolResult describing the failure."""
+    if not is_python_file(path):
+        return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                          message=f"'{display_path}' is not a Python file; outlines need a .py file")
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                          message=f"File '{display_path}' not found")
+    except PermissionError:
+        return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
+                          message=f"No read permission for '{display_path}'")
+    if not stat.S_ISREG(st.st_mode):
+        return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                          message=f"Path '{display_path}' is not a file")
+    try:
+        return cached_outline(path, FileStamp.from_stat(st), lambda: context.files.load(path, st).data)
+    except SyntaxError as e:
+        return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                          message=f"Cannot parse '{display_path}': {e.msg} (line {e.lineno})")
+    except UnicodeDecodeError:
+        return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                          message=f"Cannot parse '{display_path}': not valid UTF-8")
+    except PermissionError:
+        return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
+                          message=f"No read permission for '{display_path}'")
+    except OSError as e:
+        return ToolResult(success=False, code=ErrorCodes.UNKNOWN_ERROR, message=str(e))
@@ -0,0 +1,155 @@
+"""
+Single-pass literal multi-pattern replacement.
+
+All patterns of an edit are located in one scan of the text with a single
+compiled alternation regex, so checking that every pattern occurs exactly
+once costs one C-speed pass however many patterns there are. Matches are
+taken against the original text (replacements never feed later patterns)
+and may not overlap.
+
+Text can be fed in chunks, which lets large files be planned and rewritten in
+two streaming passes without holding them in memory.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class PatternMatcher:
+    """Finds every occurrence of a fixed list of non-empty literal patterns."""
+
+    def __init__(self, patterns: List[str]):
+        if any(not p for p in patterns):
+            raise ValueError("Patterns must not be empty")
+        self.patterns = list(patterns)
+        self.lengths = [len(p) for p in self.patterns]
+        # Longest first, so a pattern that extends another wins where both start
+        order = sorted(range(len(self.patterns)), key=lambda i: -self.lengths[i])
+        self._regex = re.compile("|".join(f"({re.escape(self.patterns[i])})" for i in order))
+        self._group_pattern = {group: index for group, index in enumerate(order, 1)}
+        # A text is rescanned this far back so matches across chunk boundaries are found
+        self.overlap = max(self.lengths) - 1
+
+    def scanner(self) -> "Scanner":
+        return Scanner(self)
+
+
+class Scanner:
+    """Incremental matcher state; feed consecutive chunks of one text."""
+
+    def __init__(self, matcher: PatternMatcher):
+        self.matcher = matcher
+        self.tail = ""
+        self.position = 0
+
+    def feed(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields (absolute start, pattern index) for every match ending in `text`."""
+        matcher = self.matcher
+        patterns, lengths = matcher.patterns, matcher.lengths
+        buffer = self.tail + text
+        offset = self.position - len(self.tail)
+        fresh = len(self.tail)      # Matches ending at or before this were reported by the previous feed
+        for match in matcher._regex.finditer(buffer):
+            start, end = match.span()
+            index = matcher._group_pattern[match.lastindex]
+            if end > fresh:
+                yield offset + start, index
+            # The regex consumed [start, end); occurrences of the other patterns starting inside it
+            # are what the overlap and uniqueness checks need to see
+            for other, pattern in enumerate(patterns):
+                if other == index:
+                    continue
+                found = buffer.find(pattern, start, end - 1 + lengths[other])
+                while found != -1:
+                    if found + lengths[other] > fresh:
+                        yield offset + found, other
+                    found = buffer.find(pattern, found + 1, end - 1 + lengths[other])
+        self.position += len(text)
+        self.tail = buffer[max(0, len(buffer) - matcher.overlap):]
+
+
+@dataclass
+class EditPlan:
+    """Where each pattern occurs; built by plan_edits."""
+    patterns: List[str]
+    replacements: List[str]
+    counts: List[int] = field(default_factory=list)
+    starts: List[Optional[int]] = field(default_factory=list)
+
+    def problem(self) -> Optional[Tuple[str, int, Optional[int]]]:
+        """
+        First reason the plan cannot be applied, in pattern order.
+
+        Returns ('not_found', index, None), ('multiple', index, None),
+        ('overlap', index, other_index) or None when every pattern matched once.
+        """
+        for index, count in enumerate(self.counts):
+            if count == 0:
+                return "not_found", index, None
+            if count > 1:
+                return "multiple", index, None
+        ordered = self.ordered()
+        for (start, end, index), (next_start, _, next_index) in zip(ordered, ordered[1:]):
+            if next_start < end:
+                return "overlap", index, next_index
+        return None
+
+    def ordered(self) -> List[Tuple[int, int, int]]:
+        """(start, end, pattern index) of each unique match, by position."""
+        return sorted(
+            (start, start + len(self.patterns[index]), index)
+            for index, start in enumerate(self.starts) if start is not None
+        )
+
+
+def plan_edits(patterns: List[str], replacements: List[str], chunks: Iterable[str]) -> EditPlan:
+    """Counts non-overlapping occurrences of every pattern in one pass over `chunks`."""
+    matcher = PatternMatcher(patterns)
+    scanner = matcher.scanner()
+    counts = [0] * len(patterns)
+    starts: List[Optional[int]] = [None] * len(patterns)
+    last_end = [0] * len(patterns)
+    for chunk in chunks:
+        for start, index in scanner.feed(chunk):
+            # Occurrences of one pattern are counted like re.finditer: without overlap
+            if start < last_end[index]:
+                continue
+            last_end[index] = start + matcher.lengths[index]
+            counts[index] += 1
+            if starts[index] is None:
+                starts[index] = start
+    return EditPlan(list(patterns), list(replacements), counts, starts)
+
+
+def apply_edits(plan: EditPlan, chunks: Iterable[str], write: Callable[[str], object]) -> Dict[int, int]:
+    """
+    Streams `chunks` (the same text the plan was built from) to `write` with the
+    planned replacements applied. Returns the 1-based line of each edit by pattern index.
+    """
+    edits = iter(plan.ordered())
+    current = next(edits, None)
+    lines: Dict[int, int] = {}
+    newlines = 0
+    base = 0
+    for chunk in chunks:
+        i, n = 0, len(chunk)
+        while i < n:
+            absolute = base + i
+            if current is not None and absolute >= current[0]:
+                start, end, index = current
+                if absolute == start:
+                    lines[index] = newlines + 1
+                    write(plan.replacements[index])
+                stop = min(end - base, n)
+                newlines += chunk.count("\n", i, stop)
+                i = stop
+                if base + i >= end:
+                    current = next(edits, None)
+            else:
+                stop = n if current is None else min(n, current[0] - base)
+                write(chunk[i:stop])
+                newlines += chunk.count("\n", i, stop)
+                i = stop
+        base += n
+    return lines
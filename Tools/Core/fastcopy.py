@@ -0,0 +1,171 @@
+"""
+File copies that keep the data out of Python where the platform allows.
+
+copy_data tries, in order: a reflink (FICLONE, a copy-on-write clone on
+btrfs/XFS/overlay filesystems that copies no data at all), copy_file_range
+(an in-kernel copy, offloaded to the server on NFS/SMB), sendfile, and
+finally a plain read/write loop. Each fast path falls through to the next
+when the kernel or filesystem does not support it.
+
+copy_file writes through atomic_writer, so the destination is replaced in
+one rename. copy_tree and move build on it for whole directories.
+"""
+
+import errno
+import os
+import shutil
+import sys
+from collections import Counter
+from typing import Tuple
+
+from Tools.Core.atomic import atomic_writer
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+# _IOW(0x94, 9, int) from linux/fs.h
+FICLONE = 0x40049409
+CHUNK_BYTES = 8 * 1024 * 1024
+# errnos meaning "this mechanism is not available here", so the next one is tried
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY,
+                errno.EBADF, errno.EPERM, errno.ENOTSUP}
+
+
+def _unsupported(e: OSError) -> bool:
+    return e.errno in _UNSUPPORTED
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> bool:
+    copied = 0
+    while True:
+        try:
+            n = os.copy_file_range(src_fd, dst_fd, CHUNK_BYTES)
+        except OSError as e:
+            if copied == 0 and _unsupported(e):
+                return False
+            raise
+        if n == 0:
+            # Some filesystems report 0 instead of failing; then the next method is tried
+            return copied > 0
+        copied += n
+
+
+def _sendfile(src_fd: int, dst_fd: int) -> bool:
+    copied = 0
+    while True:
+        try:
+            n = os.sendfile(dst_fd, src_fd, copied, CHUNK_BYTES)
+        except OSError as e:
+            if copied == 0 and _unsupported(e):
+                return False
+            raise
+        if n == 0:
+            return copied > 0
+        copied += n
+
+
+def _read_write(src_fd: int, dst_fd: int) -> None:
+    while True:
+        data = os.read(src_fd, CHUNK_BYTES)
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view):]
+
+
+def copy_data(src_fd: int, dst_fd: int, size: int) -> str:
+    """
+    Copies everything from src_fd's position to dst_fd; returns the method used.
+
+    Both descriptors must be at offset 0 of a regular file, dst empty.
+    """
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return "reflink"
+        except OSError as e:
+            if not _unsupported(e):
+                raise
+    if size and hasattr(os, "copy_file_range") and _copy_file_range(src_fd, dst_fd):
+        return "copy_file_range"
+    if size and hasattr(os, "sendfile") and sys.platform.startswith("linux") and _sendfile(src_fd, dst_fd):
+        return "sendfile"
+    _read_write(src_fd, dst_fd)
+    return "read/write"
+
+
+def resolve_destination(source: str, destination: str) -> str:
+    """Like cp and mv: a destination that is an existing directory receives the source by name."""
+    if os.path.isdir(destination) and not os.path.samefile(source, destination):
+        return os.path.join(destination, os.path.basename(source.rstrip(os.sep)))
+    return destination
+
+
+def copy_file(src: str, dst: str, fsync: bool = False) -> Tuple[int, str]:
+    """
+    Atomically replaces (or creates) `dst` with a copy of `src`, including its
+    permission bits and timestamps. Returns (bytes copied, method).
+    """
+    with open(src, "rb") as source:
+        size = os.fstat(source.fileno()).st_size
+        with atomic_writer(dst, fsync=fsync) as writer:
+            method = copy_data(source.fileno(), writer.file.fileno(), size)
+    shutil.copystat(src, dst)
+    return size, method
+
+
+def copy_tree(src: str, dst: str, fsync: bool = False) -> Tuple[int, int, Counter]:
+    """
+    Copies the directory `src` to `dst` (created if missing; existing files are
+    replaced). Symlinks are recreated, not followed. Returns (files, bytes, methods).
+    """
+    files = total = 0
+    methods: Counter = Counter()
+    stack = [(src, dst)]
+    copied_dirs = []
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        copied_dirs.append((src_dir, dst_dir))
+        with os.scandir(src_dir) as it:
+            entries = list(it)
+        for entry in entries:
+            target = os.path.join(dst_dir, entry.name)
+            if entry.is_symlink():
+                if os.path.lexists(target):
+                    os.unlink(target)
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir():
+                stack.append((entry.path, target))
+            else:
+                size, method = copy_file(entry.path, target, fsync=fsync)
+                files += 1
+                total += size
+                methods[method] += 1
+    # Directory modes and times last, children first, so a read-only source directory can still be filled
+    for src_dir, dst_dir in reversed(copied_dirs):
+        shutil.copystat(src_dir, dst_dir)
+    return files, total, methods
+
+
+def move(src: str, dst: str) -> str:
+    """
+    Moves a file or directory with a rename; across filesystems it is copied
+    and the source removed. Returns "rename" or the copy method used.
+    """
+    try:
+        os.replace(src, dst)
+        return "rename"
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    if os.path.isdir(src) and not os.path.islink(src):
+        copy_tree(src, dst, fsync=True)
+        shutil.rmtree(src)
+        return "copy"
+    _, method = copy_file(src, dst, fsync=True)
+    os.unlink(src)
+    return method
@@ -0,0 +1,139 @@
+"""
+Session-level cache of file contents for the File tools.
+
+Entries are validated against the file's (mtime, size, inode) on every lookup,
+so a cached file is only served while it is unchanged on disk. Optionally a
+content digest is kept as well, which lets callers recognise that a file whose
+metadata changed (e.g. it was touched or rewritten) still has the same bytes.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    mtime_ns: int
+    size: int
+    inode: int
+    device: int
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> "FileStamp":
+        return cls(st.st_mtime_ns, st.st_size, st.st_ino, st.st_dev)
+
+
+@dataclass
+class CachedFile:
+    path: str
+    stamp: FileStamp
+    data: bytes
+    digest: Optional[str] = None
+    _texts: Dict[str, str] = field(default_factory=dict, repr=False)
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """
+        Decodes the content with universal newlines, like open(path, 'r').
+
+        Raises UnicodeDecodeError if the content is not valid in `encoding`.
+        """
+        text = self._texts.get(encoding)
+        if text is None:
+            text = self.data.decode(encoding).replace("\r\n", "\n").replace("\r", "\n")
+            self._texts[encoding] = text
+        return text
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class FileCache:
+    """LRU cache of file bytes, bounded per file and in total."""
+
+    def __init__(self, max_file_bytes: int = 4 * 1024 * 1024,
+                 max_total_bytes: int = 32 * 1024 * 1024,
+                 hash_contents: bool = True):
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.hash_contents = hash_contents
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+
+    def lookup(self, path: str, st: Optional[os.stat_result] = None) -> Optional[CachedFile]:
+        """Returns the cached entry if the file is unchanged on disk, else None."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                return None
+            if st is None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    self.invalidate(path)
+                    return None
+            if entry.stamp != FileStamp.from_stat(st):
+                self.invalidate(path)
+                return None
+            self._entries.move_to_end(path)
+            return entry
+
+    def load(self, path: str, st: Optional[os.stat_result] = None) -> CachedFile:
+        """
+        Returns the file's content, from the cache when still valid.
+
+        Files larger than max_file_bytes are read but not retained.
+        """
+        if st is None:
+            st = os.stat(path)
+        entry = self.lookup(path, st)
+        if entry is not None:
+            return entry
+
+        with open(path, 'rb') as f:
+            data = f.read()
+            # The file may have changed between stat and read; stamp what we read
+            st = os.fstat(f.fileno())
+        return self.store(path, data, st)
+
+    def store(self, path: str, data: bytes, st: Optional[os.stat_result] = None) -> CachedFile:
+        """Caches `data` as the current content of `path` (e.g. after a write)."""
+        if st is None:
+            st = os.stat(path)
+        entry = CachedFile(
+            path=path,
+            stamp=FileStamp.from_stat(st),
+            data=data,
+            digest=content_digest(data) if self.hash_contents else None,
+        )
+        with self._lock:
+            self.invalidate(path)
+            if len(data) <= self.max_file_bytes:
+                self._entries[path] = entry
+                self._total_bytes += len(data)
+                while self._total_bytes > self.max_total_bytes and self._entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._total_bytes -= len(evicted.data)
+        return entry
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._total_bytes -= len(entry.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,233 @@
+"""
+Ranged, size-capped reads of text files, shared by read_file and read_many.
+
+read_view() returns one view of a file: whole, a run of lines from an
+offset, the last lines, or a byte range, cut at `max_bytes` and followed by
+a note saying what was shown and how to continue. Binary and undecodable
+files get a short summary instead of their content. A view identical to the
+session's last read of an unchanged file is answered with a short notice
+rather than resent.
+
+Small files are served from the session's FileCache. Large ones are mapped
+and get a sparse line index (Tools/Core/line_index.py), persisted in the
+tool cache directory so later sessions seek without rescanning.
+"""
+
+import mimetypes
+import mmap
+import os
+import stat
+from contextlib import contextmanager
+
+from Tools.base import ErrorCodes, ToolResult
+from Tools.Core.file_cache import FileStamp
+from Tools.Core.line_index import LineIndex, count_lines, find_line_start
+
+DEFAULT_MAX_BYTES = 256 * 1024
+DEFAULT_TAIL_LINES = 10
+# Files at least this large are mapped rather than cached, and get a persisted line index
+INDEXED_MIN_BYTES = 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+_LINE_INDEX_CACHE = "read_file.line_index"
+_LINE_INDEX_CACHE_SIZE = 64
+
+
+def stat_file(context, display_path):
+    """(absolute path, stat) of a regular file, or a ToolResult saying why it cannot be read."""
+    path = context.resolve_path(display_path)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                          message=f"File '{display_path}' not found")
+    except PermissionError:
+        return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
+                          message=f"No read permission for '{display_path}'")
+    if not stat.S_ISREG(st.st_mode):
+        return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                          message=f"Path '{display_path}' is not a file")
+    return path, st
+
+
+def read_view(context, path, display_path, st, numbers, mode='head', symbol=None, force=False):
+    """
+    Reads one view of `path` and records it as the session's last read.
+
+    `numbers` holds 'offset' (1-based line), 'limit' (lines), 'byte_offset',
+    'byte_limit' and 'max_bytes', each an int or None except max_bytes.
+    `symbol` is the code_outline Symbol a line range was narrowed to, named
+    in the note.
+    """
+    view = (mode, numbers['offset'], numbers['limit'], numbers['byte_offset'],
+            numbers['byte_limit'], numbers['max_bytes'])
+    try:
+        with open_buffer(context, path, st) as (buf, stamp, digest):
+            # Nothing new to show: save the tokens of resending the same content
+            previous = context.last_read(path)
+            if (previous is not None and previous.view == view and not force
+                    and (previous.stamp == stamp
+                         or (digest is not None and previous.digest == digest))):
+                return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                                  message=f"File '{display_path}' is unchanged since your last read. "
+                                          f"Use force: true to read it again.")
+
+            content = read_range(context, path, display_path, buf, stamp, mode, numbers, symbol)
+        context.mark_read(path, stamp, digest, view)
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=content)
+    except PermissionError:
+        return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
+                          message="Permission denied when reading file")
+    except Exception as e:
+        return ToolResult(success=False, code=ErrorCodes.UNKNOWN_ERROR, message=str(e))
+
+
+@contextmanager
+def open_buffer(context, path, st):
+    """Yields (buffer, stamp, digest): cached bytes for small files, a read-only mmap otherwise."""
+    if st.st_size < INDEXED_MIN_BYTES or st.st_size <= context.files.max_file_bytes:
+        entry = context.files.load(path, st)
+        yield entry.data, entry.stamp, entry.digest
+        return
+    with open(path, 'rb') as f:
+        stamp = FileStamp.from_stat(os.fstat(f.fileno()))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped, stamp, None
+
+
+def read_range(context, path, display_path, buf, stamp, mode, numbers, symbol=None):
+    """The requested part of `buf` as text, with a note when it is not the whole file."""
+    size = len(buf)
+    if b'\x00' in buf[:BINARY_SNIFF_BYTES]:
+        return binary_summary(display_path, buf, size, "Binary")
+
+    max_bytes = numbers['max_bytes']
+    limit = numbers['limit']
+    first_line = None
+    if numbers['byte_offset'] is not None or numbers['byte_limit'] is not None:
+        start = min(max(numbers['byte_offset'] or 0, 0), size)
+        end = size if numbers['byte_limit'] is None else min(size, start + max(numbers['byte_limit'], 0))
+    elif mode == 'tail':
+        start = tail_start(buf, size, DEFAULT_TAIL_LINES if limit is None else max(limit, 0))
+        end = size
+    else:
+        first_line = max((numbers['offset'] or 1) - 1, 0)
+        start = _line_start(context, path, buf, stamp, first_line)
+        end = size if limit is None else find_line_start(buf, max(limit, 0), start, stop=start + max_bytes + 1)
+
+    truncated = end - start > max_bytes
+    if truncated:
+        end = start + max_bytes
+        if numbers['byte_offset'] is None and numbers['byte_limit'] is None:
+            # Cut at a line boundary where possible
+            nl = buf.rfind(b'\n', start, end)
+            if nl >= start:
+                end = nl + 1
+
+    text = decode(buf[start:end], cut_start=start > 0, cut_end=end < size)
+    if text is None:
+        return binary_summary(display_path, buf, size, "Undecodable")
+    content = text.replace('\r\n', '\n').replace('\r', '\n').rstrip('\n')
+
+    if start == 0 and end >= size:
+        return content
+
+    # Partial view: say what was shown and how to continue
+    if first_line is not None or mode == 'tail':
+        total = _known_line_count(context, path, buf, stamp)
+        of_total = f" of {total:,}" if total is not None else ""
+        shown = content.count('\n') + 1 if content else 0
+        if mode == 'tail' and first_line is None:
+            note = f"[Showing the last {shown} lines{of_total}"
+        else:
+            last = first_line + shown
+            note = f"[Showing lines {first_line + 1}-{last}{of_total}"
+            if symbol is not None:
+                note += f" ({symbol.kind} {symbol.qualname})"
+                if last < symbol.end:
+                    note += f"; continue with offset: {last + 1}"
+            elif end < size:
+                note += f"; continue with offset: {last + 1}"
+    else:
+        note = f"[Showing bytes {start:,}-{end:,} of {size:,}"
+    if truncated:
+        note += f"; truncated at max_bytes={max_bytes}"
+    return f"{content}\n{note}]"
+
+
+def decode(chunk, cut_start=False, cut_end=False):
+    """
+    Decodes UTF-8. A range edge inside the file (`cut_start`, `cut_end`) may
+    split a character, whose pieces are dropped; anything else that does not
+    decode makes the range undecodable (None).
+    """
+    try:
+        return chunk.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    lead = 0
+    if cut_start:
+        while lead < 3 and lead < len(chunk) and 0x80 <= chunk[lead] <= 0xBF:
+            lead += 1
+    for trail in range(4 if cut_end else 1):
+        try:
+            return chunk[lead:len(chunk) - trail].decode('utf-8')
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def tail_start(buf, size, count):
+    """Offset of the first of the last `count` lines."""
+    pos = size - 1 if size and buf[size - 1:size] == b'\n' else size
+    for _ in range(count):
+        nl = buf.rfind(b'\n', 0, pos)
+        if nl == -1:
+            return 0
+        pos = nl
+    return min(pos + 1, size)
+
+
+def binary_summary(display_path, buf, size, reason):
+    kind = mimetypes.guess_type(display_path)[0] or "unknown type"
+    head = bytes(buf[:32]).hex(' ')
+    return (f"{reason} file '{display_path}' ({size:,} bytes, {kind}); content not shown.\n"
+            f"First {min(size, 32)} bytes: {head}")
+
+
+def _line_start(context, path, buf, stamp, line):
+    if line == 0:
+        return 0
+    if len(buf) < INDEXED_MIN_BYTES:
+        return find_line_start(buf, line)
+    return _line_index(context, path, buf, stamp).line_start(buf, line)
+
+
+def _known_line_count(context, path, buf, stamp):
+    """Total line count when it is cheap to know: small files, or already indexed ones."""
+    if len(buf) < INDEXED_MIN_BYTES:
+        return count_lines(buf, len(buf))
+    index = context.cache.get(_LINE_INDEX_CACHE, {}).get(path)
+    if index is not None and index.stamp == stamp:
+        return index.line_count
+    return None
+
+
+def _line_index(context, path, buf, stamp):
+    """Line index from the session, the sidecar file, or a fresh scan (then persisted)."""
+    indexes = context.cache.setdefault(_LINE_INDEX_CACHE, {})
+    index = indexes.get(path)
+    if index is not None and index.stamp == stamp:
+        return index
+    sidecar = LineIndex.sidecar_path(context.cache_dir, path)
+    index = LineIndex.load(sidecar, stamp)
+    if index is None:
+        index = LineIndex.build(buf, stamp)
+        try:
+            index.save(sidecar)
+        except OSError as e:
+            print(f"Warning: Could not save line index for '{path}': {e}")
+    indexes.pop(path, None)
+    indexes[path] = index
+    while len(indexes) > _LINE_INDEX_CACHE_SIZE:
+        indexes.pop(next(iter(indexes)))
+    return index
@@ -0,0 +1,171 @@
+"""
+.gitignore-style path filtering for tools that walk directory trees.
+
+Supports the commonly used subset of gitignore syntax: comments, `!`
+negation, trailing `/` for directories only, leading or embedded `/` to
+anchor a pattern to its .gitignore's directory, and `*`, `?`, `[...]`, `**`.
+Each directory's .gitignore applies below that directory; within and
+across files the last matching pattern wins. Parsed files are cached by
+path and mtime.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GITIGNORE = ".gitignore"
+
+
+def _translate(pattern: str) -> str:
+    """Regex body for one gitignore glob (no anchors)."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            close = pattern.find("]", i + 2 if pattern.startswith("[!", i) or pattern.startswith("[]", i) else i + 1)
+            if close == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:close]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = close + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class IgnoreRule:
+    __slots__ = ("pattern", "negate", "dir_only", "regex")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        elif pattern.startswith("\\"):
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        body = _translate(pattern.lstrip("/"))
+        self.regex = re.compile(("^" if anchored else "(?:^|.*/)") + body + "$")
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(rel_path) is not None
+
+
+def parse_patterns(lines: Iterable[str]) -> List[IgnoreRule]:
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip("\r")
+        if not line.strip() or line.startswith("#"):
+            continue
+        # Trailing spaces are ignored unless escaped
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        rules.append(IgnoreRule(line))
+    return rules
+
+
+_file_cache: Dict[str, Tuple[int, List[IgnoreRule]]] = {}
+_file_cache_lock = threading.Lock()
+
+
+def _load_gitignore(directory: str) -> List[IgnoreRule]:
+    path = os.path.join(directory, GITIGNORE)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return []
+    with _file_cache_lock:
+        cached = _file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            rules = parse_patterns(f)
+    except OSError:
+        return []
+    with _file_cache_lock:
+        _file_cache[path] = (mtime, rules)
+    return rules
+
+
+class IgnoreMatcher:
+    """
+    Decides which paths under `root` to skip.
+
+    `patterns` apply relative to root, like a .gitignore there. Walkers call
+    `enter(rel_dir)` before checking the entries of a directory so that its
+    .gitignore is picked up; rules of directories not on the current path are
+    dropped automatically.
+    """
+
+    def __init__(self, root: str, patterns: Optional[Iterable[str]] = None, use_gitignore: bool = True):
+        self.root = root
+        self.use_gitignore = use_gitignore
+        self._extra = parse_patterns(patterns or [])
+        # (base rel dir, rules) for every directory on the current path that has rules
+        self._stack: List[Tuple[str, List[IgnoreRule]]] = []
+
+    def enter(self, rel_dir: str) -> None:
+        rel_dir = "" if rel_dir in ("", ".") else rel_dir
+        while self._stack and not (rel_dir == self._stack[-1][0] or self._stack[-1][0] == ""
+                                   or rel_dir.startswith(self._stack[-1][0] + "/")):
+            self._stack.pop()
+        if self._stack and self._stack[-1][0] == rel_dir:
+            return
+        if self.use_gitignore:
+            rules = _load_gitignore(os.path.join(self.root, rel_dir) if rel_dir else self.root)
+            if rules:
+                self._stack.append((rel_dir, rules))
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in self._extra:
+            if rule.matches(rel_path, is_dir):
+                ignored = not rule.negate
+        for base, rules in self._stack:
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                local = rel_path[len(base) + 1:]
+            else:
+                local = rel_path
+            for rule in rules:
+                if rule.matches(local, is_dir):
+                    ignored = not rule.negate
+        return ignored
+
+
+def split_patterns(value: Optional[str]) -> List[str]:
+    """Splits a comma- or newline-separated ignore argument into patterns."""
+    if not value:
+        return []
+    return [p.strip() for p in re.split(r"[,\n]", str(value)) if p.strip()]
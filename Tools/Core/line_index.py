@@ -0,0 +1,124 @@
+"""
+Sparse line-offset index for large files.
+
+The index records the byte offset of every `stride`-th line, so finding the
+start of line N means one array lookup plus at most `stride` newline searches,
+whatever the size of the file. Building it takes one scan of the file; the
+result is persisted as a sidecar file in the tool cache directory and reused
+for as long as the file's (mtime, size, inode) stamp is unchanged.
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from typing import Optional, Union
+
+from Tools.Core.file_cache import FileStamp
+
+DEFAULT_STRIDE = 256
+_MAGIC = b"LIDX1"
+_HEADER = struct.Struct("<5sqqqqqqq")
+
+Buffer = Union[bytes, "mmap.mmap"]
+
+
+def find_line_start(buf: Buffer, line: int, start: int = 0, stop: Optional[int] = None) -> int:
+    """
+    Returns the offset `line` lines after `start`, or len(buf) past the end.
+
+    With `stop`, the search gives up at that offset and returns it, which bounds
+    the work when the caller will not read beyond it anyway.
+    """
+    pos = start
+    end = len(buf) if stop is None else min(stop, len(buf))
+    for _ in range(line):
+        nl = buf.find(b"\n", pos, end)
+        if nl == -1:
+            return end
+        pos = nl + 1
+    return pos
+
+
+def count_lines(buf: Buffer, size: int) -> int:
+    """Counts lines the way an editor would: a final unterminated line counts."""
+    if size == 0:
+        return 0
+    count = 0
+    pos = 0
+    chunk = 1 << 20
+    while pos < size:
+        count += buf[pos:pos + chunk].count(b"\n")
+        pos += chunk
+    if buf[size - 1:size] != b"\n":
+        count += 1
+    return count
+
+
+class LineIndex:
+    def __init__(self, stamp: FileStamp, stride: int, checkpoints: array, line_count: int):
+        self.stamp = stamp
+        self.stride = stride
+        self.checkpoints = checkpoints
+        self.line_count = line_count
+
+    @classmethod
+    def build(cls, buf: Buffer, stamp: FileStamp, stride: int = DEFAULT_STRIDE) -> "LineIndex":
+        checkpoints = array("Q", [0])
+        size = len(buf)
+        pos = 0
+        line = 0
+        find = buf.find
+        while True:
+            nl = find(b"\n", pos)
+            if nl == -1 or nl + 1 >= size:
+                break
+            pos = nl + 1
+            line += 1
+            if line % stride == 0:
+                checkpoints.append(pos)
+        line_count = count_lines(buf, size)
+        return cls(stamp, stride, checkpoints, line_count)
+
+    def line_start(self, buf: Buffer, line: int) -> int:
+        """Byte offset of 0-based `line`; len(buf) if the file has fewer lines."""
+        if line <= 0:
+            return 0
+        if line >= self.line_count:
+            return len(buf)
+        k = min(line // self.stride, len(self.checkpoints) - 1)
+        return find_line_start(buf, line - k * self.stride, self.checkpoints[k])
+
+    # --- Sidecar persistence ---
+
+    @staticmethod
+    def sidecar_path(cache_dir: str, path: str) -> str:
+        name = hashlib.blake2b(path.encode("utf-8", "surrogateescape"), digest_size=16).hexdigest()
+        return os.path.join(cache_dir, "line_index", f"{name}.idx")
+
+    def save(self, sidecar: str) -> None:
+        os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+        header = _HEADER.pack(_MAGIC, self.stamp.mtime_ns, self.stamp.size, self.stamp.inode,
+                              self.stamp.device, self.stride, self.line_count, len(self.checkpoints))
+        tmp = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(header)
+            self.checkpoints.tofile(f)
+        os.replace(tmp, sidecar)
+
+    @classmethod
+    def load(cls, sidecar: str, stamp: FileStamp) -> Optional["LineIndex"]:
+        """Loads a sidecar index; None if missing, corrupt or built for other content."""
+        try:
+            with open(sidecar, "rb") as f:
+                raw = f.read(_HEADER.size)
+                if len(raw) != _HEADER.size:
+                    return None
+                magic, mtime_ns, size, inode, device, stride, line_count, n = _HEADER.unpack(raw)
+                if magic != _MAGIC or FileStamp(mtime_ns, size, inode, device) != stamp:
+                    return None
+                checkpoints = array("Q")
+                checkpoints.fromfile(f, n)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(stamp, stride, checkpoints, line_count)
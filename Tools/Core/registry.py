@@ -1,9 +1,137 @@
 import importlib
+import importlib.util
 import inspect
+import json
+import os
 import pkgutil
-from typing import Dict, Optional
+import sys
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
-from Tools.base import Tool
+from Tools.base import Tool, Argument, ArgumentType, ToolConfig
+
+MANIFEST_VERSION = 1
+ENTRY_POINT_GROUP = "agent.tools"
+# Extra tool directories, separated like PATH entries
+TOOL_DIRS_ENV = "AGENT_TOOL_DIRS"
+MANIFEST_ENV = "AGENT_TOOL_MANIFEST"
+
+
+def _shared_sources() -> List[Path]:
+    """Modules every tool builds on (Tools/base.py, Tools/context.py, Tools/Core/...)."""
+    tools_dir = Path(__file__).parent.parent
+    return sorted(list(tools_dir.glob("*.py")) + list((tools_dir / "Core").glob("*.py")))
+
+
+def _shared_stamp() -> List[List[Any]]:
+    """Freshness stamp of the shared modules; tool metadata such as ToolConfig defaults comes from them."""
+    stamp = []
+    for path in _shared_sources():
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        stamp.append([str(path), st.st_mtime_ns, st.st_size])
+    return stamp
+
+
+def _describe_tool(tool: Tool, module_name: str, origin: Optional[str]) -> Dict[str, Any]:
+    """Builds the manifest entry for a tool instance."""
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "args": [
+            {
+                "name": arg.name,
+                "arg_type": arg.arg_type.name,
+                "description": arg.description,
+                "optional": arg.optional,
+                "default": arg.default,
+            }
+            for arg in tool.args
+        ],
+        "config": asdict(tool.config),
+        "examples": list(getattr(tool, "examples", [])),
+        "module": module_name,
+        "class": type(tool).__name__,
+        "origin": origin,
+    }
+
+
+def _import_tool_module(module_name: str, origin: Optional[str] = None):
+    """Imports a tool module by name, or from a file path for extra tool directories."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    if origin is None:
+        return importlib.import_module(module_name)
+    spec = importlib.util.spec_from_file_location(module_name, origin)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load tool module from '{origin}'")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+class LazyTool(Tool):
+    """
+    Stand-in for a tool described by the discovery manifest.
+
+    Carries the name, description and arguments needed to build prompts and
+    validate calls. The tool module is only imported on first execution.
+    """
+
+    _load_lock = threading.Lock()
+
+    def __init__(self, spec: Dict[str, Any]):
+        super().__init__(
+            name=spec["name"],
+            description=spec["description"],
+            args=[
+                Argument(
+                    name=arg["name"],
+                    arg_type=ArgumentType[arg["arg_type"]],
+                    description=arg.get("description", ""),
+                    optional=arg.get("optional", False),
+                    default=arg.get("default"),
+                )
+                for arg in spec["args"]
+            ],
+            config=ToolConfig(**spec.get("config", {})),
+        )
+        self.examples = spec.get("examples", [])
+        self._module_name = spec["module"]
+        self._class_name = spec["class"]
+        self._origin = spec.get("origin")
+        self._tool: Optional[Tool] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> Tool:
+        """Imports the tool module and instantiates the real tool."""
+        if self._tool is None:
+            with self._load_lock:
+                if self._tool is None:
+                    module = _import_tool_module(self._module_name, self._origin)
+                    self._tool = getattr(module, self._class_name)()
+        return self._tool
+
+    def execute(self, **kwargs):
+        return self.load().execute(**kwargs)
+
+    def __getattr__(self, item):
+        # Only reached for attributes the manifest does not carry
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.load(), item)
+
 
 class ToolRegistry:
     _instance = None
@@ -13,6 +141,10 @@ class ToolRegistry:
             cls._instance = super(ToolRegistry, cls).__new__(cls)
             cls._instance._tools: Dict[str, Tool] = {}
             cls._instance._discovered = False
+            cls._instance._extra_dirs: List[Path] = []
+            cls._instance.manifest_path = Path(
+                os.getenv(MANIFEST_ENV, str(Path(__file__).parent / ".tool_manifest.json"))
+            )
         return cls._instance
 
     def register(self, tool: Tool) -> None:
@@ -29,43 +161,178 @@ class ToolRegistry:
             self.discover_tools()
         return self._tools
 
+    def add_tool_dir(self, path) -> None:
+        """Adds a directory of tool modules to scan on the next discovery."""
+        tool_dir = Path(path).resolve()
+        if tool_dir not in self._extra_dirs:
+            self._extra_dirs.append(tool_dir)
+            self._discovered = False
+
     def discover_tools(self) -> Dict[str, Tool]:
-        """Discover all available tools by scanning tool directories."""
+        """
+        Discover all available tools.
+
+        Tool metadata is read from the manifest for every module whose mtime and
+        size are unchanged, so those modules are not imported until one of their
+        tools is executed. Changed or new modules are imported and re-described;
+        a change to the shared modules (see _shared_stamp) re-describes them all.
+        """
         if self._discovered:
             return self._tools
 
+        shared = _shared_stamp()
+        cached = self._load_manifest(shared)
+        modules: Dict[str, Dict[str, Any]] = {}
+        persist = False
+
+        for key, stamp, load_specs in self._iter_sources():
+            entry = cached.get(key)
+            if entry is not None and entry.get("stamp") == stamp:
+                for spec in entry["tools"]:
+                    try:
+                        self._register_missing(LazyTool(spec))
+                    except (KeyError, TypeError) as e:
+                        print(f"Error loading manifest entry for {key}: {e}")
+                modules[key] = entry
+                continue
+
+            specs, instances = load_specs()
+            for tool_instance in instances:
+                self._register_missing(tool_instance)
+            if specs is not None:
+                modules[key] = {"stamp": stamp, "tools": specs}
+            persist = True
+
+        if persist or set(modules) != set(cached):
+            self._save_manifest(modules, shared)
+
+        self._discovered = True
+        print(f"Discovered tools: {list(self._tools.keys())}")
+        return self._tools
+
+    def _register_missing(self, tool: Tool) -> None:
+        # Directories are scanned in priority order; the first definition wins
+        if tool.name not in self._tools:
+            self.register(tool)
+
+    def _tool_dirs(self) -> List[Tuple[Path, Optional[str]]]:
+        """Returns (directory, package name) pairs; extra directories have no package."""
         tools_dir = Path(__file__).parent.parent
-        tool_dirs = [
-            tools_dir / "File",
-            tools_dir / "Special"
+        tool_dirs: List[Tuple[Path, Optional[str]]] = [
+            (tools_dir / "File", "Tools.File"),
+            (tools_dir / "Special", "Tools.Special"),
         ]
+        env_dirs = [Path(p).resolve() for p in os.getenv(TOOL_DIRS_ENV, "").split(os.pathsep) if p]
+        for extra_dir in self._extra_dirs + env_dirs:
+            if all(extra_dir != d for d, _ in tool_dirs):
+                tool_dirs.append((extra_dir, None))
+        return tool_dirs
 
-        for tool_dir in tool_dirs:
+    def _iter_sources(self) -> Iterator[Tuple[str, Any, Any]]:
+        """Yields (manifest key, freshness stamp, loader) for every tool source."""
+        for tool_dir, package_name in self._tool_dirs():
             if not tool_dir.exists() or not tool_dir.is_dir():
                 continue
 
-            package_name = f"Tools.{tool_dir.name}"
             for _, module_name, is_pkg in pkgutil.iter_modules([str(tool_dir)]):
                 if module_name.startswith("__") or is_pkg:
                     continue
+                module_path = tool_dir / f"{module_name}.py"
+                try:
+                    st = module_path.stat()
+                except OSError:
+                    continue
 
+                if package_name:
+                    full_name, origin = f"{package_name}.{module_name}", None
+                else:
+                    full_name, origin = f"agent_tools.{tool_dir.name}.{module_name}", str(module_path)
+
+                yield (
+                    full_name,
+                    [st.st_mtime_ns, st.st_size],
+                    lambda n=full_name, o=origin: self._inspect_module(n, o),
+                )
+
+        for entry_point in self._entry_points():
+            dist = getattr(entry_point, "dist", None)
+            version = getattr(dist, "version", None) if dist else None
+            yield (
+                f"entry_point:{entry_point.name}",
+                [entry_point.value, version],
+                lambda ep=entry_point: self._inspect_entry_point(ep),
+            )
+
+    def _entry_points(self) -> List[Any]:
+        try:
+            from importlib.metadata import entry_points
+            return list(entry_points(group=ENTRY_POINT_GROUP))
+        except Exception as e:
+            print(f"Error reading tool entry points: {e}")
+            return []
+
+    def _inspect_module(self, module_name: str, origin: Optional[str]):
+        """Imports a module and instantiates the tools it defines."""
+        try:
+            module = _import_tool_module(module_name, origin)
+        except ImportError as e:
+            print(f"Error importing module {module_name}: {e}")
+            return None, []
+
+        instances = []
+        for name, obj in inspect.getmembers(module):
+            if (inspect.isclass(obj)
+                and issubclass(obj, Tool)
+                and obj is not Tool
+                and obj.__module__ == module.__name__
+                and not inspect.isabstract(obj)):
                 try:
-                    module = importlib.import_module(f"{package_name}.{module_name}")
-                    
-                    for name, obj in inspect.getmembers(module):
-                        if (inspect.isclass(obj) 
-                            and issubclass(obj, Tool) 
-                            and obj is not Tool 
-                            and not inspect.isabstract(obj)):
-                            try:
-                                tool_instance = obj()
-                                self.register(tool_instance)
-                            except Exception as e:
-                                print(f"Error instantiating tool {name}: {e}")
-                                
-                except ImportError as e:
-                    print(f"Error importing module {module_name}: {e}")
+                    instances.append(obj())
+                except Exception as e:
+                    print(f"Error instantiating tool {name}: {e}")
+        return self._specs_for(instances, module_name, origin), instances
 
-        self._discovered = True
-        print(f"Discovered tools: {list(self._tools.keys())}")
-        return self._tools
\ No newline at end of file
+    def _inspect_entry_point(self, entry_point):
+        try:
+            obj = entry_point.load()
+            tool_instance = obj() if inspect.isclass(obj) else obj
+        except Exception as e:
+            print(f"Error loading tool entry point {entry_point.name}: {e}")
+            return None, []
+        if not isinstance(tool_instance, Tool):
+            print(f"Entry point {entry_point.name} does not provide a Tool")
+            return None, []
+        return self._specs_for([tool_instance], type(tool_instance).__module__, None), [tool_instance]
+
+    def _specs_for(self, instances: List[Tool], module_name: str, origin: Optional[str]):
+        specs = [_describe_tool(t, module_name, origin) for t in instances]
+        try:
+            json.dumps(specs)
+        except (TypeError, ValueError):
+            # Not representable in the manifest; the module is re-imported every start
+            return None
+        return specs
+
+    def _load_manifest(self, shared: List[List[Any]]) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION or data.get("shared") != shared:
+            return {}
+        return data.get("modules", {})
+
+    def _save_manifest(self, modules: Dict[str, Dict[str, Any]], shared: List[List[Any]]) -> None:
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "shared": shared, "modules": modules}, f)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            # A read-only install still works; it just re-imports on every start
+            print(f"Warning: Could not write tool manifest '{self.manifest_path}': {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,40 @@
+"""
+Which part of the file tree the indexed tools (search, bulk_replace) cover.
+
+Both index the session's workspace once and filter by path prefix, so an
+optional directory argument narrows the results without a second index.
+"""
+
+import os
+
+from Tools.base import ErrorCodes, ToolResult
+
+
+def workspace_root(context):
+    """The directory relative tool paths resolve against (ToolContext.resolve_path), so reported paths open as-is."""
+    return context.resolve_path(".")
+
+
+def resolve_scope(context, path_arg):
+    """
+    (index root, path prefix) for an optional directory argument, or a ToolResult error.
+
+    A directory inside the workspace is searched through the workspace index with
+    a prefix filter; one outside it gets an index of its own.
+    """
+    root = workspace_root(context)
+    prefix = ""
+    if path_arg:
+        target = context.resolve_path(path_arg)
+        if not os.path.isdir(target):
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Directory '{path_arg}' not found")
+        if os.path.commonpath([root, target]) == root:
+            prefix = os.path.relpath(target, root).replace(os.sep, '/')
+            prefix = "" if prefix == "." else prefix + "/"
+        else:
+            root = target
+    if not os.path.isdir(root):
+        return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                          message=f"Workspace root '{root}' not found")
+    return root, prefix
@@ -0,0 +1,282 @@
+"""
+Copy-on-write checkpoints of the files a session changes.
+
+The Executor opens a checkpoint before every tool whose config has
+`mutates_files`; the tool then calls `preserve(path)` for each path it is
+about to change. Only those paths are saved, once per checkpoint:
+
+- a file that will be replaced by a rename or deleted is hard-linked, which
+  copies no data (the tool never modifies that inode);
+- a file that will be modified in place (append, non-atomic write) is
+  copied with fastcopy, i.e. reflinked where the filesystem supports it;
+- a path that does not exist yet is recorded as absent, so restoring
+  removes whatever the tool created there.
+
+Saved copies live under the store's directory next to a journal
+(journal.jsonl, appended to as paths are saved and rewritten when
+checkpoints are dropped). `restore(checkpoint_id)` undoes that checkpoint
+and every later one, newest first, by renaming the saved copies back into
+place.
+
+Hard links and renames only work within one filesystem, so stores are kept
+on the workspace's filesystem (see snapshot_root()). Every session gets a
+store directory of its own, named after its session id plus a random
+suffix: a new run never inherits an old run's checkpoints, and two
+processes never write the same object names. The session's owner calls
+delete() when the session ends.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from Tools.Core.fastcopy import copy_file
+
+JOURNAL = "journal.jsonl"
+MAX_CHECKPOINTS = 50
+# Used inside the workspace when the cache directory is on another filesystem
+WORKSPACE_DIR_NAME = ".agent_snapshots"
+
+
+def snapshot_root(cache_dir: str, workspace: str) -> str:
+    """Parent directory for session stores: under cache_dir if it shares the workspace's filesystem."""
+    if _device(cache_dir) == _device(workspace):
+        return os.path.join(cache_dir, "snapshots")
+    return os.path.join(workspace, WORKSPACE_DIR_NAME)
+
+
+def _device(path: str) -> Optional[int]:
+    """st_dev of `path` or of its nearest existing ancestor."""
+    path = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+
+@dataclass
+class SnapshotEntry:
+    path: str
+    kind: str                       # "file", "dir" or "absent"
+    backup: Optional[str] = None    # Name of the saved copy inside the store
+
+
+@dataclass
+class Checkpoint:
+    id: int
+    label: str
+    created: float
+    entries: Dict[str, SnapshotEntry] = field(default_factory=dict)
+
+
+class SnapshotStore:
+    @classmethod
+    def for_session(cls, root: str, session_id: str) -> 'SnapshotStore':
+        """A store in a fresh directory under `root`, never shared with another session or process."""
+        return cls(os.path.join(root, f"{session_id}-{uuid.uuid4().hex[:12]}"))
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.checkpoints: List[Checkpoint] = []
+        self._next_object = 0
+        # The checkpoint started by this process's last checkpoint() call
+        self._open: Optional[Checkpoint] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    # --- Journal ---
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(os.path.join(self.directory, JOURNAL), encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        by_id = {}
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue    # A torn last line from a crash
+            if "checkpoint" in record:
+                checkpoint = Checkpoint(record["checkpoint"], record["label"], record["created"])
+                by_id[checkpoint.id] = checkpoint
+                self.checkpoints.append(checkpoint)
+            elif record.get("in") in by_id:
+                entry = SnapshotEntry(record["path"], record["kind"], record.get("backup"))
+                by_id[record["in"]].entries.setdefault(entry.path, entry)
+                if entry.backup:
+                    self._next_object = max(self._next_object, int(entry.backup) + 1)
+
+    def _append(self, *records) -> None:
+        os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+        with open(os.path.join(self.directory, JOURNAL), "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+    def _object_path(self, name: str) -> str:
+        return os.path.join(self.directory, "objects", name)
+
+    # --- Recording ---
+
+    def checkpoint(self, label: str) -> int:
+        """Starts a new checkpoint; paths preserved from now on belong to it."""
+        with self._lock:
+            self._load()
+            if self.checkpoints and not self.checkpoints[-1].entries:
+                # The previous tool call changed nothing; reuse its slot
+                self._drop([self.checkpoints.pop()])
+            checkpoint_id = self.checkpoints[-1].id + 1 if self.checkpoints else 1
+            checkpoint = Checkpoint(checkpoint_id, label, time.time())
+            self.checkpoints.append(checkpoint)
+            self._open = checkpoint
+            self._append({"checkpoint": checkpoint_id, "label": label, "created": checkpoint.created})
+            if len(self.checkpoints) > MAX_CHECKPOINTS:
+                excess = self.checkpoints[:len(self.checkpoints) - MAX_CHECKPOINTS]
+                del self.checkpoints[:len(excess)]
+                self._drop(excess)
+            return checkpoint_id
+
+    def preserve(self, path: str, in_place: bool = False) -> None:
+        """
+        Saves `path` as it is now into the open checkpoint, unless already saved there.
+
+        `in_place` says the caller will modify the existing file rather than
+        replace or delete it, which needs a real copy instead of a hard link.
+        Does nothing when no checkpoint is open.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            checkpoint = self._open
+            if checkpoint is None or path in checkpoint.entries:
+                return
+            if not os.path.lexists(path):
+                entry = SnapshotEntry(path, "absent")
+            else:
+                name = str(self._next_object)
+                self._next_object += 1
+                os.makedirs(os.path.join(self.directory, "objects"), exist_ok=True)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    _link_tree(path, self._object_path(name))
+                    entry = SnapshotEntry(path, "dir", name)
+                else:
+                    _save_file(path, self._object_path(name), in_place)
+                    entry = SnapshotEntry(path, "file", name)
+            checkpoint.entries[path] = entry
+            self._append({"in": checkpoint.id, "path": path, "kind": entry.kind, "backup": entry.backup})
+
+    def delete(self) -> None:
+        """Removes the store's directory with every checkpoint in it; for when the session ends."""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.checkpoints = []
+            self._open = None
+            self._next_object = 0
+            self._loaded = True
+
+    # --- Restoring ---
+
+    def list(self) -> List[Checkpoint]:
+        with self._lock:
+            self._load()
+            return [c for c in self.checkpoints if c.entries]
+
+    def restore(self, checkpoint_id: int) -> List[str]:
+        """
+        Puts every path back the way it was before checkpoint `checkpoint_id`,
+        undoing it and all later checkpoints. Returns the restored paths.
+        """
+        with self._lock:
+            self._load()
+            undone = [c for c in self.checkpoints if c.id >= checkpoint_id]
+            if not undone or undone[0].id != checkpoint_id:
+                raise KeyError(checkpoint_id)
+            restored = []
+            for checkpoint in reversed(undone):
+                for entry in checkpoint.entries.values():
+                    self._restore_entry(entry)
+                    if entry.path not in restored:
+                        restored.append(entry.path)
+            self.checkpoints = [c for c in self.checkpoints if c.id < checkpoint_id]
+            if self._open in undone:
+                self._open = None
+            self._drop(undone)
+            return restored
+
+    def _restore_entry(self, entry: SnapshotEntry) -> None:
+        backup = self._object_path(entry.backup) if entry.backup else None
+        if backup is not None and not os.path.lexists(backup):
+            raise FileNotFoundError(f"Snapshot copy of '{entry.path}' is missing")
+        if os.path.isdir(entry.path) and not os.path.islink(entry.path):
+            shutil.rmtree(entry.path)
+        elif os.path.lexists(entry.path):
+            os.unlink(entry.path)
+        if backup is None:
+            return
+        os.makedirs(os.path.dirname(entry.path), exist_ok=True)
+        # Renaming the saved inode back also restores its mtime, so caches see the old stamp
+        os.replace(backup, entry.path)
+
+    def _drop(self, checkpoints: List[Checkpoint]) -> None:
+        """Deletes the saved copies of `checkpoints` (already removed from the list) and rewrites the journal."""
+        for checkpoint in checkpoints:
+            for entry in checkpoint.entries.values():
+                if entry.backup:
+                    target = self._object_path(entry.backup)
+                    if os.path.isdir(target) and not os.path.islink(target):
+                        shutil.rmtree(target, ignore_errors=True)
+                    elif os.path.lexists(target):
+                        os.unlink(target)
+        records = []
+        for checkpoint in self.checkpoints:
+            records.append({"checkpoint": checkpoint.id, "label": checkpoint.label, "created": checkpoint.created})
+            records.extend({"in": checkpoint.id, "path": e.path, "kind": e.kind, "backup": e.backup}
+                           for e in checkpoint.entries.values())
+        os.makedirs(self.directory, exist_ok=True)
+        temp = os.path.join(self.directory, JOURNAL + ".tmp")
+        with open(temp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        os.replace(temp, os.path.join(self.directory, JOURNAL))
+
+
+def _save_file(path: str, target: str, in_place: bool) -> None:
+    if os.path.islink(path):
+        os.symlink(os.readlink(path), target)
+        return
+    if not in_place:
+        try:
+            os.link(path, target)
+            return
+        except OSError:
+            pass    # Another filesystem, or no hard links: fall back to a (reflinked) copy
+    copy_file(path, target)
+
+
+def _link_tree(source: str, target: str) -> None:
+    """Mirrors a directory with hard links (copies where linking fails)."""
+    copied_dirs = []
+    for root, dirs, files in os.walk(source):
+        rel = os.path.relpath(root, source)
+        dest_dir = target if rel == "." else os.path.join(target, rel)
+        os.makedirs(dest_dir, exist_ok=True)
+        copied_dirs.append((root, dest_dir))
+        for name in files:
+            _save_file(os.path.join(root, name), os.path.join(dest_dir, name), in_place=False)
+        for name in list(dirs):
+            if os.path.islink(os.path.join(root, name)):
+                os.symlink(os.readlink(os.path.join(root, name)), os.path.join(dest_dir, name))
+                dirs.remove(name)
+    for root, dest_dir in reversed(copied_dirs):
+        shutil.copystat(root, dest_dir)
@@ -0,0 +1,62 @@
+"""
+Large multi-line tool arguments, received while the model is still streaming.
+
+The tool-call parser writes each `<<<` block into a StreamedText as the lines
+arrive. Small blocks stay in memory and are handed to tools as plain strings;
+blocks over SPOOL_MAX_BYTES are spilled to an anonymous temporary file and
+passed on as the StreamedText itself, so a tool that supports it (see
+ToolConfig.accepts_streamed_text) can copy the content to its destination in
+chunks. For every other tool the Executor converts it back to a string.
+"""
+
+import codecs
+import tempfile
+from typing import Iterator, Optional
+
+SPOOL_MAX_BYTES = 1024 * 1024
+CHUNK_BYTES = 1024 * 1024
+
+
+class StreamedText:
+    def __init__(self, max_memory: Optional[int] = None):
+        self.max_memory = SPOOL_MAX_BYTES if max_memory is None else max_memory
+        self.size = 0               # UTF-8 bytes written so far
+        self._file = tempfile.SpooledTemporaryFile(max_size=self.max_memory, mode="w+b")
+
+    @property
+    def spilled(self) -> bool:
+        """True once the content no longer fits in memory and lives in a temporary file."""
+        return self.size > self.max_memory
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8", "surrogatepass")
+        self._file.write(data)
+        self.size += len(data)
+
+    def byte_chunks(self, size: int = CHUNK_BYTES) -> Iterator[bytes]:
+        """Yields the UTF-8 content from the start; each call rereads it."""
+        self._file.seek(0)
+        while True:
+            data = self._file.read(size)
+            if not data:
+                return
+            yield data
+
+    def chunks(self, size: int = CHUNK_BYTES) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8")("surrogatepass")
+        for data in self.byte_chunks(size):
+            text = decoder.decode(data)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __str__(self) -> str:
+        return "".join(self.chunks())
+
+    def __repr__(self) -> str:
+        return f"<StreamedText {self.size} bytes{' spilled' if self.spilled else ''}>"
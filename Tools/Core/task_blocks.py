@@ -0,0 +1,34 @@
+"""
+Parsing of the multi-task argument blocks used by delegate and submit_plan.
+
+Tasks are separated by lines containing only '---'; each may start with
+'key: value' header lines (e.g. `agent: worker`) before its description.
+"""
+
+SEPARATOR = "---"
+
+
+def split_blocks(text: str):
+    """The non-empty blocks of `text` between lines containing only '---'."""
+    blocks, block = [], []
+    for line in str(text).splitlines() + [SEPARATOR]:
+        if line.strip() != SEPARATOR:
+            block.append(line)
+            continue
+        body = "\n".join(block).strip()
+        block = []
+        if body:
+            blocks.append(body)
+    return blocks
+
+
+def split_headers(block: str, keys):
+    """Takes leading 'key: value' lines (for the given keys) off a block; returns (headers, rest)."""
+    headers, lines = {}, block.splitlines()
+    while lines:
+        key, sep, value = lines[0].partition(":")
+        if not sep or key.strip().lower() not in keys:
+            break
+        headers[key.strip().lower()] = value.strip()
+        lines.pop(0)
+    return headers, "\n".join(lines).strip()
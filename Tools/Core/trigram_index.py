@@ -0,0 +1,303 @@
+"""
+Persistent trigram index over the text files of a workspace.
+
+Every indexed file is reduced to the set of 3-byte sequences (trigrams) in its
+lowercased content. A query only has to scan the files that contain all of the
+trigrams of its literal parts; for typical code searches that is a handful of
+files out of many thousands.
+
+The index is refreshed incrementally: a refresh walks the tree with scandir,
+compares each file's (mtime, size) with the indexed one and re-reads only new
+or changed files. Entries of changed and deleted files are tombstoned, and the
+postings are compacted once tombstones outnumber a quarter of the live files.
+The index is saved as a sidecar in the tool cache directory and shared by
+every session in the process (see get_index).
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from Tools.Core.ignore import IgnoreMatcher
+
+MAX_FILE_BYTES = 2 * 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+_MAGIC = b"TRGM1"
+_HEADER = struct.Struct("<5sIII")       # magic, next id, file count, trigram count
+_FILE = struct.Struct("<IqqH")          # id, mtime_ns, size, path length
+_POSTING = struct.Struct("<3sI")        # trigram, id count
+
+
+def trigrams(data: bytes) -> Set[bytes]:
+    """The distinct trigrams of `data`, ASCII-lowercased like the index."""
+    data = data.lower()
+    return {data[i:i + 3] for i in range(len(data) - 2)}
+
+
+class FileRecord:
+    __slots__ = ("id", "mtime_ns", "size")
+
+    def __init__(self, file_id: int, mtime_ns: int, size: int):
+        self.id = file_id
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+
+class TrigramIndex:
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = root
+        self.index_path = index_path
+        self.files: Dict[str, FileRecord] = {}
+        self.paths: Dict[int, str] = {}
+        self.postings: Dict[bytes, Set[int]] = {}
+        self.next_id = 0
+        self._lock = threading.RLock()
+
+    # --- Maintenance ---
+
+    def _walk(self) -> Iterator[Tuple[str, os.DirEntry]]:
+        """(relative path, entry) of every candidate file; hidden and .gitignored paths are skipped."""
+        ignore = IgnoreMatcher(self.root)
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            ignore.enter(rel_dir)
+            try:
+                with os.scandir(os.path.join(self.root, rel_dir) if rel_dir else self.root) as it:
+                    entries = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    is_file = not is_dir and entry.is_file(follow_symlinks=False)
+                except OSError:
+                    continue
+                if ignore.is_ignored(rel, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append(rel)
+                elif is_file:
+                    yield rel, entry
+            # Depth-first, so the ignore matcher's directory stack stays valid
+            stack.extend(reversed(subdirs))
+
+    def _add(self, rel: str, mtime_ns: int, size: int) -> None:
+        file_id = self.next_id
+        self.next_id += 1
+        self.files[rel] = FileRecord(file_id, mtime_ns, size)
+        self.paths[file_id] = rel
+        if size > MAX_FILE_BYTES:
+            return
+        try:
+            with open(os.path.join(self.root, rel), "rb") as f:
+                data = f.read(MAX_FILE_BYTES + 1)
+        except OSError:
+            return
+        if b"\x00" in data[:BINARY_SNIFF_BYTES] or len(data) > MAX_FILE_BYTES:
+            return
+        postings = self.postings
+        for gram in trigrams(data):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {file_id}
+            else:
+                ids.add(file_id)
+
+    def _remove(self, rel: str) -> None:
+        record = self.files.pop(rel)
+        # The id stays in the postings as a tombstone until the next compaction
+        self.paths.pop(record.id, None)
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Brings the index up to date with the tree; returns (files reindexed, files removed).
+
+        Costs one scandir per directory and one stat per file; only changed files are read.
+        """
+        with self._lock:
+            seen = set()
+            changed = removed = 0
+            for rel, entry in self._walk():
+                seen.add(rel)
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                record = self.files.get(rel)
+                if record is not None and record.mtime_ns == st.st_mtime_ns and record.size == st.st_size:
+                    continue
+                if record is not None:
+                    self._remove(rel)
+                self._add(rel, st.st_mtime_ns, st.st_size)
+                changed += 1
+            for rel in [rel for rel in self.files if rel not in seen]:
+                self._remove(rel)
+                removed += 1
+            if self.next_id - len(self.files) > max(len(self.files) // 4, 64):
+                self._compact()
+            if (changed or removed) and self.index_path:
+                try:
+                    self.save()
+                except OSError as e:
+                    print(f"Warning: Could not save search index for '{self.root}': {e}")
+            return changed, removed
+
+    def _compact(self) -> None:
+        """Drops tombstoned ids and renumbers files densely."""
+        renumber = {old: new for new, old in enumerate(sorted(self.paths))}
+        postings = {}
+        for gram, ids in self.postings.items():
+            live = {renumber[i] for i in ids if i in renumber}
+            if live:
+                postings[gram] = live
+        self.postings = postings
+        self.paths = {renumber[i]: rel for i, rel in self.paths.items()}
+        for record in self.files.values():
+            record.id = renumber[record.id]
+        self.next_id = len(renumber)
+
+    # --- Queries ---
+
+    def candidates(self, required: Iterable[bytes]) -> List[str]:
+        """
+        Paths of live files that contain every trigram of every required literal.
+
+        Literals shorter than three bytes cannot narrow the search and are ignored;
+        with nothing to narrow by, every indexed file is a candidate.
+        """
+        with self._lock:
+            sets = []
+            for literal in required:
+                for gram in trigrams(literal):
+                    sets.append(self.postings.get(gram, set()))
+            if not sets:
+                return sorted(self.files)
+            sets.sort(key=len)
+            result = set(sets[0])
+            for ids in sets[1:]:
+                result &= ids
+                if not result:
+                    break
+            return sorted(self.paths[i] for i in result if i in self.paths)
+
+    def oversized(self) -> List[str]:
+        """Paths of files too large to index; trigrams cannot rule them out."""
+        with self._lock:
+            return sorted(rel for rel, record in self.files.items() if record.size > MAX_FILE_BYTES)
+
+    # --- Persistence ---
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, self.next_id, len(self.files), len(self.postings)))
+                for rel, record in self.files.items():
+                    encoded = rel.encode("utf-8", "surrogateescape")
+                    f.write(_FILE.pack(record.id, record.mtime_ns, record.size, len(encoded)))
+                    f.write(encoded)
+                for gram, ids in self.postings.items():
+                    f.write(_POSTING.pack(gram, len(ids)))
+                    array("I", sorted(ids)).tofile(f)
+            os.replace(tmp, self.index_path)
+
+    @classmethod
+    def load(cls, root: str, index_path: str) -> Optional["TrigramIndex"]:
+        """Loads a saved index; None if missing or unreadable (the caller rebuilds it)."""
+        index = cls(root, index_path)
+        try:
+            with open(index_path, "rb") as f:
+                magic, next_id, file_count, gram_count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return None
+                for _ in range(file_count):
+                    file_id, mtime_ns, size, length = _FILE.unpack(f.read(_FILE.size))
+                    rel = f.read(length).decode("utf-8", "surrogateescape")
+                    index.files[rel] = FileRecord(file_id, mtime_ns, size)
+                    index.paths[file_id] = rel
+                for _ in range(gram_count):
+                    gram, count = _POSTING.unpack(f.read(_POSTING.size))
+                    ids = array("I")
+                    ids.fromfile(f, count)
+                    index.postings[gram] = set(ids)
+        except (OSError, EOFError, struct.error, UnicodeDecodeError):
+            return None
+        index.next_id = next_id
+        return index
+
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre_constants
+except ImportError:     # Python < 3.11
+    import sre_parse as _sre_parse, sre_constants as _sre_constants
+
+
+def regex_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Literal runs that every match of `pattern` must contain.
+
+    Only the top-level sequence is analysed (plus groups that are part of it);
+    alternations, optional parts and character classes end a run. The result is
+    a necessary condition for a match, used to pick candidate files.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except Exception:
+        return []
+    runs: List[str] = []
+    current: List[str] = []
+
+    def end_run():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    def visit(items):
+        for op, arg in items:
+            if op is _sre_constants.LITERAL:
+                current.append(chr(arg))
+            elif op is _sre_constants.SUBPATTERN:
+                visit(arg[-1])
+            elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+                low, _, sub = arg
+                end_run()
+                if low >= 1:
+                    visit(sub)
+                end_run()
+            elif op is _sre_constants.AT:
+                continue
+            else:
+                end_run()
+
+    visit(parsed)
+    end_run()
+    return [run for run in runs if len(run) >= 3]
+
+
+_indexes: Dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def index_path_for(cache_dir: str, root: str) -> str:
+    name = hashlib.blake2b(root.encode("utf-8", "surrogateescape"), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, "trigram", f"{name}.idx")
+
+
+def get_index(root: str, cache_dir: str) -> TrigramIndex:
+    """The process-wide index of `root`, loaded from its sidecar or created empty (refresh fills it)."""
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            path = index_path_for(cache_dir, root)
+            index = TrigramIndex.load(root, path) or TrigramIndex(root, path)
+            _indexes[root] = index
+        return index
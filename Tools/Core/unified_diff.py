@@ -0,0 +1,290 @@
+"""
+Unified diff parsing and fuzzy hunk application for patch_file.
+
+Hunks are located by their content, not only by the line numbers in their
+header: the search starts at the expected line and moves outwards, first for an
+exact match, then ignoring whitespace, then with up to `fuzz` context lines
+dropped from either end (like GNU patch). Headers without line numbers
+("@@ ... @@") are accepted, which is what models often produce.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_METADATA_PREFIXES = ("diff ", "index ", "new file mode", "deleted file mode", "old mode", "new mode",
+                      "similarity index", "rename from", "rename to", "Binary files", "Index: ", "===")
+
+
+class DiffParseError(ValueError):
+    pass
+
+
+@dataclass
+class Hunk:
+    old_start: Optional[int]            # 1-based; None when the header had no line numbers
+    old_count: Optional[int]
+    lines: List[Tuple[str, str]] = field(default_factory=list)     # (' ' | '-' | '+', text)
+    old_missing_newline: bool = False
+    new_missing_newline: bool = False
+
+    @property
+    def old_lines(self) -> List[str]:
+        return [text for tag, text in self.lines if tag != "+"]
+
+    @property
+    def new_lines(self) -> List[str]:
+        return [text for tag, text in self.lines if tag != "-"]
+
+
+@dataclass
+class FilePatch:
+    old_path: Optional[str]             # None for /dev/null (file creation)
+    new_path: Optional[str]             # None for /dev/null (file deletion)
+    hunks: List[Hunk] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        return self.new_path if self.new_path is not None else self.old_path
+
+
+def _header_path(value: str) -> Optional[str]:
+    path = value.split("\t", 1)[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(text: str, default_path: Optional[str] = None) -> List[FilePatch]:
+    """
+    Parses a unified diff into per-file patches.
+
+    Hunks before any ---/+++ header apply to `default_path`. Hunk line counts
+    are not trusted; a hunk ends at the next header or non-diff line.
+    """
+    lines = [line[:-1] if line.endswith("\r") else line for line in text.split("\n")]
+    patches: List[FilePatch] = []
+    current: Optional[FilePatch] = None
+    hunk: Optional[Hunk] = None
+
+    def close_hunk():
+        nonlocal hunk
+        if hunk is not None:
+            # Blank lines after a hunk are separators, not empty context lines
+            while hunk.lines and hunk.lines[-1] is _BLANK:
+                hunk.lines.pop()
+            if not hunk.lines:
+                raise DiffParseError("Empty hunk")
+        hunk = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            close_hunk()
+            current = FilePatch(_header_path(line[4:]), _header_path(lines[i + 1][4:]))
+            if current.path is None:
+                raise DiffParseError("Both sides of a file header are /dev/null")
+            patches.append(current)
+            i += 2
+            continue
+        if line.startswith("@@"):
+            close_hunk()
+            if current is None:
+                if default_path is None:
+                    raise DiffParseError("Hunk without a ---/+++ file header; pass the target path")
+                current = FilePatch(default_path, default_path)
+                patches.append(current)
+            m = _HUNK_HEADER.match(line)
+            if m:
+                hunk = Hunk(int(m.group(1)), int(m.group(2)) if m.group(2) is not None else 1)
+            else:
+                hunk = Hunk(None, None)
+            current.hunks.append(hunk)
+            i += 1
+            continue
+        if hunk is not None:
+            if line == "":
+                hunk.lines.append(_BLANK)
+            elif line[0] in " -+":
+                hunk.lines.append((line[0], line[1:]))
+            elif line.startswith("\\"):
+                # "\ No newline at end of file" refers to the line before it
+                if hunk.lines:
+                    tag = hunk.lines[-1][0]
+                    if tag != "+":
+                        hunk.old_missing_newline = True
+                    if tag != "-":
+                        hunk.new_missing_newline = True
+            else:
+                close_hunk()
+            i += 1
+            continue
+        if line.strip() and not line.startswith(_METADATA_PREFIXES) and current is not None:
+            raise DiffParseError(f"Unexpected line in diff: {line!r}")
+        i += 1
+    close_hunk()
+
+    if not patches or not any(p.hunks for p in patches):
+        raise DiffParseError("No hunks found")
+    for patch in patches:
+        if not patch.hunks and patch.old_path is not None and patch.new_path is not None:
+            raise DiffParseError(f"No hunks for '{patch.path}'")
+    return patches
+
+
+# A raw empty line inside a hunk: an empty context line whose leading space was lost
+_BLANK = (" ", "")
+
+
+def _normalize_whitespace(line: str) -> str:
+    return " ".join(line.split())
+
+
+@dataclass
+class HunkResult:
+    index: int                          # 1-based position in the file's patch
+    applied: bool
+    line: Optional[int] = None          # 1-based line where the hunk was applied
+    offset: int = 0
+    fuzz: int = 0
+    ignored_whitespace: bool = False
+    expected: Optional[int] = None
+
+    def describe(self) -> str:
+        if not self.applied:
+            near = f" (expected near line {self.expected})" if self.expected is not None else ""
+            return f"Hunk {self.index}: FAILED - context not found{near}"
+        notes = []
+        if self.offset:
+            notes.append(f"offset {self.offset:+d} lines")
+        if self.fuzz:
+            notes.append(f"fuzz {self.fuzz}")
+        if self.ignored_whitespace:
+            notes.append("ignoring whitespace")
+        suffix = f" ({', '.join(notes)})" if notes else ""
+        return f"Hunk {self.index}: applied at line {self.line}{suffix}"
+
+
+def _trim_context(lines: List[Tuple[str, str]], fuzz: int) -> Optional[Tuple[int, int]]:
+    """Drops up to `fuzz` context lines from each end; None if nothing would be left to anchor on."""
+    start, end = 0, len(lines)
+    for _ in range(fuzz):
+        if start < end and lines[start][0] == " ":
+            start += 1
+    for _ in range(fuzz):
+        if end > start and lines[end - 1][0] == " ":
+            end -= 1
+    if not any(tag != "+" for tag, _ in lines[start:end]):
+        return None
+    return start, end
+
+
+def _find(lines: List[str], old: List[str], norm: Callable[[str], str],
+          hint: int, floor: int) -> Optional[int]:
+    """
+    Start of the match of `old` in `lines`: nearest to `hint` at or after `floor`
+    (where the previous hunk ended), or without a hint the first at/after `floor`.
+    """
+    # Anchor on the most distinctive line, then verify each candidate around it
+    anchor = max(range(len(old)), key=lambda k: len(old[k].strip()))
+    target = norm(old[anchor])
+    wanted = [norm(line) for line in old]
+    candidates = []
+    for p, line in enumerate(lines):
+        if norm(line) == target:
+            pos = p - anchor
+            if 0 <= pos <= len(lines) - len(old) and \
+                    all(norm(lines[pos + k]) == wanted[k] for k in range(len(old))):
+                candidates.append(pos)
+    if not candidates:
+        return None
+    if hint < 0:
+        after = [pos for pos in candidates if pos >= floor]
+        return after[0] if after else candidates[0]
+    # Hunks apply in order, so never before (or inside) what an earlier hunk rewrote
+    after = [pos for pos in candidates if pos >= floor]
+    if not after:
+        return None
+    return min(after, key=lambda pos: (abs(pos - hint), pos))
+
+
+def apply_hunks(lines: List[str], hunks: List[Hunk], fuzz: int = 2) -> Tuple[List[str], List[HunkResult], Dict[str, bool]]:
+    """
+    Applies `hunks` in order to `lines` (without line endings).
+
+    Returns the new lines, one result per hunk, and end-of-file newline changes
+    ({'missing_newline': bool} when a hunk that reached the end said so).
+    """
+    lines = list(lines)
+    results: List[HunkResult] = []
+    eof: Dict[str, bool] = {}
+    delta = 0
+    floor = 0
+    for index, hunk in enumerate(hunks, 1):
+        expected = None if hunk.old_start is None else hunk.old_start + delta
+        if not hunk.old_lines:
+            # Pure insertion: only the header says where
+            if hunk.old_start is None and lines:
+                results.append(HunkResult(index, False))
+                continue
+            pos = 0 if hunk.old_start is None else min(max(hunk.old_start + delta - (hunk.old_count != 0), 0), len(lines))
+            new = hunk.new_lines
+            lines[pos:pos] = new
+            results.append(HunkResult(index, True, line=pos + 1))
+            delta += len(new)
+            floor = pos + len(new)
+            if pos + len(new) == len(lines) and (hunk.old_missing_newline or hunk.new_missing_newline):
+                eof["missing_newline"] = hunk.new_missing_newline
+            continue
+
+        hint = -1 if expected is None else expected - 1
+        found = None
+        tried = set()
+        for level in range(max(fuzz, 0) + 1):
+            span = _trim_context(hunk.lines, level)
+            if span is None:
+                break
+            if span in tried:
+                continue
+            tried.add(span)
+            start, end = span
+            trimmed = hunk.lines[start:end]
+            old = [text for tag, text in trimmed if tag != "+"]
+            lead = sum(1 for tag, _ in hunk.lines[:start] if tag != "+")
+            for ignore_ws, norm in ((False, lambda s: s), (True, _normalize_whitespace)):
+                pos = _find(lines, old, norm, hint + lead if hint >= 0 else -1, floor)
+                if pos is not None:
+                    found = (pos, trimmed, old, level, ignore_ws, lead)
+                    break
+            if found:
+                break
+        if found is None:
+            results.append(HunkResult(index, False, expected=expected))
+            continue
+
+        pos, trimmed, old, level, ignore_ws, lead = found
+        # Context lines keep the file's own text, which matters when whitespace was ignored
+        replacement = []
+        cursor = pos
+        for tag, text in trimmed:
+            if tag == " ":
+                replacement.append(lines[cursor])
+                cursor += 1
+            elif tag == "-":
+                cursor += 1
+            else:
+                replacement.append(text)
+        at_end = pos + len(old) == len(lines)
+        lines[pos:pos + len(old)] = replacement
+        offset = 0 if expected is None else (pos - lead + 1) - expected
+        results.append(HunkResult(index, True, line=pos - lead + 1, offset=offset, fuzz=level,
+                                  ignored_whitespace=ignore_ws))
+        delta += len(replacement) - len(old)
+        floor = pos + len(replacement)
+        if at_end and (hunk.old_missing_newline or hunk.new_missing_newline):
+            eof["missing_newline"] = hunk.new_missing_newline
+    return lines, results, eof
@@ -1,6 +1,28 @@
-from Tools.File.read import ReadFile
-from Tools.File.edit import EditFile
-from Tools.File.delete import DeleteFile
-from Tools.File.write import WriteFile
+import importlib
 
-__all__ = ['ReadFile', 'EditFile', 'DeleteFile', 'WriteFile']
+# Tool modules are imported on first attribute access (see Tools/__init__.py)
+_LAZY_EXPORTS = {
+    'ReadFile': 'Tools.File.read',
+    'EditFile': 'Tools.File.edit',
+    'PatchFile': 'Tools.File.patch',
+    'DeleteFile': 'Tools.File.delete',
+    'WriteFile': 'Tools.File.write',
+    'SearchFiles': 'Tools.File.search',
+    'OutlineFile': 'Tools.File.outline',
+    'BulkReplace': 'Tools.File.bulk_replace',
+    'ReadManyFiles': 'Tools.File.read_many',
+    'CopyFile': 'Tools.File.copy',
+    'MoveFile': 'Tools.File.move',
+    'RestoreCheckpoint': 'Tools.File.restore',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+__all__ = ['ReadFile', 'EditFile', 'PatchFile', 'DeleteFile', 'WriteFile', 'SearchFiles', 'OutlineFile',
+           'BulkReplace', 'ReadManyFiles', 'CopyFile', 'MoveFile', 'RestoreCheckpoint']
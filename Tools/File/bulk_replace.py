@@ -0,0 +1,290 @@
+import multiprocessing
+import os
+import re
+import secrets
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.atomic import fsync_directory, write_staged
+from Tools.Core.file_cache import FileStamp
+from Tools.Core.ignore import IgnoreRule, split_patterns
+from Tools.Core.search_scope import resolve_scope
+from Tools.Core.trigram_index import BINARY_SNIFF_BYTES, get_index, regex_literals
+
+try:
+    from re import _parser as _sre_parse
+except ImportError:     # Python < 3.11
+    import sre_parse as _sre_parse
+
+# Fewer candidate files than this are processed in-process; a pool costs more than it saves
+PARALLEL_MIN_FILES = 16
+BATCH_FILES = 32
+MAX_LISTED_FILES = 50
+PREVIEW_LINES = 3
+
+# Shared by every call. Spawned rather than forked: tools run on worker threads,
+# and forking a threaded process can copy locks held by other threads.
+_pool = None
+_pool_lock = threading.Lock()
+
+def _shared_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+@lru_cache(maxsize=8)
+def _compile(pattern, flags):
+    return re.compile(pattern, flags)
+
+def _process_file(path, spec):
+    """
+    Runs the replacement on one file. Returns (count, stamp, staged temp path, previews, error).
+
+    With spec['write'] the new content is staged next to the file; the caller commits it.
+    """
+    matcher = _compile(spec['pattern'], spec['flags'])
+    replacement = spec['replacement']
+    if not spec['regex']:
+        replacement = replacement.replace('\\', '\\\\')
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+            stamp = FileStamp.from_stat(os.fstat(f.fileno()))
+    except OSError as e:
+        return 0, None, None, [], str(e)
+    if b'\x00' in data[:BINARY_SNIFF_BYTES]:
+        return 0, stamp, None, [], None
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return 0, stamp, None, [], "not valid UTF-8"
+    new_text, count = matcher.subn(replacement, text)
+    if not count:
+        return 0, stamp, None, [], None
+
+    previews = []
+    for m in matcher.finditer(text):
+        if len(previews) == PREVIEW_LINES:
+            break
+        line_start = text.rfind('\n', 0, m.start()) + 1
+        line_end = text.find('\n', m.end())
+        line = text[line_start:line_end if line_end != -1 else len(text)]
+        line_no = text.count('\n', 0, line_start) + 1
+        if previews and previews[-1][0] == line_no:
+            continue
+        previews.append((line_no, line.rstrip('\r'), matcher.sub(replacement, line).rstrip('\r')))
+
+    temp_path = None
+    if spec['write']:
+        try:
+            temp_path = write_staged(path, new_text.encode('utf-8'), fsync=spec['fsync'])
+        except OSError as e:
+            return count, stamp, None, previews, str(e)
+    return count, stamp, temp_path, previews, None
+
+def _process_batch(root, rels, spec):
+    return [(rel,) + _process_file(os.path.join(root, rel), spec) for rel in rels]
+
+class BulkReplace(Tool):
+    def __init__(self):
+        super().__init__(
+            name="bulk_replace",
+            description="Replaces text across many files at once; shows a dry run unless dry_run is false",
+            args=[
+                Argument("find", ArgumentType.STRING, "Text or regular expression to replace"),
+                Argument("replace", ArgumentType.STRING, "Replacement text (\\1 or \\g<name> for regex groups)"),
+                Argument("regex", ArgumentType.BOOLEAN, "Treat find as a regular expression",
+                         optional=True, default=False),
+                Argument("glob", ArgumentType.STRING,
+                         "Comma-separated file patterns to include, e.g. '*.py, src/**'", optional=True, default=None),
+                Argument("path", ArgumentType.FILEPATH, "Only change files below this directory",
+                         optional=True, default=None),
+                Argument("case_sensitive", ArgumentType.BOOLEAN, "Match case", optional=True, default=True),
+                Argument("dry_run", ArgumentType.BOOLEAN,
+                         "Only report what would change; set to false to apply", optional=True, default=True)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        find = str(args['find'] or '')
+        if not find:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="find must not be empty")
+        is_regex = to_bool(args['regex'])
+        flags = re.MULTILINE | (0 if to_bool(args['case_sensitive']) else re.IGNORECASE)
+        pattern = find if is_regex else re.escape(find)
+        try:
+            compiled = re.compile(pattern, flags)
+            if is_regex:
+                _sre_parse.parse_template(str(args['replace'] or ''), compiled)
+        except re.error as e:
+            return ToolResult(success=False, code=ErrorCodes.MALFORMED_ARGUMENT, message=f"Invalid regex: {e}")
+        dry_run = to_bool(args['dry_run'])
+
+        scope = resolve_scope(context, args.get('path'))
+        if isinstance(scope, ToolResult):
+            return scope
+        root, prefix = scope
+        globs = [IgnoreRule(p) for p in split_patterns(args.get('glob'))]
+        index = get_index(root, context.cache_dir)
+        index.refresh()
+        literals = regex_literals(find, flags) if is_regex else [find]
+        if flags & re.IGNORECASE:
+            literals = [lit for lit in literals if lit.isascii()]
+        candidates = sorted(set(index.candidates(lit.encode('utf-8') for lit in literals)) | set(index.oversized()))
+        candidates = [rel for rel in candidates
+                      if rel.startswith(prefix) and (not globs or any(g.matches(rel, False) for g in globs))]
+
+        spec = {'pattern': pattern, 'flags': flags, 'replacement': str(args['replace'] or ''),
+                'regex': is_regex, 'write': not dry_run, 'fsync': True}
+        outcomes = self._process(root, candidates, spec)
+        changed = [o for o in outcomes if o[1]]
+        skipped = [(rel, error) for rel, count, _, _, _, error in outcomes if error and not count]
+        total = sum(o[1] for o in changed)
+
+        # A file that matched but could not be staged fails the whole run; unreadable files are skipped
+        fatal = [(rel, error) for rel, count, _, _, _, error in changed if error]
+        if fatal:
+            self._discard(changed)
+            details = "\n".join(f"  {rel}: {error}" for rel, error in fatal)
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Replacement failed; no files were changed:\n{details}")
+        if not changed:
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message=f"No matches for '{find}' ({len(candidates)} candidate files checked)")
+
+        if dry_run:
+            header = (f"Dry run: would replace {total} occurrences in {len(changed)} files "
+                      f"(run again with dry_run: false to apply):")
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message=self._report(header, changed, skipped, previews=True))
+
+        try:
+            self._commit(context, root, changed)
+        except _Conflict as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"'{e}' changed while the replacement ran; no files were changed")
+        except OSError as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Replacement failed and was rolled back; no files were changed: {e}")
+        header = f"Replaced {total} occurrences in {len(changed)} files:"
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                          message=self._report(header, changed, skipped, previews=False))
+
+    def _process(self, root, candidates, spec):
+        """Outcomes (rel, count, stamp, temp path, previews, error) of every candidate, in path order."""
+        if len(candidates) < PARALLEL_MIN_FILES:
+            return _process_batch(root, candidates, spec)
+        batches = [candidates[i:i + BATCH_FILES] for i in range(0, len(candidates), BATCH_FILES)]
+        pool = _shared_pool()
+        outcomes = []
+        try:
+            for batch in pool.map(_process_batch, [root] * len(batches), batches, [spec] * len(batches)):
+                outcomes.extend(batch)
+        except BrokenProcessPool:
+            # A worker died; the next call starts a fresh pool
+            _discard_pool(pool)
+            raise
+        return outcomes
+
+    def _discard(self, changed):
+        for _, _, _, temp_path, _, _ in changed:
+            if temp_path:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+    def _commit(self, context, root, changed):
+        """
+        Swaps every staged file into place. Each original is kept as a hard-linked
+        backup until all swaps succeed; on any failure the originals are restored.
+        """
+        for rel, _, stamp, _, _, _ in changed:
+            try:
+                current = FileStamp.from_stat(os.stat(os.path.join(root, rel)))
+            except OSError:
+                current = None
+            if current != stamp:
+                self._discard(changed)
+                raise _Conflict(rel)
+
+        swapped = []
+        try:
+            for rel, _, _, temp_path, _, _ in changed:
+                path = os.path.join(root, rel)
+                context.snapshots.preserve(path)
+                backup = _backup(path)
+                try:
+                    os.replace(temp_path, path)
+                except BaseException:
+                    # Still the same file as `path`, which is untouched
+                    os.unlink(backup)
+                    raise
+                swapped.append((path, backup))
+                context.files.invalidate(path)
+        except BaseException:
+            for path, backup in reversed(swapped):
+                try:
+                    os.replace(backup, path)
+                except OSError as e:
+                    print(f"Warning: Could not restore '{path}' after a failed bulk replace: {e}")
+                context.files.invalidate(path)
+            self._discard(changed)
+            raise
+        for path, backup in swapped:
+            try:
+                os.unlink(backup)
+            except OSError:
+                pass
+        for directory in {os.path.dirname(path) for path, _ in swapped}:
+            fsync_directory(directory)
+
+    def _report(self, header, changed, skipped, previews):
+        lines = [header]
+        for rel, count, _, _, file_previews, _ in changed[:MAX_LISTED_FILES]:
+            lines.append(f"{rel} ({count})")
+            if previews:
+                for line_no, old, new in file_previews:
+                    lines.append(f"  {line_no}: - {old.strip()}")
+                    lines.append(f"  {' ' * len(str(line_no))}  + {new.strip()}")
+        if len(changed) > MAX_LISTED_FILES:
+            lines.append(f"... and {len(changed) - MAX_LISTED_FILES} more files")
+        if skipped:
+            lines.append(f"Skipped {len(skipped)} files: "
+                         + ", ".join(f"{rel} ({error})" for rel, error in skipped[:10]))
+        return "\n".join(lines)
+
+class _Conflict(Exception):
+    """A file changed between scanning and committing."""
+
+def _backup(path):
+    """Hard-links (or copies) `path` to a unique hidden name beside it; returns the backup's name."""
+    directory, name = os.path.split(path)
+    for _ in range(100):
+        backup = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.bak")
+        try:
+            os.link(path, backup)
+            return backup
+        except FileExistsError:
+            continue
+        except OSError:
+            shutil.copy2(path, backup)
+            return backup
+    raise FileExistsError(f"Could not create a backup of '{path}'")
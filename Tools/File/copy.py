@@ -0,0 +1,68 @@
+import os
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.fastcopy import copy_file, copy_tree, resolve_destination
+
+class CopyFile(Tool):
+    def __init__(self):
+        super().__init__(
+            name="copy_file",
+            description="Copies a file or directory on disk without reading it into the conversation",
+            args=[
+                Argument("source", ArgumentType.FILEPATH, "File or directory to copy"),
+                Argument("destination", ArgumentType.FILEPATH,
+                         "New path, or an existing directory to copy into"),
+                Argument("recursive", ArgumentType.BOOLEAN, "Required to copy a directory",
+                         optional=True, default=False),
+                Argument("overwrite", ArgumentType.BOOLEAN, "Replace an existing destination",
+                         optional=True, default=False)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        source = context.resolve_path(args['source'])
+        if not os.path.exists(source):
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Source '{args['source']}' does not exist")
+        is_dir = os.path.isdir(source)
+        if is_dir and not to_bool(args['recursive']):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message=f"'{args['source']}' is a directory; use recursive: true to copy it")
+        destination = resolve_destination(source, context.resolve_path(args['destination']))
+        if os.path.exists(destination):
+            if os.path.samefile(source, destination):
+                return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                                  message="Source and destination are the same file")
+            if not to_bool(args['overwrite']):
+                return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
+                                  message=f"'{destination}' already exists and overwrite=False")
+            if os.path.isdir(destination) != is_dir:
+                return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
+                                  message=f"Cannot replace '{destination}' with a "
+                                          f"{'directory' if is_dir else 'file'}")
+        if is_dir and (destination + os.sep).startswith(source + os.sep):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Cannot copy a directory into itself")
+        parent = os.path.dirname(destination) or '.'
+        if not os.path.isdir(parent):
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Directory '{parent}' does not exist")
+
+        try:
+            context.snapshots.preserve(destination)
+            if is_dir:
+                files, size, methods = copy_tree(source, destination)
+                how = ", ".join(f"{method}: {count}" for method, count in methods.most_common())
+                message = (f"Copied directory '{args['source']}' to '{destination}' "
+                           f"({files} files, {size:,} bytes{'; ' + how if how else ''})")
+            else:
+                size, method = copy_file(source, destination)
+                context.files.invalidate(destination)
+                message = f"Copied '{args['source']}' to '{destination}' ({size:,} bytes, {method})"
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=message)
+        except PermissionError as e:
+            return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED, message=str(e))
+        except OSError as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED, message=str(e))
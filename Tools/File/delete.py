@@ -1,5 +1,6 @@
 import os
 from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+from Tools.context import current_context
 
 class DeleteFile(Tool):
     def __init__(self):
@@ -10,7 +11,7 @@ class DeleteFile(Tool):
                 Argument("filename", ArgumentType.FILEPATH, "File path"),
                 Argument("force", ArgumentType.BOOLEAN, "Force delete", optional=True, default=False)
             ],
-            config=ToolConfig(test_mode=True, needs_sudo=False)
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
         )
 
     def execute(self, **kwargs):
@@ -25,21 +26,24 @@ class DeleteFile(Tool):
 
 
     def _run(self, args):
-        if not os.path.exists(args['filename']):
+        context = current_context()
+        path = context.resolve_path(args['filename'])
+        if not os.path.exists(path):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND, 
                               message=f"File '{args['filename']}' does not exist")
-        if os.path.isdir(args['filename']):
+        if os.path.isdir(path):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
                               message=f"'{args['filename']}' is a directory")
         
         # Check if the parent directory is writable
-        parent_dir = os.path.dirname(args['filename'])
+        parent_dir = os.path.dirname(path)
         if not os.access(parent_dir, os.W_OK):
             return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
                               message=f"No write permission for '{args['filename']}'")
         
         try:
-            os.remove(args['filename'])
+            context.snapshots.preserve(path)
+            os.remove(path)
             return ToolResult(success=True, code=ErrorCodes.SUCCESS,
                               message=f"File '{args['filename']}' deleted successfully")
         except PermissionError as pe:
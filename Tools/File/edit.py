@@ -1,8 +1,23 @@
+import io
 import os
-import re
+import stat
 import json
 from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
-from Tools.File.read import ReadFile
+from Tools.context import current_context
+from Tools.Core.atomic import atomic_write, atomic_writer
+from Tools.Core.edit_engine import plan_edits, apply_edits
+from Tools.Core.file_cache import FileStamp
+
+# Files at least this large are edited in two streaming passes instead of in memory
+STREAM_MIN_BYTES = 32 * 1024 * 1024
+STREAM_CHUNK_CHARS = 1024 * 1024
+
+def _text_chunks(f):
+    while True:
+        chunk = f.read(STREAM_CHUNK_CHARS)
+        if not chunk:
+            return
+        yield chunk
 
 class EditFile(Tool):
     def __init__(self):
@@ -14,84 +29,123 @@ class EditFile(Tool):
                 Argument("replacements", ArgumentType.STRING, "JSON string with pattern-replacement pairs"),
                 Argument("encoding", ArgumentType.STRING, "File encoding", optional=True, default="utf-8")
             ],
-            config=ToolConfig(test_mode=True, needs_sudo=False)
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
         )
-        self.read_tool = ReadFile()
 
     def _run(self, args):
-        if not os.path.exists(args['filename']):
+        context = current_context()
+        path = context.resolve_path(args['filename'])
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
                               message=f"File '{args['filename']}' not found")
-        if os.path.isdir(args['filename']):
+        if stat.S_ISDIR(st.st_mode):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
                               message=f"'{args['filename']}' is a directory")
-        if not os.access(args['filename'], os.R_OK):
-            return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
-                              message=f"No read permission for '{args['filename']}'")
-        if not os.access(args['filename'], os.W_OK):
+        if not os.access(path, os.W_OK):
             return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
                               message=f"No write permission for '{args['filename']}'")
         
-        # Normalize file path for comparison
-        filename_norm = os.path.abspath(args['filename'])
-        last_read = self.read_tool.last_read_file
-        # Handle case where last_read_file is None
-        if last_read:
-            last_read = os.path.abspath(last_read)
-        else:
-            last_read = ""
-        if last_read != filename_norm:
+        # Reads are tracked per session, whichever read_file call made them
+        if not context.has_read(path):
             return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
                               message=f"File '{args['filename']}' must be read first using read_file")
         
         try:
-            try:
-                with open(args['filename'], 'r', encoding=args['encoding']) as file:
-                    content = file.read()
-            except Exception as e:
-                if isinstance(e, UnicodeDecodeError):
-                    return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
-                                      message=f"Unable to decode file with encoding '{args['encoding']}'")
-                else:
-                    raise e
-            
-            changes_made = 0
-            change_summary = []
-            
-            try:
-                replacement_dict = json.loads(args['replacements'])
-                if not isinstance(replacement_dict, dict):
-                    return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
-                                      message="Replacements must be a JSON object")
-            except json.JSONDecodeError:
+            replacement_dict = json.loads(args['replacements'])
+            if not isinstance(replacement_dict, dict):
                 return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
-                                  message="Invalid JSON format for replacements")
-            
-            for pattern, replacement in replacement_dict.items():
-                # Save a copy of the current content for matching
-                original_content = content
-                matches = list(re.finditer(re.escape(pattern), original_content, re.MULTILINE))
-                if len(matches) == 0:
-                    return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
-                                      message=f"Pattern not found: '{pattern}'")
-                elif len(matches) > 1:
-                    return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
-                                      message=f"Pattern '{pattern}' found multiple times ({len(matches)})")
-                # Compute line number from the original content before replacing
-                line_num = original_content[:matches[0].start()].count('\n') + 1
-                content = content.replace(pattern, replacement)
-                changes_made += 1
-                change_summary.append(f"Line {line_num}: '{pattern}' -> '{replacement}'")
-            
-            try:
-                with open(args['filename'], 'w', encoding=args['encoding']) as file:
-                    file.write(content)
-            except Exception as e:
-                return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
-                                  message=f"Error writing file: {str(e)}")
-            
-            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
-                              message=f"Made {changes_made} replacements:\n" + "\n".join(change_summary))
+                                  message="Replacements must be a JSON object")
+        except json.JSONDecodeError:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid JSON format for replacements")
+        patterns = list(replacement_dict)
+        replacements = [str(r) for r in replacement_dict.values()]
+        if any(not p for p in patterns):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Patterns must not be empty")
+        
+        try:
+            if st.st_size >= STREAM_MIN_BYTES:
+                return self._edit_streaming(context, path, st, patterns, replacements, args['encoding'])
+            return self._edit_in_memory(context, path, st, patterns, replacements, args['encoding'])
+        except UnicodeDecodeError:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
+                              message=f"Unable to decode file with encoding '{args['encoding']}'")
         except Exception as e:
             return ToolResult(success=False, code=ErrorCodes.UNKNOWN_ERROR,
                               message=f"Error editing file: {str(e)}")
+
+    def _edit_in_memory(self, context, path, st, patterns, replacements, encoding):
+        # Served from the session cache when the file is unchanged since it was read
+        content = context.files.load(path, st).text(encoding)
+        plan = plan_edits(patterns, replacements, [content])
+        failure = self._check_plan(plan)
+        if failure is not None:
+            return failure
+        
+        parts = []
+        lines = apply_edits(plan, [content], parts.append)
+        data = "".join(parts).encode(encoding)
+        try:
+            context.snapshots.preserve(path)
+            new_st = atomic_write(path, data)
+        except Exception as e:
+            context.files.invalidate(path)
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Error writing file: {str(e)}")
+        context.files.store(path, data, new_st)
+        return self._summary(plan, lines)
+
+    def _edit_streaming(self, context, path, st, patterns, replacements, encoding):
+        """Plans in one pass over the file, then rewrites it in a second pass; memory stays O(chunk)."""
+        context.files.invalidate(path)
+        with open(path, 'r', encoding=encoding) as f:
+            stamp = FileStamp.from_stat(os.fstat(f.fileno()))
+            plan = plan_edits(patterns, replacements, _text_chunks(f))
+        failure = self._check_plan(plan)
+        if failure is not None:
+            return failure
+        
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                if FileStamp.from_stat(os.fstat(f.fileno())) != stamp:
+                    return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                                      message=f"File '{path}' changed during the edit; read it again")
+                context.snapshots.preserve(path)
+                with atomic_writer(path) as writer:
+                    out = io.TextIOWrapper(writer.file, encoding=encoding, newline='')
+                    try:
+                        lines = apply_edits(plan, _text_chunks(f), out.write)
+                        out.flush()
+                    finally:
+                        # The atomic writer owns the underlying file
+                        out.detach()
+        except UnicodeDecodeError:
+            raise
+        except Exception as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Error writing file: {str(e)}")
+        return self._summary(plan, lines)
+
+    def _check_plan(self, plan):
+        problem = plan.problem()
+        if problem is None:
+            return None
+        kind, index, other = problem
+        pattern = plan.patterns[index]
+        if kind == 'not_found':
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Pattern not found: '{pattern}'")
+        if kind == 'multiple':
+            return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
+                              message=f"Pattern '{pattern}' found multiple times ({plan.counts[index]})")
+        return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
+                          message=f"Patterns '{pattern}' and '{plan.patterns[other]}' overlap")
+
+    def _summary(self, plan, lines):
+        change_summary = [f"Line {lines[i]}: '{p}' -> '{r}'"
+                          for i, (p, r) in enumerate(zip(plan.patterns, plan.replacements))]
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                          message=f"Made {len(change_summary)} replacements:\n" + "\n".join(change_summary))
@@ -1,7 +1,32 @@
-
 import os
-from pathlib import Path
-from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.ignore import IgnoreMatcher, split_patterns
+
+DEFAULT_MAX_ENTRIES = 200
+LONG_HEADER = [f"{'Type':<6} {'Size':<10} {'Name':<30}", "-" * 50]
+
+def _scan(path):
+    """Directory entries, directories first, each group sorted by name. One scandir, no extra stats."""
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append((entry.name, entry, is_dir))
+    dirs.sort(key=lambda item: item[0])
+    files.sort(key=lambda item: item[0])
+    return dirs + files
+
+def _parse_cursor(cursor):
+    """'<directory relative to the listed path>:<entry index>' -> (components, index)."""
+    section, _, index = str(cursor).rpartition(':')
+    if not section or not index.isdigit():
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    parts = [] if section == '.' else section.split('/')
+    return parts, int(index)
 
 class ListDirectory(Tool):
     def __init__(self):
@@ -40,97 +65,163 @@ class ListDirectory(Tool):
                     description="Whether to use long listing format (similar to ls -l)",
                     optional=True,
                     default=False
+                ),
+                Argument(
+                    name="max_depth",
+                    arg_type=ArgumentType.INT,
+                    description="How many directory levels to descend when recursive (1 = this directory only)",
+                    optional=True,
+                    default=None
+                ),
+                Argument(
+                    name="max_entries",
+                    arg_type=ArgumentType.INT,
+                    description="Maximum number of entries to return; the rest can be fetched with the cursor",
+                    optional=True,
+                    default=DEFAULT_MAX_ENTRIES
+                ),
+                Argument(
+                    name="cursor",
+                    arg_type=ArgumentType.STRING,
+                    description="Continue a previous listing from the cursor it returned",
+                    optional=True,
+                    default=None
+                ),
+                Argument(
+                    name="ignore",
+                    arg_type=ArgumentType.STRING,
+                    description="Comma-separated .gitignore-style patterns to leave out",
+                    optional=True,
+                    default=None
+                ),
+                Argument(
+                    name="use_gitignore",
+                    arg_type=ArgumentType.BOOLEAN,
+                    description="Whether to leave out paths matched by .gitignore files",
+                    optional=True,
+                    default=True
                 )
             ],
             config=config
         )
 
     def _run(self, args, **kwargs):
-        path = args.get("path", ".")
-        show_hidden = args.get("show_hidden", False)
-        recursive = args.get("recursive", False)
-        long_format = args.get("long_format", False)
-        
+        path = current_context().resolve_path(args.get("path") or ".")
+        show_hidden = to_bool(args.get("show_hidden", False))
+        recursive = to_bool(args.get("recursive", False))
+        long_format = to_bool(args.get("long_format", False))
+
         if not os.path.exists(path):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND, message=f"Path '{path}' does not exist.")
         if not os.path.isdir(path):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND, message=f"Path '{path}' is not a directory.")
         if not os.access(path, os.R_OK):
             return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED, message=f"No read permission for directory '{path}'.")
-        
+
         try:
-            if recursive:
-                listing = self._list_recursive(path, show_hidden, long_format)
-            else:
-                listing = self._list_directory(path, show_hidden, long_format)
+            max_depth = int(args['max_depth']) if args.get('max_depth') not in (None, '') else None
+            max_entries = int(args['max_entries']) if args.get('max_entries') not in (None, '') else DEFAULT_MAX_ENTRIES
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_depth or max_entries - must be an integer")
+        if max_entries <= 0 or (max_depth is not None and max_depth <= 0):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="max_depth and max_entries must be positive")
+        if not recursive:
+            max_depth = 1
+        try:
+            resume = _parse_cursor(args['cursor']) if args.get('cursor') else None
+        except ValueError as e:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE, message=str(e))
+
+        ignore = IgnoreMatcher(path, split_patterns(args.get('ignore')),
+                               use_gitignore=to_bool(args.get('use_gitignore', True)))
+        try:
+            listing = self._render(path, recursive, long_format, show_hidden, ignore, max_depth, max_entries, resume)
             return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=listing)
         except Exception as e:
             return ToolResult(success=False, code=ErrorCodes.UNKNOWN_ERROR, message=f"Error listing directory: {str(e)}")
-    
-    def _list_directory(self, path, show_hidden, long_format):
-        items = os.listdir(path)
-        if not show_hidden:
-            items = [item for item in items if not item.startswith('.')]
-        dirs = []
-        files = []
-        for item in items:
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path):
-                dirs.append(item)
+
+    def _sections(self, root, rel_parts, depth, show_hidden, ignore, max_depth, resume):
+        """
+        Yields (rel_dir, index, entry, name, is_dir) for every listed entry, one directory
+        section at a time in depth-first order, the way the listing prints them.
+
+        `resume` = (components, index) skips everything up to that point without
+        scanning the directories that come before it.
+        """
+        rel_dir = '/'.join(rel_parts)
+        directory = os.path.join(root, *rel_parts)
+        ignore.enter(rel_dir)
+        try:
+            scanned = _scan(directory)
+        except OSError:
+            return
+        entries = []
+        for name, entry, is_dir in scanned:
+            if not show_hidden and name.startswith('.'):
+                continue
+            if ignore.is_ignored(f"{rel_dir}/{name}" if rel_dir else name, is_dir):
+                continue
+            entries.append((name, entry, is_dir))
+
+        target, start = None, 0
+        if resume is not None:
+            components, index = resume
+            if len(components) == len(rel_parts):
+                start = index
+                resume = None
             else:
-                files.append(item)
-        dirs.sort()
-        files.sort()
-        sorted_items = dirs + files
-        if long_format:
-            result = []
-            result.append(f"Directory listing of {os.path.abspath(path)}:")
-            result.append(f"{'Type':<6} {'Size':<10} {'Name':<30}")
-            result.append("-" * 50)
-            for item in sorted_items:
-                item_path = os.path.join(path, item)
-                is_dir = os.path.isdir(item_path)
-                size = os.path.getsize(item_path) if os.path.exists(item_path) else 0
-                item_type = "DIR" if is_dir else "FILE"
-                size_str = f"{size:,}" if not is_dir else "<DIR>"
-                result.append(f"{item_type:<6} {size_str:<10} {item:<30}")
-            return "\n".join(result)
-        else:
-            result = []
-            result.append(f"Directory listing of {os.path.abspath(path)}:")
-            for item in sorted_items:
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    result.append(f"{item}/")
-                else:
-                    result.append(item)
-            return "\n".join(result)
-    
-    def _list_recursive(self, path, show_hidden, long_format):
-        result = []
-        for root, dirs, files in os.walk(path):
-            if not show_hidden:
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                files = [f for f in files if not f.startswith('.')]
-            dirs.sort()
-            files.sort()
-            rel_path = os.path.relpath(root, start=os.path.dirname(path))
-            if rel_path == '.':
-                rel_path = os.path.basename(path) or path
-            result.append(f"\nDirectory: {rel_path}")
+                # This section was finished on an earlier page; only descend towards the cursor
+                target = components[len(rel_parts)]
+                start = len(entries)
+
+        for index in range(start, len(entries)):
+            name, entry, is_dir = entries[index]
+            yield rel_dir, index, entry, name, is_dir
+
+        if max_depth is not None and depth >= max_depth:
+            return
+        for name, entry, is_dir in entries:
+            if not is_dir or entry.is_symlink():
+                continue
+            if target is not None and name < target:
+                continue
+            sub_resume = resume if name == target else None
+            yield from self._sections(root, rel_parts + [name], depth + 1, show_hidden, ignore, max_depth,
+                                      sub_resume)
+
+    def _render(self, path, recursive, long_format, show_hidden, ignore, max_depth, max_entries, resume):
+        result = [] if recursive else [f"Directory listing of {os.path.abspath(path)}:"]
+        if long_format and not recursive:
+            result.extend(LONG_HEADER)
+        label = os.path.basename(path.rstrip(os.sep)) or path
+        current_section = None
+        count = 0
+        next_cursor = None
+        for rel_dir, index, entry, name, is_dir in self._sections(path, [], 1, show_hidden, ignore,
+                                                                   max_depth, resume):
+            if count == max_entries:
+                next_cursor = f"{rel_dir or '.'}:{index}"
+                break
+            if recursive and rel_dir != current_section:
+                current_section = rel_dir
+                result.append(f"\nDirectory: {label}/{rel_dir}" if rel_dir else f"\nDirectory: {label}")
+                if long_format:
+                    result.extend(LONG_HEADER)
             if long_format:
-                if files or dirs:
-                    result.append(f"{'Type':<6} {'Size':<10} {'Name':<30}")
-                    result.append("-" * 50)
-                for d in dirs:
-                    result.append(f"{'DIR':<6} {'<DIR>':<10} {d:<30}")
-                for f in files:
-                    file_path = os.path.join(root, f)
-                    size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
-                    result.append(f"{'FILE':<6} {size:,}<10 {f:<30}")
+                if is_dir:
+                    result.append(f"{'DIR':<6} {'<DIR>':<10} {name:<30}")
+                else:
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        size = 0
+                    result.append(f"{'FILE':<6} {size:<10,} {name:<30}")
             else:
-                for d in dirs:
-                    result.append(f"{d}/")
-                for f in files:
-                    result.append(f)
+                result.append(f"{name}/" if is_dir else name)
+            count += 1
+
+        if next_cursor is not None:
+            result.append(f"\n[Listed {count} entries; more remain. Continue with cursor: {next_cursor}]")
         return "\n".join(result)
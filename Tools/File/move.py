@@ -0,0 +1,63 @@
+import os
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.fastcopy import move, resolve_destination
+
+class MoveFile(Tool):
+    def __init__(self):
+        super().__init__(
+            name="move_file",
+            description="Moves or renames a file or directory on disk",
+            args=[
+                Argument("source", ArgumentType.FILEPATH, "File or directory to move"),
+                Argument("destination", ArgumentType.FILEPATH,
+                         "New path, or an existing directory to move into"),
+                Argument("overwrite", ArgumentType.BOOLEAN, "Replace an existing destination file",
+                         optional=True, default=False)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        source = context.resolve_path(args['source'])
+        if not os.path.lexists(source):
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Source '{args['source']}' does not exist")
+        is_dir = os.path.isdir(source) and not os.path.islink(source)
+        destination = resolve_destination(source, context.resolve_path(args['destination']))
+        if os.path.lexists(destination):
+            if os.path.exists(destination) and os.path.samefile(source, destination):
+                return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                                  message="Source and destination are the same file")
+            if is_dir or os.path.isdir(destination):
+                return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
+                                  message=f"'{destination}' already exists")
+            if not to_bool(args['overwrite']):
+                return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
+                                  message=f"'{destination}' already exists and overwrite=False")
+        if is_dir and (destination + os.sep).startswith(source + os.sep):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Cannot move a directory into itself")
+        parent = os.path.dirname(destination) or '.'
+        if not os.path.isdir(parent):
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Directory '{parent}' does not exist")
+
+        try:
+            context.snapshots.preserve(source)
+            context.snapshots.preserve(destination)
+            method = move(source, destination)
+        except PermissionError as e:
+            return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED, message=str(e))
+        except OSError as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED, message=str(e))
+        context.files.invalidate(source)
+        context.files.invalidate(destination)
+        record = context.read_files.pop(source, None)
+        if record is not None and method == "rename":
+            # Same inode and mtime: what the session read is still what is at the new path
+            context.read_files[destination] = record
+        how = "" if method == "rename" else f" (across filesystems, copied with {method})"
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                          message=f"Moved '{args['source']}' to '{destination}'{how}")
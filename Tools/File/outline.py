@@ -0,0 +1,39 @@
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+from Tools.context import current_context
+from Tools.Core.code_outline import load_outline
+
+class OutlineFile(Tool):
+    def __init__(self):
+        super().__init__(
+            name="outline",
+            description="Lists the classes and functions of a Python file with their line ranges",
+            args=[
+                Argument("path", ArgumentType.FILEPATH, "Python file path"),
+                Argument("max_depth", ArgumentType.INT,
+                         "Nesting levels to show (1 = module-level definitions only)", optional=True, default=None)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        path = context.resolve_path(args['path'])
+        try:
+            max_depth = int(args['max_depth']) if args.get('max_depth') not in (None, '') else None
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_depth - must be an integer")
+        if max_depth is not None and max_depth <= 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="max_depth must be positive")
+
+        symbols = load_outline(context, path, args['path'])
+        if isinstance(symbols, ToolResult):
+            return symbols
+        shown = [s for s in symbols if max_depth is None or s.depth < max_depth]
+        if not shown:
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message=f"No classes or functions in '{args['path']}'")
+        lines = [f"{args['path']} ({len(symbols)} definitions):"]
+        lines.extend("  " * s.depth + s.describe() for s in shown)
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="\n".join(lines))
@@ -0,0 +1,193 @@
+import os
+import stat
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.atomic import atomic_write
+from Tools.Core.unified_diff import DiffParseError, apply_hunks, parse_unified_diff
+
+DEFAULT_FUZZ = 2
+
+class _PatchError(Exception):
+    """A file-level problem that stops the whole patch (missing file, no permission, ...)."""
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+class _PlannedFile:
+    """The patched state of one file, before anything is written."""
+    def __init__(self, path, display, original, lines, trailing_newline, newline):
+        self.path = path
+        self.display = display
+        self.original = original            # bytes on disk, None if the file does not exist
+        self.lines = lines
+        self.trailing_newline = trailing_newline
+        self.newline = newline
+        self.delete = False
+        self.results = []
+
+    def data(self, encoding):
+        if not self.lines:
+            return b""
+        text = self.newline.join(self.lines) + (self.newline if self.trailing_newline else "")
+        return text.encode(encoding)
+
+class PatchFile(Tool):
+    def __init__(self):
+        super().__init__(
+            name="patch_file",
+            description="Applies a unified diff (one or more files, one or more hunks each)",
+            args=[
+                Argument("patch", ArgumentType.STRING, "Unified diff with ---/+++ file headers and @@ hunks"),
+                Argument("path", ArgumentType.FILEPATH,
+                         "Target file for a diff without ---/+++ headers", optional=True, default=None),
+                Argument("fuzz", ArgumentType.INT,
+                         "Context lines a hunk may ignore at each end when it does not match exactly",
+                         optional=True, default=DEFAULT_FUZZ),
+                Argument("dry_run", ArgumentType.BOOLEAN, "Check that the patch applies without writing",
+                         optional=True, default=False),
+                Argument("encoding", ArgumentType.STRING, "File encoding", optional=True, default="utf-8")
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False, mutates_files=True)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        try:
+            fuzz = int(args['fuzz']) if args.get('fuzz') not in (None, '') else DEFAULT_FUZZ
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid fuzz - must be an integer")
+        try:
+            file_patches = parse_unified_diff(args['patch'], default_path=args.get('path'))
+        except DiffParseError as e:
+            return ToolResult(success=False, code=ErrorCodes.MALFORMED_ARGUMENT,
+                              message=f"Invalid patch: {e}")
+
+        encoding = args['encoding']
+        # Every hunk of every file is applied in memory first; nothing is written unless all succeed
+        planned = {}
+        try:
+            for file_patch in file_patches:
+                self._plan(context, planned, file_patch, fuzz, encoding)
+        except _PatchError as e:
+            return ToolResult(success=False, code=e.code, message=str(e))
+        except UnicodeDecodeError:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_OPERATION,
+                              message=f"Unable to decode file with encoding '{encoding}'")
+
+        report = self._report(planned.values())
+        failed = sum(1 for f in planned.values() for r in f.results if not r.applied)
+        if failed:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Patch not applied ({failed} hunks failed); no files were changed.\n{report}")
+        if to_bool(args['dry_run']):
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message=f"Dry run: patch applies cleanly.\n{report}")
+
+        try:
+            self._commit(context, list(planned.values()), encoding)
+        except Exception as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Error writing patched files (changes rolled back): {e}")
+        hunks = sum(len(f.results) for f in planned.values())
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                          message=f"Patched {len(planned)} files ({hunks} hunks):\n{report}")
+
+    def _plan(self, context, planned, file_patch, fuzz, encoding):
+        if file_patch.old_path is None:
+            path = context.resolve_path(file_patch.new_path)
+            if path in planned:
+                raise _PatchError(ErrorCodes.RESOURCE_EXISTS, f"File '{file_patch.new_path}' is created twice in the patch")
+            state = planned[path] = self._load(context, path, file_patch.new_path, True, encoding)
+        else:
+            path = context.resolve_path(file_patch.old_path)
+            state = planned.get(path)
+            if state is None:
+                state = planned[path] = self._load(context, path, file_patch.old_path, False, encoding)
+
+        lines, results, eof = apply_hunks(state.lines, file_patch.hunks, fuzz=fuzz)
+        state.lines = lines
+        if 'missing_newline' in eof:
+            state.trailing_newline = not eof['missing_newline']
+
+        if file_patch.new_path is None:
+            state.delete = True
+        elif file_patch.old_path is not None and context.resolve_path(file_patch.new_path) != path:
+            # A rename writes the patched content to the new path and deletes the old one
+            target = context.resolve_path(file_patch.new_path)
+            if target in planned:
+                raise _PatchError(ErrorCodes.RESOURCE_EXISTS, f"File '{file_patch.new_path}' is created twice in the patch")
+            renamed = planned[target] = self._load(context, target, file_patch.new_path, True, encoding)
+            renamed.lines, renamed.trailing_newline, renamed.newline = state.lines, state.trailing_newline, state.newline
+            state.delete = True
+            state = renamed
+        state.results.extend(results)
+
+    def _load(self, context, path, display, creating, encoding):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if not creating:
+                raise _PatchError(ErrorCodes.RESOURCE_NOT_FOUND, f"File '{display}' not found")
+            dirname = os.path.dirname(path)
+            if not os.path.isdir(dirname):
+                raise _PatchError(ErrorCodes.RESOURCE_NOT_FOUND, f"Directory '{dirname}' does not exist")
+            if not os.access(dirname, os.W_OK):
+                raise _PatchError(ErrorCodes.PERMISSION_DENIED, f"No write permission in '{dirname}'")
+            return _PlannedFile(path, display, None, [], True, "\n")
+        if creating:
+            raise _PatchError(ErrorCodes.RESOURCE_EXISTS, f"File '{display}' already exists")
+        if not stat.S_ISREG(st.st_mode):
+            raise _PatchError(ErrorCodes.INVALID_ARGUMENT_VALUE, f"Path '{display}' is not a file")
+        if not os.access(path, os.W_OK):
+            raise _PatchError(ErrorCodes.PERMISSION_DENIED, f"No write permission for '{display}'")
+
+        # No prior read is required: every hunk's context is checked against the file as it is now
+        entry = context.files.load(path, st)
+        text = entry.text(encoding)
+        newline = "\r\n" if b"\r\n" in entry.data else "\n"
+        trailing_newline = text.endswith("\n") or not text
+        lines = text.split("\n")
+        if text.endswith("\n"):
+            lines.pop()
+        if not text:
+            lines = []
+        return _PlannedFile(path, display, entry.data, lines, trailing_newline, newline)
+
+    def _commit(self, context, files, encoding):
+        """Writes each file atomically; if one fails, the files already written are restored."""
+        for state in files:
+            context.snapshots.preserve(state.path)
+        done = []
+        try:
+            for state in sorted(files, key=lambda f: f.delete):
+                if state.delete:
+                    os.unlink(state.path)
+                    context.files.invalidate(state.path)
+                else:
+                    data = state.data(encoding)
+                    new_st = atomic_write(state.path, data)
+                    context.files.store(state.path, data, new_st)
+                done.append(state)
+        except Exception:
+            for state in reversed(done):
+                try:
+                    if state.original is None:
+                        os.unlink(state.path)
+                    else:
+                        atomic_write(state.path, state.original)
+                except OSError as e:
+                    print(f"Warning: Could not restore '{state.path}' after a failed patch: {e}")
+                context.files.invalidate(state.path)
+            raise
+
+    def _report(self, files):
+        sections = []
+        for state in files:
+            header = state.display
+            if state.delete:
+                header += " (deleted)"
+            elif state.original is None:
+                header += " (created)"
+            sections.append("\n".join([header] + [f"  {r.describe()}" for r in state.results]))
+        return "\n".join(sections)
@@ -1,50 +1,104 @@
-import os
-from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+import difflib
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.code_outline import find_symbols, load_outline
+from Tools.Core.file_reader import DEFAULT_MAX_BYTES, read_view, stat_file
+
+_INT_ARGS = {
+    'lines': "line count",
+    'offset': "offset",
+    'limit': "limit",
+    'byte_offset': "byte offset",
+    'byte_limit': "byte limit",
+    'max_bytes': "max_bytes",
+}
 
 class ReadFile(Tool):
     def __init__(self):
         super().__init__(
             name="read_file",
-            description="Reads file contents",
+            description="Reads file contents, optionally a range of lines or bytes",
             args=[
                 Argument("path", ArgumentType.FILEPATH, "File path"),
-                Argument("lines", ArgumentType.INT, "Lines to read", optional=True, default=None)
+                Argument("lines", ArgumentType.INT, "Lines to read", optional=True, default=None),
+                Argument("offset", ArgumentType.INT, "Line number to start reading from (1-based)",
+                         optional=True, default=None),
+                Argument("limit", ArgumentType.INT, "Maximum number of lines to read (same as lines)",
+                         optional=True, default=None),
+                Argument("mode", ArgumentType.STRING,
+                         "'head' reads from the start or offset, 'tail' reads the last lines",
+                         optional=True, default="head"),
+                Argument("byte_offset", ArgumentType.INT, "Byte position to start reading from",
+                         optional=True, default=None),
+                Argument("byte_limit", ArgumentType.INT, "Maximum number of bytes to read from byte_offset",
+                         optional=True, default=None),
+                Argument("max_bytes", ArgumentType.INT, "Hard cap on the number of bytes returned",
+                         optional=True, default=DEFAULT_MAX_BYTES),
+                Argument("symbol", ArgumentType.STRING,
+                         "Read only this class or function of a Python file, e.g. 'Executor.execute'",
+                         optional=True, default=None),
+                Argument("force", ArgumentType.BOOLEAN,
+                         "Return the content even if unchanged since the last read", optional=True, default=False)
             ],
             config=ToolConfig(test_mode=True, needs_sudo=False)
         )
-        self.last_read_file = None
 
     def _run(self, args):
-        if not os.path.exists(args['path']):
-            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
-                              message=f"File '{args['path']}' not found")
-        if not os.path.isfile(args['path']):
+        context = current_context()
+        target = stat_file(context, args['path'])
+        if isinstance(target, ToolResult):
+            return target
+        path, st = target
+
+        numbers = {}
+        for name, label in _INT_ARGS.items():
+            value = args.get(name)
+            try:
+                numbers[name] = int(value) if value not in (None, '') else None
+            except (TypeError, ValueError):
+                return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                                  message=f"Invalid {label} - must be an integer")
+        mode = str(args.get('mode') or 'head').lower()
+        if mode not in ('head', 'tail'):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message=f"Invalid mode '{mode}' - must be 'head' or 'tail'")
+        if numbers['limit'] is None:
+            numbers['limit'] = numbers['lines']
+        if numbers['max_bytes'] is None:
+            numbers['max_bytes'] = DEFAULT_MAX_BYTES
+        if numbers['max_bytes'] <= 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_bytes - must be positive")
+
+        symbol = None
+        if args.get('symbol'):
+            if numbers['byte_offset'] is not None or numbers['byte_limit'] is not None or mode == 'tail':
+                return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                                  message="symbol cannot be combined with byte ranges or tail mode")
+            symbol = self._find_symbol(context, path, args['path'], str(args['symbol']))
+            if isinstance(symbol, ToolResult):
+                return symbol
+            # offset stays a file line number, so a truncated symbol read continues with the same symbol
+            first = min(max(numbers['offset'] or symbol.start, symbol.start), symbol.end)
+            numbers['offset'] = first
+            numbers['limit'] = symbol.end - first + 1 if numbers['limit'] is None \
+                else min(numbers['limit'], symbol.end - first + 1)
+
+        return read_view(context, path, args['path'], st, numbers, mode, symbol, to_bool(args['force']))
+
+    def _find_symbol(self, context, path, display_path, name):
+        """The single symbol `name` addresses, or a ToolResult explaining why there is none."""
+        symbols = load_outline(context, path, display_path)
+        if isinstance(symbols, ToolResult):
+            return symbols
+        matches = find_symbols(symbols, name)
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
             return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
-                              message=f"Path '{args['path']}' is not a file")
-        if not os.access(args['path'], os.R_OK):
-            return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
-                              message=f"No read permission for '{args['path']}'")
-        try:
-            with open(args['path'], 'r') as f:
-                if args['lines'] is not None:
-                    try:
-                        lines = int(args['lines'])
-                        content = []
-                        for _ in range(lines):
-                            line = f.readline()
-                            if not line:
-                                break
-                            content.append(line.rstrip('\n'))
-                        content = '\n'.join(content)
-                    except ValueError:
-                        return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
-                                          message="Invalid line count - must be an integer")
-                else:
-                    content = f.read().rstrip('\n')
-            self.last_read_file = os.path.abspath(args['path'])
-            return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=content)
-        except PermissionError:
-            return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
-                              message="Permission denied when reading file")
-        except Exception as e:
-            return ToolResult(success=False, code=ErrorCodes.UNKNOWN_ERROR, message=str(e))
+                              message=f"'{name}' is ambiguous in '{display_path}': "
+                                      + ", ".join(f"{s.qualname} (L{s.start})" for s in matches))
+        close = difflib.get_close_matches(name, [s.qualname for s in symbols], n=5)
+        hint = f" Did you mean: {', '.join(close)}?" if close else " Use the outline tool to list its symbols."
+        return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                          message=f"Symbol '{name}' not found in '{display_path}'.{hint}")
@@ -0,0 +1,124 @@
+import contextvars
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.file_reader import DEFAULT_MAX_BYTES, read_view, stat_file
+from Tools.Core.ignore import split_patterns
+
+DEFAULT_MAX_FILE_BYTES = 32 * 1024
+MAX_FILES = 50
+MAX_WORKERS = 8
+_GLOB_CHARS = set("*?[")
+
+def allocate_budget(sizes, per_file, total):
+    """
+    Byte cap for each file: at most `per_file`, and together at most `total`.
+
+    Small files get what they need and the rest is shared evenly by the larger
+    ones, so one big file cannot crowd out the others.
+    """
+    caps = [0] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: min(sizes[i], per_file))
+    remaining = total
+    for position, i in enumerate(order):
+        share = remaining // (len(order) - position)
+        caps[i] = min(sizes[i], per_file, share)
+        remaining -= caps[i]
+    return caps
+
+class ReadManyFiles(Tool):
+    def __init__(self):
+        super().__init__(
+            name="read_many",
+            description="Reads several files in one call; paths may be globs",
+            args=[
+                Argument("paths", ArgumentType.STRING,
+                         "Comma- or newline-separated file paths or globs, e.g. 'Core/*.py, README.md'"),
+                Argument("max_bytes_per_file", ArgumentType.INT, "Maximum bytes returned for any one file",
+                         optional=True, default=DEFAULT_MAX_FILE_BYTES),
+                Argument("max_total_bytes", ArgumentType.INT, "Maximum bytes returned altogether",
+                         optional=True, default=DEFAULT_MAX_BYTES),
+                Argument("force", ArgumentType.BOOLEAN,
+                         "Return files even if unchanged since the last read", optional=True, default=False)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        try:
+            per_file = int(args['max_bytes_per_file']) if args.get('max_bytes_per_file') not in (None, '') \
+                else DEFAULT_MAX_FILE_BYTES
+            total = int(args['max_total_bytes']) if args.get('max_total_bytes') not in (None, '') \
+                else DEFAULT_MAX_BYTES
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_bytes_per_file or max_total_bytes - must be an integer")
+        if per_file <= 0 or total <= 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="max_bytes_per_file and max_total_bytes must be positive")
+
+        paths, unmatched = self._expand(context, split_patterns(args['paths']))
+        if not paths and not unmatched:
+            return ToolResult(success=False, code=ErrorCodes.MISSING_REQUIRED_ARGUMENT,
+                              message="No paths given")
+        skipped = paths[MAX_FILES:]
+        paths = paths[:MAX_FILES]
+
+        sizes = []
+        for display in paths:
+            try:
+                sizes.append(os.stat(context.resolve_path(display)).st_size)
+            except OSError:
+                sizes.append(0)
+        caps = allocate_budget(sizes, per_file, total)
+        force = to_bool(args.get('force'))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(paths)))) as pool:
+            # Each task runs in a copy of this context so the workers see the caller's ToolContext
+            futures = [pool.submit(contextvars.copy_context().run, self._read_one, display, size, cap, force)
+                       for display, size, cap in zip(paths, sizes, caps)]
+            sections = [future.result() for future in futures]
+
+        sections.extend(f"==> {pattern} <==\n[No files match]" for pattern in unmatched)
+        footer = f"[Read {len(paths)} files within a {total:,}-byte budget"
+        if skipped:
+            footer += f"; {len(skipped)} more files not read (limit {MAX_FILES}): {', '.join(skipped[:10])}"
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="\n".join(sections + [footer + "]"]))
+
+    def _expand(self, context, patterns):
+        """Displayable paths in argument order (glob matches sorted), and the globs that matched nothing."""
+        base = context.working_dir or os.getcwd()
+        paths, unmatched, seen = [], [], set()
+        for pattern in patterns:
+            if _GLOB_CHARS & set(pattern):
+                matches = sorted(m for m in glob.glob(context.resolve_path(pattern), recursive=True)
+                                 if os.path.isfile(m))
+                if not matches:
+                    unmatched.append(pattern)
+                found = [os.path.relpath(m, base) if not os.path.isabs(pattern) else m for m in matches]
+            else:
+                found = [pattern]
+            for display in found:
+                resolved = context.resolve_path(display)
+                if resolved not in seen:
+                    seen.add(resolved)
+                    paths.append(display)
+        return paths, unmatched
+
+    def _read_one(self, display, size, cap, force):
+        header = f"==> {display} <=="
+        if cap <= 0 and size > 0:
+            return f"{header}\n[Not read: the total byte budget is used up]"
+        context = current_context()
+        target = stat_file(context, display)
+        if isinstance(target, ToolResult):
+            return f"{header}\n[Error: {target.message}]"
+        path, st = target
+        numbers = {'offset': None, 'limit': None, 'byte_offset': None, 'byte_limit': None, 'max_bytes': max(cap, 1)}
+        result = read_view(context, path, display, st, numbers, force=force)
+        if not result.success:
+            return f"{header}\n[Error: {result.message}]"
+        return f"{header}\n{result.message}"
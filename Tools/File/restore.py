@@ -0,0 +1,52 @@
+import time
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+from Tools.context import current_context
+
+class RestoreCheckpoint(Tool):
+    def __init__(self):
+        super().__init__(
+            name="restore_checkpoint",
+            description="Lists file checkpoints, or undoes every file change made since one",
+            args=[
+                Argument("checkpoint", ArgumentType.INT,
+                         "Checkpoint to restore; it and all later changes are undone. Omit to list checkpoints",
+                         optional=True, default=None)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        store = context.snapshots
+        if args.get('checkpoint') in (None, ''):
+            checkpoints = store.list()
+            if not checkpoints:
+                return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="No checkpoints recorded")
+            lines = ["Checkpoints (restoring one undoes it and every later one):"]
+            for checkpoint in reversed(checkpoints):
+                when = time.strftime("%H:%M:%S", time.localtime(checkpoint.created))
+                paths = list(checkpoint.entries)
+                shown = ", ".join(paths[:3]) + (f", ... (+{len(paths) - 3})" if len(paths) > 3 else "")
+                lines.append(f"  {checkpoint.id}: {checkpoint.label} at {when} - {shown}")
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="\n".join(lines))
+
+        try:
+            checkpoint_id = int(args['checkpoint'])
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid checkpoint - must be an integer")
+        try:
+            restored = store.restore(checkpoint_id)
+        except KeyError:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Checkpoint {checkpoint_id} not found; call without arguments to list them")
+        except OSError as e:
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
+                              message=f"Restore failed part way: {e}")
+        for path in restored:
+            context.files.invalidate(path)
+            # The content may differ from what was read since; make the agent look again
+            context.read_files.pop(path, None)
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                          message=f"Restored {len(restored)} paths to their state before checkpoint "
+                                  f"{checkpoint_id}:\n" + "\n".join(f"  {p}" for p in restored))
@@ -0,0 +1,144 @@
+import os
+import re
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.ignore import IgnoreRule, split_patterns
+from Tools.Core.search_scope import resolve_scope
+from Tools.Core.trigram_index import BINARY_SNIFF_BYTES, get_index, regex_literals
+
+DEFAULT_MAX_RESULTS = 50
+MAX_PER_FILE = 5
+SNIPPET_CHARS = 160
+# Lines that look like definitions rank their file higher
+_DEFINITION = re.compile(r'^\s*(?:async\s+def|def|class|function|func|fn|interface|struct|enum|type|const|let|var)\b')
+
+def _snippet(line, start, end):
+    """The matched line, cut to SNIPPET_CHARS around the match."""
+    line = line.rstrip('\r')
+    if len(line) <= SNIPPET_CHARS:
+        return line
+    left = max(0, min(start - SNIPPET_CHARS // 3, len(line) - SNIPPET_CHARS))
+    text = line[left:left + SNIPPET_CHARS]
+    return ("..." if left else "") + text + ("..." if left + SNIPPET_CHARS < len(line) else "")
+
+class SearchFiles(Tool):
+    def __init__(self):
+        super().__init__(
+            name="search",
+            description="Searches file contents in the workspace (indexed; literal or regex)",
+            args=[
+                Argument("query", ArgumentType.STRING, "Text or regular expression to search for"),
+                Argument("regex", ArgumentType.BOOLEAN, "Treat the query as a regular expression",
+                         optional=True, default=False),
+                Argument("case_sensitive", ArgumentType.BOOLEAN,
+                         "Match case; by default only when the query contains uppercase letters",
+                         optional=True, default=None),
+                Argument("path", ArgumentType.FILEPATH, "Only search below this directory",
+                         optional=True, default=None),
+                Argument("glob", ArgumentType.STRING,
+                         "Comma-separated file patterns to include, e.g. '*.py, src/**'", optional=True, default=None),
+                Argument("max_results", ArgumentType.INT, "Maximum number of matching lines to return",
+                         optional=True, default=DEFAULT_MAX_RESULTS)
+            ],
+            config=ToolConfig(test_mode=True, needs_sudo=False)
+        )
+
+    def _run(self, args):
+        context = current_context()
+        query = str(args['query'] or '')
+        if not query:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE, message="Query must not be empty")
+        try:
+            max_results = int(args['max_results']) if args.get('max_results') not in (None, '') else DEFAULT_MAX_RESULTS
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_results - must be an integer")
+        if max_results <= 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="max_results must be positive")
+
+        case_sensitive = args.get('case_sensitive')
+        case_sensitive = any(c.isupper() for c in query) if case_sensitive in (None, '') else to_bool(case_sensitive)
+        flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+        is_regex = to_bool(args['regex'])
+        try:
+            matcher = re.compile(query if is_regex else re.escape(query), flags)
+        except re.error as e:
+            return ToolResult(success=False, code=ErrorCodes.MALFORMED_ARGUMENT, message=f"Invalid regex: {e}")
+        literals = regex_literals(query, flags) if is_regex else [query]
+        if not case_sensitive:
+            # The index lowercases ASCII only, so non-ASCII literals cannot narrow a caseless search
+            literals = [lit for lit in literals if lit.isascii()]
+
+        scope = resolve_scope(context, args.get('path'))
+        if isinstance(scope, ToolResult):
+            return scope
+        root, prefix = scope
+        globs = [IgnoreRule(p) for p in split_patterns(args.get('glob'))]
+
+        index = get_index(root, context.cache_dir)
+        index.refresh()
+        # Files too large to index cannot be ruled out by trigrams, so they are always scanned
+        candidates = sorted(set(index.candidates(lit.encode('utf-8') for lit in literals)) | set(index.oversized()))
+        candidates = [rel for rel in candidates
+                      if rel.startswith(prefix) and (not globs or any(g.matches(rel, False) for g in globs))]
+
+        ranked = []
+        for rel in candidates:
+            hits = self._search_file(os.path.join(root, rel), matcher)
+            if hits:
+                ranked.append((self._score(rel, query, hits), rel, hits))
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+
+        total = sum(len(hits) for _, _, hits in ranked)
+        if not total:
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message=f"No matches for '{query}' ({len(candidates)} candidate files checked)")
+        lines = []
+        shown = 0
+        for _, rel, hits in ranked:
+            if shown >= max_results:
+                break
+            lines.append(rel)
+            for line_no, snippet in hits[:min(MAX_PER_FILE, max_results - shown)]:
+                lines.append(f"  {line_no}: {snippet}")
+                shown += 1
+            if len(hits) > MAX_PER_FILE:
+                lines.append(f"  ... {len(hits) - MAX_PER_FILE} more in this file")
+        header = f"{total} matches in {len(ranked)} files"
+        if shown < total:
+            header += f" (showing {shown}; narrow with path or glob)"
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=header + ":\n" + "\n".join(lines))
+
+    def _search_file(self, path, matcher):
+        """(line number, snippet) of each matching line."""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return []
+        if b'\x00' in data[:BINARY_SNIFF_BYTES]:
+            return []
+        text = data.decode('utf-8', errors='replace')
+        hits = []
+        line_no, scanned_to, last_line = 1, 0, 0
+        for m in matcher.finditer(text):
+            line_no += text.count('\n', scanned_to, m.start())
+            scanned_to = m.start()
+            if line_no == last_line:
+                continue
+            last_line = line_no
+            line_start = text.rfind('\n', 0, m.start()) + 1
+            line_end = text.find('\n', m.start())
+            line = text[line_start:line_end if line_end != -1 else len(text)]
+            hits.append((line_no, _snippet(line, m.start() - line_start, m.end() - line_start)))
+        return hits
+
+    def _score(self, rel, query, hits):
+        score = min(len(hits), 10)
+        name = os.path.basename(rel).lower()
+        if query.lower() in name:
+            score += 20
+        if any(_DEFINITION.match(snippet) for _, snippet in hits):
+            score += 10
+        return score - rel.count('/') * 0.1
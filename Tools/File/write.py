@@ -1,5 +1,32 @@
 import os
-from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ToolResult, ArgumentType, to_bool
+from Tools.context import current_context
+from Tools.Core.atomic import atomic_writer
+from Tools.Core.streamed_text import StreamedText
+
+# While streaming large content, flush to disk every this many bytes when fsync is on,
+# so the final sync does not have to write back everything at once
+FSYNC_BATCH_BYTES = 8 * 1024 * 1024
+
+def _content_chunks(content):
+    """UTF-8 chunks of a str or a StreamedText (which is read back in chunks, never whole)."""
+    if isinstance(content, StreamedText):
+        yield from content.byte_chunks()
+    elif content:
+        yield str(content).encode('utf-8')
+
+def _write_chunks(f, content, fsync):
+    written = 0
+    unsynced = 0
+    for chunk in _content_chunks(content):
+        f.write(chunk)
+        written += len(chunk)
+        unsynced += len(chunk)
+        if fsync and unsynced >= FSYNC_BATCH_BYTES:
+            f.flush()
+            os.fsync(f.fileno())
+            unsynced = 0
+    return written
 
 class WriteFile(Tool):
     def __init__(self):
@@ -9,31 +36,66 @@ class WriteFile(Tool):
             args=[
                 Argument("path", ArgumentType.FILEPATH, "File path"),
                 Argument("content", ArgumentType.STRING, "Content to write"),
-                Argument("overwrite", ArgumentType.BOOLEAN, "Overwrite if exists", optional=True, default=False)
-            ]
+                Argument("overwrite", ArgumentType.BOOLEAN, "Overwrite if exists", optional=True, default=False),
+                Argument("mode", ArgumentType.STRING,
+                         "'write' creates or replaces the file, 'append' adds to the end of it",
+                         optional=True, default="write"),
+                Argument("atomic", ArgumentType.BOOLEAN,
+                         "Replace the file via a temporary file and rename (write mode)", optional=True, default=True),
+                Argument("fsync", ArgumentType.BOOLEAN,
+                         "Flush the data to disk before returning, so the write survives a crash (slower)",
+                         optional=True, default=False)
+            ],
+            config=ToolConfig(accepts_streamed_text=True, mutates_files=True)
         )
 
     def _run(self, args):
-        if os.path.isdir(args['path']):
+        path = current_context().resolve_path(args['path'])
+        mode = str(args.get('mode') or 'write').lower()
+        if mode not in ('write', 'append'):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message=f"Invalid mode '{mode}' - must be 'write' or 'append'")
+        if os.path.isdir(path):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
                               message=f"'{args['path']}' is a directory")
-        dirname = os.path.dirname(args['path']) or '.'
+        dirname = os.path.dirname(path) or '.'
         if not os.path.exists(dirname):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
                               message=f"Directory '{dirname}' does not exist")
         if not os.access(dirname, os.W_OK):
             return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
                               message=f"No write permission in '{dirname}'")
-        if os.path.exists(args['path']) and not args['overwrite']:
+        if mode == 'write' and os.path.exists(path) and not to_bool(args['overwrite']):
             return ToolResult(success=False, code=ErrorCodes.RESOURCE_EXISTS,
                               message=f"File '{args['path']}' already exists and overwrite=False")
+        fsync = to_bool(args['fsync'])
+        atomic = to_bool(args['atomic'])
         try:
-            with open(args['path'], 'w') as f:
-                f.write(args['content'])
-            return ToolResult(success=True, code=ErrorCodes.SUCCESS)
+            current_context().snapshots.preserve(path, in_place=mode == 'append' or not atomic)
+            if mode == 'append':
+                with open(path, 'ab') as f:
+                    written = _write_chunks(f, args['content'], fsync)
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                message = f"Appended {written:,} bytes to '{args['path']}'"
+            elif atomic:
+                with atomic_writer(path, fsync=fsync) as writer:
+                    written = _write_chunks(writer.file, args['content'], fsync)
+                message = f"Wrote {written:,} bytes to '{args['path']}'"
+            else:
+                with open(path, 'wb') as f:
+                    written = _write_chunks(f, args['content'], fsync)
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                message = f"Wrote {written:,} bytes to '{args['path']}'"
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=message)
         except PermissionError as pe:
             return ToolResult(success=False, code=ErrorCodes.PERMISSION_DENIED,
                               message=str(pe))
         except Exception as e:
             return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED,
                               message=str(e))
+        finally:
+            current_context().files.invalidate(path)
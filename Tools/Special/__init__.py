@@ -2,12 +2,33 @@
 Special tools for agent-specific actions.
 """
 
-from Tools.Special.message import Message
-from Tools.Special.pause import Pause
-from Tools.Special.end import End
+import importlib
+
+# Tool modules are imported on first attribute access (see Tools/__init__.py)
+_LAZY_EXPORTS = {
+    'Message': 'Tools.Special.message',
+    'Pause': 'Tools.Special.pause',
+    'End': 'Tools.Special.end',
+    'Delegate': 'Tools.Special.delegate',
+    'SubmitPlan': 'Tools.Special.plan',
+    'JobStatus': 'Tools.Special.job_status',
+    'JobWait': 'Tools.Special.job_wait',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'Message',
     'Pause',
-    'End'
-] 
\ No newline at end of file
+    'End',
+    'Delegate',
+    'SubmitPlan',
+    'JobStatus',
+    'JobWait'
+]
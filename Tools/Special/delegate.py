@@ -0,0 +1,113 @@
+from Core.utils import condense
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ArgumentType, ToolResult
+from Tools.context import calling_loop, current_context
+from Tools.Core.task_blocks import split_blocks, split_headers
+
+_FINISHED = ("completed", "ended")
+
+
+def parse_tasks(text: str, default_agent: str):
+    """Splits the tasks block into (agent, task) pairs; blocks are separated by '---' lines."""
+    subtasks = []
+    for block in split_blocks(text):
+        headers, body = split_headers(block, ("agent",))
+        agent = headers.get("agent", default_agent)
+        if not agent or not body:
+            raise ValueError(f"Subtask {len(subtasks) + 1} needs an agent id and a task")
+        subtasks.append((agent, body))
+    return subtasks
+
+
+def format_report(records) -> str:
+    counts = {}
+    for record in records:
+        counts[record["status"]] = counts.get(record["status"], 0) + 1
+    tokens = sum(r.get("usage", {}).get("input_tokens", 0) + r.get("usage", {}).get("output_tokens", 0)
+                 for r in records)
+    elapsed = max((r.get("elapsed", 0.0) for r in records), default=0.0)
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+    lines = [f"{len(records)} subtasks: {summary} ({elapsed:.1f}s, {tokens} tokens)"]
+    for number, record in enumerate(records, 1):
+        title = record["task"].splitlines()[0][:80]
+        lines.append(f"\n[{number}] {record['agent']} ({record['status']}, {record['turns']} turns): {title}")
+        output = condense(record.get("output") or record.get("error", ""))
+        lines.append(output or "(no output)")
+    return "\n".join(lines)
+
+
+class Delegate(Tool):
+    def __init__(self):
+        config = ToolConfig(
+            test_mode=True,
+            needs_sudo=False,
+            waits_on_sessions=True
+        )
+        super().__init__(
+            name="delegate",
+            description="Runs subtasks concurrently on other agents, each in a fresh session, and returns their final answers",
+            args=[
+                Argument(
+                    name="tasks",
+                    arg_type=ArgumentType.STRING,
+                    description="The subtasks, separated by lines containing only '---'. A subtask may start with "
+                                "an 'agent: <agent_id>' line; the rest is the self-contained task for that agent"
+                ),
+                Argument(
+                    name="agent",
+                    arg_type=ArgumentType.STRING,
+                    optional=True,
+                    default="worker",
+                    description="Agent for subtasks that do not name one"
+                ),
+                Argument(
+                    name="max_turns",
+                    arg_type=ArgumentType.INT,
+                    optional=True,
+                    description="Turn limit for each subtask (capped by the runtime's budget)"
+                ),
+                Argument(
+                    name="timeout",
+                    arg_type=ArgumentType.FLOAT,
+                    optional=True,
+                    description="Seconds for all subtasks together; unfinished ones are stopped (capped by the runtime's budget)"
+                )
+            ],
+            config=config
+        )
+
+    def _run(self, args):
+        delegator = current_context().delegator
+        loop = calling_loop()
+        if delegator is None or loop is None:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_UNAVAILABLE,
+                              message="Delegation is not available in this session")
+        try:
+            subtasks = parse_tasks(args.get("tasks") or "", (args.get("agent") or "worker").strip())
+        except ValueError as e:
+            return ToolResult(success=False, code=ErrorCodes.MALFORMED_ARGUMENT, message=str(e))
+        try:
+            max_turns = int(args['max_turns']) if args.get('max_turns') not in (None, '') else None
+            timeout = float(args['timeout']) if args.get('timeout') not in (None, '') else None
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid max_turns or timeout - must be a number")
+        if (max_turns is not None and max_turns <= 0) or (timeout is not None and timeout <= 0):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="max_turns and timeout must be positive")
+
+        # Imported here: the delegator only exists when Core's runtime created this session
+        from Core.delegation import Subtask
+        try:
+            records = delegator.run_threadsafe(
+                loop, [Subtask(agent, task) for agent, task in subtasks],
+                max_turns=max_turns, timeout=timeout)
+        except KeyError as e:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"{e.args[0]}. Known agents: {', '.join(delegator.agents())}")
+        except ValueError as e:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE, message=str(e))
+
+        report = format_report(records)
+        if not any(record["status"] in _FINISHED for record in records):
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED, message=report)
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=report)
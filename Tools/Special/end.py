@@ -5,7 +5,8 @@ class End(Tool):
     def __init__(self):
         config = ToolConfig(
             test_mode=True,
-            needs_sudo=False
+            needs_sudo=False,
+            runs_on_loop=True
         )
 
         super().__init__(
@@ -0,0 +1,42 @@
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ArgumentType, ToolResult
+from Tools.context import current_context
+
+
+class JobStatus(Tool):
+    def __init__(self):
+        config = ToolConfig(
+            test_mode=True,
+            needs_sudo=False,
+            runs_on_loop=True
+        )
+        super().__init__(
+            name="job_status",
+            description="Shows the status of background jobs (tool calls made with 'background: true'), "
+                        "and the result of a finished one",
+            args=[
+                Argument(
+                    name="job",
+                    arg_type=ArgumentType.STRING,
+                    optional=True,
+                    description="The job id, as returned when it started; omit to list every job"
+                )
+            ],
+            config=config
+        )
+
+    def _run(self, args):
+        jobs = current_context().jobs
+        if jobs is None:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_UNAVAILABLE,
+                              message="Background jobs are not available in this session")
+        job_id = (args.get("job") or "").strip()
+        if not job_id:
+            if not jobs.jobs:
+                return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="No background jobs")
+            return ToolResult(success=True, code=ErrorCodes.SUCCESS,
+                              message="\n".join(job.describe() for job in jobs.jobs.values()))
+        try:
+            job = jobs.get(job_id)
+        except KeyError as e:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND, message=e.args[0])
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=job.report())
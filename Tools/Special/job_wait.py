@@ -0,0 +1,56 @@
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ArgumentType, ToolResult
+from Tools.context import calling_loop, current_context
+
+DEFAULT_TIMEOUT = 60.0
+MAX_TIMEOUT = 600.0
+
+
+class JobWait(Tool):
+    def __init__(self):
+        config = ToolConfig(
+            test_mode=True,
+            needs_sudo=False,
+            waits_on_sessions=True
+        )
+        super().__init__(
+            name="job_wait",
+            description="Waits for a background job to finish and returns its result",
+            args=[
+                Argument(
+                    name="job",
+                    arg_type=ArgumentType.STRING,
+                    description="The job id, as returned when it started"
+                ),
+                Argument(
+                    name="timeout",
+                    arg_type=ArgumentType.FLOAT,
+                    optional=True,
+                    description=f"Seconds to wait at most (default {DEFAULT_TIMEOUT:.0f}, up to {MAX_TIMEOUT:.0f}); "
+                                f"the job keeps running after that"
+                )
+            ],
+            config=config
+        )
+
+    def _run(self, args):
+        jobs = current_context().jobs
+        loop = calling_loop()
+        if jobs is None or loop is None:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_UNAVAILABLE,
+                              message="Background jobs are not available in this session")
+        try:
+            timeout = float(args['timeout']) if args.get('timeout') not in (None, '') else DEFAULT_TIMEOUT
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid timeout - must be a number")
+        if timeout < 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE, message="timeout cannot be negative")
+
+        try:
+            job = jobs.wait_threadsafe(loop, args.get("job") or "", min(timeout, MAX_TIMEOUT))
+        except KeyError as e:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND, message=e.args[0])
+        if job.finished is None:
+            return ToolResult(success=False, code=ErrorCodes.TIMEOUT,
+                              message=f"{job.describe()}; its result will be added when it finishes")
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=job.report())
@@ -1,14 +1,16 @@
 from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ArgumentType, ToolResult
+from Tools.context import current_context
 
 class Message(Tool):
     def __init__(self):
         config = ToolConfig(
             test_mode=True,
-            needs_sudo=False
+            needs_sudo=False,
+            runs_on_loop=True
         )
         super().__init__(
             name="message",
-            description="Sends a message from the agent to the user",
+            description="Sends a message to the user or to another agent",
             args=[
                 Argument(
                     name="text",
@@ -22,6 +24,13 @@ class Message(Tool):
                     optional=True,
                     default=False, # Default is False
                     description="Whether to highlight this message as important"
+                ),
+                Argument(
+                    name="to",
+                    arg_type=ArgumentType.STRING,
+                    optional=True,
+                    default="user",
+                    description="Recipient: 'user', or the id of another agent when agents run concurrently"
                 )
             ],
             config=config
@@ -43,6 +52,14 @@ class Message(Tool):
             is_important = important_arg.lower() == 'true'
         # ---------------------------------------------------------------
 
+        recipient = (args.get("to") or "user").strip()
+        bus = current_context().message_bus
+        if bus is not None:
+            return self._send(bus, recipient, str(text), is_important)
+        if recipient != "user":
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_UNAVAILABLE,
+                              message="Messages to other agents need the concurrent runtime; only 'user' is reachable")
+
         if is_important:
             formatted_message = f"\n!!! IMPORTANT MESSAGE !!!\n{text}\n!!!\n"
         else:
@@ -52,3 +69,23 @@ class Message(Tool):
         print(formatted_message)
         # Return success, message indicates display happened
         return ToolResult(success=True, code=ErrorCodes.SUCCESS, message="Message displayed.")
+
+    def _send(self, bus, recipient, text, important):
+        # Imported here: the bus only exists when Core's concurrent runtime is running
+        from Core.message_bus import Envelope, MailboxFull, UnknownRecipient
+
+        sender = current_context().session_id
+        if recipient == sender:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="An agent cannot send a message to itself")
+        try:
+            bus.post(Envelope(sender=sender, recipient=recipient, text=text, important=important))
+        except UnknownRecipient:
+            known = ", ".join(a for a in bus.addresses() if a != sender)
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"Unknown recipient '{recipient}'. Known recipients: {known}")
+        except MailboxFull:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_BUSY,
+                              message=f"The inbox of '{recipient}' is full ({bus.pending(recipient)} unread "
+                                      f"messages); wait for a reply before sending more")
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=f"Message sent to {recipient}.")
@@ -4,7 +4,8 @@ class Pause(Tool):
     def __init__(self):
         config = ToolConfig(
             test_mode=True,
-            needs_sudo=False
+            needs_sudo=False,
+            runs_on_loop=True
         )
         super().__init__(
             name="pause",
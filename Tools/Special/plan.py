@@ -0,0 +1,88 @@
+import asyncio
+
+from Tools.base import Tool, Argument, ToolConfig, ErrorCodes, ArgumentType, ToolResult
+from Tools.context import calling_loop, current_context
+from Tools.Core.task_blocks import split_blocks, split_headers
+
+HEADERS = ("id", "agent", "after")
+
+
+def parse_plan(text: str, default_agent: str):
+    """Turns the tasks block into task specs for Core.task_graph.TaskGraph.from_specs."""
+    specs = []
+    for number, block in enumerate(split_blocks(text), 1):
+        headers, body = split_headers(block, HEADERS)
+        if not body:
+            raise ValueError(f"Task {number} has no description")
+        after = [d.strip() for d in headers.get("after", "").split(",") if d.strip()]
+        specs.append({"id": headers.get("id") or str(number), "task": body,
+                      "agent": headers.get("agent") or default_agent, "depends_on": after})
+    return specs
+
+
+class SubmitPlan(Tool):
+    def __init__(self):
+        config = ToolConfig(
+            test_mode=True,
+            needs_sudo=False,
+            waits_on_sessions=True
+        )
+        super().__init__(
+            name="submit_plan",
+            description="Runs a plan of subtasks with dependencies: each subtask goes to an agent as soon as the ones "
+                        "it depends on are done, independent ones in parallel, and failed ones are retried",
+            args=[
+                Argument(
+                    name="tasks",
+                    arg_type=ArgumentType.STRING,
+                    description="The subtasks, separated by lines containing only '---'. Each may start with "
+                                "'id: <name>', 'agent: <agent_id>' and 'after: <id>, <id>' lines; the rest is the "
+                                "task. A task receives the results of the tasks it comes after"
+                ),
+                Argument(
+                    name="agent",
+                    arg_type=ArgumentType.STRING,
+                    optional=True,
+                    default="worker",
+                    description="Agent for subtasks that do not name one"
+                ),
+                Argument(
+                    name="timeout",
+                    arg_type=ArgumentType.FLOAT,
+                    optional=True,
+                    description="Seconds for the whole plan; unfinished subtasks are stopped (capped by the runtime's budget)"
+                )
+            ],
+            config=config
+        )
+
+    def _run(self, args):
+        delegator = current_context().delegator
+        loop = calling_loop()
+        if delegator is None or loop is None:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_UNAVAILABLE,
+                              message="Plans cannot be run in this session")
+        try:
+            timeout = float(args['timeout']) if args.get('timeout') not in (None, '') else None
+        except (TypeError, ValueError):
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE,
+                              message="Invalid timeout - must be a number")
+        if timeout is not None and timeout <= 0:
+            return ToolResult(success=False, code=ErrorCodes.INVALID_ARGUMENT_VALUE, message="timeout must be positive")
+
+        # Imported here: the delegator only exists when Core's runtime created this session
+        from Core.task_graph import DEFAULT_TIMEOUT, TaskGraph, TaskStatus, run_graph
+        try:
+            graph = TaskGraph.from_specs(parse_plan(args.get("tasks") or "", (args.get("agent") or "worker").strip()))
+        except ValueError as e:
+            return ToolResult(success=False, code=ErrorCodes.MALFORMED_ARGUMENT, message=str(e))
+        try:
+            asyncio.run_coroutine_threadsafe(
+                run_graph(graph, delegator, timeout=min(timeout or DEFAULT_TIMEOUT, DEFAULT_TIMEOUT)), loop).result()
+        except KeyError as e:
+            return ToolResult(success=False, code=ErrorCodes.RESOURCE_NOT_FOUND,
+                              message=f"{e.args[0]}. Known agents: {', '.join(delegator.agents())}")
+
+        if any(node.status is not TaskStatus.COMPLETED for node in graph.nodes.values()):
+            return ToolResult(success=False, code=ErrorCodes.OPERATION_FAILED, message=graph.summary())
+        return ToolResult(success=True, code=ErrorCodes.SUCCESS, message=graph.summary())
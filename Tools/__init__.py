@@ -1,30 +1,61 @@
 """
 Tools package for agent operations.
+
+Tool classes are exported lazily so that importing the package (or any module
+in it) does not import every tool. The registry builds prompts from its
+discovery manifest and only imports a tool module when the tool is executed.
 """
 
+import importlib
+
 # Import base components
 from Tools.base import Tool, Argument, ToolConfig, ArgumentType
 from Tools.error_codes import ErrorCodes
+from Tools.context import ToolContext, current_context, use_context
 
-# Import File tools
-from Tools.File.read import ReadFile
-from Tools.File.write import WriteFile
-from Tools.File.edit import EditFile
-from Tools.File.delete import DeleteFile
-from Tools.File.ls import ListDirectory
+_LAZY_EXPORTS = {
+    # File tools
+    'ReadFile': 'Tools.File.read',
+    'WriteFile': 'Tools.File.write',
+    'EditFile': 'Tools.File.edit',
+    'PatchFile': 'Tools.File.patch',
+    'SearchFiles': 'Tools.File.search',
+    'OutlineFile': 'Tools.File.outline',
+    'BulkReplace': 'Tools.File.bulk_replace',
+    'ReadManyFiles': 'Tools.File.read_many',
+    'CopyFile': 'Tools.File.copy',
+    'MoveFile': 'Tools.File.move',
+    'RestoreCheckpoint': 'Tools.File.restore',
+    'DeleteFile': 'Tools.File.delete',
+    'ListDirectory': 'Tools.File.ls',
+
+    # Special tools
+    'Message': 'Tools.Special.message',
+    'Pause': 'Tools.Special.pause',
+    'End': 'Tools.Special.end',
+    'Delegate': 'Tools.Special.delegate',
+    'SubmitPlan': 'Tools.Special.plan',
+    'JobStatus': 'Tools.Special.job_status',
+    'JobWait': 'Tools.Special.job_wait',
+}
 
-# Import Special tools
-from Tools.Special.message import Message
-from Tools.Special.pause import Pause
-from Tools.Special.end import End
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # Base components
     'Tool', 'Argument', 'ToolConfig', 'ErrorCodes', 'ArgumentType',
+    'ToolContext', 'current_context', 'use_context',
     
     # File tools
-    'ReadFile', 'WriteFile', 'EditFile', 'DeleteFile', 'ListDirectory',
+    'ReadFile', 'WriteFile', 'EditFile', 'PatchFile', 'DeleteFile', 'ListDirectory', 'SearchFiles',
+    'OutlineFile', 'BulkReplace', 'ReadManyFiles', 'CopyFile', 'MoveFile', 'RestoreCheckpoint',
     
     # Special tools
-    'Message', 'Pause', 'End'
+    'Message', 'Pause', 'End', 'Delegate', 'SubmitPlan', 'JobStatus', 'JobWait'
 ]
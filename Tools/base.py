@@ -5,6 +5,12 @@ from typing import List, Dict, Any, Optional
 from Tools.error_codes import ErrorCodes, ConversationEnded
 import traceback # For debugging unexpected errors
 
+def to_bool(value: Any) -> bool:
+    """Interprets a tool argument as a boolean; the parser passes strings like 'true'."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "1", "on")
+    return bool(value)
+
 class ArgumentType(Enum):
     STRING = auto()
     BOOLEAN = auto()
@@ -24,6 +30,15 @@ class Argument:
 class ToolConfig:
     test_mode: bool = True
     needs_sudo: bool = False
+    # Large <<< block arguments arrive as a StreamedText instead of a str (see Tools/Core/streamed_text.py)
+    accepts_streamed_text: bool = False
+    # The Executor opens a snapshot checkpoint before each call (see Tools/Core/snapshots.py)
+    mutates_files: bool = False
+    # Run on the event loop thread instead of a worker thread (cheap tools that touch loop-bound state)
+    runs_on_loop: bool = False
+    # Waits on other agent sessions or background jobs (delegate, job_wait); runs without holding a "tools"
+    # slot, which those need
+    waits_on_sessions: bool = False
 
 @dataclass
 class ToolResult:
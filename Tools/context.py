@@ -0,0 +1,124 @@
+"""
+Per-session state for tool execution.
+
+Tool instances are shared process-wide singletons (see Tools/Core/registry.py),
+so anything that belongs to one conversation lives in a ToolContext instead.
+The Executor activates the caller's context around every tool call; tools look
+it up with current_context(). Because the active context is held in a
+ContextVar, concurrent sessions on different asyncio tasks or threads never see
+each other's state.
+"""
+
+import asyncio
+import os
+import tempfile
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from Tools.Core.file_cache import FileCache
+from Tools.Core.snapshots import SnapshotStore, snapshot_root
+
+
+def default_cache_dir() -> str:
+    """Directory for on-disk tool caches such as line-offset sidecar indexes."""
+    configured = os.getenv("AGENT_TOOL_CACHE_DIR")
+    if configured:
+        return configured
+    uid = getattr(os, "getuid", lambda: "user")()
+    return os.path.join(tempfile.gettempdir(), f"agent_tool_cache_{uid}")
+
+
+@dataclass
+class ReadRecord:
+    """What a session was last shown of a file."""
+    stamp: Any = None           # FileStamp at read time
+    digest: Optional[str] = None
+    view: Any = None            # Which part of the file was returned
+
+
+@dataclass
+class ToolContext:
+    session_id: str = "default"
+    # Relative tool paths are resolved against this; None means the process cwd
+    working_dir: Optional[str] = None
+    # Absolute paths the session has read (edit_file requires a prior read)
+    read_files: Dict[str, ReadRecord] = field(default_factory=dict)
+    # File contents shared by read_file and edit_file
+    files: FileCache = field(default_factory=FileCache)
+    # Free-form per-session caches, keyed by the owning tool or component
+    cache: Dict[str, Any] = field(default_factory=dict)
+    # On-disk caches; safe to share between sessions
+    cache_dir: str = field(default_factory=default_cache_dir)
+    # Checkpoints of the files this session's tools changed; defaults to a new store of this session's own
+    snapshots: Optional[SnapshotStore] = None
+    # Core.message_bus.MessageBus when agents run concurrently; the message tool routes through it
+    message_bus: Any = None
+    # Core.delegation.Delegator when the session may hand subtasks to other agents (the delegate tool)
+    delegator: Any = None
+    # Core.jobs.JobManager of the session's background tool calls (job_status, job_wait)
+    jobs: Any = None
+
+    def __post_init__(self):
+        if self.snapshots is None:
+            root = snapshot_root(self.cache_dir, self.working_dir or os.getcwd())
+            self.snapshots = SnapshotStore.for_session(root, self.session_id)
+
+    def resolve_path(self, path: str) -> str:
+        """Returns the absolute path for a tool path argument."""
+        path = os.path.expanduser(str(path))
+        if self.working_dir and not os.path.isabs(path):
+            path = os.path.join(self.working_dir, path)
+        return os.path.abspath(path)
+
+    def mark_read(self, path: str, stamp: Any = None, digest: Optional[str] = None, view: Any = None) -> None:
+        self.read_files[self.resolve_path(path)] = ReadRecord(stamp, digest, view)
+
+    def has_read(self, path: str) -> bool:
+        return self.resolve_path(path) in self.read_files
+
+    def last_read(self, path: str) -> Optional[ReadRecord]:
+        return self.read_files.get(self.resolve_path(path))
+
+
+# Used when a tool runs outside any session, e.g. called directly from a script
+_default_context = ToolContext()
+_current_context: contextvars.ContextVar[Optional[ToolContext]] = contextvars.ContextVar(
+    "tool_context", default=None
+)
+# Set by the Executor when it hands a tool call to a worker thread
+_calling_loop: contextvars.ContextVar[Optional[asyncio.AbstractEventLoop]] = contextvars.ContextVar(
+    "calling_loop", default=None
+)
+
+
+def current_context() -> ToolContext:
+    """Returns the context of the session whose tool call is running."""
+    context = _current_context.get()
+    return context if context is not None else _default_context
+
+
+@contextmanager
+def use_context(context: ToolContext) -> Iterator[ToolContext]:
+    """Makes `context` the active tool context for the enclosed block."""
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def calling_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The event loop of the session whose tool call runs in this worker thread, if any."""
+    return _calling_loop.get()
+
+
+@contextmanager
+def use_calling_loop(loop: asyncio.AbstractEventLoop) -> Iterator[asyncio.AbstractEventLoop]:
+    """Records `loop` for worker threads started inside the block (contextvars are copied to them)."""
+    token = _calling_loop.set(loop)
+    try:
+        yield loop
+    finally:
+        _calling_loop.reset(token)
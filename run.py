@@ -12,6 +12,13 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from Core.orchestrator import Orchestrator, load_agent_configurations
+from Core.batch import BatchRunner, load_items, DEFAULT_CONCURRENCY
+from Core.delegation import Delegator
+from Core.task_graph import load_plan, run_graph
+from Core.server import AgentServer, DEFAULT_PORT
+from Core.hibernation import DEFAULT_IDLE_SECONDS, DEFAULT_MEMORY_BUDGET
+from Core.supervisor import Supervisor
+from Core.rate_limit import SharedRateLimiter, parse_rate_limits
 from Core.utils import get_multiline_input
 
 def load_env_variables():
@@ -29,12 +36,46 @@ async def main():
     parser.add_argument("--prompt", type=str, default=None, help="Initial prompt for the CEO agent.")
     parser.add_argument("--agent", type=str, default="ceo", help="ID of the agent to interact with initially.")
     parser.add_argument("--max-turns", type=int, default=10, help="Maximum number of autonomous turns.")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Run all loaded agents at once, talking through the message tool.")
+    parser.add_argument("--batch", type=str, default=None,
+                        help="JSONL file of prompts to run headless, one independent session per line.")
+    parser.add_argument("--output", type=str, default=None, help="Batch results file (JSONL). Default: <batch>.results.jsonl")
+    parser.add_argument("--progress", type=str, default=None,
+                        help="Batch progress file used to resume after a crash. Default: <output>.progress")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of batch sessions (or plan tasks) running at once.")
+    parser.add_argument("--plan", type=str, default=None,
+                        help="JSON file of tasks with dependencies to run in parallel, each in its own session.")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as an HTTP server hosting many sessions instead of the interactive loop.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Address the server listens on.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port the server listens on.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Server worker processes; sessions are sharded across them (0 = one per CPU).")
+    parser.add_argument("--rate-limit", action="append", default=[], metavar="PROVIDER=RPM",
+                        help="Requests per minute allowed for a provider across all workers. Repeatable.")
+    parser.add_argument("--memory-budget", type=float, default=DEFAULT_MEMORY_BUDGET / 2 ** 20, metavar="MB",
+                        help="Megabytes of conversation text a server worker keeps in memory; the least recently "
+                             "active idle sessions beyond it are hibernated to disk.")
+    parser.add_argument("--hibernate-after", type=float, default=DEFAULT_IDLE_SECONDS, metavar="SECONDS",
+                        help="Hibernate server sessions idle for this long regardless of the memory budget.")
     # Add args to override default model/provider for specific agents later if needed
     # parser.add_argument("--ceo-provider", type=str, help="Override CEO provider")
     # parser.add_argument("--ceo-model", type=str, help="Override CEO model")
 
     args = parser.parse_args()
 
+    if args.batch:
+        await run_batch(args)
+        return
+    if args.plan:
+        await run_plan(args)
+        return
+    if args.serve:
+        await run_server(args)
+        return
+
     initial_prompt = args.prompt
     if not initial_prompt:
         initial_prompt = get_multiline_input("Enter the initial prompt for the CEO agent (press Enter twice to submit):\n")
@@ -64,7 +105,8 @@ async def main():
              print(f"Available agents: {list(orchestrator.agents.keys())}")
              sys.exit(1)
 
-        await orchestrator.run_main_loop(
+        run = orchestrator.run_concurrent if args.concurrent else orchestrator.run_main_loop
+        await run(
             initial_prompt=initial_prompt,
             target_agent_id=args.agent,
             max_turns=args.max_turns
@@ -75,6 +117,62 @@ async def main():
         traceback.print_exc()
         sys.exit(1)
 
+async def run_server(args):
+    try:
+        rate_limits = parse_rate_limits(args.rate_limit)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    memory_budget = int(args.memory_budget * 2 ** 20)
+    if args.workers != 1:
+        supervisor = Supervisor(workers=args.workers or None, host=args.host, port=args.port,
+                                rate_limits=rate_limits, max_turns=args.max_turns,
+                                memory_budget=memory_budget, idle_seconds=args.hibernate_after)
+        await supervisor.serve_forever()
+        return
+    orchestrator = Orchestrator(load_agent_configurations())
+    for provider, client in orchestrator.clients.items():
+        if provider in rate_limits:
+            client.rate_limiter = SharedRateLimiter(rate_limits[provider])
+    server = AgentServer(orchestrator, host=args.host, port=args.port, max_turns=args.max_turns,
+                         memory_budget=memory_budget, idle_seconds=args.hibernate_after)
+    await server.serve_forever()
+
+async def run_batch(args):
+    try:
+        items = load_items(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"Error reading batch file: {e}")
+        sys.exit(1)
+    output_path = args.output or os.path.splitext(args.batch)[0] + ".results.jsonl"
+
+    orchestrator = Orchestrator(load_agent_configurations())
+    runner = BatchRunner(orchestrator, output_path, progress_path=args.progress, concurrency=args.concurrency,
+                         default_agent=args.agent, max_turns=args.max_turns)
+    statuses = await runner.run(items)
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())) or "nothing to do"
+    print(f"Batch finished: {summary}. Results in {output_path}")
+
+async def run_plan(args):
+    try:
+        graph = load_plan(args.plan)
+    except (OSError, ValueError) as e:
+        print(f"Error reading plan file: {e}")
+        sys.exit(1)
+
+    orchestrator = Orchestrator(load_agent_configurations())
+    delegator = Delegator(orchestrator, "plan", max_turns=args.max_turns)
+
+    def report(node):
+        print(f"[plan] {node.id}: {node.status.value}", file=sys.stderr, flush=True)
+
+    try:
+        await run_graph(graph, delegator, max_parallel=args.concurrency, on_update=report)
+    except KeyError as e:
+        print(f"Error: {e.args[0]}. Available agents: {list(orchestrator.agents.keys())}")
+        sys.exit(1)
+    print(graph.summary())
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())